@@ -0,0 +1,118 @@
+"""
+Configuration of the offline task advancement benchmarks.
+
+The benchmarks replay the recorded test task episodes through the tasks without simulator and
+check that the advancements are the recorded ones. Without baseline, they only report their
+results. The timings depend on the machine, so no baseline is committed (`baseline.json` is
+ignored by git) and each contributor records their own:
+1. On the main branch, record the baseline with `pytest benchmarks --task-bench-update-baseline`.
+2. On the change, run `pytest benchmarks` to fail on the regressions beyond
+   `--task-bench-threshold` compared to the baseline.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_NB_ROUNDS = 3
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+benchmark_results_key = pytest.StashKey[dict[str, dict[str, Any]]]()
+SUMMARY_COLUMNS = {
+    "nb_steps": ("steps", "{:>12d}"),
+    "steps_per_second": ("steps/s", "{:>12.1f}"),
+    "p50_step_latency_ms": ("p50 (ms)", "{:>12.3f}"),
+    "p99_step_latency_ms": ("p99 (ms)", "{:>12.3f}"),
+    "reset_time_ms": ("reset (ms)", "{:>12.2f}"),
+    "peak_memory_mib": ("peak (MiB)", "{:>12.2f}"),
+}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("task_bench", "task advancement benchmarks")
+    group.addoption(
+        "--task-bench-rounds",
+        type=int,
+        default=DEFAULT_NB_ROUNDS,
+        help="Number of timed replays of each recorded episode.",
+    )
+    group.addoption(
+        "--task-bench-baseline",
+        type=Path,
+        default=DEFAULT_BASELINE_PATH,
+        help="Path of the json file of the baseline results.",
+    )
+    group.addoption(
+        "--task-bench-threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Relative regression of the throughput, p50 latency or peak memory failing a benchmark.",
+    )
+    group.addoption(
+        "--task-bench-update-baseline",
+        action="store_true",
+        help="Write the results in the baseline instead of comparing them to it.",
+    )
+
+
+def _get_option(config: pytest.Config, name: str, default: Any) -> Any:
+    # The options are not registered when the benchmarks are collected from the repository root
+    return config.getoption(name, default=default)
+
+
+@pytest.fixture(scope="session")
+def nb_rounds(pytestconfig: pytest.Config) -> int:
+    return _get_option(pytestconfig, "task_bench_rounds", DEFAULT_NB_ROUNDS)
+
+
+@pytest.fixture(scope="session")
+def regression_threshold(pytestconfig: pytest.Config) -> float:
+    return _get_option(pytestconfig, "task_bench_threshold", DEFAULT_REGRESSION_THRESHOLD)
+
+
+@pytest.fixture(scope="session")
+def baseline_results(pytestconfig: pytest.Config) -> dict[str, dict[str, Any]]:
+    """Baseline results of each recorded episode, empty when updating the baseline or without baseline."""
+    baseline_path = _get_option(pytestconfig, "task_bench_baseline", DEFAULT_BASELINE_PATH)
+    if _get_option(pytestconfig, "task_bench_update_baseline", False) or not baseline_path.exists():
+        return {}
+    with baseline_path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(pytestconfig: pytest.Config) -> dict[str, dict[str, Any]]:
+    """Results of the benchmarks of the session, by recorded episode."""
+    return pytestconfig.stash.setdefault(benchmark_results_key, {})
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter, config: pytest.Config) -> None:
+    results = config.stash.get(benchmark_results_key, {})
+    if not results:
+        return
+    terminalreporter.section("task advancement benchmarks")
+    terminalreporter.write_line(f"{'episode':<36}" + "".join(f"{title:>12}" for title, _ in SUMMARY_COLUMNS.values()))
+    for episode_name, episode_results in results.items():
+        terminalreporter.write_line(
+            f"{episode_name:<36}"
+            + "".join(fmt.format(episode_results[metric]) for metric, (_, fmt) in SUMMARY_COLUMNS.items())
+        )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    results = config.stash.get(benchmark_results_key, {})
+    if not results or not _get_option(config, "task_bench_update_baseline", False):
+        return
+    baseline_path = _get_option(config, "task_bench_baseline", DEFAULT_BASELINE_PATH)
+    # Keep the baseline of the episodes that were not benchmarked in this session
+    baseline = {}
+    if baseline_path.exists():
+        with baseline_path.open(encoding="utf-8") as f:
+            baseline = json.load(f)
+    baseline.update(results)
+    with baseline_path.open("w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
@@ -0,0 +1,162 @@
+"""
+Offline benchmarks of the task advancement on the recorded test task episodes.
+
+Each recorded episode is replayed through `GraphTask.reset` and `GraphTask.compute_task_advancement`
+without simulator: once with tracemalloc to measure the peak memory, then `--task-bench-rounds`
+timed rounds, each with a new task. Every replay must give the recorded advancements and
+terminations, so that an optimization of the task advancement is proven both faster and
+equivalent.
+"""
+
+import gc
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from tests.test_tasks import RecordedEpisode, load_recorded_episode, test_task_data_dir
+
+from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.tasks import (
+    CleanToiletsTask,
+    CleanUpBathroomTask,
+    CleanUpBedroomTask,
+    CleanUpKitchenTask,
+    CleanUpLivingRoomTask,
+    ClearDiningTable,
+    DoHomeworkTask,
+    LookInLight,
+    Open,
+    Pickup,
+    PlaceCooledIn,
+    PrepareGoingToBedTask,
+    PrepareMealTask,
+    WashCutleryTask,
+)
+from rl_thor.envs.tasks.tasks_interface import GraphTask
+
+recorded_episodes: dict[str, Callable[[], GraphTask]] = {
+    "pickup_mug": lambda: Pickup(picked_up_object_type=SimObjectType.MUG),
+    "open_fridge": lambda: Open(opened_object_type=SimObjectType.FRIDGE),
+    "place_cooled_in_apple_counter_top": lambda: PlaceCooledIn(
+        placed_object_type=SimObjectType.APPLE, receptacle_type=SimObjectType.COUNTER_TOP
+    ),
+    "look_in_light_book": lambda: LookInLight(looked_at_object_type=SimObjectType.BOOK),
+    "prepare_meal": PrepareMealTask,
+    "prepare_going_to_bed": PrepareGoingToBedTask,
+    "WashCutleryTask": WashCutleryTask,
+    "ClearDiningTable": ClearDiningTable,
+    "DoHomework": DoHomeworkTask,
+    "CleanToilets": CleanToiletsTask,
+    "clean_up_kitchen": CleanUpKitchenTask,
+    "clean_up_living_room": CleanUpLivingRoomTask,
+    "clean_up_bedroom": CleanUpBedroomTask,
+    "clean_up_bathroom": CleanUpBathroomTask,
+}
+
+# Metrics compared to the baseline: True if higher is better
+GATED_METRICS = {
+    "steps_per_second": True,
+    "p50_step_latency_ms": False,
+    "peak_memory_mib": False,
+}
+
+
+def replay_episode(
+    task_factory: Callable[[], GraphTask],
+    episode: RecordedEpisode,
+    step_latencies: list[float] | None = None,
+) -> float:
+    """
+    Replay the episode with a new task and check that its results are the recorded ones.
+
+    Args:
+        task_factory (Callable[[], GraphTask]): Function creating the task of the episode.
+        episode (RecordedEpisode): Recorded episode.
+        step_latencies (list[float] | None): List to which the duration of each advancement
+            computation is appended, in seconds. Defaults to None.
+
+    Returns:
+        reset_time (float): Duration of the reset of the task, in seconds.
+    """
+    task = task_factory()
+    start_time = time.perf_counter()
+    reset_successful, task_advancement, is_terminated, _ = task.reset(episode.initial_controller())
+    reset_time = time.perf_counter() - start_time
+    assert reset_successful
+    advancement_list, terminated_list = [task_advancement], [is_terminated]
+
+    for event, controller_action in episode.steps():
+        start_time = time.perf_counter()
+        task_advancement, is_terminated, _ = task.compute_task_advancement(event, controller_action)
+        if step_latencies is not None:
+            step_latencies.append(time.perf_counter() - start_time)
+        advancement_list.append(task_advancement)
+        terminated_list.append(is_terminated)
+
+    assert advancement_list == episode.advancement_list
+    assert terminated_list == episode.terminated_list
+    return reset_time
+
+
+def get_quantile(values: list[float], q: float) -> float:
+    """Return the q-quantile of the values, interpolated between the closest ranks."""
+    sorted_values = sorted(values)
+    rank = q * (len(sorted_values) - 1)
+    lower_idx = int(rank)
+    upper_idx = min(lower_idx + 1, len(sorted_values) - 1)
+    return sorted_values[lower_idx] + (sorted_values[upper_idx] - sorted_values[lower_idx]) * (rank - lower_idx)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("episode_name", list(recorded_episodes))
+def test_task_advancement_benchmark(
+    episode_name: str,
+    nb_rounds: int,
+    regression_threshold: float,
+    baseline_results: dict[str, dict[str, Any]],
+    benchmark_results: dict[str, dict[str, Any]],
+) -> None:
+    episode_dir = test_task_data_dir / episode_name
+    # The events of some episodes are not shipped with the test data
+    if not (episode_dir / "event_list.pkl").exists():
+        pytest.skip(f"No recorded events for the episode {episode_name}.")
+    task_factory = recorded_episodes[episode_name]
+    episode = load_recorded_episode(episode_dir)
+
+    # Untimed round measuring the memory allocated by the replay, which also warms up the caches
+    tracemalloc.start()
+    replay_episode(task_factory, episode)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Like timeit, avoid timing the garbage collections triggered by the loaded events
+    step_latencies: list[float] = []
+    gc.collect()
+    gc.disable()
+    try:
+        reset_times = [replay_episode(task_factory, episode, step_latencies) for _ in range(nb_rounds)]
+    finally:
+        gc.enable()
+
+    results = {
+        "nb_steps": len(episode.event_list) - 1,
+        "steps_per_second": len(step_latencies) / sum(step_latencies),
+        "p50_step_latency_ms": get_quantile(step_latencies, 0.5) * 1000,
+        "p99_step_latency_ms": get_quantile(step_latencies, 0.99) * 1000,
+        "reset_time_ms": statistics.median(reset_times) * 1000,
+        "peak_memory_mib": peak_memory / 2**20,
+    }
+    benchmark_results[episode_name] = results
+
+    baseline = baseline_results.get(episode_name)
+    if baseline is None:
+        return
+    regressions = []
+    for metric, higher_is_better in GATED_METRICS.items():
+        relative_change = results[metric] / baseline[metric] - 1
+        if (-relative_change if higher_is_better else relative_change) > regression_threshold:
+            regressions.append(f"{metric}: {baseline[metric]:.4g} -> {results[metric]:.4g} ({relative_change:+.1%})")
+    assert not regressions, f"Regressions of {episode_name} beyond {regression_threshold:.0%}: {regressions}"
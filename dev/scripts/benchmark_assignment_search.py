@@ -0,0 +1,119 @@
+"""
+Script to benchmark the best global assignment search on the recorded test task episodes.
+
+Compare the branch-and-bound search of GraphTask with the exhaustive scan of the cartesian product
+of the overlap classes' interesting assignments, and check that both return the same best
+assignment.
+"""
+
+import gc
+import itertools
+import pickle as pkl  # noqa: S403
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.items import Assignment
+from rl_thor.envs.tasks.tasks import (
+    CleanToiletsTask,
+    CleanUpBathroomTask,
+    CleanUpBedroomTask,
+    CleanUpKitchenTask,
+    CleanUpLivingRoomTask,
+    DoHomeworkTask,
+    LookInLight,
+    Open,
+    Pickup,
+    PlaceCooledIn,
+    PrepareGoingToBedTask,
+    WashCutleryTask,
+)
+from rl_thor.envs.tasks.tasks_interface import GraphTask
+
+test_task_data_dir = Path(__file__).parent.parent.parent / "tests" / "data" / "test_tasks"
+NB_REPEATS = 5
+
+recorded_episodes = {
+    "pickup_mug": lambda: Pickup(picked_up_object_type=SimObjectType.MUG),
+    "open_fridge": lambda: Open(opened_object_type=SimObjectType.FRIDGE),
+    "place_cooled_in_apple_counter_top": lambda: PlaceCooledIn(
+        placed_object_type=SimObjectType.APPLE, receptacle_type=SimObjectType.COUNTER_TOP
+    ),
+    "look_in_light_book": lambda: LookInLight(looked_at_object_type=SimObjectType.BOOK),
+    "prepare_going_to_bed": PrepareGoingToBedTask,
+    "WashCutleryTask": WashCutleryTask,
+    "DoHomework": DoHomeworkTask,
+    "CleanToilets": CleanToiletsTask,
+    "clean_up_kitchen": CleanUpKitchenTask,
+    "clean_up_living_room": CleanUpLivingRoomTask,
+    "clean_up_bedroom": CleanUpBedroomTask,
+    "clean_up_bathroom": CleanUpBathroomTask,
+}
+
+
+@dataclass
+class MockController:
+    """Minimal stand-in for the AI2-THOR controller used to reset the tasks."""
+
+    last_event: Any
+    last_action: dict[str, Any]
+
+
+def exhaustive_search(task: GraphTask, overlap_classes_assignments: list[list[Assignment]]) -> tuple[int, Assignment]:
+    """Return the best global assignment by scanning the whole cartesian product."""
+    max_task_advancement = -1
+    best_assignment: Assignment = {}
+    for assignment_product in itertools.product(*overlap_classes_assignments):
+        global_assignment = {
+            item: obj_id
+            for overlap_class_assignment in assignment_product
+            for item, obj_id in overlap_class_assignment.items()
+        }
+        assignment_advancement = task.compute_assignment_advancement(global_assignment)
+        if assignment_advancement > max_task_advancement:
+            max_task_advancement = assignment_advancement
+            best_assignment = global_assignment
+            if max_task_advancement == task.maximum_advancement:
+                break
+    return max_task_advancement, best_assignment
+
+
+print(f"{'episode':<36}{'steps':>6}{'exhaustive (ms)':>18}{'branch-and-bound (ms)':>24}{'speedup':>10}")
+for episode_name, task_factory in recorded_episodes.items():
+    episode_dir = test_task_data_dir / episode_name
+    with (
+        (episode_dir / "event_list.pkl").open("rb") as f,
+        (episode_dir / "controller_action_list.pkl").open("rb") as g,
+    ):
+        event_list = pkl.load(f)  # noqa: S301
+        controller_action_list = pkl.load(g)  # noqa: S301
+
+    task = task_factory()
+    task.reset(MockController(event_list[0], controller_action_list[0]))
+    exhaustive_time = 0.0
+    branch_and_bound_time = 0.0
+    # Like timeit, avoid timing the garbage collections triggered by the loaded events
+    gc.disable()
+    for event in event_list[1:]:
+        scene_objects_dict = {obj["objectId"]: obj for obj in event.metadata["objects"]}
+        overlap_classes_assignments = [
+            overlap_class.compute_interesting_assignments(scene_objects_dict) for overlap_class in task.overlap_classes
+        ]
+        for _ in range(NB_REPEATS):
+            start_time = time.perf_counter()
+            exhaustive_result = exhaustive_search(task, overlap_classes_assignments)
+            exhaustive_time += time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            branch_and_bound_result = task._search_best_assignment(overlap_classes_assignments)  # noqa: SLF001
+            branch_and_bound_time += time.perf_counter() - start_time
+        assert branch_and_bound_result == exhaustive_result, episode_name
+    gc.enable()
+
+    nb_steps = len(event_list) - 1
+    print(
+        f"{episode_name:<36}{nb_steps:>6}{exhaustive_time * 1000 / NB_REPEATS:>18.2f}"
+        f"{branch_and_bound_time * 1000 / NB_REPEATS:>24.2f}{exhaustive_time / branch_and_bound_time:>10.1f}"
+    )
@@ -0,0 +1,124 @@
+"""
+Script to benchmark the memory held by the candidate data of the tasks and allocated at each step.
+
+The tasks are reset in scenes scaled by the synthetic controller at increasing object densities
+(see `rl_thor.envs.scene_scaling`), then their advancement is computed after random object
+interactions with the incremental advancement disabled, so that every candidate is updated at each
+step. For each task and density, the script reports:
+- the number of candidates of the task,
+- the memory held by the task after the reset and the number of objects tracked by the garbage
+    collector that it holds (every tracked object is traversed by each full collection),
+- the peak memory allocated during a step and the mean time of a step.
+
+Usage:
+    python dev/scripts/benchmark_candidate_data_memory.py --densities 1 5 20
+"""
+
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from rl_thor.envs.actions import Ai2thorAction
+from rl_thor.envs.controllers import SyntheticController
+from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.tasks import CleanUpKitchenTask, PlaceCooledIn, PlaceNSameIn
+from rl_thor.envs.tasks.tasks_interface import GraphTask
+
+DEFAULT_DENSITIES = [1, 5, 20]
+SCENE = "FloorPlan1"
+NB_STEPS = 20
+STATE_PERTURBATION = 0.25
+TASKS = {
+    "place_cooled_in": lambda: PlaceCooledIn(
+        placed_object_type=SimObjectType.APPLE, receptacle_type=SimObjectType.COUNTER_TOP
+    ),
+    "place_2_vases_in_cabinet": lambda: PlaceNSameIn(
+        placed_object_type=SimObjectType.VASE, receptacle_type=SimObjectType.CABINET, n=2
+    ),
+    "clean_up_kitchen": CleanUpKitchenTask,
+}
+INTERACTION_ACTIONS = [
+    Ai2thorAction.PICKUP_OBJECT,
+    Ai2thorAction.PUT_OBJECT,
+    Ai2thorAction.OPEN_OBJECT,
+    Ai2thorAction.CLOSE_OBJECT,
+    Ai2thorAction.TOGGLE_OBJECT_ON,
+    Ai2thorAction.TOGGLE_OBJECT_OFF,
+]
+
+
+def reset_task(task: GraphTask, controller: SyntheticController) -> tuple[int, int]:
+    """Reset the task and return the memory and the number of tracked objects it holds afterwards."""
+    gc.collect()
+    nb_tracked_objects = len(gc.get_objects())
+    tracemalloc.start()
+    reset_successful, _, _, _ = task.preprocess_and_reset(controller)
+    if not reset_successful:
+        tracemalloc.stop()
+        raise RuntimeError(f"{task} could not be reset in {SCENE}.")  # noqa: TRY003
+    # Release the info of the reset, only the task is kept
+    task._last_advancement_result = None  # noqa: SLF001
+    gc.collect()
+    held_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held_memory, len(gc.get_objects()) - nb_tracked_objects
+
+
+def benchmark_task(task: GraphTask, controller: SyntheticController, rng: np.random.Generator) -> dict[str, float]:
+    """Return the memory held by the task and the peak memory and time of its steps."""
+    controller.reset(SCENE)
+    held_memory, nb_tracked_objects = reset_task(task, controller)
+    task.incremental_advancement = False
+
+    object_ids = [obj_metadata["objectId"] for obj_metadata in controller.last_event.metadata["objects"]]
+    step_peaks, step_times = [], []
+    for _ in range(NB_STEPS):
+        action = INTERACTION_ACTIONS[rng.integers(len(INTERACTION_ACTIONS))]
+        event = controller.step(action=action, objectId=object_ids[rng.integers(len(object_ids))])
+        tracemalloc.start()
+        task.compute_task_advancement(event, controller.last_action)
+        _, step_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        step_peaks.append(step_peak)
+        start_time = time.perf_counter()
+        task.compute_task_advancement(event, controller.last_action)
+        step_times.append(time.perf_counter() - start_time)
+
+    return {
+        "nb_candidates": sum(len(item.candidates_data) for item in (*task.items, *task.auxiliary_items)),
+        "held_memory_kib": held_memory / 2**10,
+        "tracked_objects": nb_tracked_objects,
+        "step_peak_kib": statistics.mean(step_peaks) / 2**10,
+        "step_time_ms": statistics.mean(step_times) * 1000,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--densities", type=int, nargs="+", default=DEFAULT_DENSITIES, help="Object densities.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random interactions.")
+    args = parser.parse_args()
+
+    print(
+        f"{'task':<28}{'density':>8}{'candidates':>12}{'held (KiB)':>12}{'tracked':>10}"
+        f"{'step peak (KiB)':>17}{'step (ms)':>11}"
+    )
+    for density in sorted(args.densities):
+        controller = SyntheticController(
+            frame_shape=(1, 1, 3), object_density=density, state_perturbation=STATE_PERTURBATION
+        )
+        for task_name, task_factory in TASKS.items():
+            results = benchmark_task(task_factory(), controller, np.random.default_rng(args.seed))
+            print(
+                f"{task_name:<28}{density:>8}{results['nb_candidates']:>12}{results['held_memory_kib']:>12.1f}"
+                f"{results['tracked_objects']:>10}{results['step_peak_kib']:>17.1f}{results['step_time_ms']:>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
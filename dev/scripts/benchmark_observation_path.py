@@ -0,0 +1,66 @@
+"""
+Script to benchmark the frame memory traffic of the channel first observation path.
+
+Compare, for each frame resolution, the observation paths of `ChannelFirstObservationWrapper` when
+the consumer stores the observation in its own buffer (like Stable Baselines3's VecEnv buffers):
+- view: `np.moveaxis` view of the frame, copied once (strided) by the consumer,
+- buffer: frame first written in a contiguous buffer of the wrapper, then copied by the consumer,
+and report the peak temporary allocation and the time per step.
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+
+RESOLUTIONS = [(300, 300), (600, 600)]
+NB_STEPS = 200
+
+
+def view_path(frame: np.ndarray, consumer_buffer: np.ndarray) -> None:
+    """Moveaxis view of the frame, stored by the consumer."""
+    env_obs = np.moveaxis(frame, -1, 0)
+    consumer_buffer[...] = env_obs
+
+
+def buffer_path(frame: np.ndarray, frame_buffer: np.ndarray, consumer_buffer: np.ndarray) -> None:
+    """Frame written in the contiguous buffer of the wrapper, stored by the consumer."""
+    np.copyto(frame_buffer, np.moveaxis(frame, -1, 0))
+    env_obs = frame_buffer.view()
+    env_obs.flags.writeable = False
+    consumer_buffer[...] = env_obs
+
+
+def measure(step_function: Callable[..., None], frames: list[np.ndarray], *buffers: np.ndarray) -> tuple[float, float]:
+    """Return the peak bytes allocated during the steps and the time per step in microseconds."""
+    tracemalloc.start()
+    for frame in frames:
+        step_function(frame, *buffers)
+    _, peak_allocated_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start_time = time.perf_counter()
+    for frame in frames:
+        step_function(frame, *buffers)
+    step_time = (time.perf_counter() - start_time) / len(frames)
+    return peak_allocated_bytes, step_time * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    rng = np.random.default_rng(0)
+    for height, width in RESOLUTIONS:
+        frames = [rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8) for _ in range(NB_STEPS)]
+        consumer_buffer = np.empty((3, height, width), dtype=np.uint8)
+        frame_buffer = np.empty((3, height, width), dtype=np.uint8)
+
+        view_bytes, view_time = measure(view_path, frames, consumer_buffer)
+        buffer_bytes, buffer_time = measure(buffer_path, frames, frame_buffer, consumer_buffer)
+        print(f"{height}x{width} (frame: {frames[0].nbytes / 1e3:.0f} kB)")
+        print(f"  view:   {view_bytes / 1e3:8.1f} kB peak allocation, {view_time:8.1f} us per step")
+        print(f"  buffer: {buffer_bytes / 1e3:8.1f} kB peak allocation, {buffer_time:8.1f} us per step")
+
+
+if __name__ == "__main__":
+    main()
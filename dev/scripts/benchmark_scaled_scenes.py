@@ -0,0 +1,196 @@
+"""
+Script to benchmark the reset and step cost of the tasks against the number of objects in the scene.
+
+The scenes are the objects metadata samples scaled by the synthetic controller at increasing object
+densities (see `rl_thor.envs.scene_scaling`). For each task of ALL_TASKS and each density, the
+task is reset in each compatible scene and its advancement is computed after random object
+interactions. The mean reset and step times are printed against the mean number of objects,
+written in a CSV file and charted with matplotlib.
+
+Usage:
+    python dev/scripts/benchmark_scaled_scenes.py --densities 1 5 20 --output scaled_scenes.csv --plot scaled_scenes.png
+
+A task is not benchmarked at the higher densities once its reset or step time exceeds the time
+budget, which shows the density where it falls over.
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from rl_thor.envs.actions import Ai2thorAction
+from rl_thor.envs.controllers import SyntheticController
+from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.tasks import ALL_TASKS, TaskType
+
+DEFAULT_DENSITIES = [1, 5, 20]
+DEFAULT_SCENES = ["FloorPlan1", "FloorPlan201", "FloorPlan301", "FloorPlan401"]
+NB_STEPS = 20
+STATE_PERTURBATION = 0.25
+DEFAULT_TIME_BUDGET = 5.0
+
+# Arguments of the tasks without default arguments
+TASK_ARGS: dict[TaskType, dict[str, Any]] = {
+    TaskType.PLACE_IN: {"placed_object_type": SimObjectType.MUG, "receptacle_type": SimObjectType.COUNTER_TOP},
+    TaskType.PLACE_N_SAME_IN: {
+        "placed_object_type": SimObjectType.MUG,
+        "receptacle_type": SimObjectType.COUNTER_TOP,
+        "n": 2,
+    },
+    TaskType.PLACE_WITH_MOVEABLE_RECEP_IN: {
+        "placed_object_type": SimObjectType.APPLE,
+        "pickupable_receptacle_type": SimObjectType.PLATE,
+        "receptacle_type": SimObjectType.COUNTER_TOP,
+    },
+    TaskType.PLACE_CLEANED_IN: {"placed_object_type": SimObjectType.MUG, "receptacle_type": SimObjectType.COUNTER_TOP},
+    TaskType.PLACE_HEATED_IN: {"placed_object_type": SimObjectType.MUG, "receptacle_type": SimObjectType.COUNTER_TOP},
+    TaskType.PLACE_COOLED_IN: {"placed_object_type": SimObjectType.APPLE, "receptacle_type": SimObjectType.COUNTER_TOP},
+    TaskType.LOOK_IN_LIGHT: {"looked_at_object_type": SimObjectType.BOOK},
+    TaskType.PICKUP: {"picked_up_object_type": SimObjectType.MUG},
+    TaskType.OPEN: {"opened_object_type": SimObjectType.FRIDGE},
+    TaskType.COOK: {"cooked_object_type": SimObjectType.POTATO},
+    TaskType.BREAK: {"broken_object_type": SimObjectType.MUG},
+    TaskType.TOGGLE: {"toggled_object_type": SimObjectType.LIGHT_SWITCH},
+    TaskType.COOL_DOWN: {"cooled_object_type": SimObjectType.APPLE},
+    TaskType.BRING_CLOSE: {"object_type_1": SimObjectType.MUG, "object_type_2": SimObjectType.PLATE},
+    TaskType.PLACE_TWO_IN: {
+        "object_type_1": SimObjectType.MUG,
+        "object_type_2": SimObjectType.PLATE,
+        "receptacle_type": SimObjectType.COUNTER_TOP,
+    },
+    TaskType.PLACE_IN_FILLED_SINK: {"placed_object_type": SimObjectType.MUG},
+    TaskType.PLACE_3_IN_FILLED_SINK: {
+        "placed_object_type_1": SimObjectType.MUG,
+        "placed_object_type_2": SimObjectType.PLATE,
+        "placed_object_type_3": SimObjectType.CUP,
+    },
+}
+INTERACTION_ACTIONS = [
+    Ai2thorAction.PICKUP_OBJECT,
+    Ai2thorAction.PUT_OBJECT,
+    Ai2thorAction.OPEN_OBJECT,
+    Ai2thorAction.CLOSE_OBJECT,
+    Ai2thorAction.TOGGLE_OBJECT_ON,
+    Ai2thorAction.TOGGLE_OBJECT_OFF,
+    Ai2thorAction.DIRTY_OBJECT,
+    Ai2thorAction.CLEAN_OBJECT,
+]
+
+
+def benchmark_task(
+    task_type: TaskType,
+    controller: SyntheticController,
+    scenes: list[str],
+    rng: np.random.Generator,
+) -> dict[str, float] | None:
+    """
+    Return the mean number of objects, reset time and step time of the task in the compatible scenes.
+
+    Returns None if the task is incompatible with all the scenes.
+    """
+    nb_objects, reset_times, step_times = [], [], []
+    for scene in scenes:
+        event = controller.reset(scene)
+        task = ALL_TASKS[task_type](**TASK_ARGS.get(task_type, {}))
+        # The tasks print why the reset failed
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            reset_successful, _, _, _ = task.preprocess_and_reset(controller)
+            reset_time = time.perf_counter() - start_time
+        if not reset_successful:
+            continue
+        nb_objects.append(len(event.metadata["objects"]))
+        reset_times.append(reset_time)
+
+        object_ids = [obj_metadata["objectId"] for obj_metadata in event.metadata["objects"]]
+        for _ in range(NB_STEPS):
+            action = INTERACTION_ACTIONS[rng.integers(len(INTERACTION_ACTIONS))]
+            event = controller.step(action=action, objectId=object_ids[rng.integers(len(object_ids))])
+            start_time = time.perf_counter()
+            task.compute_task_advancement(event, controller.last_action)
+            step_times.append(time.perf_counter() - start_time)
+
+    if not reset_times:
+        return None
+    return {
+        "nb_objects": statistics.mean(nb_objects),
+        "reset_time_ms": statistics.mean(reset_times) * 1000,
+        "step_time_ms": statistics.mean(step_times) * 1000,
+    }
+
+
+def plot_results(results: list[dict[str, Any]], plot_path: Path) -> None:
+    """Chart the reset and step times of each task against the number of objects."""
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6), sharex=True)
+    for task_type in dict.fromkeys(result["task_type"] for result in results):
+        task_results = [result for result in results if result["task_type"] == task_type]
+        nb_objects = [result["nb_objects"] for result in task_results]
+        for ax, metric in zip(axes, ("reset_time_ms", "step_time_ms"), strict=True):
+            ax.plot(nb_objects, [result[metric] for result in task_results], marker="o", label=task_type)
+    for ax, title in zip(axes, ("Reset time (ms)", "Step time (ms)"), strict=True):
+        ax.set(title=title, xlabel="Number of objects", xscale="log", yscale="log")
+    axes[1].legend(fontsize="small", loc="center left", bbox_to_anchor=(1, 0.5))
+    fig.tight_layout()
+    fig.savefig(plot_path)
+
+
+def main() -> None:
+    """Run the benchmark and print, write and chart the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--densities", type=int, nargs="+", default=DEFAULT_DENSITIES, help="Object densities.")
+    parser.add_argument("--scenes", nargs="+", default=DEFAULT_SCENES, help="Scenes with an objects metadata sample.")
+    parser.add_argument("--tasks", nargs="+", default=list(ALL_TASKS), help="Task types to benchmark.")
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=DEFAULT_TIME_BUDGET,
+        help="Reset or step time (in seconds) above which a task is not benchmarked at higher densities.",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Path of the CSV file of the results.")
+    parser.add_argument("--plot", type=Path, default=None, help="Path of the chart of the results.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random interactions.")
+    args = parser.parse_args()
+
+    results = []
+    over_budget_tasks: set[TaskType] = set()
+    print(f"{'task':<28}{'density':>8}{'objects':>10}{'reset (ms)':>14}{'step (ms)':>14}")
+    for density in sorted(args.densities):
+        controller = SyntheticController(
+            frame_shape=(1, 1, 3), object_density=density, state_perturbation=STATE_PERTURBATION
+        )
+        for task_type in map(TaskType, args.tasks):
+            if task_type in over_budget_tasks:
+                print(f"{task_type:<28}{density:>8}{'over time budget':>38}")
+                continue
+            task_results = benchmark_task(task_type, controller, args.scenes, np.random.default_rng(args.seed))
+            if task_results is None:
+                print(f"{task_type:<28}{density:>8}{'no compatible scene':>38}")
+                continue
+            print(
+                f"{task_type:<28}{density:>8}{task_results['nb_objects']:>10.0f}"
+                f"{task_results['reset_time_ms']:>14.2f}{task_results['step_time_ms']:>14.3f}"
+            )
+            results.append({"task_type": str(task_type), "density": density, **task_results})
+            if max(task_results["reset_time_ms"], task_results["step_time_ms"]) > args.time_budget * 1000:
+                over_budget_tasks.add(task_type)
+
+    if args.output is not None and results:
+        with args.output.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+    if args.plot is not None and results:
+        plot_results(results, args.plot)
+
+
+if __name__ == "__main__":
+    main()
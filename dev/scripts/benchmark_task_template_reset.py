@@ -0,0 +1,110 @@
+"""
+Script to benchmark the reset of the tasks with and without the reuse of their compiled template.
+
+For each task and scene, the task is reset repeatedly with the synthetic controller, either by
+instantiating the task from its blueprint at each reset (previous behavior) or by reusing the task
+compiled by its template (see `rl_thor.envs.tasks.tasks_interface.TaskTemplate`). The mean times of
+the instantiation and of the whole reset are printed for both, along with the mean reset time of a
+synthetic-backend ITHOREnv for comparison.
+
+Usage:
+    python dev/scripts/benchmark_task_template_reset.py --nb-resets 50
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any
+
+from rl_thor.envs.ai2thor_envs import ITHOREnv
+from rl_thor.envs.controllers import SyntheticController
+from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.tasks import ALL_TASKS, TaskType
+from rl_thor.envs.tasks.tasks_interface import BaseTask, TaskBlueprint, TaskTemplate
+
+DEFAULT_NB_RESETS = 50
+SCENE = "FloorPlan1"
+TASK_ARGS: dict[TaskType, dict[str, Any]] = {
+    TaskType.PLACE_IN: {"placed_object_type": SimObjectType.APPLE, "receptacle_type": SimObjectType.FRIDGE},
+    TaskType.PLACE_COOLED_IN: {"placed_object_type": SimObjectType.APPLE, "receptacle_type": SimObjectType.COUNTER_TOP},
+    TaskType.PLACE_N_SAME_IN: {
+        "placed_object_type": SimObjectType.VASE,
+        "receptacle_type": SimObjectType.CABINET,
+        "n": 2,
+    },
+    TaskType.CLEAN_UP_KITCHEN: {},
+}
+
+
+def benchmark_resets(
+    task_blueprint: TaskBlueprint,
+    controller: SyntheticController,
+    nb_resets: int,
+    reuse_template: bool,
+) -> tuple[float, float]:
+    """Return the mean instantiation and reset times of the task, in milliseconds."""
+    task_template = TaskTemplate(task_blueprint)
+    instantiation_times, reset_times = [], []
+    for _ in range(nb_resets):
+        controller.reset(SCENE)
+        start_time = time.perf_counter()
+        task: BaseTask = (
+            task_template.instantiate() if reuse_template else task_blueprint.task_type(**task_blueprint.task_args)
+        )
+        instantiation_time = time.perf_counter() - start_time
+        reset_successful, _, _, _ = task.preprocess_and_reset(controller)
+        reset_time = time.perf_counter() - start_time
+        if not reset_successful:
+            raise RuntimeError(f"{task} could not be reset in {SCENE}.")  # noqa: TRY003
+        instantiation_times.append(instantiation_time)
+        reset_times.append(reset_time)
+    # The first reset of the template compiles the task, like the first episode of the env
+    return statistics.mean(instantiation_times[1:]) * 1000, statistics.mean(reset_times[1:]) * 1000
+
+
+def benchmark_env_resets(task_type: TaskType, nb_resets: int) -> float:
+    """Return the mean reset time of a synthetic-backend environment with the task, in milliseconds."""
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "tasks": {
+                "task_blueprints": [
+                    {"task_type": str(task_type), "args": TASK_ARGS[task_type], "scenes": [SCENE]},
+                ]
+            },
+        }
+    )
+    env.reset(seed=0)
+    reset_times = []
+    for _ in range(nb_resets):
+        start_time = time.perf_counter()
+        env.reset()
+        reset_times.append(time.perf_counter() - start_time)
+    env.close()
+    return statistics.mean(reset_times) * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--nb-resets", type=int, default=DEFAULT_NB_RESETS, help="Number of resets per task.")
+    args = parser.parse_args()
+
+    controller = SyntheticController(frame_shape=(1, 1, 3))
+    print(
+        f"{'task':<20}{'instantiation (ms)':>20}{'template (ms)':>15}{'reset (ms)':>12}"
+        f"{'template reset (ms)':>21}{'env reset (ms)':>16}"
+    )
+    for task_type, task_args in TASK_ARGS.items():
+        task_blueprint = TaskBlueprint(ALL_TASKS[task_type], {SCENE}, task_args)
+        instantiation_time, reset_time = benchmark_resets(task_blueprint, controller, args.nb_resets, False)
+        template_time, template_reset_time = benchmark_resets(task_blueprint, controller, args.nb_resets, True)
+        env_reset_time = benchmark_env_resets(task_type, args.nb_resets)
+        print(
+            f"{task_type:<20}{instantiation_time:>20.3f}{template_time:>15.3f}{reset_time:>12.3f}"
+            f"{template_reset_time:>21.3f}{env_reset_time:>16.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -174,8 +174,7 @@ class EvalOnEachTaskAndSceneCallback(BaseCallback):
                     task_maximum_advancement = info.get("task_maximum_advancement", None)
 
                     while not terminated and not truncated:
-                        obs_copy = obs.copy()
-                        action, _states = self.model.predict(obs_copy, deterministic=True)
+                        action, _states = self.model.predict(obs, deterministic=True)
                         # Make action parameters scalars
                         action = {k: v.item() for k, v in action.items()} if isinstance(action, dict) else action.item()
 
@@ -1,3 +1,4 @@
 """Module used to define the environments of RL-THOR environment."""
 
 from rl_thor.envs.ai2thor_envs import ITHOREnv
+from rl_thor.envs.async_envs import AsyncITHOREnv, EpisodeResult, run_episodes
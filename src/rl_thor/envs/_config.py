@@ -26,6 +26,14 @@ class EnvConfigKeys(StrEnum):
     ACTION_DISCRETE_PARAM_VALUES = "action_discrete_param_values"
     ACTION_MODIFIERS = "action_modifiers"
     TASKS = "tasks"
+    INFO_VERBOSITY = "info_verbosity"
+    PIPELINED_REWARD = "pipelined_reward"
+    ACTION_MASK_IN_INFO = "action_mask_in_info"
+    CONTROLLER_BACKEND = "controller_backend"
+    CONTROLLER_BACKEND_PARAMETERS = "controller_backend_parameters"
+    CONTROLLER_POOL = "controller_pool"
+    OBSERVATION = "observation"
+    PROFILING = "profiling"
 
 
 # * Unused
@@ -78,6 +86,7 @@ class TaskConfigKeys(StrEnum):
 
     GLOBALLY_EXCLUDED_SCENES = "globally_excluded_scenes"
     TASK_BLUEPRINTS = "task_blueprints"
+    COMPAT_INDEX_PATH = "compat_index_path"
 
 
 # * Unused
@@ -89,6 +98,14 @@ class TaskBlueprintConfigKeys(StrEnum):
     SCENES = "scenes"
 
 
+class InfoVerbosity(StrEnum):
+    """Amount of information returned by the environment at each step."""
+
+    MINIMAL = "minimal"  # Only scalar information, without the task info and the event metadata
+    STANDARD = "standard"  # Task info details computed only when they are read, before the next step
+    DEBUG = "debug"  # Task info details computed at each step
+
+
 # %% === Simulator Configuration ===
 @dataclass(frozen=True)
 class ControllerParametersConfig:
@@ -98,8 +115,6 @@ class ControllerParametersConfig:
     platform: Literal["CloudRendering"] | None = None
     visibility_distance: float = 1.5
     # === Rendering parameters ===
-    # render_depth_image: bool = False # Not supported yet
-    # render_instance_segmentation: bool = False # Not supported yet
     frame_width: int = 300
     frame_height: int = 300
     field_of_view: int = 90
@@ -109,8 +124,6 @@ class ControllerParametersConfig:
         return {
             "platform": self.platform,
             "visibilityDistance": self.visibility_distance,
-            "renderDepthImage": False,
-            "renderInstanceSegmentation": False,
             "frameWidth": self.frame_width,
             "frameHeight": self.frame_height,
             "fieldOfView": self.field_of_view,
@@ -128,6 +141,42 @@ class SceneRandomizationConfig:
     random_object_colors: bool = False
 
 
+@dataclass(frozen=True)
+class ControllerPoolConfig:
+    """Configuration class for the pool of controllers keeping the recently loaded scenes."""
+
+    size: int = 1
+    warm_scene_resets: bool = False
+
+
+# %% === Observation Configuration ===
+@dataclass(frozen=True)
+class ObservationConfig:
+    """Configuration class for the observations of the environment."""
+
+    channel_first: bool = False
+    frame_height: int | None = None  # Height of the controller frames if None
+    frame_width: int | None = None  # Width of the controller frames if None
+    grayscale: bool = False
+    frame_stack: int = 1
+    center_crop: list[int] | None = None  # [height, width] of the crop, applied before resizing
+    # === Additional modalities ===
+    depth: bool = False
+    instance_segmentation: bool = False
+    object_state: bool = False
+    object_state_max_objects: int = 32
+
+
+# %% === Profiling Configuration ===
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """Configuration class for the profiling of the steps of the environment."""
+
+    enabled: bool = False
+    sink: Literal["csv", "jsonl"] | None = None  # No sink if None, the breakdowns are only in the info
+    sink_path: str | None = None  # Relative to the current working directory
+
+
 # %% === Actions Configuration ===
 
 
@@ -292,6 +341,7 @@ class TaskConfig:
 
     globally_excluded_scenes: list[str] = field(default_factory=list)
     task_blueprints: list[TaskBlueprintConfig] = field(default_factory=list)
+    compat_index_path: str | None = None
 
     @staticmethod
     def init_from_dict(task_config_dict: dict[str, Any]) -> TaskConfig:
@@ -318,10 +368,20 @@ class EnvConfig:
     seed: int = 0
     max_episode_steps: int = 1000
     no_task_advancement_reward: bool = False
+    info_verbosity: InfoVerbosity = InfoVerbosity.STANDARD
+    pipelined_reward: bool = False
+    action_mask_in_info: bool = False
 
     # === Simulator configuration ===
+    controller_backend: str = "ai2thor"
+    controller_backend_parameters: dict[str, Any] = field(default_factory=dict)
     controller_parameters: ControllerParametersConfig = field(default_factory=ControllerParametersConfig)
     scene_randomization: SceneRandomizationConfig = field(default_factory=SceneRandomizationConfig)
+    controller_pool: ControllerPoolConfig = field(default_factory=ControllerPoolConfig)
+    # === Observation configuration ===
+    observation: ObservationConfig = field(default_factory=ObservationConfig)
+    # === Profiling configuration ===
+    profiling: ProfilingConfig = field(default_factory=ProfilingConfig)
     # === Actions configuration ===
     action_groups: ActionGroupsConfig = field(default_factory=ActionGroupsConfig)
     action_modifiers: ActionModifiersConfig = field(default_factory=ActionModifiersConfig)
@@ -347,6 +407,9 @@ class EnvConfig:
                 EnvConfigKeys.SCENE_RANDOMIZATION: SceneRandomizationConfig(
                     **env_dict.get(EnvConfigKeys.SCENE_RANDOMIZATION, {})
                 ),
+                EnvConfigKeys.CONTROLLER_POOL: ControllerPoolConfig(**env_dict.get(EnvConfigKeys.CONTROLLER_POOL, {})),
+                EnvConfigKeys.OBSERVATION: ObservationConfig(**env_dict.get(EnvConfigKeys.OBSERVATION, {})),
+                EnvConfigKeys.PROFILING: ProfilingConfig(**env_dict.get(EnvConfigKeys.PROFILING, {})),
                 EnvConfigKeys.ACTION_GROUPS: ActionGroupsConfig(**env_dict.get(EnvConfigKeys.ACTION_GROUPS, {})),
                 EnvConfigKeys.ACTION_MODIFIERS: ActionModifiersConfig(
                     **env_dict.get(EnvConfigKeys.ACTION_MODIFIERS, {})
@@ -355,6 +418,9 @@ class EnvConfig:
                     **env_dict.get(EnvConfigKeys.ACTION_DISCRETE_PARAM_VALUES, {})
                 ),
                 EnvConfigKeys.TASKS: TaskConfig.init_from_dict(env_dict.get(EnvConfigKeys.TASKS, {})),
+                EnvConfigKeys.INFO_VERBOSITY: InfoVerbosity(
+                    env_dict.get(EnvConfigKeys.INFO_VERBOSITY, InfoVerbosity.STANDARD)
+                ),
             },
         )
         return EnvConfig(**dict_copy)
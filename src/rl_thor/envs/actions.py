@@ -29,6 +29,8 @@ from dataclasses import dataclass, field
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from rl_thor.envs.sim_objects import (
     OPENABLES,
     WATER_SOURCES,
@@ -40,9 +42,11 @@ from rl_thor.envs.sim_objects import (
 
 if TYPE_CHECKING:
     from ai2thor.server import Event
+    from numpy.typing import NDArray
 
     from rl_thor.envs._config import ActionDiscreteParamValuesConfig
     from rl_thor.envs.ai2thor_envs import ITHOREnv
+    from rl_thor.envs.scene_object_table import SceneObjectTable
     from rl_thor.envs.sim_objects import SimObjId
 
 
@@ -228,6 +232,24 @@ class EnvironmentAction:
             return True
         return obj_metadata[self._object_required_property]
 
+    def compute_operability_mask(self, scene_object_table: SceneObjectTable) -> NDArray[np.bool_]:
+        """
+        Return the mask of the objects operable by the action, vectorized version of `is_object_operable`.
+
+        The operability only depends on fixed properties of the objects, so the mask can be
+        reused as long as the objects of the scene don't change.
+
+        Args:
+            scene_object_table (SceneObjectTable): Scene object table of the event.
+
+        Returns:
+            operability_mask (NDArray[np.bool_]): Whether each row of the table is operable by the
+                action.
+        """
+        if self._object_required_property is None:
+            return np.ones(len(scene_object_table), dtype=np.bool_)
+        return scene_object_table.column(self._object_required_property)
+
     def perform(
         self,
         env: ITHOREnv,
@@ -705,6 +727,20 @@ class OpenCloseEnvAction(EnvironmentAction):
         obj_type = obj_metadata[SimObjFixedProp.OBJECT_TYPE]
         return obj_type in OPENABLES and super().is_object_operable(obj_metadata)
 
+    def compute_operability_mask(self, scene_object_table: SceneObjectTable) -> NDArray[np.bool_]:
+        """
+        Return the mask of the objects operable by the "OpenObject" and "CloseObject" actions in ai2thor.
+
+        Args:
+            scene_object_table (SceneObjectTable): Scene object table of the event.
+
+        Returns:
+            operability_mask (NDArray[np.bool_]): Whether each row of the table is operable by the
+                action.
+        """
+        is_openable_type = np.isin(scene_object_table.column(SimObjFixedProp.OBJECT_TYPE), list(OPENABLES))
+        return is_openable_type & super().compute_operability_mask(scene_object_table)
+
 
 @dataclass(frozen=True)
 class ToggleEnvAction(EnvironmentAction):
@@ -6,19 +6,20 @@ TODO: Finish module docstring.
 
 from __future__ import annotations
 
-import operator
+import concurrent.futures
 import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
 import gymnasium as gym
 import numpy as np
 import yaml
-from ai2thor.controller import Controller
 from numpy.typing import NDArray
 
-from rl_thor.envs._config import EnvConfig
+from rl_thor.envs import profiling
+from rl_thor.envs._config import EnvConfig, InfoVerbosity
 from rl_thor.envs.actions import (
     ACTIONS_BY_GROUP,
     ACTIONS_BY_NAME,
@@ -26,22 +27,69 @@ from rl_thor.envs.actions import (
     EnvActionName,
     EnvironmentAction,
 )
+from rl_thor.envs.compat_index import CompatIndex
+from rl_thor.envs.controllers import ControllerPool
+from rl_thor.envs.observations import NB_OBJECT_STATE_FEATURES, FrameProcessor, compute_object_state
+from rl_thor.envs.profiling import SpanName, StepProfiler
+from rl_thor.envs.reward import LazyInfoDict
+from rl_thor.envs.scene_object_table import SceneObjectTable
 from rl_thor.envs.scenes import ALL_SCENES, SCENE_ID_TO_INDEX_MAP, SCENE_IDS, SceneGroup, SceneId
-from rl_thor.envs.sim_objects import SimObjMetadata, SimObjVariableProp
+from rl_thor.envs.sim_objects import SimObjVariableProp
 from rl_thor.envs.tasks.tasks import ALL_TASKS, UnknownTaskTypeError
 from rl_thor.envs.tasks.tasks_interface import (
     BaseTask,
     TaskBlueprint,
+    TaskTemplate,
 )
 from rl_thor.utils.general_utils import ROOT_DIR, update_nested_dict
 
 if TYPE_CHECKING:
+    from ai2thor.controller import Controller
     from ai2thor.server import Event
 
+    from rl_thor.envs.controllers import OfflineController
     from rl_thor.envs.reward import BaseRewardHandler
     from rl_thor.envs.sim_objects import SimObjId
 
 
+# %% === Constants ===
+COLD_SCENE_INITIALIZATION_TIME = "cold_scene_initialization_time"
+WARM_SCENE_INITIALIZATION_TIME = "warm_scene_initialization_time"
+
+
+# %% === Reward results ===
+@dataclass(frozen=True, slots=True)
+class RewardResult:
+    """Reward, task completion and task information computed for a step of the environment."""
+
+    reward: float
+    terminated: bool
+    task_info: dict[str, Any]
+    computation_time: float
+    episode_step: int
+
+    def merged(self, next_result: RewardResult) -> RewardResult:
+        """
+        Combine the result with the result of the next step.
+
+        The rewards and computation times are summed and the task information of the next step is
+        kept.
+
+        Args:
+            next_result (RewardResult): Reward result of the next step.
+
+        Returns:
+            reward_result (RewardResult): Combined reward result.
+        """
+        return RewardResult(
+            self.reward + next_result.reward,
+            self.terminated or next_result.terminated,
+            next_result.task_info,
+            self.computation_time + next_result.computation_time,
+            next_result.episode_step,
+        )
+
+
 # %% === Environment definitions ===
 class BaseAI2THOREnv[ObsType, ActType](gym.Env, ABC):
     """Base class for AI2-THOR environment."""
@@ -113,9 +161,24 @@ class ITHOREnv(
         super().reset(seed=self.config.seed)
         # TODO: Add the possibility to add task blueprints directly instead of going through the config
         self.task_blueprints = self._create_task_blueprints(self.config)
+        # The task of each blueprint is compiled once and reused for each of its episodes
+        self.task_templates = [TaskTemplate(task_blueprint) for task_blueprint in self.task_blueprints]
         self._initialize_action_space()
         self._initialize_observation_space()
-        self.controller = self._create_ai2thor_controller(self.config)
+        self.controller_pool = ControllerPool.from_config(self.config)
+        self.controller = self.controller_pool.active_controller
+        self._scene_object_table: SceneObjectTable | None = None
+        self._scene_object_table_event: Event | None = None
+        self._operability_masks: dict[EnvActionName, NDArray[np.bool_]] = {}
+        self._operability_masks_object_ids: list[SimObjId] | None = None
+        # In pipelined reward mode, the rewards are computed in step order by a single background thread
+        self._reward_executor = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="rl_thor_reward")
+            if self.config.pipelined_reward
+            else None
+        )
+        self._pending_reward: concurrent.futures.Future[RewardResult] | None = None
+        self.profiler = StepProfiler.from_config(self.config.profiling)
 
         # === Type Annotations ===
         self.config: EnvConfig
@@ -123,7 +186,8 @@ class ITHOREnv(
         self.action_idx_to_name: dict[int, EnvActionName]
         self.action_space: gym.spaces.Dict
         self.observation_space: gym.spaces.Dict
-        self.controller: Controller
+        self.controller_pool: ControllerPool
+        self.controller: Controller | OfflineController
         self.current_scene: SceneId
         self.current_task_type: type[BaseTask]
         self.task: BaseTask
@@ -131,13 +195,44 @@ class ITHOREnv(
         self.reward_handler: BaseRewardHandler
         self.np_random: np.random.Generator
         self.task_blueprints: list[TaskBlueprint]
+        self.task_templates: list[TaskTemplate]
+        self.profiler: StepProfiler | None
         self.last_info: dict[str, Any]
+        self.frame_processor: FrameProcessor
+        self._object_state_ids: list[SimObjId]
+        self._scene_object_table: SceneObjectTable | None
+        self._scene_object_table_event: Event | None
+        self._operability_masks: dict[EnvActionName, NDArray[np.bool_]]
+        self._operability_masks_object_ids: list[SimObjId] | None
+        self._reward_executor: concurrent.futures.ThreadPoolExecutor | None
+        self._pending_reward: concurrent.futures.Future[RewardResult] | None
 
     @property
     def last_event(self) -> Event:
         """Return the last event of the environment."""
         return self.controller.last_event  # type: ignore
 
+    @property
+    def last_scene_object_table(self) -> SceneObjectTable:
+        """Return the scene object table of the last event of the environment."""
+        return self._get_scene_object_table(self.last_event)
+
+    def _get_scene_object_table(self, event: Event) -> SceneObjectTable:
+        """
+        Return the scene object table of the event, built only once per event.
+
+        Args:
+            event (Event): Event corresponding to the state of the scene.
+
+        Returns:
+            scene_object_table (SceneObjectTable): Scene object table of the event.
+        """
+        if self._scene_object_table is None or self._scene_object_table_event is not event:
+            with profiling.span(SpanName.SCENE_OBJECT_TABLE):
+                self._scene_object_table = SceneObjectTable.from_event(event)
+            self._scene_object_table_event = event
+        return self._scene_object_table
+
     @property
     def last_frame(self) -> NDArray[np.uint8]:
         """Return the last frame of the environment."""
@@ -224,11 +319,12 @@ class ITHOREnv(
         self.action_space = gym.spaces.Dict(action_space_dict)
 
     def _initialize_observation_space(self) -> None:
-        resolution = (
+        self.frame_processor = FrameProcessor(
+            self.config.observation,
             self.config.controller_parameters.frame_height,
             self.config.controller_parameters.frame_width,
         )
-        env_obs_space = gym.spaces.Box(low=0, high=255, shape=(resolution[0], resolution[1], 3), dtype=np.uint8)
+        env_obs_space = gym.spaces.Box(low=0, high=255, shape=self.frame_processor.observation_shape, dtype=np.uint8)
         # task_desc_obs_space = gym.spaces.Text(
         #     max_length=1000, charset="abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789,. "
         # )
@@ -238,12 +334,30 @@ class ITHOREnv(
             len(ALL_SCENES)
         )  # TODO? Replace by only the number of scenes in the task blueprints?
 
-        self.observation_space: gym.spaces.Dict = gym.spaces.Dict({
+        observation_spaces: dict[str, gym.Space] = {
             "env_obs": env_obs_space,
             # "task_desc_obs": task_desc_obs_space,
             "task_obs": task_obs_space,
             "scene_obs": scene_obs_space,
-        })
+        }
+        # Additional modalities, rendered or computed only when enabled
+        observation_config = self.config.observation
+        if observation_config.depth:
+            observation_spaces["depth"] = gym.spaces.Box(
+                low=0, high=np.inf, shape=self.frame_processor.get_auxiliary_frame_shape(1), dtype=np.float32
+            )
+        if observation_config.instance_segmentation:
+            observation_spaces["instance_segmentation"] = gym.spaces.Box(
+                low=0, high=255, shape=self.frame_processor.get_auxiliary_frame_shape(3), dtype=np.uint8
+            )
+        if observation_config.object_state:
+            observation_spaces["object_state"] = gym.spaces.Box(
+                low=-np.inf,
+                high=np.inf,
+                shape=(observation_config.object_state_max_objects, NB_OBJECT_STATE_FEATURES),
+                dtype=np.float32,
+            )
+        self.observation_space: gym.spaces.Dict = gym.spaces.Dict(observation_spaces)
 
     @staticmethod
     def _compute_config_available_scenes(
@@ -288,17 +402,29 @@ class ITHOREnv(
         task_blueprints_config = config.tasks.task_blueprints
         task_blueprints = []
         globally_excluded_scenes = set(config.tasks.globally_excluded_scenes)
+        compat_index = (
+            None if config.tasks.compat_index_path is None else CompatIndex.load(config.tasks.compat_index_path)
+        )
         for task_blueprint_config in task_blueprints_config:
             task_type = task_blueprint_config.task_type
             if task_type not in ALL_TASKS:
                 raise UnknownTaskTypeError(task_type)
 
+            scenes = ITHOREnv._compute_config_available_scenes(
+                task_blueprint_config.scenes, excluded_scenes=globally_excluded_scenes
+            )
+            if compat_index is not None:
+                # The objects can start elsewhere with random spawns, so the task is not necessarily completed
+                scenes = compat_index.filter_scenes(
+                    task_type,
+                    task_blueprint_config.args,
+                    scenes,
+                    exclude_completed=not config.scene_randomization.random_object_spawn,
+                )
             task_blueprints.append(
                 TaskBlueprint(
                     task_type=ALL_TASKS[task_type],
-                    scenes=ITHOREnv._compute_config_available_scenes(
-                        task_blueprint_config.scenes, excluded_scenes=globally_excluded_scenes
-                    ),
+                    scenes=scenes,
                     task_args=task_blueprint_config.args,
                 )
             )
@@ -308,34 +434,40 @@ class ITHOREnv(
 
         return task_blueprints
 
-    @staticmethod
-    def _create_ai2thor_controller(config: EnvConfig) -> Controller:
+    def step(
+        self, action: dict[str, Any]
+    ) -> tuple[dict[str, NDArray[np.uint8] | str], float, bool, bool, dict[str, Any]]:
         """
-        Initialize the AI2THOR controller.
+        Take a step in the environment.
+
+        In pipelined reward mode, the reward, task completion and task information returned are
+        those of the previous step (see `reward_episode_step` in the info), except on the last step
+        of the episode where the rewards of both steps are summed. When the task was completed at
+        the previous step, the step is terminated and the reward of its action is not computed.
 
         Args:
-            config (EnvConfig): Environment config.
+            action (dict): Action to take in the environment.
 
         Returns:
-            controller (Controller): AI2THOR controller.
-        """
-        # Hardcoded parameters
-        controller_parameters = {
-            "agentMode": "default",
-            "snapToGrid": False,
-            "rotateStepDegrees": config.action_discrete_param_values.rotation_degrees,
-            "gridSize": config.action_discrete_param_values.movement_magnitude,
-        }
-        # Parameters from the config
-        controller_parameters.update(config.controller_parameters.get_controller_parameters())
-
-        return Controller(**controller_parameters)
+            observation(dict[str, NDArray[np.uint8] | str]): Observation of the environment.
+            reward (float): Reward of the action.
+            terminated (bool): Whether the agent reaches a terminal state (realized the task).
+            truncated (bool): Whether the limit of steps per episode has been reached.
+            info (dict): Additional information about the environment, with the "profiling"
+                breakdown of the step if profiling is enabled.
+        """
+        if self.profiler is None:
+            return self._step(action)
+        with profiling.activate(self.profiler):
+            observation, reward, terminated, truncated, info = self._step(action)
+        info["profiling"] = self.profiler.end_step(self.step_count)
+        return observation, reward, terminated, truncated, info
 
-    def step(
+    def _step(
         self, action: dict[str, Any]
     ) -> tuple[dict[str, NDArray[np.uint8] | str], float, bool, bool, dict[str, Any]]:
         """
-        Take a step in the environment.
+        Take a step in the environment, see `step`.
 
         Args:
             action (dict): Action to take in the environment.
@@ -352,23 +484,25 @@ class ITHOREnv(
         env_action = ACTIONS_BY_NAME[action_name]
         target_object_coordinates: tuple[float, float] | None = action.get("target_object_coordinates")
         action_parameter: float | None = action.get("action_parameter")
-        scene_objects_dict = {obj["objectId"]: obj for obj in self.last_event.metadata["objects"]}
+        scene_object_table = self.last_scene_object_table
 
         # === Identify the target object if needed for the action ===
-        target_object_id, failed_action_event = self._identify_target_object(
-            env_action, target_object_coordinates, scene_objects_dict
-        )
+        with profiling.span(SpanName.IDENTIFY_TARGET_OBJECT):
+            target_object_id, failed_action_event = self._identify_target_object(
+                env_action, target_object_coordinates, scene_object_table
+            )
 
         # === Perform the action ===
         action_execution_time = None
         if failed_action_event is None:
             start_time = time.perf_counter()
 
-            new_event = env_action.perform(
-                env=self,
-                action_parameter=action_parameter,
-                target_object_id=target_object_id,  # TODO: Create NoObject object
-            )
+            with profiling.span(SpanName.CONTROLLER_STEP):
+                new_event = env_action.perform(
+                    env=self,
+                    action_parameter=action_parameter,
+                    target_object_id=target_object_id,  # TODO: Create NoObject object
+                )
 
             end_time = time.perf_counter()
             action_execution_time = end_time - start_time
@@ -379,43 +513,175 @@ class ITHOREnv(
 
         self.step_count += 1
 
-        environment_obs: NDArray = new_event.frame  # type: ignore # TODO: Check how to fix this type issue
-        observation = self._get_full_observation(environment_obs)
+        truncated = self.step_count >= self.config.max_episode_steps
+        speed_performance: dict[str, float | None] = {"action_execution_time": action_execution_time}
+        if self._reward_executor is None:
+            reward_result = self._compute_reward(
+                self.reward_handler,
+                new_event,
+                self.controller.last_action,
+                self._get_scene_object_table(new_event),
+                self.step_count,
+            )
+        else:
+            reward_result, speed_performance["reward_wait_time"] = self._get_pipelined_reward(new_event, truncated)
+        reward, terminated, task_info = reward_result.reward, reward_result.terminated, reward_result.task_info
+
+        with profiling.span(SpanName.OBSERVATION):
+            # TODO: Check how to fix this
+            environment_obs = self.frame_processor.process(new_event.frame)  # type: ignore
+            observation = self._get_full_observation(environment_obs, new_event)
+
+        with profiling.span(SpanName.BUILD_INFO):
+            info = {
+                "episode_step": self.step_count,
+                "metadata": new_event.metadata,
+                "task_info": task_info,
+                "is_success": terminated,
+                "max_task_advancement": self.task.maximum_advancement,
+                "task_advancement": task_info.get("task_advancement", None),
+                # Performance logging
+                "speed_performance": {
+                    "reward_computation_time": reward_result.computation_time,
+                    **speed_performance,
+                },
+                "task_type": self.task.__class__.__name__,
+                # "task_args": self.task_blueprints[self.task_idx].task_args,
+                # "task_description": self.task.text_description(),
+                # "scene": self.current_scene,
+            }
+            if self._reward_executor is not None:
+                info["reward_episode_step"] = reward_result.episode_step
+            if self.config.action_mask_in_info:
+                info["action_mask"] = self.action_masks()
+            self._apply_info_verbosity(info)
+            self.last_info = info
+
+        return observation, reward, terminated, truncated, info
 
-        # Start the timer before the computation
+    def _compute_reward(
+        self,
+        reward_handler: BaseRewardHandler,
+        event: Event,
+        controller_action: dict[str, Any],
+        scene_object_table: SceneObjectTable,
+        episode_step: int,
+    ) -> RewardResult:
+        """
+        Compute the reward of a step and time the computation.
+
+        In pipelined reward mode, this method runs in the reward thread, so it only uses its
+        arguments and the lazy task information is evaluated before the next step changes the
+        state of the task.
+
+        Args:
+            reward_handler (BaseRewardHandler): Reward handler of the episode of the step.
+            event (Event): Event resulting from the action of the step.
+            controller_action (dict[str, Any]): Action executed by the controller during the step.
+            scene_object_table (SceneObjectTable): Scene object table of the event.
+            episode_step (int): Step of the episode the reward corresponds to.
+
+        Returns:
+            reward_result (RewardResult): Reward, task completion and task information of the step.
+        """
         start_time = time.perf_counter()
-        reward, terminated, task_info = self.reward_handler.get_reward(new_event, self.controller.last_action)
-        # End the timer after the computation
+        # In pipelined reward mode, the profiler of the env is activated in the reward thread
+        with profiling.activate(self.profiler), profiling.span(SpanName.REWARD):
+            reward, terminated, task_info = reward_handler.get_reward(event, controller_action, scene_object_table)
+        if (
+            self._reward_executor is not None
+            and self.config.info_verbosity != InfoVerbosity.MINIMAL
+            and isinstance(task_info, LazyInfoDict)
+        ):
+            task_info = task_info.evaluate_all()
         end_time = time.perf_counter()
-        reward_computation_time = end_time - start_time
 
-        truncated = self.step_count >= self.config.max_episode_steps
-        info = {
-            "episode_step": self.step_count,
-            "metadata": new_event.metadata,
-            "task_info": task_info,
-            "is_success": terminated,
-            "max_task_advancement": self.task.maximum_advancement,
-            "task_advancement": task_info.get("task_advancement", None),
-            # Performance logging
-            "speed_performance": {
-                "reward_computation_time": reward_computation_time,
-                "action_execution_time": action_execution_time,
-            },
-            "task_type": self.task.__class__.__name__,
-            # "task_args": self.task_blueprints[self.task_idx].task_args,
-            # "task_description": self.task.text_description(),
-            # "scene": self.current_scene,
-        }
-        self.last_info = info
+        return RewardResult(reward, terminated, task_info, end_time - start_time, episode_step)
 
-        return observation, reward, terminated, truncated, info
+    def _get_pipelined_reward(self, event: Event, truncated: bool) -> tuple[RewardResult, float]:
+        """
+        Return the reward of the previous step and submit the reward computation of the current one.
+
+        The reward of the current step is computed in the reward thread while the agent chooses
+        and performs the next action, with its own scene object table of the event so that the
+        lazy columns and memos of the table of the environment are only built by the main thread.
+        The first step of an episode has no previous reward and returns a reward of 0. If the task
+        was completed at the previous step, the episode ends at the current step and its reward
+        is not computed. On the last step of the episode (truncated), the current reward is also
+        waited for and both are summed so that no reward is lost.
+
+        Args:
+            event (Event): Event resulting from the action of the current step.
+            truncated (bool): Whether the current step is the last one of the episode.
+
+        Returns:
+            reward_result (RewardResult): Reward result returned for the current step.
+            reward_wait_time (float): Time spent waiting for the reward thread.
+        """
+        assert self._reward_executor is not None
+        start_time = time.perf_counter()
+        if self._pending_reward is None:
+            reward_result = RewardResult(0.0, False, {}, 0.0, self.step_count - 1)
+        else:
+            reward_result = self._pending_reward.result()
+            self._pending_reward = None
+        reward_wait_time = time.perf_counter() - start_time
+        if reward_result.terminated:
+            return reward_result, reward_wait_time
+
+        self._pending_reward = self._reward_executor.submit(
+            self._compute_reward,
+            self.reward_handler,
+            event,
+            self.controller.last_action,
+            SceneObjectTable.from_event(event),
+            self.step_count,
+        )
+        if truncated:
+            start_time = time.perf_counter()
+            reward_result = reward_result.merged(self._pending_reward.result())
+            reward_wait_time += time.perf_counter() - start_time
+            self._pending_reward = None
+
+        return reward_result, reward_wait_time
+
+    def flush_pending_reward(self) -> tuple[float, bool, dict[str, Any]]:
+        """
+        Wait for the reward of the last step that has not been returned yet.
+
+        Only useful in pipelined reward mode, for trainers that need the reward of the last step
+        synchronously (e.g. before bootstrapping). The next step then returns a reward of 0, like
+        the first step of an episode.
+
+        Returns:
+            reward (float): Reward of the last step, 0 if there is no pending reward.
+            terminated (bool): Whether the task was completed at the last step.
+            task_info (dict[str, Any]): Information about the task at the last step.
+        """
+        if self._pending_reward is None:
+            return 0.0, False, {}
+        reward_result = self._pending_reward.result()
+        self._pending_reward = None
+        return reward_result.reward, reward_result.terminated, reward_result.task_info
+
+    def _apply_info_verbosity(self, info: dict[str, Any]) -> None:
+        """
+        Remove or compute the entries of the step information according to the info verbosity.
+
+        Args:
+            info (dict[str, Any]): Information returned by the environment, modified in place.
+        """
+        match self.config.info_verbosity:
+            case InfoVerbosity.MINIMAL:
+                del info["task_info"], info["metadata"]
+            case InfoVerbosity.DEBUG if isinstance(info["task_info"], LazyInfoDict):
+                info["task_info"] = info["task_info"].evaluate_all()
 
     def _identify_target_object(
         self,
         env_action: EnvironmentAction,
         target_object_coordinates: tuple[float, float] | None,
-        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        scene_object_table: SceneObjectTable,
     ) -> tuple[SimObjId | None, Event | None]:
         """
         Identify the target object the given action (if any) and a failed action event if their is no valid target object.
@@ -423,8 +689,7 @@ class ITHOREnv(
         Args:
             env_action (EnvironmentAction): Action to perform.
             target_object_coordinates (tuple[float, float] | None): Coordinates of the target object.
-            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping object ids to
-                their metadata.
+            scene_object_table (SceneObjectTable): Scene object table of the last event.
 
         Returns:
             target_object_id (SimObjId | None): Id of the target object.
@@ -437,22 +702,10 @@ class ITHOREnv(
         # Closest object case
         if self.config.action_modifiers.target_closest_object:
             # Look for the closest operable object for the action
-            visible_objects_metadata = [
-                obj_metadata
-                for obj_metadata in scene_objects_dict.values()
-                if obj_metadata[SimObjVariableProp.IS_INTERACTABLE]
-            ]
-            closest_operable_object = min(
-                (
-                    obj_metadata
-                    for obj_metadata in visible_objects_metadata
-                    if env_action.is_object_operable(obj_metadata)
-                ),
-                key=operator.itemgetter("distance"),
-                default=None,
-            )
-            if closest_operable_object is not None:
-                return closest_operable_object["objectId"], None
+            target_mask = self._get_target_mask(env_action, scene_object_table)
+            if target_mask.any():
+                distances = np.where(target_mask, scene_object_table.distances, np.inf)
+                return scene_object_table.object_ids[int(np.argmin(distances))], None
             return None, env_action.fail_perform(
                 env=self,
                 error_message=f"No operable object found to perform action {env_action.name} in the agent's field of view.",
@@ -468,7 +721,7 @@ class ITHOREnv(
         )
         if bool(query):
             selected_object_id = query.metadata["actionReturn"]
-            if env_action.is_object_operable(scene_objects_dict[selected_object_id]):
+            if env_action.is_object_operable(scene_object_table[selected_object_id]):
                 return selected_object_id, None
 
         failed_action = env_action.fail_perform(
@@ -477,6 +730,72 @@ class ITHOREnv(
         )
         return None, failed_action
 
+    def _get_operability_masks(self, scene_object_table: SceneObjectTable) -> dict[EnvActionName, NDArray[np.bool_]]:
+        """
+        Return the operability masks of the available actions with a target object.
+
+        The masks only depend on the fixed properties of the objects, so they are computed once
+        per scene and only recomputed when the objects of the scene change (e.g. sliced objects).
+
+        Args:
+            scene_object_table (SceneObjectTable): Scene object table of the event.
+
+        Returns:
+            operability_masks (dict[EnvActionName, NDArray[np.bool_]]): Mask of the objects
+                operable by each action, aligned with the rows of the table.
+        """
+        if self._operability_masks_object_ids != scene_object_table.object_ids:
+            self._operability_masks = {
+                action_name: ACTIONS_BY_NAME[action_name].compute_operability_mask(scene_object_table)
+                for action_name in self.action_idx_to_name.values()
+                if ACTIONS_BY_NAME[action_name].has_target_object
+            }
+            self._operability_masks_object_ids = scene_object_table.object_ids
+        return self._operability_masks
+
+    def _get_target_mask(
+        self, env_action: EnvironmentAction, scene_object_table: SceneObjectTable
+    ) -> NDArray[np.bool_]:
+        """
+        Return the mask of the objects that can currently be targeted by the action.
+
+        Those are the interactable objects operable by the action, whose distance is known.
+
+        Args:
+            env_action (EnvironmentAction): Action with a target object.
+            scene_object_table (SceneObjectTable): Scene object table of the event.
+
+        Returns:
+            target_mask (NDArray[np.bool_]): Mask of the objects that can be targeted, aligned with
+                the rows of the table.
+        """
+        return (
+            self._get_operability_masks(scene_object_table)[env_action.name]
+            & scene_object_table.column(SimObjVariableProp.IS_INTERACTABLE)
+            & ~np.isnan(scene_object_table.distances)
+        )
+
+    def action_masks(self) -> NDArray[np.bool_]:
+        """
+        Return the mask of the actions that can currently be performed, indexed like the action space.
+
+        The actions without target object are always available, and those with a target object
+        are available if an interactable object is operable by the action. The method name
+        follows the convention of the maskable policies of sb3-contrib.
+
+        Returns:
+            action_mask (NDArray[np.bool_]): Whether each action index can be performed.
+        """
+        scene_object_table = self.last_scene_object_table
+        return np.fromiter(
+            (
+                not env_action.has_target_object or bool(self._get_target_mask(env_action, scene_object_table).any())
+                for env_action in (ACTIONS_BY_NAME[action_name] for action_name in self.action_idx_to_name.values())
+            ),
+            dtype=np.bool_,
+            count=len(self.action_idx_to_name),
+        )
+
     # TODO: Adapt this with general task and reward handling
     def reset(
         self,
@@ -498,12 +817,16 @@ class ITHOREnv(
 
         Returns:
             observation (dict[str, NDArray[np.uint8] | str]): Observation of the environment.
-            info (dict): Additional information about the environment.
+            info (dict): Additional information about the environment. In pipelined reward mode,
+                "flushed_reward" is the reward of the last step of the previous episode that was
+                not returned by `step` (e.g. when the episode is ended by a time limit wrapper).
         """
         # print("Resetting environment.")
         super().reset(seed=seed, options=options)
         if options is None:
             options = {}
+        # The reward of the last step of the previous episode may still be computed
+        flushed_reward, _, _ = self.flush_pending_reward()
 
         # Sample a task blueprint
         forced_task_idx = options.get("forced_task_idx")
@@ -514,18 +837,18 @@ class ITHOREnv(
         task_blueprint = self.task_blueprints[self.task_idx]
         self.current_task_type = task_blueprint.task_type
 
-        self.task = task_blueprint.task_type(**task_blueprint.task_args)
+        self.task = self.task_templates[self.task_idx].instantiate()
         # TODO: Support more than one reward handler
         self.reward_handler = self.task.get_reward_handler(self.config.no_task_advancement_reward)
 
         # Reset the controller, task and reward handler
         forced_scene = options.get("forced_scene")
         if forced_scene is None:
-            task_completion, task_info, scene_initialization_time = self._sample_scene_and_reset_controller_task_reward(
-                task_blueprint
+            task_completion, task_info, scene_initialization_times = (
+                self._sample_scene_and_reset_controller_task_reward(task_blueprint)
             )
         else:
-            successful_reset, task_completion, task_info, scene_initialization_time = (
+            successful_reset, task_completion, task_info, scene_initialization_times = (
                 self._reset_controller_task_reward(scene=self.current_scene)
             )
             if not successful_reset:
@@ -541,42 +864,69 @@ class ITHOREnv(
             "is_success": task_completion,
             "max_task_advancement": self.task.maximum_advancement,
             "task_advancement": task_info.get("task_advancement", None),
-            "speed_performance": {"scene_initialization_time": scene_initialization_time},
+            "speed_performance": {
+                "scene_initialization_time": sum(scene_initialization_times.values()),
+                **scene_initialization_times,
+            },
             "task_type": self.task.__class__.__name__,
             "task_args": task_blueprint.task_args,
             "task_description": self.task.text_description(),
             "scene": self.current_scene,
         }
-
-        obs_env: NDArray = self.last_event.frame  # type: ignore
-        observation = self._get_full_observation(obs_env)
+        if self._reward_executor is not None:
+            info["flushed_reward"] = flushed_reward
+        if self.config.action_mask_in_info:
+            info["action_mask"] = self.action_masks()
+        self._apply_info_verbosity(info)
+
+        self._object_state_ids = self.task.get_candidate_object_ids()
+        obs_env = self.frame_processor.reset(self.last_event.frame)  # type: ignore
+        observation = self._get_full_observation(obs_env, self.last_event)
         print(f"Starting new episode in {self.current_scene} with task {self.current_task_type.__name__}.")
 
         self.last_info = info
         return observation, info
 
-    def _get_full_observation(self, environment_obs: NDArray[np.uint8]) -> dict[str, Any]:
+    def _get_full_observation(self, environment_obs: NDArray[np.uint8], event: Event) -> dict[str, Any]:
         """
         Get the full observation of the environment.
 
         Args:
             environment_obs (NDArray[np.uint8]): Observation of the environment (frame of the
                 agent's view).
+            event (Event): Event of the observation, used for the additional modalities.
 
         Returns:
             dict[str, Any]: Full observation of the environment.
         """
-        return {
+        observation = {
             "env_obs": environment_obs,
             # "task_desc_obs": self.task.text_description(),
             "task_obs": self.task_idx,
             "scene_obs": SCENE_ID_TO_INDEX_MAP[self.current_scene],
         }
+        observation_config = self.config.observation
+        if observation_config.depth:
+            observation["depth"] = self.frame_processor.process_auxiliary_frame(event.depth_frame)  # type: ignore
+        if observation_config.instance_segmentation:
+            observation["instance_segmentation"] = self.frame_processor.process_auxiliary_frame(
+                event.instance_segmentation_frame  # type: ignore
+            )
+        if observation_config.object_state:
+            observation["object_state"] = compute_object_state(
+                self._get_scene_object_table(event),
+                self._object_state_ids,
+                observation_config.object_state_max_objects,
+            )
+        return observation
 
-    def _reset_controller_task_reward(self, scene: SceneId) -> tuple[bool, bool, dict[str, Any], float]:
+    def _reset_controller_task_reward(self, scene: SceneId) -> tuple[bool, bool, dict[str, Any], dict[str, float]]:
         """
         Reset the controller, task and reward handler for a given scene.
 
+        The scene is restored from the controller pool if possible (warm reset) and loaded
+        otherwise (cold reset).
+
         Args:
             scene (SceneId): Scene to reset the controller to.
 
@@ -584,12 +934,13 @@ class ITHOREnv(
             successful_reset (bool): Whether the reset was successful.
             task_completion (bool): Whether the task is completed.
             task_info (dict[str, Any]): Additional information about the task.
-            scene_initialization_time (float): Time taken to initialize the scene.
+            scene_initialization_times (dict[str, float]): Time taken to initialize the scene, with
+                cold and warm resets reported separately.
         """
         # Instantiate the scene
         start_time = time.perf_counter()
 
-        self.controller.reset(scene=scene)  # type: ignore
+        self.controller, is_warm_reset = self.controller_pool.reset(scene)
         self._randomize_scene(self.controller)
 
         end_time = time.perf_counter()
@@ -597,12 +948,16 @@ class ITHOREnv(
         # print(f"Scene {scene} initialized in {scene_initialization_time:.4f} seconds.")
 
         successful_reset, task_completion, task_info = self.reward_handler.reset(self.controller)
+        scene_initialization_times = {
+            COLD_SCENE_INITIALIZATION_TIME: 0.0 if is_warm_reset else scene_initialization_time,
+            WARM_SCENE_INITIALIZATION_TIME: scene_initialization_time if is_warm_reset else 0.0,
+        }
 
-        return successful_reset, task_completion, task_info, scene_initialization_time
+        return successful_reset, task_completion, task_info, scene_initialization_times
 
     def _sample_scene_and_reset_controller_task_reward(
         self, task_blueprint: TaskBlueprint
-    ) -> tuple[bool, dict[str, Any], float]:
+    ) -> tuple[bool, dict[str, Any], dict[str, float]]:
         """
         Sample a scene from the task blueprint and reset the controller, task and reward handler.
 
@@ -612,11 +967,15 @@ class ITHOREnv(
         Returns:
             task_completion (bool): Whether the task is completed.
             task_info (dict[str, Any]): Additional information about the task.
-            scene_initialization_time (float): Time taken to initialize the scene.
+            scene_initialization_times (dict[str, float]): Time taken to initialize the sampled
+                scenes, with cold and warm resets reported separately.
 
         """
         successful_reset = False
         task_completion = False
+        scene_initialization_times = dict.fromkeys(
+            (COLD_SCENE_INITIALIZATION_TIME, WARM_SCENE_INITIALIZATION_TIME), 0.0
+        )
         # Repeat until a compatible scene is found and remove incompatible ones from the task blueprint
         while not successful_reset or task_completion:
             # print(f"Sampling a scene from the task blueprint {task_blueprint.task_type.__name__}.")
@@ -624,9 +983,11 @@ class ITHOREnv(
             sampled_scene = self.np_random.choice(sorted_scenes)
             # print(f"Sampled scene: {sampled_scene}.")
 
-            successful_reset, task_completion, task_info, scene_initialization_time = (
+            successful_reset, task_completion, task_info, sampled_scene_initialization_times = (
                 self._reset_controller_task_reward(sampled_scene)
             )
+            for key, initialization_time in sampled_scene_initialization_times.items():
+                scene_initialization_times[key] += initialization_time
             if not successful_reset:  # TODO: Fix this for tasks with 0 arguments to work
                 print(
                     f"Scene {sampled_scene} is not compatible with the task blueprint {task_blueprint.task_type} ({task_blueprint.task_args}). Removing it from the task blueprint."
@@ -642,17 +1003,17 @@ class ITHOREnv(
 
         self.current_scene = sampled_scene
 
-        return task_completion, task_info, scene_initialization_time
+        return task_completion, task_info, scene_initialization_times
 
     def _randomize_scene(
         self,
-        controller: Controller,
+        controller: Controller | OfflineController,
     ) -> None:
         """
         Randomize the scene according to the environment config.
 
         Args:
-            controller (Controller): AI2THOR controller after initializing the scene.
+            controller (Controller | OfflineController): Controller after initializing the scene.
         """
         randomization_config = self.config.scene_randomization
         if randomization_config.random_agent_spawn:
@@ -689,9 +1050,14 @@ class ITHOREnv(
         """
         Close the environment.
 
-        In particular, stop the ai2thor controller.
+        In particular, stop the controllers and the reward thread, and close the profiling sink.
         """
-        self.controller.stop()
+        if self._reward_executor is not None:
+            self._reward_executor.shutdown(wait=True, cancel_futures=True)
+            self._pending_reward = None
+        if self.profiler is not None:
+            self.profiler.close()
+        self.controller_pool.stop()
 
 
 # %% === Exceptions ===
@@ -0,0 +1,210 @@
+"""
+Asyncio interface for RL-THOR environments.
+
+The blocking calls of an environment (the controller round trip and the task advancement) run in a
+thread dedicated to the environment, so that a single event loop can drive many environments
+concurrently: while a simulator renders, the other environments keep stepping.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import inspect
+import itertools
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from rl_thor.envs.ai2thor_envs import ITHOREnv
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+
+    import gymnasium as gym
+
+
+# %% === Environments ===
+class AsyncITHOREnv:
+    """
+    Asyncio wrapper of an RL-THOR environment running its blocking calls in a dedicated thread.
+
+    Every call to the environment runs in the same thread, one at a time, so the environment and
+    its controller are never used concurrently.
+    """
+
+    def __init__(self, env: gym.Env, executor: concurrent.futures.ThreadPoolExecutor | None = None) -> None:
+        """
+        Initialize the asyncio environment.
+
+        Args:
+            env (gym.Env): Environment to wrap, usually an ITHOREnv or a wrapped ITHOREnv.
+            executor (concurrent.futures.ThreadPoolExecutor | None): Single-thread executor running
+                the calls to the environment. A new one is created if None. Defaults to None.
+        """
+        self.env = env
+        self._executor = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="rl_thor_env")
+            if executor is None
+            else executor
+        )
+
+        # === Type Annotations ===
+        self.env: gym.Env
+        self._executor: concurrent.futures.ThreadPoolExecutor
+
+    @classmethod
+    async def create(
+        cls,
+        config_path: str | Path = Path("config/environment_config.yaml"),
+        config_override: dict | None = None,
+    ) -> AsyncITHOREnv:
+        """
+        Create an ITHOREnv in the thread of the new asyncio environment.
+
+        The controller is started in the executor, so creating many environments doesn't block
+        the event loop.
+
+        Args:
+            config_path (str | Path): Relative path to the environment config file. Default is
+                "config/environment_config.yaml".
+            config_override (dict, Optional): Dictionary whose keys will override the given config.
+
+        Returns:
+            async_env (AsyncITHOREnv): Asyncio environment wrapping the new ITHOREnv.
+        """
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="rl_thor_env")
+        env = await asyncio.get_running_loop().run_in_executor(executor, ITHOREnv, config_path, config_override)
+        return cls(env, executor)
+
+    @property
+    def observation_space(self) -> gym.Space:
+        """Return the observation space of the environment."""
+        return self.env.observation_space
+
+    @property
+    def action_space(self) -> gym.Space:
+        """Return the action space of the environment."""
+        return self.env.action_space
+
+    async def _run[T](self, function: Callable[..., T], *args: Any) -> T:
+        """
+        Run a blocking function in the thread of the environment.
+
+        Args:
+            function (Callable[..., T]): Function to run.
+            *args (Any): Arguments of the function.
+
+        Returns:
+            result (T): Result of the function.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def reset(
+        self,
+        seed: int | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[Any, dict[str, Any]]:
+        """
+        Reset the environment.
+
+        Args:
+            seed (int, Optional): Seed for the environment random number generator.
+            options (dict[str, Any], Optional): Additional options for the reset.
+
+        Returns:
+            observation (Any): Observation of the environment.
+            info (dict): Additional information about the environment.
+        """
+        return await self._run(lambda: self.env.reset(seed=seed, options=options))
+
+    async def step(self, action: Any) -> tuple[Any, float, bool, bool, dict[str, Any]]:
+        """
+        Take a step in the environment.
+
+        Args:
+            action (Any): Action to take in the environment.
+
+        Returns:
+            observation (Any): Observation of the environment.
+            reward (float): Reward of the action.
+            terminated (bool): Whether the agent reaches a terminal state (realized the task).
+            truncated (bool): Whether the limit of steps per episode has been reached.
+            info (dict): Additional information about the environment.
+        """
+        return await self._run(self.env.step, action)
+
+    async def close(self) -> None:
+        """Close the environment and stop its thread."""
+        await self._run(self.env.close)
+        self._executor.shutdown(wait=False)
+
+
+# %% === Batch runner ===
+@dataclass(frozen=True)
+class EpisodeResult:
+    """Summary of an episode run by `run_episodes`."""
+
+    env_index: int
+    episode_index: int
+    episode_return: float
+    episode_length: int
+    terminated: bool
+    truncated: bool
+    info: dict[str, Any]
+
+
+async def run_episodes(
+    envs: Sequence[AsyncITHOREnv],
+    policy: Callable[[Any], Any | Awaitable[Any]],
+    nb_episodes: int,
+    seed: int | None = None,
+    max_steps: int | None = None,
+) -> list[EpisodeResult]:
+    """
+    Run episodes concurrently on the environments until the given number of episodes is reached.
+
+    Each environment runs episodes one after another, taking the next episode index as soon as it
+    finishes one, so that faster environments run more episodes.
+
+    Args:
+        envs (Sequence[AsyncITHOREnv]): Environments to run the episodes on.
+        policy (Callable[[Any], Any | Awaitable[Any]]): Function returning the action to take
+            given an observation, or a coroutine function.
+        nb_episodes (int): Total number of episodes to run.
+        seed (int, Optional): Seed of the first reset of each environment, incremented for each
+            environment. Defaults to None.
+        max_steps (int, Optional): Maximum number of steps per episode. Defaults to None.
+
+    Returns:
+        episode_results (list[EpisodeResult]): Results of the episodes, sorted by episode index.
+    """
+    episode_indices = iter(range(nb_episodes))
+
+    async def run_env_episodes(env_index: int, env: AsyncITHOREnv) -> list[EpisodeResult]:
+        env_results = []
+        env_seed = None if seed is None else seed + env_index
+        for episode_index in episode_indices:
+            obs, info = await env.reset(seed=env_seed)
+            env_seed = None
+            episode_return, episode_length = 0.0, 0
+            terminated, truncated = False, False
+            while not terminated and not truncated:
+                action = policy(obs)
+                if inspect.isawaitable(action):
+                    action = await action
+                obs, reward, terminated, truncated, info = await env.step(action)
+                episode_return += float(reward)
+                episode_length += 1
+                if max_steps is not None and episode_length >= max_steps:
+                    break
+            env_results.append(
+                EpisodeResult(env_index, episode_index, episode_return, episode_length, terminated, truncated, info)
+            )
+        return env_results
+
+    envs_results = await asyncio.gather(*itertools.starmap(run_env_episodes, enumerate(envs)))
+    return sorted(
+        (result for env_results in envs_results for result in env_results),
+        key=lambda result: result.episode_index,
+    )
@@ -0,0 +1,19 @@
+"""
+Scene-task compatibility index of the RL-THOR environment.
+
+The index records, for each task blueprint (task type and arguments), the scenes where the task can
+be instantiated. It is computed offline with the command line interface of the package:
+    python -m rl_thor.envs.compat_index --config config/environment_config.yaml --output compat_index.json
+
+and used by the environment when `tasks/compat_index_path` is set in its config.
+"""
+
+from rl_thor.envs.compat_index.index import (
+    COMPAT_INDEX_VERSION,
+    CompatIndex,
+    CompatIndexEntry,
+    CompatIndexVersionError,
+    build_compat_index,
+    evaluate_blueprint,
+    get_default_blueprints,
+)
@@ -0,0 +1,66 @@
+"""
+Command line interface computing the scene-task compatibility index.
+
+Usage:
+    python -m rl_thor.envs.compat_index --config config/environment_config.yaml --output compat_index.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import yaml
+
+from rl_thor.envs._config import EnvConfig
+from rl_thor.envs.compat_index.index import build_compat_index, get_default_blueprints
+from rl_thor.envs.controllers import DEFAULT_METADATA_SAMPLES_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """
+    Compute the scene-task compatibility index and write it in a JSON file.
+
+    Args:
+        argv (Sequence[str] | None): Command line arguments. Defaults to the arguments of the process.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m rl_thor.envs.compat_index",
+        description="Compute the scene-task compatibility index from the objects metadata samples of the scenes.",
+    )
+    parser.add_argument("--output", "-o", type=Path, required=True, help="Path of the JSON index file to write.")
+    parser.add_argument(
+        "--config",
+        "-c",
+        type=Path,
+        default=None,
+        help="Environment config whose task blueprints are evaluated, besides the tasks without arguments.",
+    )
+    parser.add_argument(
+        "--metadata-dir",
+        type=Path,
+        default=DEFAULT_METADATA_SAMPLES_DIR,
+        help="Directory of the objects metadata samples of the scenes.",
+    )
+    args = parser.parse_args(argv)
+
+    config = None
+    if args.config is not None:
+        with args.config.open() as f:
+            config = EnvConfig.init_from_dict(yaml.safe_load(f))
+    compat_index = build_compat_index(get_default_blueprints(config), metadata_dir=args.metadata_dir)
+    compat_index.save(args.output)
+    for entry in compat_index.entries.values():
+        print(
+            f"{entry.task_type} {entry.task_args}: {len(entry.compatible_scenes)} compatible, "
+            f"{len(entry.completed_scenes)} already completed, {len(entry.incompatible_scenes)} incompatible scenes"
+        )
+    print(f"Compatibility index written to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Scene-task compatibility index and its computation from the objects metadata samples.
+
+The index records, for each task blueprint (task type and arguments), the scenes where the task can
+be instantiated, computed offline with the reset logic of the tasks on the objects metadata samples
+of the scenes (with the synthetic controller backend). The environment uses it to remove the
+incompatible scenes from its task blueprints, instead of discovering them by resetting the
+simulator.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import inspect
+import io
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from rl_thor.envs.controllers import DEFAULT_METADATA_SAMPLES_DIR, SyntheticController
+from rl_thor.envs.scenes import ALL_SCENES
+from rl_thor.envs.tasks.tasks import ALL_TASKS, TaskType, UnknownTaskTypeError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from rl_thor.envs._config import EnvConfig
+    from rl_thor.envs.scenes import SceneId
+    from rl_thor.envs.tasks.tasks_interface import TaskArgValue
+
+
+# %% === Constants ===
+COMPAT_INDEX_VERSION = 1
+
+
+# %% === Compatibility index ===
+@dataclass(frozen=True)
+class CompatIndexEntry:
+    """Compatibility of a task blueprint with the evaluated scenes."""
+
+    task_type: TaskType
+    task_args: dict[str, TaskArgValue] = field(default_factory=dict)
+    # Scenes where the task can be instantiated and is not already completed
+    compatible_scenes: frozenset[SceneId] = frozenset()
+    # Scenes where the task can be instantiated but is already completed at the beginning of the episode
+    completed_scenes: frozenset[SceneId] = frozenset()
+    # Scenes where the task can't be instantiated
+    incompatible_scenes: frozenset[SceneId] = frozenset()
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the entry as a JSON serializable dictionary.
+
+        Returns:
+            entry_dict (dict[str, Any]): Dictionary of the entry.
+        """
+        return {
+            "task_type": str(self.task_type),
+            "task_args": self.task_args,
+            "compatible_scenes": sorted(self.compatible_scenes),
+            "completed_scenes": sorted(self.completed_scenes),
+            "incompatible_scenes": sorted(self.incompatible_scenes),
+        }
+
+    @staticmethod
+    def from_dict(entry_dict: dict[str, Any]) -> CompatIndexEntry:
+        """
+        Create the entry from its dictionary.
+
+        Args:
+            entry_dict (dict[str, Any]): Dictionary of the entry.
+
+        Returns:
+            entry (CompatIndexEntry): Entry of the index.
+        """
+        return CompatIndexEntry(
+            task_type=TaskType(entry_dict["task_type"]),
+            task_args=entry_dict["task_args"],
+            compatible_scenes=frozenset(entry_dict["compatible_scenes"]),
+            completed_scenes=frozenset(entry_dict["completed_scenes"]),
+            incompatible_scenes=frozenset(entry_dict["incompatible_scenes"]),
+        )
+
+
+def get_blueprint_key(task_type: TaskType | str, task_args: Mapping[str, TaskArgValue]) -> str:
+    """
+    Return the key of a task blueprint in the index, independent of the order of its arguments.
+
+    Args:
+        task_type (TaskType | str): Type of the task.
+        task_args (Mapping[str, TaskArgValue]): Arguments of the task.
+
+    Returns:
+        key (str): Key of the task blueprint.
+    """
+    return json.dumps([str(task_type), dict(task_args)], sort_keys=True)
+
+
+class CompatIndex:
+    """
+    Index of the compatibility between task blueprints and scenes.
+
+    The scenes that were not evaluated for a task blueprint (e.g. scenes without objects metadata
+    sample) and the task blueprints that are not in the index are considered compatible.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[CompatIndexEntry],
+        metadata_digest: str,
+        version: int = COMPAT_INDEX_VERSION,
+    ) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            entries (Iterable[CompatIndexEntry]): Entries of the task blueprints.
+            metadata_digest (str): Digest of the objects metadata samples used to compute the index.
+            version (int): Version of the format of the index. Defaults to the current version.
+        """
+        self.entries = {get_blueprint_key(entry.task_type, entry.task_args): entry for entry in entries}
+        self.metadata_digest = metadata_digest
+        self.version = version
+
+    def get_entry(self, task_type: TaskType | str, task_args: Mapping[str, TaskArgValue]) -> CompatIndexEntry | None:
+        """
+        Return the entry of a task blueprint, or None if it is not in the index.
+
+        Args:
+            task_type (TaskType | str): Type of the task.
+            task_args (Mapping[str, TaskArgValue]): Arguments of the task.
+
+        Returns:
+            entry (CompatIndexEntry | None): Entry of the task blueprint.
+        """
+        return self.entries.get(get_blueprint_key(task_type, task_args))
+
+    def filter_scenes(
+        self,
+        task_type: TaskType | str,
+        task_args: Mapping[str, TaskArgValue],
+        scenes: Iterable[SceneId],
+        exclude_completed: bool = True,
+    ) -> set[SceneId]:
+        """
+        Return the scenes that are compatible with a task blueprint.
+
+        Args:
+            task_type (TaskType | str): Type of the task.
+            task_args (Mapping[str, TaskArgValue]): Arguments of the task.
+            scenes (Iterable[SceneId]): Scenes to filter.
+            exclude_completed (bool): Whether to also exclude the scenes where the task is already
+                completed in the initial state of the scene. Defaults to True.
+
+        Returns:
+            compatible_scenes (set[SceneId]): Scenes that are not known to be incompatible.
+        """
+        entry = self.get_entry(task_type, task_args)
+        if entry is None:
+            return set(scenes)
+        excluded_scenes = (
+            entry.incompatible_scenes | entry.completed_scenes if exclude_completed else entry.incompatible_scenes
+        )
+        return {scene for scene in scenes if scene not in excluded_scenes}
+
+    def is_up_to_date(self, metadata_dir: str | Path = DEFAULT_METADATA_SAMPLES_DIR) -> bool:
+        """
+        Return whether the index was computed with the current objects metadata samples.
+
+        Args:
+            metadata_dir (str | Path): Directory of the objects metadata samples of the scenes.
+
+        Returns:
+            is_up_to_date (bool): Whether the digest of the samples matches the one of the index.
+        """
+        return compute_metadata_digest(metadata_dir) == self.metadata_digest
+
+    def save(self, path: str | Path) -> None:
+        """
+        Write the index in a JSON file.
+
+        Args:
+            path (str | Path): Path of the file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        index_dict = {
+            "version": self.version,
+            "metadata_digest": self.metadata_digest,
+            "entries": [entry.to_dict() for entry in self.entries.values()],
+        }
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(index_dict, f, indent=2)
+
+    @staticmethod
+    def load(path: str | Path) -> CompatIndex:
+        """
+        Read the index from a JSON file.
+
+        Args:
+            path (str | Path): Path of the file.
+
+        Returns:
+            compat_index (CompatIndex): Scene-task compatibility index.
+        """
+        with Path(path).open(encoding="utf-8") as f:
+            index_dict = json.load(f)
+        version = index_dict.get("version")
+        if version != COMPAT_INDEX_VERSION:
+            raise CompatIndexVersionError(path, version)
+        return CompatIndex(
+            (CompatIndexEntry.from_dict(entry_dict) for entry_dict in index_dict["entries"]),
+            metadata_digest=index_dict["metadata_digest"],
+            version=version,
+        )
+
+
+# %% === Index computation ===
+def compute_metadata_digest(metadata_dir: str | Path = DEFAULT_METADATA_SAMPLES_DIR) -> str:
+    """
+    Return the digest of the objects metadata samples, to detect outdated indexes.
+
+    Args:
+        metadata_dir (str | Path): Directory of the objects metadata samples of the scenes.
+
+    Returns:
+        digest (str): SHA-256 digest of the names and contents of the samples.
+    """
+    digest = hashlib.sha256()
+    for sample_path in sorted(Path(metadata_dir).glob("*.json")):
+        digest.update(sample_path.name.encode())
+        digest.update(sample_path.read_bytes())
+    return digest.hexdigest()
+
+
+def evaluate_blueprint(
+    task_type: TaskType | str,
+    task_args: Mapping[str, TaskArgValue],
+    scenes: Iterable[SceneId],
+    controller: SyntheticController,
+) -> CompatIndexEntry:
+    """
+    Evaluate the compatibility of a task blueprint with scenes with the reset logic of the task.
+
+    Args:
+        task_type (TaskType | str): Type of the task.
+        task_args (Mapping[str, TaskArgValue]): Arguments of the task.
+        scenes (Iterable[SceneId]): Scenes to evaluate.
+        controller (SyntheticController): Controller on the objects metadata samples of the scenes.
+
+    Returns:
+        entry (CompatIndexEntry): Compatibility of the task blueprint with the evaluated scenes.
+    """
+    if task_type not in ALL_TASKS:
+        raise UnknownTaskTypeError(task_type)  # type: ignore
+    task_class = ALL_TASKS[TaskType(task_type)]
+    compatible_scenes, completed_scenes, incompatible_scenes = set(), set(), set()
+    for scene in scenes:
+        controller.reset(scene=scene)
+        # The tasks print why the reset failed
+        with contextlib.redirect_stdout(io.StringIO()):
+            reset_successful, _, is_task_completed, _ = task_class(**task_args).preprocess_and_reset(controller)  # type: ignore
+        if not reset_successful:
+            incompatible_scenes.add(scene)
+        elif is_task_completed:
+            completed_scenes.add(scene)
+        else:
+            compatible_scenes.add(scene)
+
+    return CompatIndexEntry(
+        task_type=TaskType(task_type),
+        task_args=dict(task_args),
+        compatible_scenes=frozenset(compatible_scenes),
+        completed_scenes=frozenset(completed_scenes),
+        incompatible_scenes=frozenset(incompatible_scenes),
+    )
+
+
+def get_default_blueprints(config: EnvConfig | None = None) -> list[tuple[TaskType, dict[str, TaskArgValue]]]:
+    """
+    Return the task blueprints without arguments and the task blueprints of the config.
+
+    Args:
+        config (EnvConfig | None): Environment config whose task blueprints are added. Defaults to
+            None.
+
+    Returns:
+        blueprints (list[tuple[TaskType, dict[str, TaskArgValue]]]): Types and arguments of the task
+            blueprints.
+    """
+    blueprints: list[tuple[TaskType, dict[str, TaskArgValue]]] = [
+        (task_type, {})
+        for task_type, task_class in ALL_TASKS.items()
+        if all(
+            parameter.default is not inspect.Parameter.empty
+            for parameter in list(inspect.signature(task_class.__init__).parameters.values())[1:]
+            if parameter.kind not in {inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD}
+        )
+    ]
+    if config is not None:
+        blueprints.extend(
+            (TaskType(task_blueprint_config.task_type), task_blueprint_config.args)
+            for task_blueprint_config in config.tasks.task_blueprints
+        )
+    return blueprints
+
+
+def build_compat_index(
+    blueprints: Iterable[tuple[TaskType | str, Mapping[str, TaskArgValue]]],
+    scenes: Sequence[SceneId] = ALL_SCENES,
+    metadata_dir: str | Path = DEFAULT_METADATA_SAMPLES_DIR,
+) -> CompatIndex:
+    """
+    Compute the compatibility index of task blueprints with the scenes that have a metadata sample.
+
+    Args:
+        blueprints (Iterable[tuple[TaskType | str, Mapping[str, TaskArgValue]]]): Types and
+            arguments of the task blueprints.
+        scenes (Sequence[SceneId]): Scenes to evaluate, the ones without objects metadata sample
+            are skipped. Defaults to all the scenes.
+        metadata_dir (str | Path): Directory of the objects metadata samples of the scenes.
+
+    Returns:
+        compat_index (CompatIndex): Scene-task compatibility index.
+    """
+    controller = SyntheticController(metadata_dir=metadata_dir, frame_shape=(1, 1, 3))
+    sampled_scenes = [scene for scene in scenes if (controller.metadata_dir / f"{scene}_physics.json").exists()]
+    entries = [
+        evaluate_blueprint(task_type, task_args, sampled_scenes, controller) for task_type, task_args in blueprints
+    ]
+    return CompatIndex(entries, metadata_digest=compute_metadata_digest(metadata_dir))
+
+
+# %% === Exceptions ===
+class CompatIndexVersionError(ValueError):
+    """Exception raised when loading a compatibility index written with another version of the format."""
+
+    def __init__(self, path: str | Path, version: int | None) -> None:
+        self.path = path
+        self.version = version
+
+    def __str__(self) -> str:
+        return f"Compatibility index {self.path} has version {self.version} but version {COMPAT_INDEX_VERSION} is required. Compute it again with `python -m rl_thor.envs.compat_index`."
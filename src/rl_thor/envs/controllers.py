@@ -0,0 +1,1089 @@
+"""
+Controller backends of the RL-THOR environment.
+
+The environment drives the scene through a controller with the interface of the AI2-THOR
+controller (`reset`, `step`, `last_event`, `last_action` and `stop`). The backend is selected with
+the `controller_backend` option of the environment config, among the backends registered in
+`CONTROLLER_BACKENDS`:
+- "ai2thor": the AI2-THOR controller, running the Unity simulator (default).
+- "replay": serves the events recorded for an episode, for example in `tests/data/test_tasks`.
+- "synthetic": lightweight state machine on top of the scene metadata samples, applying the
+    semantics of the object interaction actions without rendering.
+
+The offline backends ("replay" and "synthetic") don't need the Unity simulator, so the task and
+reward computations can be tested and benchmarked in isolation. Their frames are blank or recorded
+frames, and the parameters of their constructor are given with the `controller_backend_parameters`
+option of the environment config.
+"""
+
+from __future__ import annotations
+
+import copy
+import functools
+import json
+import math
+import pickle as pkl  # noqa: S403
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from ai2thor.controller import Controller
+from ai2thor.server import Event, MetadataWrapper
+
+from rl_thor.envs.actions import Ai2thorAction
+from rl_thor.envs.scene_scaling import InvalidObjectDensityError, scale_scene_objects
+from rl_thor.envs.sim_objects import SimObjFixedProp, SimObjVariableProp
+from rl_thor.utils.general_utils import ROOT_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from rl_thor.envs._config import EnvConfig
+    from rl_thor.envs.scenes import SceneId
+    from rl_thor.envs.sim_objects import SimObjId, SimObjMetadata
+
+
+# %% === Constants ===
+PHYSICS_SCENE_SUFFIX = "_physics"
+DEFAULT_METADATA_SAMPLES_DIR = ROOT_DIR / "dev" / "data" / "objects_metadata_samples"
+EVENT_LIST_FILE_NAME = "event_list.pkl"
+CONTROLLER_ACTION_LIST_FILE_NAME = "controller_action_list.pkl"
+
+# Actions used by the environment to query or randomize the scene, that don't change the state of its objects
+QUERY_ACTIONS = frozenset({
+    "Done",
+    "GetObjectInFrame",
+    "GetReachablePositions",
+    "Teleport",
+    "TeleportFull",
+    "InitialRandomSpawn",
+    "RandomizeMaterials",
+    "RandomizeLighting",
+    "RandomizeColors",
+})
+NAVIGATION_ACTIONS = frozenset({
+    Ai2thorAction.MOVE_AHEAD,
+    Ai2thorAction.MOVE_BACK,
+    Ai2thorAction.MOVE_LEFT,
+    Ai2thorAction.MOVE_RIGHT,
+    Ai2thorAction.ROTATE_LEFT,
+    Ai2thorAction.ROTATE_RIGHT,
+    Ai2thorAction.LOOK_UP,
+    Ai2thorAction.LOOK_DOWN,
+    Ai2thorAction.CROUCH,
+    Ai2thorAction.STAND,
+})
+
+
+def get_scene_id(scene_name: str) -> SceneId:
+    """
+    Return the id of a scene from its name in the event metadata (e.g. "FloorPlan1_physics").
+
+    Args:
+        scene_name (str): Name of the scene in the event metadata, or id of the scene.
+
+    Returns:
+        scene_id (SceneId): Id of the scene.
+    """
+    return scene_name.removesuffix(PHYSICS_SCENE_SUFFIX)  # type: ignore
+
+
+def _to_action_dict(action: str | dict[str, Any] | None, action_args: dict[str, Any]) -> dict[str, Any]:
+    """
+    Return the action and its arguments as a single dictionary, like the AI2-THOR controller.
+
+    Args:
+        action (str | dict[str, Any] | None): Name of the action or dictionary of the action and
+            its arguments.
+        action_args (dict[str, Any]): Other arguments of the action.
+
+    Returns:
+        action_dict (dict[str, Any]): Dictionary of the action and its arguments.
+    """
+    if isinstance(action, dict):
+        return {**action, **action_args}
+    return {"action": action, **action_args}
+
+
+# %% === Offline controllers ===
+class OfflineController(ABC):
+    """
+    Base class for the controllers replacing the AI2-THOR controller without running Unity.
+
+    Offline controllers have the same interface as the AI2-THOR controller for the methods and
+    attributes used by the environment.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the controller."""
+        self.last_event: Event | None = None
+        self.last_action: dict[str, Any] = {}
+
+    @abstractmethod
+    def reset(self, scene: SceneId | str, **init_params: Any) -> Event:
+        """
+        Reset the controller to the initial state of a scene.
+
+        Args:
+            scene (SceneId | str): Id or name of the scene.
+            **init_params (Any): Initialization parameters of the AI2-THOR controller, ignored.
+
+        Returns:
+            event (Event): Event corresponding to the initial state of the scene.
+        """
+
+    @abstractmethod
+    def step(self, action: str | dict[str, Any] | None = None, **action_args: Any) -> Event:
+        """
+        Perform an action in the scene.
+
+        Args:
+            action (str | dict[str, Any] | None): Name of the action or dictionary of the action and
+                its arguments.
+            **action_args (Any): Arguments of the action.
+
+        Returns:
+            event (Event): Event corresponding to the new state of the scene.
+        """
+
+    def stop(self) -> None:  # noqa: B027
+        """Stop the controller; offline controllers have no process to stop."""
+
+
+class ReplayController(OfflineController):
+    """
+    Controller serving the events recorded for episodes instead of simulating the actions.
+
+    Each episode is a directory containing the list of events (`event_list.pkl`) and the list of
+    controller actions (`controller_action_list.pkl`) recorded with the AI2-THOR controller, the
+    first event being the one of the scene initialization. Resetting the controller to a scene
+    serves the first event of the next recorded episode of this scene (the episodes of a scene are
+    used in turn), and each action that is not a query of the scene (see `QUERY_ACTIONS`) serves
+    the next recorded event, whatever the action is. Once all the events of the episode have been
+    served, the actions fail and the state of the scene doesn't change anymore.
+
+    The recorded episodes are loaded once, when the controller is created.
+    """
+
+    def __init__(self, data_dir: str | Path = ROOT_DIR / "tests" / "data" / "test_tasks") -> None:
+        """
+        Load the recorded episodes of the data directory and its sub-directories.
+
+        Args:
+            data_dir (str | Path): Directory of the recorded episodes. Defaults to the recorded
+                episodes of the task tests.
+        """
+        super().__init__()
+        self.data_dir = Path(data_dir)
+        self._episodes_by_scene: dict[SceneId, list[tuple[list[Event], list[dict[str, Any]]]]] = {}
+        for event_list_path in sorted(self.data_dir.rglob(EVENT_LIST_FILE_NAME)):
+            events, actions = self._load_episode(event_list_path.parent)
+            scene_id = get_scene_id(events[0].metadata["sceneName"])
+            self._episodes_by_scene.setdefault(scene_id, []).append((events, actions))
+        self._scene_reset_counts: dict[SceneId, int] = {}
+        self._events: list[Event] = []
+        self._actions: list[dict[str, Any]] = []
+        self._event_index = 0
+
+    @staticmethod
+    def from_config(config: EnvConfig) -> ReplayController:
+        """
+        Create the controller from the environment config.
+
+        Args:
+            config (EnvConfig): Environment config, whose controller backend parameters are the
+                arguments of the controller.
+
+        Returns:
+            controller (ReplayController): Replay controller.
+        """
+        return ReplayController(**config.controller_backend_parameters)
+
+    @property
+    def available_scenes(self) -> list[SceneId]:
+        """Scenes with at least one recorded episode."""
+        return list(self._episodes_by_scene)
+
+    @staticmethod
+    def _load_episode(episode_dir: Path) -> tuple[list[Event], list[dict[str, Any]]]:
+        """
+        Load the events and controller actions recorded for an episode.
+
+        Args:
+            episode_dir (Path): Directory of the recorded episode.
+
+        Returns:
+            events (list[Event]): Recorded events.
+            actions (list[dict[str, Any]]): Recorded controller actions, one per event.
+        """
+        with (episode_dir / EVENT_LIST_FILE_NAME).open("rb") as f:
+            events = pkl.load(f)  # noqa: S301
+        action_list_path = episode_dir / CONTROLLER_ACTION_LIST_FILE_NAME
+        if action_list_path.exists():
+            with action_list_path.open("rb") as f:
+                actions = pkl.load(f)  # noqa: S301
+        else:
+            actions = [{"action": event.metadata["lastAction"]} for event in events]
+        return events, actions
+
+    @staticmethod
+    def _copy_event(event: Event, **metadata_updates: Any) -> Event:
+        """
+        Return a copy of a recorded event, so that the environment can modify its metadata.
+
+        The objects metadata and the frame are shared with the recorded event.
+
+        Args:
+            event (Event): Recorded event.
+            **metadata_updates (Any): Metadata entries replaced in the copy.
+
+        Returns:
+            event_copy (Event): Copy of the event.
+        """
+        event_copy = copy.copy(event)
+        event_copy.metadata = MetadataWrapper({**event.metadata, **metadata_updates})
+        event_copy.events = [event_copy]
+        return event_copy
+
+    def reset(self, scene: SceneId | str, **init_params: Any) -> Event:  # noqa: ARG002
+        """
+        Serve the first event of the next recorded episode of the scene.
+
+        Args:
+            scene (SceneId | str): Id or name of the scene.
+            **init_params (Any): Initialization parameters of the AI2-THOR controller, ignored.
+
+        Returns:
+            event (Event): Recorded event of the scene initialization.
+        """
+        scene_id = get_scene_id(scene)
+        episodes = self._episodes_by_scene.get(scene_id)
+        if not episodes:
+            raise NoRecordedEpisodeError(scene_id, self.data_dir)
+        reset_count = self._scene_reset_counts.get(scene_id, 0)
+        self._scene_reset_counts[scene_id] = reset_count + 1
+        self._events, self._actions = episodes[reset_count % len(episodes)]
+        self._event_index = 0
+        self.last_action = self._actions[0]
+        self.last_event = self._copy_event(self._events[0])
+        return self.last_event
+
+    def step(self, action: str | dict[str, Any] | None = None, **action_args: Any) -> Event:
+        """
+        Serve the next recorded event, or the current one if the action is a query of the scene.
+
+        Args:
+            action (str | dict[str, Any] | None): Name of the action or dictionary of the action and
+                its arguments.
+            **action_args (Any): Arguments of the action.
+
+        Returns:
+            event (Event): Recorded event following the action.
+        """
+        if self.last_event is None:
+            raise ControllerNotResetError(self)
+        action_dict = _to_action_dict(action, action_args)
+        action_name = action_dict["action"]
+        current_event = self._events[self._event_index]
+        if action_name in QUERY_ACTIONS:
+            self.last_action = action_dict
+            self.last_event = self._copy_event(
+                current_event,
+                lastAction=action_name,
+                lastActionSuccess=True,
+                errorMessage="",
+                actionReturn=self._get_query_return(action_name, current_event),
+            )
+        elif self._event_index + 1 < len(self._events):
+            self._event_index += 1
+            self.last_action = self._actions[self._event_index]
+            self.last_event = self._copy_event(self._events[self._event_index])
+        else:
+            self.last_action = action_dict
+            self.last_event = self._copy_event(
+                current_event,
+                lastAction=action_name,
+                lastActionSuccess=False,
+                errorMessage="The recorded episode has no more events.",
+                actionReturn=None,
+            )
+        return self.last_event
+
+    def _get_query_return(self, action_name: str, current_event: Event) -> Any:
+        """
+        Return the result of a query action.
+
+        The object in frame is the target of the next recorded action, so that the environment
+        targets the recorded objects, and the only reachable position is the current position of
+        the agent.
+
+        Args:
+            action_name (str): Name of the query action.
+            current_event (Event): Recorded event of the current state of the scene.
+
+        Returns:
+            action_return (Any): Result of the query action.
+        """
+        match action_name:
+            case "GetObjectInFrame" if self._event_index + 1 < len(self._actions):
+                return self._actions[self._event_index + 1].get("objectId")
+            case "GetReachablePositions":
+                return [current_event.metadata["agent"]["position"]]
+            case _:
+                return None
+
+
+class SyntheticController(OfflineController):
+    """
+    Controller simulating the object interactions on the objects metadata samples of the scenes.
+
+    The initial state of a scene is read from the objects metadata sample of the scene
+    (`<scene>_physics.json` in the metadata directory), and all the objects are considered visible
+    and interactable by the agent. The controller applies the effects of picking up, putting,
+    dropping, opening, closing, toggling, dirtying and cleaning the objects on their metadata, and
+    the other conditions of the actions than the properties of the objects are not checked (e.g.
+    distance to the agent). Setting the poses of objects moves them without physics: an object set
+    at its initial position is back in its initial receptacles and an object set at the position of
+    a receptacle is in this receptacle, like after being put in it. The navigation and scene
+    randomization actions succeed without any effect and the other actions fail.
+
+    The metadata of the objects are copied on write: the metadata of the objects not modified by an
+    action are shared between the consecutive events.
+
+    With an object density higher than 1, the objects of the metadata samples are replicated to
+    stress-test the tasks on denser scenes (see `rl_thor.envs.scene_scaling`).
+    """
+
+    def __init__(
+        self,
+        metadata_dir: str | Path = DEFAULT_METADATA_SAMPLES_DIR,
+        frame_shape: tuple[int, int, int] = (300, 300, 3),
+        render_depth_image: bool = False,
+        render_instance_segmentation: bool = False,
+        object_density: int = 1,
+        state_perturbation: float = 0.0,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            metadata_dir (str | Path): Directory of the objects metadata samples of the scenes.
+                Defaults to the samples of the `dev/data` directory.
+            frame_shape (tuple[int, int, int]): Shape of the blank frames of the events. Defaults to
+                (300, 300, 3).
+            render_depth_image (bool): Whether the events have a blank depth frame. Defaults to
+                False.
+            render_instance_segmentation (bool): Whether the events have a blank instance
+                segmentation frame. Defaults to False.
+            object_density (int): Number of instances of each object of the metadata samples in
+                the scenes. Defaults to 1.
+            state_perturbation (float): Probability of flipping each boolean state of the
+                replicated objects when the object density is higher than 1. Defaults to 0.
+        """
+        super().__init__()
+        if object_density < 1:
+            raise InvalidObjectDensityError(object_density)
+        self.metadata_dir = Path(metadata_dir)
+        self.object_density = object_density
+        self.state_perturbation = state_perturbation
+        self.frame = np.zeros(frame_shape, dtype=np.uint8)
+        self.frame.flags.writeable = False
+        self.depth_frame = np.zeros(frame_shape[:2], dtype=np.float32) if render_depth_image else None
+        self.instance_segmentation_frame = (
+            np.zeros(frame_shape, dtype=np.uint8) if render_instance_segmentation else None
+        )
+        for frame in (self.depth_frame, self.instance_segmentation_frame):
+            if frame is not None:
+                frame.flags.writeable = False
+        self._initial_objects_by_scene: dict[SceneId, dict[SimObjId, SimObjMetadata]] = {}
+        self._scene_id: SceneId | None = None
+        self._objects: dict[SimObjId, SimObjMetadata] = {}
+        self._held_object_id: SimObjId | None = None
+        self._action_handlers: dict[str, Callable[[SimObjMetadata], str | None]] = {
+            Ai2thorAction.PICKUP_OBJECT: self._pickup,
+            Ai2thorAction.PUT_OBJECT: self._put,
+            Ai2thorAction.OPEN_OBJECT: self._open,
+            Ai2thorAction.CLOSE_OBJECT: self._close,
+            Ai2thorAction.TOGGLE_OBJECT_ON: self._toggle_on,
+            Ai2thorAction.TOGGLE_OBJECT_OFF: self._toggle_off,
+            Ai2thorAction.DIRTY_OBJECT: self._dirty,
+            Ai2thorAction.CLEAN_OBJECT: self._clean,
+        }
+        self._scene_action_handlers: dict[str, Callable[[dict[str, Any]], str | None]] = {
+            Ai2thorAction.DROP_HAND_OBJECT: self._drop_hand_object,
+            "SetObjectPoses": self._set_object_poses,
+        }
+
+    @staticmethod
+    def from_config(config: EnvConfig) -> SyntheticController:
+        """
+        Create the controller from the environment config.
+
+        Args:
+            config (EnvConfig): Environment config, whose controller backend parameters are the
+                arguments of the controller.
+
+        Returns:
+            controller (SyntheticController): Synthetic controller.
+        """
+        frame_shape = (config.controller_parameters.frame_height, config.controller_parameters.frame_width, 3)
+        return SyntheticController(**{
+            "frame_shape": frame_shape,
+            "render_depth_image": config.observation.depth,
+            "render_instance_segmentation": config.observation.instance_segmentation,
+            **config.controller_backend_parameters,
+        })
+
+    def _get_initial_objects(self, scene_id: SceneId) -> dict[SimObjId, SimObjMetadata]:
+        """
+        Return the initial metadata of the objects of the scene, loaded and scaled only once per scene.
+
+        Args:
+            scene_id (SceneId): Id of the scene.
+
+        Returns:
+            initial_objects (dict[SimObjId, SimObjMetadata]): Initial metadata of the objects.
+        """
+        initial_objects = self._initial_objects_by_scene.get(scene_id)
+        if initial_objects is None:
+            metadata_path = self.metadata_dir / f"{scene_id}{PHYSICS_SCENE_SUFFIX}.json"
+            if not metadata_path.exists():
+                raise NoMetadataSampleError(scene_id, self.metadata_dir)
+            with metadata_path.open() as f:
+                initial_objects = json.load(f)
+            for obj_metadata in initial_objects.values():
+                obj_metadata[SimObjVariableProp.VISIBLE] = True
+                obj_metadata[SimObjVariableProp.IS_INTERACTABLE] = True
+            if self.object_density > 1:
+                initial_objects = scale_scene_objects(
+                    initial_objects, self.object_density, state_perturbation=self.state_perturbation
+                )
+            self._initial_objects_by_scene[scene_id] = initial_objects
+        return initial_objects
+
+    def reset(self, scene: SceneId | str, **init_params: Any) -> Event:  # noqa: ARG002
+        """
+        Reset the objects of the scene to their state in the metadata sample.
+
+        Args:
+            scene (SceneId | str): Id or name of the scene.
+            **init_params (Any): Initialization parameters of the AI2-THOR controller, ignored.
+
+        Returns:
+            event (Event): Event corresponding to the initial state of the scene.
+        """
+        scene_id = get_scene_id(scene)
+        # The initial metadata are never modified since they are copied on write
+        self._objects = dict(self._get_initial_objects(scene_id))
+        self._scene_id = scene_id
+        self._held_object_id = None
+        self.last_action = {"action": "Initialize"}
+        self.last_event = self._create_event("Initialize", error_message=None)
+        return self.last_event
+
+    def step(self, action: str | dict[str, Any] | None = None, **action_args: Any) -> Event:
+        """
+        Apply the effects of the action on the objects of the scene.
+
+        Args:
+            action (str | dict[str, Any] | None): Name of the action or dictionary of the action and
+                its arguments.
+            **action_args (Any): Arguments of the action.
+
+        Returns:
+            event (Event): Event corresponding to the new state of the scene.
+        """
+        if self.last_event is None:
+            raise ControllerNotResetError(self)
+        action_dict = _to_action_dict(action, action_args)
+        action_name = action_dict["action"]
+        action_return = None
+        error_message = None
+        if action_name in NAVIGATION_ACTIONS or action_name in QUERY_ACTIONS - {"GetObjectInFrame"}:
+            if action_name == "GetReachablePositions":
+                action_return = [self.last_event.metadata["agent"]["position"]]
+        elif action_name in self._action_handlers:
+            target_object = self._objects.get(action_dict.get("objectId"))  # type: ignore
+            if target_object is None:
+                error_message = f"Object {action_dict.get('objectId')} not found in the scene."
+            else:
+                error_message = self._action_handlers[action_name](target_object)
+        elif action_name in self._scene_action_handlers:
+            error_message = self._scene_action_handlers[action_name](action_dict)
+        else:
+            error_message = f"Action {action_name} is not supported by the synthetic controller."
+
+        self.last_action = action_dict
+        self.last_event = self._create_event(action_name, error_message, action_return)
+        return self.last_event
+
+    def _create_event(self, action_name: str, error_message: str | None, action_return: Any = None) -> Event:
+        """
+        Create the event of the current state of the scene.
+
+        Args:
+            action_name (str): Name of the last action.
+            error_message (str | None): Error message of the last action, None if it succeeded.
+            action_return (Any): Result of the last action. Defaults to None.
+
+        Returns:
+            event (Event): Event of the current state of the scene.
+        """
+        height, width = self.frame.shape[:2]
+        held_object_id = self._held_object_id
+        event = Event({
+            "objects": list(self._objects.values()),
+            "agent": {
+                "name": "agent",
+                "position": {"x": 0.0, "y": 0.9, "z": 0.0},
+                "rotation": {"x": 0.0, "y": 0.0, "z": 0.0},
+                "cameraHorizon": 0.0,
+                "isStanding": True,
+            },
+            "inventoryObjects": []
+            if held_object_id is None
+            else [
+                {
+                    SimObjFixedProp.OBJECT_ID: held_object_id,
+                    SimObjFixedProp.OBJECT_TYPE: self._objects[held_object_id][SimObjFixedProp.OBJECT_TYPE],
+                }
+            ],
+            "sceneName": f"{self._scene_id}{PHYSICS_SCENE_SUFFIX}",
+            "lastAction": action_name,
+            "lastActionSuccess": error_message is None,
+            "errorMessage": error_message or "",
+            "actionReturn": action_return,
+            "screenWidth": width,
+            "screenHeight": height,
+        })
+        event.frame = self.frame
+        event.depth_frame = self.depth_frame
+        event.instance_segmentation_frame = self.instance_segmentation_frame
+        return event
+
+    def _update_object(self, obj_id: SimObjId, **updates: Any) -> SimObjMetadata:
+        """
+        Replace the metadata of an object by an updated copy.
+
+        Args:
+            obj_id (SimObjId): Id of the object.
+            **updates (Any): Updated metadata entries.
+
+        Returns:
+            obj_metadata (SimObjMetadata): New metadata of the object.
+        """
+        obj_metadata = {**self._objects[obj_id], **updates}
+        self._objects[obj_id] = obj_metadata
+        return obj_metadata
+
+    def _move_object(self, obj_id: SimObjId, parent_ids: list[SimObjId] | None, **updates: Any) -> None:
+        """
+        Move an object to new receptacles, updating the objects contained in the receptacles.
+
+        Args:
+            obj_id (SimObjId): Id of the object.
+            parent_ids (list[SimObjId] | None): Ids of the new receptacles of the object, None if
+                the object is not in a receptacle.
+            **updates (Any): Other updated metadata entries of the object.
+        """
+        previous_parent_ids = self._objects[obj_id][SimObjVariableProp.PARENT_RECEPTACLES] or ()
+        for parent_id in previous_parent_ids:
+            parent_metadata = self._objects.get(parent_id)
+            if parent_metadata is not None and parent_id not in (parent_ids or ()):
+                contained_ids = [
+                    contained_id
+                    for contained_id in parent_metadata[SimObjVariableProp.RECEPTACLE_OBJ_IDS] or ()
+                    if contained_id != obj_id
+                ]
+                self._update_object(parent_id, receptacleObjectIds=contained_ids)
+        for parent_id in parent_ids or ():
+            parent_metadata = self._objects.get(parent_id)
+            contained_ids = (parent_metadata or {}).get(SimObjVariableProp.RECEPTACLE_OBJ_IDS) or []
+            if parent_metadata is not None and obj_id not in contained_ids:
+                self._update_object(parent_id, receptacleObjectIds=[*contained_ids, obj_id])
+        self._update_object(obj_id, parentReceptacles=parent_ids, **updates)
+
+    def _pickup(self, target_object: SimObjMetadata) -> str | None:
+        obj_id = target_object[SimObjFixedProp.OBJECT_ID]
+        if not target_object[SimObjFixedProp.PICKUPABLE]:
+            return f"{obj_id} is not pickupable."
+        if self._held_object_id is not None:
+            return f"Agent is already holding {self._held_object_id}."
+        self._move_object(obj_id, None, isPickedUp=True)
+        self._held_object_id = obj_id
+        return None
+
+    def _put(self, target_object: SimObjMetadata) -> str | None:
+        receptacle_id = target_object[SimObjFixedProp.OBJECT_ID]
+        held_object_id = self._held_object_id
+        if held_object_id is None:
+            return "Agent is not holding any object."
+        if not target_object[SimObjFixedProp.RECEPTACLE]:
+            return f"{receptacle_id} is not a receptacle."
+        if target_object[SimObjFixedProp.OPENABLE] and not target_object[SimObjVariableProp.IS_OPEN]:
+            return f"{receptacle_id} is closed."
+        self._move_object(
+            held_object_id,
+            [receptacle_id],
+            isPickedUp=False,
+            position=target_object[SimObjVariableProp.POSITION],
+        )
+        self._held_object_id = None
+        return None
+
+    def _drop_hand_object(self, action_dict: dict[str, Any]) -> str | None:  # noqa: ARG002
+        if self._held_object_id is None:
+            return "Agent is not holding any object."
+        self._move_object(self._held_object_id, None, isPickedUp=False)
+        self._held_object_id = None
+        return None
+
+    def _set_object_poses(self, action_dict: dict[str, Any]) -> str | None:
+        initial_objects = self._get_initial_objects(self._scene_id)  # type: ignore
+        object_ids_by_name = {obj_metadata["name"]: obj_id for obj_id, obj_metadata in self._objects.items()}
+        receptacle_ids_by_position = {
+            tuple(obj_metadata[SimObjVariableProp.POSITION].values()): obj_id
+            for obj_id, obj_metadata in self._objects.items()
+            if obj_metadata[SimObjFixedProp.RECEPTACLE]
+        }
+        for object_pose in action_dict.get("objectPoses", ()):
+            obj_id = object_ids_by_name.get(object_pose["objectName"])
+            if obj_id is None:
+                return f"Object {object_pose['objectName']} not found in the scene."
+            position = object_pose["position"]
+            if position == initial_objects[obj_id][SimObjVariableProp.POSITION]:
+                parent_ids = initial_objects[obj_id][SimObjVariableProp.PARENT_RECEPTACLES]
+            else:
+                receptacle_id = receptacle_ids_by_position.get(tuple(position.values()))
+                parent_ids = None if receptacle_id is None else [receptacle_id]
+            self._move_object(obj_id, parent_ids, isPickedUp=False, position=position, rotation=object_pose["rotation"])
+            if obj_id == self._held_object_id:
+                self._held_object_id = None
+        return None
+
+    def _set_state(
+        self,
+        target_object: SimObjMetadata,
+        required_property: SimObjFixedProp,
+        **updates: Any,
+    ) -> str | None:
+        obj_id = target_object[SimObjFixedProp.OBJECT_ID]
+        if not target_object[required_property]:
+            return f"{obj_id} is not {required_property}."
+        self._update_object(obj_id, **updates)
+        return None
+
+    def _open(self, target_object: SimObjMetadata) -> str | None:
+        return self._set_state(target_object, SimObjFixedProp.OPENABLE, isOpen=True, openness=1.0)
+
+    def _close(self, target_object: SimObjMetadata) -> str | None:
+        return self._set_state(target_object, SimObjFixedProp.OPENABLE, isOpen=False, openness=0.0)
+
+    def _toggle_on(self, target_object: SimObjMetadata) -> str | None:
+        return self._set_state(target_object, SimObjFixedProp.TOGGLEABLE, isToggled=True)
+
+    def _toggle_off(self, target_object: SimObjMetadata) -> str | None:
+        return self._set_state(target_object, SimObjFixedProp.TOGGLEABLE, isToggled=False)
+
+    def _dirty(self, target_object: SimObjMetadata) -> str | None:
+        return self._set_state(target_object, SimObjFixedProp.DIRTYABLE, isDirty=True)
+
+    def _clean(self, target_object: SimObjMetadata) -> str | None:
+        return self._set_state(target_object, SimObjFixedProp.DIRTYABLE, isDirty=False)
+
+
+# %% === Backends registry ===
+def create_ai2thor_controller(config: EnvConfig) -> Controller:
+    """
+    Initialize the AI2THOR controller.
+
+    Args:
+        config (EnvConfig): Environment config.
+
+    Returns:
+        controller (Controller): AI2THOR controller.
+    """
+    # Hardcoded parameters
+    controller_parameters = {
+        "agentMode": "default",
+        "snapToGrid": False,
+        "rotateStepDegrees": config.action_discrete_param_values.rotation_degrees,
+        "gridSize": config.action_discrete_param_values.movement_magnitude,
+    }
+    # Parameters from the config
+    controller_parameters.update(config.controller_parameters.get_controller_parameters())
+    # The additional frames are only rendered when they are observed
+    controller_parameters.update({
+        "renderDepthImage": config.observation.depth,
+        "renderInstanceSegmentation": config.observation.instance_segmentation,
+    })
+    controller_parameters.update(config.controller_backend_parameters)
+
+    return Controller(**controller_parameters)
+
+
+type ControllerFactory = Callable[[EnvConfig], Controller | OfflineController]
+
+CONTROLLER_BACKENDS: dict[str, ControllerFactory] = {
+    "ai2thor": create_ai2thor_controller,
+    "replay": ReplayController.from_config,
+    "synthetic": SyntheticController.from_config,
+}
+
+
+def register_controller_backend(name: str, factory: ControllerFactory) -> None:
+    """
+    Register a controller backend, that can then be selected in the environment config.
+
+    Args:
+        name (str): Name of the backend in the `controller_backend` option of the config.
+        factory (ControllerFactory): Function creating the controller from the environment config.
+    """
+    CONTROLLER_BACKENDS[name] = factory
+
+
+def create_controller(config: EnvConfig) -> Controller | OfflineController:
+    """
+    Create the controller of the backend selected in the environment config.
+
+    Args:
+        config (EnvConfig): Environment config.
+
+    Returns:
+        controller (Controller | OfflineController): Controller of the environment.
+    """
+    factory = CONTROLLER_BACKENDS.get(config.controller_backend)
+    if factory is None:
+        raise UnknownControllerBackendError(config.controller_backend)
+    return factory(config)
+
+
+# %% === Controller pool ===
+class SceneSnapshot:
+    """
+    Initial state of a scene, restored with actions instead of reloading the scene.
+
+    The restored state consists of the poses of the pickupable and moveable objects (with
+    `SetObjectPoses`), the pose of the agent, and the openness, toggle, dirty and liquid states of
+    the objects. Slicing, breaking, cooking and using up objects can't be undone, so a scene where
+    one of these happened can't be restored.
+    """
+
+    def __init__(self, event: Event) -> None:
+        """
+        Take the snapshot of the scene in the state of the event.
+
+        Args:
+            event (Event): Event of the initial state of the scene.
+        """
+        self.scene_name: str = event.metadata["sceneName"]
+        self.agent_metadata: dict[str, Any] = event.metadata["agent"]
+        self.objects: dict[SimObjId, SimObjMetadata] = {
+            obj_metadata[SimObjFixedProp.OBJECT_ID]: obj_metadata for obj_metadata in event.metadata["objects"]
+        }
+
+    def get_restoration_actions(self, event: Event) -> list[dict[str, Any]] | None:
+        """
+        Return the actions restoring the snapshot from the state of the event.
+
+        Args:
+            event (Event): Event of the current state of the scene.
+
+        Returns:
+            restoration_actions (list[dict[str, Any]] | None): Actions to perform to restore the
+                snapshot, or None if the snapshot can't be restored from this state.
+        """
+        current_objects = {
+            obj_metadata[SimObjFixedProp.OBJECT_ID]: obj_metadata for obj_metadata in event.metadata["objects"]
+        }
+        if event.metadata["sceneName"] != self.scene_name or current_objects.keys() != self.objects.keys():
+            return None
+
+        restoration_actions = []
+        if event.metadata["inventoryObjects"]:
+            restoration_actions.append({"action": Ai2thorAction.DROP_HAND_OBJECT, "forceAction": True})
+        if event.metadata["inventoryObjects"] or any(
+            not _are_poses_close(obj_metadata, current_objects[obj_id])
+            for obj_id, obj_metadata in self.objects.items()
+            if obj_metadata[SimObjFixedProp.PICKUPABLE] or obj_metadata[SimObjFixedProp.MOVEABLE]
+        ):
+            restoration_actions.append({
+                "action": "SetObjectPoses",
+                "objectPoses": [
+                    {
+                        "objectName": obj_metadata["name"],
+                        "position": obj_metadata[SimObjVariableProp.POSITION],
+                        "rotation": obj_metadata["rotation"],
+                    }
+                    for obj_metadata in self.objects.values()
+                    if obj_metadata[SimObjFixedProp.PICKUPABLE] or obj_metadata[SimObjFixedProp.MOVEABLE]
+                ],
+            })
+
+        for obj_id, obj_metadata in self.objects.items():
+            current_metadata = current_objects[obj_id]
+            if any(current_metadata[prop] != obj_metadata[prop] for prop in IRREVERSIBLE_PROPERTIES):
+                return None
+            restoration_actions.extend(
+                {"action": action, "objectId": obj_id, "forceAction": True, **action_args}
+                for action, action_args in _get_state_restoration_actions(obj_metadata, current_metadata)
+            )
+
+        agent_metadata = event.metadata["agent"]
+        if any(agent_metadata[key] != self.agent_metadata[key] for key in ("position", "rotation", "cameraHorizon")):
+            restoration_actions.append({
+                "action": "TeleportFull",
+                "position": self.agent_metadata["position"],
+                "rotation": self.agent_metadata["rotation"],
+                "horizon": self.agent_metadata["cameraHorizon"],
+                "standing": self.agent_metadata["isStanding"],
+                "forceAction": True,
+            })
+        return restoration_actions
+
+    def restore(self, controller: Controller | OfflineController) -> bool:
+        """
+        Restore the snapshot in the scene loaded by the controller.
+
+        Args:
+            controller (Controller | OfflineController): Controller whose scene is the scene of the
+                snapshot.
+
+        Returns:
+            restored (bool): Whether the snapshot was restored; if not, the scene has to be
+                reloaded.
+        """
+        restoration_actions = self.get_restoration_actions(controller.last_event)  # type: ignore
+        if restoration_actions is None:
+            return False
+        return all(controller.step(action=action) for action in restoration_actions)
+
+
+IRREVERSIBLE_PROPERTIES = (
+    SimObjVariableProp.IS_SLICED,
+    SimObjVariableProp.IS_BROKEN,
+    SimObjVariableProp.IS_COOKED,
+    SimObjVariableProp.IS_USED_UP,
+)
+
+
+def _are_poses_close(obj_metadata: SimObjMetadata, other_metadata: SimObjMetadata, tolerance: float = 1e-3) -> bool:
+    """
+    Return whether the two objects metadata have the same position and rotation, up to a tolerance.
+
+    Args:
+        obj_metadata (SimObjMetadata): Metadata of the first object.
+        other_metadata (SimObjMetadata): Metadata of the second object.
+        tolerance (float): Absolute tolerance on the coordinates. Defaults to 1e-3.
+
+    Returns:
+        are_close (bool): Whether the poses of the objects are close.
+    """
+    if other_metadata[SimObjVariableProp.IS_PICKED_UP]:
+        return False
+    return all(
+        math.isclose(obj_metadata[key][axis], other_metadata[key][axis], abs_tol=tolerance)
+        for key in (SimObjVariableProp.POSITION, "rotation")
+        for axis in ("x", "y", "z")
+    )
+
+
+def _get_state_restoration_actions(
+    obj_metadata: SimObjMetadata, current_metadata: SimObjMetadata
+) -> list[tuple[str, dict[str, Any]]]:
+    """
+    Return the actions restoring the openness, toggle, dirty and liquid states of an object.
+
+    Args:
+        obj_metadata (SimObjMetadata): Metadata of the object in the snapshot.
+        current_metadata (SimObjMetadata): Current metadata of the object.
+
+    Returns:
+        state_restoration_actions (list[tuple[str, dict[str, Any]]]): Names and arguments of the
+            actions to perform on the object.
+    """
+    actions = []
+    if obj_metadata[SimObjFixedProp.OPENABLE] and not math.isclose(
+        obj_metadata[SimObjVariableProp.OPENNESS], current_metadata[SimObjVariableProp.OPENNESS], abs_tol=1e-3
+    ):
+        if obj_metadata[SimObjVariableProp.IS_OPEN]:
+            actions.append((Ai2thorAction.OPEN_OBJECT, {"openness": obj_metadata[SimObjVariableProp.OPENNESS]}))
+        else:
+            actions.append((Ai2thorAction.CLOSE_OBJECT, {}))
+    if obj_metadata[SimObjVariableProp.IS_TOGGLED] != current_metadata[SimObjVariableProp.IS_TOGGLED]:
+        toggle_action = (
+            Ai2thorAction.TOGGLE_OBJECT_ON
+            if obj_metadata[SimObjVariableProp.IS_TOGGLED]
+            else Ai2thorAction.TOGGLE_OBJECT_OFF
+        )
+        actions.append((toggle_action, {}))
+    if obj_metadata[SimObjVariableProp.IS_DIRTY] != current_metadata[SimObjVariableProp.IS_DIRTY]:
+        dirty_action = (
+            Ai2thorAction.DIRTY_OBJECT if obj_metadata[SimObjVariableProp.IS_DIRTY] else Ai2thorAction.CLEAN_OBJECT
+        )
+        actions.append((dirty_action, {}))
+    if (
+        obj_metadata[SimObjVariableProp.IS_FILLED_WITH_LIQUID]
+        != current_metadata[SimObjVariableProp.IS_FILLED_WITH_LIQUID]
+        or obj_metadata[SimObjVariableProp.FILL_LIQUID] != current_metadata[SimObjVariableProp.FILL_LIQUID]
+    ):
+        if obj_metadata[SimObjVariableProp.IS_FILLED_WITH_LIQUID]:
+            actions.append((
+                Ai2thorAction.FILL_OBJECT_WITH_LIQUID,
+                {"fillLiquid": obj_metadata[SimObjVariableProp.FILL_LIQUID]},
+            ))
+        else:
+            actions.append((Ai2thorAction.EMPTY_LIQUID_FROM_OBJECT, {}))
+    return actions
+
+
+class ControllerPool:
+    """
+    Pool of controllers keeping the recently loaded scenes, in least recently used order.
+
+    Each controller of the pool keeps the scene it loaded last, with a snapshot of the initial
+    state of the scene. With warm scene resets, resetting to a scene kept by a controller restores
+    the snapshot with a few actions instead of reloading the scene (a warm reset); otherwise, the
+    scene is loaded by a new controller if the pool is not full, or by the controller of the least
+    recently used scene (a cold reset). The snapshots are taken before the scene randomization,
+    which is applied again after each reset.
+    """
+
+    def __init__(
+        self,
+        controller_factory: Callable[[], Controller | OfflineController],
+        size: int = 1,
+        warm_scene_resets: bool = False,
+    ) -> None:
+        """
+        Create the first controller of the pool.
+
+        Args:
+            controller_factory (Callable[[], Controller | OfflineController]): Function creating a
+                controller of the pool.
+            size (int): Maximum number of controllers, and so of scenes kept loaded. Defaults to 1.
+            warm_scene_resets (bool): Whether to restore the snapshot of the scenes kept loaded
+                instead of reloading them. Defaults to False.
+        """
+        self.controller_factory = controller_factory
+        self.size = size
+        self.warm_scene_resets = warm_scene_resets
+        self.controllers = [controller_factory()]
+        self.active_controller = self.controllers[0]
+        self._loaded_scenes: OrderedDict[SceneId, tuple[Controller | OfflineController, SceneSnapshot]] = OrderedDict()
+
+    @staticmethod
+    def from_config(config: EnvConfig) -> ControllerPool:
+        """
+        Create the controller pool of the environment config.
+
+        Args:
+            config (EnvConfig): Environment config.
+
+        Returns:
+            controller_pool (ControllerPool): Pool of controllers of the backend of the config.
+        """
+        return ControllerPool(
+            functools.partial(create_controller, config),
+            size=config.controller_pool.size,
+            warm_scene_resets=config.controller_pool.warm_scene_resets,
+        )
+
+    @property
+    def loaded_scenes(self) -> list[SceneId]:
+        """Scenes kept loaded by the controllers, from the least to the most recently used."""
+        return list(self._loaded_scenes)
+
+    def reset(self, scene: SceneId) -> tuple[Controller | OfflineController, bool]:
+        """
+        Reset a controller of the pool to the initial state of the scene and make it active.
+
+        Args:
+            scene (SceneId): Scene to reset to.
+
+        Returns:
+            controller (Controller | OfflineController): Controller reset to the scene.
+            is_warm_reset (bool): Whether the scene was restored instead of being reloaded.
+        """
+        loaded_scene = self._loaded_scenes.pop(scene, None)
+        if loaded_scene is not None:
+            controller, snapshot = loaded_scene
+            if self.warm_scene_resets and snapshot.restore(controller):
+                self._loaded_scenes[scene] = loaded_scene
+                self.active_controller = controller
+                return controller, True
+        else:
+            controller = self._get_free_controller()
+
+        controller.reset(scene=scene)
+        self._loaded_scenes[scene] = (controller, SceneSnapshot(controller.last_event))  # type: ignore
+        self.active_controller = controller
+        return controller, False
+
+    def _get_free_controller(self) -> Controller | OfflineController:
+        """
+        Return a controller to load a new scene, creating it or evicting the least recently used scene.
+
+        Returns:
+            controller (Controller | OfflineController): Controller not keeping any scene.
+        """
+        used_controller_ids = {id(controller) for controller, _ in self._loaded_scenes.values()}
+        for controller in self.controllers:
+            if id(controller) not in used_controller_ids:
+                return controller
+        if len(self.controllers) < self.size:
+            controller = self.controller_factory()
+            self.controllers.append(controller)
+            return controller
+        return self._loaded_scenes.popitem(last=False)[1][0]
+
+    def stop(self) -> None:
+        """Stop all the controllers of the pool."""
+        for controller in self.controllers:
+            controller.stop()
+        self._loaded_scenes.clear()
+
+
+# %% === Exceptions ===
+class UnknownControllerBackendError(ValueError):
+    """Exception raised for unknown controller backends in the environment config."""
+
+    def __init__(self, controller_backend: str) -> None:
+        self.controller_backend = controller_backend
+
+    def __str__(self) -> str:
+        return f"Unknown controller backend '{self.controller_backend}' in the environment config. Available backends are {list(CONTROLLER_BACKENDS)}; new backends can be added with register_controller_backend."
+
+
+class ControllerNotResetError(Exception):
+    """Exception raised when an action is performed before the controller is reset to a scene."""
+
+    def __init__(self, controller: OfflineController) -> None:
+        self.controller = controller
+
+    def __str__(self) -> str:
+        return f"{self.controller.__class__.__name__} must be reset to a scene before performing actions."
+
+
+class NoRecordedEpisodeError(ValueError):
+    """Exception raised when the replay controller is reset to a scene without recorded episode."""
+
+    def __init__(self, scene_id: SceneId, data_dir: Path) -> None:
+        self.scene_id = scene_id
+        self.data_dir = data_dir
+
+    def __str__(self) -> str:
+        return f"No recorded episode of scene {self.scene_id} in {self.data_dir}."
+
+
+class NoMetadataSampleError(ValueError):
+    """Exception raised when the synthetic controller is reset to a scene without metadata sample."""
+
+    def __init__(self, scene_id: SceneId, metadata_dir: Path) -> None:
+        self.scene_id = scene_id
+        self.metadata_dir = metadata_dir
+
+    def __str__(self) -> str:
+        return f"No objects metadata sample of scene {self.scene_id} in {self.metadata_dir}."
@@ -0,0 +1,300 @@
+"""
+Processing of the frames of the events into the frame observations of RL-THOR environments.
+
+The frames are center cropped, downsampled, converted to grayscale and stacked with NumPy inside
+the environment, so that only the final observations leave the environment (e.g. through the pipes
+and shared memory of the vectorized environments).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from rl_thor.envs.sim_objects import SimObjVariableProp
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from rl_thor.envs._config import ObservationConfig
+    from rl_thor.envs.scene_object_table import SceneObjectTable
+    from rl_thor.envs.sim_objects import SimObjId
+
+
+# ITU-R BT.601 luma weights, scaled by 256 to compute the grayscale frames with integers
+GRAYSCALE_WEIGHTS = np.array([77, 150, 29], dtype=np.uint16)
+# Features of each object in the object state observation, after the presence flag and the position
+OBJECT_STATE_FLAGS = (SimObjVariableProp.IS_OPEN, SimObjVariableProp.IS_TOGGLED, SimObjVariableProp.IS_PICKED_UP)
+NB_OBJECT_STATE_FEATURES = 4 + len(OBJECT_STATE_FLAGS)
+
+
+class FrameProcessor:
+    """
+    Processor writing the frames of the events in a buffer in the layout of the observation space.
+
+    The frames are center cropped, downsampled by nearest neighbor sampling and converted to
+    grayscale if configured. With frame stacking, the frames are stacked along the channel axis,
+    from the oldest to the newest.
+
+    Each frame is written in the buffer of the processor and the observations are read-only views
+    of the buffer, valid until the next processed frame: they have to be copied to be kept. Each
+    episode gets a new buffer, so that the last observation of an episode (e.g. the terminal
+    observation of a vectorized environment) is not overwritten by the reset. The stacked frames are kept in a ring buffer where each frame is written twice, so that the
+    stack is always a view of consecutive slots. Without any transform, stacking or channel first
+    layout, the observations are read-only views of the frames themselves.
+    """
+
+    def __init__(self, config: ObservationConfig, frame_height: int, frame_width: int) -> None:
+        """
+        Initialize the transforms and allocate the buffer.
+
+        Args:
+            config (ObservationConfig): Observation configuration of the environment.
+            frame_height (int): Height of the frames of the controller.
+            frame_width (int): Width of the frames of the controller.
+        """
+        self.channel_first = config.channel_first
+        self.frame_stack = config.frame_stack
+        self.grayscale = config.grayscale
+        if self.frame_stack < 1:
+            raise InvalidObservationConfigError("frame_stack", self.frame_stack)
+
+        # === Center crop ===
+        crop_height, crop_width = (frame_height, frame_width) if config.center_crop is None else config.center_crop
+        if not (0 < crop_height <= frame_height and 0 < crop_width <= frame_width):
+            raise InvalidObservationConfigError("center_crop", config.center_crop)
+        top, left = (frame_height - crop_height) // 2, (frame_width - crop_width) // 2
+        self._crop = (slice(top, top + crop_height), slice(left, left + crop_width))
+
+        # === Resize ===
+        height = crop_height if config.frame_height is None else config.frame_height
+        width = crop_width if config.frame_width is None else config.frame_width
+        if height <= 0 or width <= 0:
+            raise InvalidObservationConfigError("frame_height/frame_width", (height, width))
+        self._resize_indices = (
+            None
+            if (height, width) == (crop_height, crop_width)
+            else (
+                (np.arange(height) * crop_height // height)[:, np.newaxis],
+                np.arange(width) * crop_width // width,
+            )
+        )
+
+        # === Layout ===
+        nb_channels = 1 if self.grayscale else 3
+        self.frame_shape = (nb_channels, height, width) if self.channel_first else (height, width, nb_channels)
+        self.observation_shape = (
+            (self.frame_stack * nb_channels, height, width)
+            if self.channel_first
+            else (height, width, self.frame_stack * nb_channels)
+        )
+        self.resolution = (height, width)
+        self._is_identity = (
+            self._resize_indices is None
+            and config.center_crop is None
+            and not self.grayscale
+            and not self.channel_first
+            and self.frame_stack == 1
+        )
+        # Ring buffer of 2 * frame_stack frames, with the stack axis just before the channel axis
+        nb_slots = 2 * self.frame_stack if self.frame_stack > 1 else 1
+        buffer_shape = (
+            (nb_slots, nb_channels, height, width) if self.channel_first else (height, width, nb_slots, nb_channels)
+        )
+        self._buffer = np.empty(buffer_shape, dtype=np.uint8)
+        self._slot = 0
+
+        # === Type Annotations ===
+        self.channel_first: bool
+        self.frame_stack: int
+        self.grayscale: bool
+        self.resolution: tuple[int, int]
+        self.frame_shape: tuple[int, int, int]
+        self.observation_shape: tuple[int, int, int]
+        self._crop: tuple[slice, slice]
+        self._resize_indices: tuple[NDArray[np.intp], NDArray[np.intp]] | None
+        self._is_identity: bool
+        self._buffer: NDArray[np.uint8]
+        self._slot: int
+
+    def _crop_and_resize[T: np.generic](self, frame: NDArray[T]) -> NDArray[T]:
+        """
+        Center crop and resize the frame.
+
+        Args:
+            frame (NDArray[T]): Frame of the event, with the height and width as first axes.
+
+        Returns:
+            resized_frame (NDArray[T]): Cropped and resized frame, possibly a view of the frame.
+        """
+        frame = frame[self._crop]
+        if self._resize_indices is not None:
+            frame = frame[self._resize_indices]
+        return frame
+
+    def _transform(self, frame: NDArray[np.uint8]) -> NDArray[np.uint8]:
+        """
+        Crop, resize and convert the frame to grayscale, in the layout of the observations.
+
+        Args:
+            frame (NDArray[np.uint8]): Frame of the event, in (height, width, channels) layout.
+
+        Returns:
+            transformed_frame (NDArray[np.uint8]): Transformed frame, possibly a view of the frame.
+        """
+        frame = self._crop_and_resize(frame)
+        if self.grayscale:
+            frame = ((frame @ GRAYSCALE_WEIGHTS) >> 8).astype(np.uint8)[..., np.newaxis]
+        if self.channel_first:
+            frame = np.moveaxis(frame, -1, 0)
+        return frame
+
+    def get_auxiliary_frame_shape(self, nb_channels: int) -> tuple[int, int, int]:
+        """
+        Return the shape of the observations of an auxiliary frame (e.g. depth frame).
+
+        Args:
+            nb_channels (int): Number of channels of the auxiliary frame.
+
+        Returns:
+            auxiliary_frame_shape (tuple[int, int, int]): Shape of the auxiliary frame observations.
+        """
+        return (nb_channels, *self.resolution) if self.channel_first else (*self.resolution, nb_channels)
+
+    def process_auxiliary_frame[T: np.generic](self, frame: NDArray[T]) -> NDArray[T]:
+        """
+        Return the observation of an auxiliary frame of the event (e.g. depth frame).
+
+        The auxiliary frames are center cropped and resized like the frames, but neither
+        converted to grayscale nor stacked. The observation is a new read-only array.
+
+        Args:
+            frame (NDArray[T]): Auxiliary frame, in (height, width) or (height, width, channels)
+                layout.
+
+        Returns:
+            auxiliary_frame_observation (NDArray[T]): Read-only auxiliary frame observation.
+        """
+        frame = self._crop_and_resize(frame)
+        if frame.ndim == 2:  # noqa: PLR2004
+            frame = frame[..., np.newaxis]
+        if self.channel_first:
+            frame = np.moveaxis(frame, -1, 0)
+        auxiliary_frame_observation = np.array(frame, order="C")
+        auxiliary_frame_observation.flags.writeable = False
+        return auxiliary_frame_observation
+
+    def _slot_view(self, slot: int) -> NDArray[np.uint8]:
+        """
+        Return the view of the given slot of the buffer, in the shape of a single frame.
+
+        Args:
+            slot (int): Slot of the buffer.
+
+        Returns:
+            slot_view (NDArray[np.uint8]): View of the slot.
+        """
+        return self._buffer[slot] if self.channel_first else self._buffer[:, :, slot]
+
+    def _stack_view(self) -> NDArray[np.uint8]:
+        """
+        Return the read-only view of the stacked frames, in the shape of the observations.
+
+        Returns:
+            stack_view (NDArray[np.uint8]): Read-only view of the stacked frames.
+        """
+        # The slots after the current one contain the previous frames, followed by the current one
+        start = (self._slot + 1) % self.frame_stack if self.frame_stack > 1 else 0
+        stack_slots = slice(start, start + self.frame_stack)
+        stack = self._buffer[stack_slots] if self.channel_first else self._buffer[:, :, stack_slots]
+        stack_view = stack.reshape(self.observation_shape)
+        stack_view.flags.writeable = False
+        return stack_view
+
+    def reset(self, frame: NDArray[np.uint8]) -> NDArray[np.uint8]:
+        """
+        Return the observation of the first frame of an episode, repeated to fill the frame stack.
+
+        Args:
+            frame (NDArray[np.uint8]): First frame of the episode, in (height, width, channels)
+                layout.
+
+        Returns:
+            frame_observation (NDArray[np.uint8]): Read-only view of the frame observation.
+        """
+        if self._is_identity:
+            return self.process(frame)
+        transformed_frame = self._transform(frame)
+        # The last observation of the previous episode is a view of the previous buffer
+        self._buffer = np.empty_like(self._buffer)
+        for slot in range(len(self._buffer) if self.channel_first else self._buffer.shape[2]):
+            np.copyto(self._slot_view(slot), transformed_frame)
+        self._slot = 0
+        return self._stack_view()
+
+    def process(self, frame: NDArray[np.uint8]) -> NDArray[np.uint8]:
+        """
+        Return the observation of a new frame of the episode.
+
+        Args:
+            frame (NDArray[np.uint8]): New frame, in (height, width, channels) layout.
+
+        Returns:
+            frame_observation (NDArray[np.uint8]): Read-only view of the frame observation.
+        """
+        if self._is_identity:
+            frame_observation = frame.view()
+            frame_observation.flags.writeable = False
+            return frame_observation
+        transformed_frame = self._transform(frame)
+        if self.frame_stack > 1:
+            self._slot = (self._slot + 1) % self.frame_stack
+            np.copyto(self._slot_view(self._slot + self.frame_stack), transformed_frame)
+        np.copyto(self._slot_view(self._slot), transformed_frame)
+        return self._stack_view()
+
+
+def compute_object_state(
+    scene_object_table: SceneObjectTable, object_ids: list[SimObjId], nb_rows: int
+) -> NDArray[np.float32]:
+    """
+    Return the state vectors of the given objects, padded with zeros to the given number of rows.
+
+    The state of an object is [present, x, y, z, isOpen, isToggled, isPickedUp]. The objects
+    that are not in the scene anymore (e.g. sliced objects) have zero vectors, and the objects
+    after the given number of rows are ignored.
+
+    Args:
+        scene_object_table (SceneObjectTable): Scene object table of the event.
+        object_ids (list[SimObjId]): Ids of the objects, in the order of the rows.
+        nb_rows (int): Number of rows of the object state.
+
+    Returns:
+        object_state (NDArray[np.float32]): Array of shape (nb_rows, NB_OBJECT_STATE_FEATURES).
+    """
+    object_state = np.zeros((nb_rows, NB_OBJECT_STATE_FEATURES), dtype=np.float32)
+    row_index = scene_object_table.row_index
+    present_rows = [
+        (state_row, row_index[obj_id]) for state_row, obj_id in enumerate(object_ids[:nb_rows]) if obj_id in row_index
+    ]
+    if not present_rows:
+        return object_state
+    state_rows, table_rows = np.array(present_rows).T
+    object_state[state_rows, 0] = 1
+    object_state[state_rows, 1:4] = scene_object_table.positions[table_rows]
+    for feature_idx, flag in enumerate(OBJECT_STATE_FLAGS, start=4):
+        object_state[state_rows, feature_idx] = scene_object_table.column(flag)[table_rows]
+    return object_state
+
+
+# %% === Exceptions ===
+class InvalidObservationConfigError(ValueError):
+    """Exception raised when a value of the observation configuration is invalid."""
+
+    def __init__(self, parameter: str, value: object) -> None:
+        self.parameter = parameter
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"Invalid value {self.value} for the observation parameter '{self.parameter}'."
@@ -0,0 +1,436 @@
+"""
+Profiling hooks of RL-THOR environments.
+
+The environment, the tasks and the items report named spans (timed sections of a step) and
+counters through the module-level `span` and `count` hooks. The hooks record in the profiler
+activated in the current thread, and do nothing when no profiler is active, so that the
+instrumentation costs a thread-local attribute lookup when profiling is disabled.
+
+Each step of a profiled environment gives a breakdown of the time spent in each span and of the
+counters of the step, added to the step info and written to the sink of the profiler if any. The
+spans are also aggregated in histograms over the lifetime of the profiler.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import csv
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from rl_thor.envs._config import ProfilingConfig
+
+
+# %% === Constants ===
+class SpanName(StrEnum):
+    """Names of the spans recorded by the environment, the tasks and the items."""
+
+    IDENTIFY_TARGET_OBJECT = "identify_target_object"
+    CONTROLLER_STEP = "controller_step"
+    SCENE_OBJECT_TABLE = "scene_object_table"
+    REWARD = "reward"
+    UPDATE_CANDIDATES_DATA = "update_candidates_data"
+    UPDATE_AUXILIARY_ITEMS = "update_auxiliary_items"
+    COMPUTE_INTERESTING_ASSIGNMENTS = "compute_interesting_assignments"
+    SEARCH_BEST_ASSIGNMENT = "search_best_assignment"
+    OBSERVATION = "observation"
+    BUILD_INFO = "build_info"
+
+
+class CounterName(StrEnum):
+    """Names of the counters recorded by the tasks and the items."""
+
+    CANDIDATES_SCORED = "candidates_scored"
+    ASSIGNMENTS_ENUMERATED = "assignments_enumerated"
+    ASSIGNMENTS_PRUNED = "assignments_pruned"
+    GLOBAL_ASSIGNMENTS = "global_assignments"
+
+
+SPAN_NAMES = tuple(SpanName)
+COUNTER_NAMES = tuple(CounterName)
+# Upper edges of the buckets of the span histograms, from 1 us to ~8 s (the last bucket is unbounded)
+HISTOGRAM_BUCKET_EDGES = tuple(1e-6 * 2**exponent for exponent in range(24))
+
+
+# %% === Hooks ===
+class _ProfilerState(threading.local):
+    """Profiler activated in the current thread."""
+
+    profiler: StepProfiler | None = None
+
+
+_state = _ProfilerState()
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def span(name: str) -> contextlib.AbstractContextManager[Any]:
+    """
+    Return a context manager timing a span in the profiler of the current thread.
+
+    Args:
+        name (str): Name of the span.
+
+    Returns:
+        span_context (contextlib.AbstractContextManager[Any]): Context manager recording the span,
+            or a shared no-op context manager if no profiler is active.
+    """
+    profiler = _state.profiler
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name)
+
+
+def count(name: str, value: int = 1) -> None:
+    """
+    Increment a counter of the profiler of the current thread, if any.
+
+    Args:
+        name (str): Name of the counter.
+        value (int): Value to add to the counter. Defaults to 1.
+    """
+    profiler = _state.profiler
+    if profiler is not None:
+        profiler.count(name, value)
+
+
+def is_profiling() -> bool:
+    """
+    Return True if a profiler is active in the current thread.
+
+    Used to skip computing the values of the counters when profiling is disabled.
+
+    Returns:
+        is_profiling (bool): Whether a profiler is active in the current thread.
+    """
+    return _state.profiler is not None
+
+
+@contextlib.contextmanager
+def activate(profiler: StepProfiler | None) -> Generator[None]:
+    """
+    Activate the profiler in the current thread for the duration of the context.
+
+    Args:
+        profiler (StepProfiler | None): Profiler to activate, or None to leave the hooks as they
+            are.
+    """
+    if profiler is None:
+        yield
+        return
+    previous_profiler = _state.profiler
+    _state.profiler = profiler
+    try:
+        yield
+    finally:
+        _state.profiler = previous_profiler
+
+
+# %% === Histograms ===
+class SpanHistogram:
+    """Histogram of the durations of a span, with logarithmic buckets (see HISTOGRAM_BUCKET_EDGES)."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.bucket_counts = [0] * (len(HISTOGRAM_BUCKET_EDGES) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+        # === Type Annotations ===
+        self.bucket_counts: list[int]
+        self.count: int
+        self.total: float
+        self.min: float
+        self.max: float
+
+    def add(self, duration: float) -> None:
+        """
+        Add a duration to the histogram.
+
+        Args:
+            duration (float): Duration of the span, in seconds.
+        """
+        self.bucket_counts[bisect.bisect_left(HISTOGRAM_BUCKET_EDGES, duration)] += 1
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+    def quantile(self, q: float) -> float:
+        """
+        Return an upper estimate of the quantile of the durations, from the bucket edges.
+
+        Args:
+            q (float): Quantile, between 0 and 1.
+
+        Returns:
+            quantile (float): Upper edge of the bucket containing the quantile, bounded by the
+                maximum duration; 0 if the histogram is empty.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative_count = 0
+        for bucket_idx, bucket_count in enumerate(self.bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank and bucket_count:
+                if bucket_idx == len(HISTOGRAM_BUCKET_EDGES):
+                    return self.max
+                return min(HISTOGRAM_BUCKET_EDGES[bucket_idx], self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float | int]:
+        """
+        Return the statistics of the histogram.
+
+        Returns:
+            summary (dict[str, float | int]): Count, total, mean, min, max and estimated p50, p90
+                and p99 of the durations, in seconds.
+        """
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+# %% === Sinks ===
+class ProfilingSink(ABC):
+    """Base class for the sinks receiving the breakdown of each profiled step."""
+
+    @abstractmethod
+    def write(self, record: dict[str, Any]) -> None:
+        """
+        Write the breakdown of a step.
+
+        Args:
+            record (dict[str, Any]): Breakdown of the step (see StepProfiler.end_step).
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Close the sink; does nothing by default."""
+
+
+class _FileProfilingSink(ProfilingSink, ABC):
+    """Base class for the sinks writing the breakdowns in a file."""
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Open the file of the sink.
+
+        Args:
+            path (str | Path): Path of the file, overwritten if it exists.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", newline="", encoding="utf-8")
+
+        # === Type Annotations ===
+        self.path: Path
+        self._file: TextIO
+
+    def close(self) -> None:
+        """Close the file of the sink."""
+        self._file.close()
+
+
+class JsonlProfilingSink(_FileProfilingSink):
+    """Sink writing the breakdown of each step as a JSON line."""
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write the breakdown of a step as a JSON line."""
+        self._file.write(json.dumps(record) + "\n")
+
+
+class CsvProfilingSink(_FileProfilingSink):
+    """
+    Sink writing the breakdown of each step as a CSV row.
+
+    The columns are the episode step, the spans and the counters recorded by RL-THOR (see
+    SPAN_NAMES and COUNTER_NAMES); the spans and counters that are not recorded during a step are
+    0 and the custom ones are ignored.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        Open the file of the sink and write the header.
+
+        Args:
+            path (str | Path): Path of the file, overwritten if it exists.
+        """
+        super().__init__(path)
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=["episode_step", *SPAN_NAMES, *COUNTER_NAMES], restval=0, extrasaction="ignore"
+        )
+        self._writer.writeheader()
+
+        # === Type Annotations ===
+        self._writer: csv.DictWriter
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Write the breakdown of a step as a CSV row."""
+        self._writer.writerow({"episode_step": record["episode_step"], **record["spans"], **record["counters"]})
+
+
+# %% === Profiler ===
+class StepProfiler:
+    """
+    Profiler recording the spans and counters of the steps of an environment.
+
+    The spans and counters are accumulated until the end of the step, then aggregated in the
+    histograms of the profiler and written to its sink. In pipelined reward mode, the spans of the
+    reward computation of a step are recorded by the reward thread and are part of the breakdown
+    of the step ending after them.
+    """
+
+    def __init__(self, sink: ProfilingSink | None = None) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            sink (ProfilingSink | None): Sink receiving the breakdown of each step. Defaults to
+                None.
+        """
+        self.sink = sink
+        self.histograms: dict[str, SpanHistogram] = {}
+        self.counter_totals: dict[str, int] = {}
+        self._step_spans: dict[str, float] = {}
+        self._step_counters: dict[str, int] = {}
+        # The reward thread records spans concurrently with the main thread in pipelined mode
+        self._lock = threading.Lock()
+
+        # === Type Annotations ===
+        self.sink: ProfilingSink | None
+        self.histograms: dict[str, SpanHistogram]
+        self.counter_totals: dict[str, int]
+        self._step_spans: dict[str, float]
+        self._step_counters: dict[str, int]
+        self._lock: threading.Lock
+
+    @classmethod
+    def from_config(cls, config: ProfilingConfig) -> StepProfiler | None:
+        """
+        Return the profiler of the configuration, or None if profiling is disabled.
+
+        Args:
+            config (ProfilingConfig): Profiling configuration of the environment.
+
+        Returns:
+            profiler (StepProfiler | None): Profiler writing in the configured sink.
+        """
+        if not config.enabled:
+            return None
+        sink: ProfilingSink | None = None
+        if config.sink is not None:
+            if config.sink_path is None:
+                raise MissingProfilingSinkPathError(config.sink)
+            sink = (CsvProfilingSink if config.sink == "csv" else JsonlProfilingSink)(config.sink_path)
+        return cls(sink)
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Generator[None]:
+        """
+        Time the context as a span of the current step.
+
+        Args:
+            name (str): Name of the span.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - start_time)
+
+    def record_span(self, name: str, duration: float) -> None:
+        """
+        Add the duration of a span to the current step.
+
+        Args:
+            name (str): Name of the span.
+            duration (float): Duration of the span, in seconds.
+        """
+        with self._lock:
+            self._step_spans[name] = self._step_spans.get(name, 0.0) + duration
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter of the current step.
+
+        Args:
+            name (str): Name of the counter.
+            value (int): Value to add to the counter. Defaults to 1.
+        """
+        with self._lock:
+            self._step_counters[name] = self._step_counters.get(name, 0) + value
+
+    def end_step(self, episode_step: int) -> dict[str, Any]:
+        """
+        End the current step and return its breakdown.
+
+        The total duration of each span during the step is added to its histogram.
+
+        Args:
+            episode_step (int): Step of the episode.
+
+        Returns:
+            breakdown (dict[str, Any]): Episode step, total duration of each span (in seconds) and
+                value of each counter during the step.
+        """
+        with self._lock:
+            step_spans, self._step_spans = self._step_spans, {}
+            step_counters, self._step_counters = self._step_counters, {}
+        for name, duration in step_spans.items():
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = SpanHistogram()
+            histogram.add(duration)
+        for name, value in step_counters.items():
+            self.counter_totals[name] = self.counter_totals.get(name, 0) + value
+        breakdown = {"episode_step": episode_step, "spans": step_spans, "counters": step_counters}
+        if self.sink is not None:
+            self.sink.write(breakdown)
+        return breakdown
+
+    def summary(self) -> dict[str, Any]:
+        """
+        Return the statistics of the spans and the totals of the counters since the creation of the profiler.
+
+        Returns:
+            summary (dict[str, Any]): Statistics of the histogram of each span (per step) and
+                total of each counter.
+        """
+        return {
+            "spans": {name: histogram.summary() for name, histogram in self.histograms.items()},
+            "counters": dict(self.counter_totals),
+        }
+
+    def close(self) -> None:
+        """Close the sink of the profiler."""
+        if self.sink is not None:
+            self.sink.close()
+
+
+# %% === Exceptions ===
+class MissingProfilingSinkPathError(ValueError):
+    """Exception raised when a profiling sink is configured without a path."""
+
+    def __init__(self, sink: str) -> None:
+        self.sink = sink
+
+    def __str__(self) -> str:
+        return f"The '{self.sink}' profiling sink requires a sink_path in the profiling configuration."
@@ -6,16 +6,119 @@ TODO: Finish module docstring.
 
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Iterator
 
     from ai2thor.controller import Controller
     from ai2thor.server import Event
 
+    from rl_thor.envs.scene_object_table import SceneObjectTable
 
+
+# %% === Information ===
+class LazyInfoDict(Mapping[str, Any]):
+    """
+    Read-only information dictionary whose expensive entries are computed on first access.
+
+    The lazy entries are computed from the state of their task at the time of the access, so they
+    have to be read before the next step of the environment (or evaluated with `evaluate_all`);
+    the tasks raise an error when they are read later. Pickling the dictionary evaluates every
+    entry and gives a plain dictionary, while copies (e.g. the deep copies of the infos by Stable
+    Baselines3's DummyVecEnv) keep the entries that are not computed yet lazy.
+    """
+
+    __slots__ = ("_lazy_values", "_values")
+
+    def __init__(
+        self,
+        values: dict[str, Any] | None = None,
+        lazy_values: dict[str, Callable[[], Any]] | None = None,
+    ) -> None:
+        """
+        Initialize the already computed entries and the functions computing the lazy ones.
+
+        Args:
+            values (dict[str, Any] | None): Entries of the dictionary that are already computed.
+                Defaults to None.
+            lazy_values (dict[str, Callable[[], Any]] | None): Dictionary mapping the keys of the
+                lazy entries to the functions computing their value. Defaults to None.
+        """
+        self._values = {} if values is None else values
+        self._lazy_values = {} if lazy_values is None else lazy_values
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            compute_value = self._lazy_values.pop(key)
+        value = self._values[key] = compute_value()
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._values
+        # The lazy entries are moved to the values when they are read during the iteration
+        yield from tuple(self._lazy_values)
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._lazy_values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or key in self._lazy_values
+
+    def __reduce__(self) -> tuple[type[dict], tuple[dict[str, Any]]]:
+        return dict, (self.evaluate_all(),)
+
+    def __copy__(self) -> LazyInfoDict:
+        return LazyInfoDict(dict(self._values), dict(self._lazy_values))
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> LazyInfoDict:
+        # The functions of the lazy entries are shared with the copy
+        return LazyInfoDict(copy.deepcopy(self._values, memo), dict(self._lazy_values))
+
+    def __repr__(self) -> str:
+        return f"LazyInfoDict({self._values}, lazy_keys={list(self._lazy_values)})"
+
+    def is_evaluated(self, key: str) -> bool:
+        """
+        Return True if the value of the entry is already computed.
+
+        Args:
+            key (str): Key of the entry.
+
+        Returns:
+            is_evaluated (bool): Whether the value of the entry is already computed.
+        """
+        return key in self._values
+
+    def evaluate_all(self) -> dict[str, Any]:
+        """
+        Compute every lazy entry and return the information as a plain dictionary.
+
+        Returns:
+            info (dict[str, Any]): Dictionary containing every entry of the information.
+        """
+        return {key: self[key] for key in list(self)}
+
+    def updated(self, **values: Any) -> LazyInfoDict:
+        """
+        Return a copy of the information with the given entries replaced, without computing the lazy ones.
+
+        Args:
+            **values (Any): Entries to add or replace.
+
+        Returns:
+            info (LazyInfoDict): Copy of the information with the given entries.
+        """
+        lazy_values = {key: compute_value for key, compute_value in self._lazy_values.items() if key not in values}
+        return LazyInfoDict({**self._values, **values}, lazy_values)
+
+
+# %% === Reward handlers ===
 class BaseRewardHandler(ABC):
     """Base class for reward handlers."""
 
@@ -24,6 +127,7 @@ class BaseRewardHandler(ABC):
         self,
         event: Event,
         controller_action: dict[str, Any],
+        scene_object_table: SceneObjectTable | None = None,
     ) -> tuple[float, bool, dict[str, Any]]:
         """
         Return the reward, task completion and additional information for the given event.
@@ -32,6 +136,8 @@ class BaseRewardHandler(ABC):
             event (Event): Event to calculate the reward for.
             controller_action (dict[str, Any]): Dictionary containing the information about the
                 action executed by the controller, obtained with controller.last_action.
+            scene_object_table (SceneObjectTable | None): Scene object table of the event, to avoid
+                indexing the objects of the event again. Defaults to None.
 
         Returns:
             reward (float): Reward for the event.
@@ -72,6 +178,7 @@ class MultiRewardHandler(BaseRewardHandler):
         self,
         event: Event,
         controller_action: dict[str, Any],
+        scene_object_table: SceneObjectTable | None = None,
     ) -> tuple[float, bool, dict[str, dict[str, Any]]]:
         """
         Return the sum of the rewards from the reward handlers.
@@ -80,6 +187,8 @@ class MultiRewardHandler(BaseRewardHandler):
             event (Event): Event to calculate the reward for.
             controller_action (dict[str, Any]): Dictionary containing the information about the
                 action executed by the controller.
+            scene_object_table (SceneObjectTable | None): Scene object table of the event, shared
+                by the reward handlers. Defaults to None.
 
         Returns:
             reward (float): Sum of the rewards from the reward handlers for the event.
@@ -87,7 +196,10 @@ class MultiRewardHandler(BaseRewardHandler):
             info (dict[str, Any]): Additional information about the state of the task.
         """
         rewards, task_completions, infos = zip(
-            *(reward_handler.get_reward(event, controller_action) for reward_handler in self.reward_handlers),
+            *(
+                reward_handler.get_reward(event, controller_action, scene_object_table)
+                for reward_handler in self.reward_handlers
+            ),
             strict=True,
         )
         combined_info = {
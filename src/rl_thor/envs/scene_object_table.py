@@ -0,0 +1,499 @@
+"""
+Scene object table of RL-THOR environment.
+
+The scene object table indexes the objects of an AI2-THOR event once per step and is shared by
+the environment, the reward handlers, the tasks, the item properties and the relations.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from rl_thor.envs.sim_objects import SimObjFixedProp, SimObjId, SimObjMetadata, SimObjVariableProp
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Sequence
+
+    from ai2thor.server import Event
+    from numpy.typing import NDArray
+
+    from rl_thor.envs.sim_objects import SimObjMetadataKey
+
+
+# %% === Constants ===
+BOOLEAN_METADATA_KEYS: frozenset[SimObjMetadataKey] = frozenset({
+    SimObjFixedProp.RECEPTACLE,
+    SimObjFixedProp.TOGGLEABLE,
+    SimObjFixedProp.BREAKABLE,
+    SimObjFixedProp.CAN_FILL_WITH_LIQUID,
+    SimObjFixedProp.DIRTYABLE,
+    SimObjFixedProp.CAN_BE_USED_UP,
+    SimObjFixedProp.COOKABLE,
+    SimObjFixedProp.IS_HEAT_SOURCE,
+    SimObjFixedProp.IS_COLD_SOURCE,
+    SimObjFixedProp.SLICEABLE,
+    SimObjFixedProp.OPENABLE,
+    SimObjFixedProp.PICKUPABLE,
+    SimObjFixedProp.MOVEABLE,
+    SimObjVariableProp.VISIBLE,
+    SimObjVariableProp.IS_INTERACTABLE,
+    SimObjVariableProp.IS_TOGGLED,
+    SimObjVariableProp.IS_BROKEN,
+    SimObjVariableProp.IS_FILLED_WITH_LIQUID,
+    SimObjVariableProp.IS_DIRTY,
+    SimObjVariableProp.IS_USED_UP,
+    SimObjVariableProp.IS_COOKED,
+    SimObjVariableProp.IS_SLICED,
+    SimObjVariableProp.IS_OPEN,
+    SimObjVariableProp.IS_PICKED_UP,
+})
+FLOAT_METADATA_KEYS: frozenset[SimObjMetadataKey] = frozenset({
+    SimObjFixedProp.MASS,
+    SimObjVariableProp.OPENNESS,
+    "distance",
+})
+TEMPERATURE_CODES = {"Cold": -1, "RoomTemp": 0, "Hot": 1}
+UNKNOWN_TEMPERATURE_CODE = 0
+_EMPTY_IDS: tuple[SimObjId, ...] = ()
+# Below this number of objects, computing the distances to every object is faster than querying
+# a spatial grid.
+SPATIAL_GRID_MIN_OBJECTS = 256
+
+
+# %% === Scene object table ===
+class SceneObjectTable(dict[SimObjId, SimObjMetadata]):  # noqa: FURB189
+    """
+    Table of the objects of a scene at a given step.
+
+    The table is the dictionary mapping the object ids to their metadata (the usual
+    scene_objects_dict), so it can be used anywhere such a dictionary is expected. It also holds
+    the row of each object and exposes the object metadata as NumPy columns, which are only
+    computed when they are first accessed. The table should not be modified after its creation.
+
+    Attributes:
+        object_ids (list[SimObjId]): Ids of the objects, in the order of the rows.
+        row_index (dict[SimObjId, int]): Map of the object ids to their row in the columns.
+    """
+
+    def __init__(self, objects: list[SimObjMetadata]) -> None:
+        """
+        Index the objects and initialize the columns cache.
+
+        Args:
+            objects (list[SimObjMetadata]): Metadata of the objects of the scene, as given in the
+                "objects" field of the event metadata.
+        """
+        super().__init__({obj["objectId"]: obj for obj in objects})
+        self._objects = objects
+        self._columns: dict[SimObjMetadataKey, NDArray] = {}
+        self._spatial_grids: dict[float, SpatialGrid] = {}
+        self._property_memos: dict[Hashable, tuple[NDArray[np.bool_], NDArray[np.bool_]]] = {}
+
+        # === Type annotations ===
+        self._objects: list[SimObjMetadata]
+        self._columns: dict[SimObjMetadataKey, NDArray]
+        self._spatial_grids: dict[float, SpatialGrid]
+        self._property_memos: dict[Hashable, tuple[NDArray[np.bool_], NDArray[np.bool_]]]
+
+    @functools.cached_property
+    def object_ids(self) -> list[SimObjId]:
+        """
+        Ids of the objects, in the order of the rows.
+
+        Returns:
+            object_ids (list[SimObjId]): Ids of the objects.
+        """
+        return list(self.keys())
+
+    @functools.cached_property
+    def row_index(self) -> dict[SimObjId, int]:
+        """
+        Map of the object ids to their row in the columns.
+
+        Returns:
+            row_index (dict[SimObjId, int]): Row of each object id.
+        """
+        return {obj_id: row for row, obj_id in enumerate(self.object_ids)}
+
+    @classmethod
+    def from_event(cls, event: Event) -> SceneObjectTable:
+        """
+        Return the scene object table of the event.
+
+        Args:
+            event (Event): Event corresponding to the state of the scene.
+
+        Returns:
+            scene_object_table (SceneObjectTable): Scene object table of the event.
+        """
+        return cls(event.metadata["objects"])
+
+    @functools.cached_property
+    def containment_graph(self) -> ContainmentGraph:
+        """
+        Containment graph of the objects, built the first time it is accessed.
+
+        Returns:
+            containment_graph (ContainmentGraph): Receptacle-content relationships of the objects.
+        """
+        return ContainmentGraph(self)
+
+    def column(self, key: SimObjMetadataKey) -> NDArray:
+        """
+        Return the column of the given metadata key.
+
+        Boolean and numerical metadata are stored in columns of the corresponding NumPy type (missing
+        values are False or NaN), other metadata in object columns.
+
+        Args:
+            key (SimObjMetadataKey): Metadata key of the column.
+
+        Returns:
+            column (NDArray): Value of the metadata for each row of the table.
+        """
+        column = self._columns.get(key)
+        if column is None:
+            column = self._build_column(key)
+            column.flags.writeable = False
+            self._columns[key] = column
+        return column
+
+    def get_property_memo(self, signature: Hashable) -> tuple[NDArray[np.bool_], NDArray[np.bool_]]:
+        """
+        Return the memoized results of the item properties with the given signature.
+
+        The memo is shared by all the properties with the same signature during the step, and is
+        not carried over to the table of the next step. The results are only valid for the rows
+        that are marked as evaluated; the arrays are filled by the properties themselves.
+
+        Args:
+            signature (Hashable): Signature of the property (see BaseItemProp.signature).
+
+        Returns:
+            results (NDArray[np.bool_]): Result of the property for each row of the table.
+            is_evaluated (NDArray[np.bool_]): Whether the result of each row is known.
+        """
+        property_memo = self._property_memos.get(signature)
+        if property_memo is None:
+            nb_objects = len(self._objects)
+            property_memo = (np.zeros(nb_objects, dtype=np.bool_), np.zeros(nb_objects, dtype=np.bool_))
+            self._property_memos[signature] = property_memo
+        return property_memo
+
+    def _build_column(self, key: SimObjMetadataKey) -> NDArray:
+        """
+        Build the column of the given metadata key.
+
+        Args:
+            key (SimObjMetadataKey): Metadata key of the column.
+
+        Returns:
+            column (NDArray): Value of the metadata for each row of the table.
+        """
+        nb_objects = len(self._objects)
+        if key in BOOLEAN_METADATA_KEYS:
+            return np.fromiter((bool(obj.get(key)) for obj in self._objects), dtype=np.bool_, count=nb_objects)
+        if key in FLOAT_METADATA_KEYS:
+            return np.fromiter(
+                (np.nan if obj.get(key) is None else obj[key] for obj in self._objects),
+                dtype=np.float64,
+                count=nb_objects,
+            )
+        if key == SimObjVariableProp.POSITION:
+            return np.fromiter(
+                (position[axis] for position in (obj[key] for obj in self._objects) for axis in "xyz"),
+                dtype=np.float64,
+                count=3 * nb_objects,
+            ).reshape(nb_objects, 3)
+        column = np.empty(nb_objects, dtype=object)
+        column[:] = [obj.get(key) for obj in self._objects]
+        return column
+
+    @property
+    def positions(self) -> NDArray[np.float64]:
+        """
+        Positions (x, y, z) of the objects.
+
+        Returns:
+            positions (NDArray[np.float64]): Array of shape (nb_objects, 3) with the position of
+                each object.
+        """
+        return self.column(SimObjVariableProp.POSITION)
+
+    @property
+    def distances(self) -> NDArray[np.float64]:
+        """
+        Distances between the agent and the objects.
+
+        Returns:
+            distances (NDArray[np.float64]): Distance of each object to the agent.
+        """
+        return self.column("distance")
+
+    @functools.cached_property
+    def temperature_codes(self) -> NDArray[np.int8]:
+        """
+        Temperature of the objects encoded as integers (-1 for cold, 0 for room temperature, 1 for hot).
+
+        The temperature column itself holds the temperature strings, so that it can be compared
+        to the temperature values of the item properties.
+
+        Returns:
+            temperature_codes (NDArray[np.int8]): Temperature code of each object.
+        """
+        temperature_codes = np.fromiter(
+            (
+                TEMPERATURE_CODES.get(temperature, UNKNOWN_TEMPERATURE_CODE)
+                for temperature in self.column(SimObjVariableProp.TEMPERATURE)
+            ),
+            dtype=np.int8,
+            count=len(self._objects),
+        )
+        temperature_codes.flags.writeable = False
+        return temperature_codes
+
+    def get_value(self, obj_id: SimObjId, key: SimObjMetadataKey) -> object:
+        """
+        Return the value of a metadata of an object from the columns.
+
+        Args:
+            obj_id (SimObjId): Id of the object.
+            key (SimObjMetadataKey): Metadata key.
+
+        Returns:
+            value (object): Value of the metadata of the object in the column.
+        """
+        return self.column(key)[self.row_index[obj_id]]
+
+    def compute_2d_distances(self, obj_id: SimObjId) -> NDArray[np.float64]:
+        """
+        Return the 2D (x, z) distance between the given object and every object of the table.
+
+        Args:
+            obj_id (SimObjId): Id of the object.
+
+        Returns:
+            distances (NDArray[np.float64]): Distance between the object and each object of the
+                table, in the order of the rows.
+        """
+        offsets = self._positions_2d - self._positions_2d[self.row_index[obj_id]]
+        return np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+
+    def get_spatial_grid(self, cell_size: float) -> SpatialGrid:
+        """
+        Return the spatial grid of the objects with the given cell size.
+
+        The grid is built the first time it is requested and then shared by every user of the
+        table, e.g. all the close-to relations with the same distance.
+
+        Args:
+            cell_size (float): Side length of the cells of the grid.
+
+        Returns:
+            spatial_grid (SpatialGrid): Spatial grid of the (x, z) positions of the objects.
+        """
+        spatial_grid = self._spatial_grids.get(cell_size)
+        if spatial_grid is None:
+            spatial_grid = SpatialGrid(self._positions_2d, cell_size)
+            self._spatial_grids[cell_size] = spatial_grid
+        return spatial_grid
+
+    def find_close_object_ids(self, obj_id: SimObjId, distance: float) -> list[SimObjId]:
+        """
+        Return the ids of the objects whose 2D (x, z) distance to the given object is at most the given distance.
+
+        In large scenes, only the objects of the neighboring cells of a spatial grid whose cell
+        size is the distance are checked.
+
+        Args:
+            obj_id (SimObjId): Id of the object.
+            distance (float): Maximum distance to the object.
+
+        Returns:
+            close_object_ids (list[SimObjId]): Ids of the objects close to the object, without the
+                object itself.
+        """
+        row = self.row_index[obj_id]
+        if len(self._objects) < SPATIAL_GRID_MIN_OBJECTS:
+            close_rows = np.flatnonzero(self.compute_2d_distances(obj_id) <= distance)
+        else:
+            close_rows = self.get_spatial_grid(distance).query_radius(self._positions_2d[row], distance)
+        object_ids = self.object_ids
+        return [object_ids[close_row] for close_row in close_rows.tolist() if close_row != row]
+
+    @functools.cached_property
+    def _positions_2d(self) -> NDArray[np.float64]:
+        """
+        Positions (x, z) of the objects, used to compute 2D distances.
+
+        Returns:
+            positions_2d (NDArray[np.float64]): Array of shape (nb_objects, 2) with the (x, z)
+                position of each object.
+        """
+        return np.ascontiguousarray(self.positions[:, [0, 2]])
+
+
+# %% === Spatial grid ===
+class SpatialGrid:
+    """
+    Uniform grid over the 2D (x, z) positions of the objects of a scene, used for radius queries.
+
+    Each object is stored in the cell containing its position, so that a radius query only has to
+    check the objects of the cells overlapping the query disk instead of every object of the scene.
+
+    Attributes:
+        positions_2d (NDArray[np.float64]): Array of shape (nb_objects, 2) with the (x, z) position
+            of each object.
+        cell_size (float): Side length of the cells.
+        sorted_rows (NDArray[np.intp]): Rows of the objects sorted by cell.
+        cells (dict[tuple[int, int], tuple[int, int]]): Map of the coordinates of the non-empty
+            cells to the start and stop indices of their objects in sorted_rows.
+    """
+
+    def __init__(self, positions_2d: NDArray[np.float64], cell_size: float) -> None:
+        """
+        Build the grid.
+
+        Args:
+            positions_2d (NDArray[np.float64]): Array of shape (nb_objects, 2) with the (x, z)
+                position of each object.
+            cell_size (float): Side length of the cells, should be strictly positive. Using the
+                radius of the queries as cell size makes each query look at 3x3 cells.
+        """
+        self.positions_2d = positions_2d
+        self.cell_size = cell_size
+        cell_coordinates = np.floor(positions_2d / cell_size).astype(np.int64)
+        self.sorted_rows = np.lexsort((cell_coordinates[:, 1], cell_coordinates[:, 0]))
+        sorted_cell_coordinates = cell_coordinates[self.sorted_rows]
+        is_cell_start = np.ones(len(positions_2d), dtype=np.bool_)
+        is_cell_start[1:] = np.any(sorted_cell_coordinates[1:] != sorted_cell_coordinates[:-1], axis=1)
+        cell_starts = np.flatnonzero(is_cell_start)
+        cell_stops = np.append(cell_starts[1:], len(positions_2d))
+        self.cells = {
+            (cell_x, cell_z): (start, stop)
+            for (cell_x, cell_z), start, stop in zip(
+                sorted_cell_coordinates[cell_starts].tolist(), cell_starts.tolist(), cell_stops.tolist(), strict=True
+            )
+        }
+
+        # === Type annotations ===
+        self.positions_2d: NDArray[np.float64]
+        self.cell_size: float
+        self.sorted_rows: NDArray[np.intp]
+        self.cells: dict[tuple[int, int], tuple[int, int]]
+
+    def query_radius(self, center: NDArray[np.float64], radius: float) -> NDArray[np.intp]:
+        """
+        Return the rows of the objects whose distance to the center is at most the radius.
+
+        Args:
+            center (NDArray[np.float64]): (x, z) position of the center of the query.
+            radius (float): Radius of the query.
+
+        Returns:
+            rows (NDArray[np.intp]): Rows of the objects in the query disk, in increasing order.
+        """
+        cell_x, cell_z = (math.floor(coordinate / self.cell_size) for coordinate in center.tolist())
+        nb_cells = math.ceil(radius / self.cell_size)
+        cell_slices = []
+        for neighbor_x in range(cell_x - nb_cells, cell_x + nb_cells + 1):
+            for neighbor_z in range(cell_z - nb_cells, cell_z + nb_cells + 1):
+                cell = self.cells.get((neighbor_x, neighbor_z))
+                if cell is not None:
+                    cell_slices.append(self.sorted_rows[cell[0] : cell[1]])
+        if not cell_slices:
+            return np.empty(0, dtype=np.intp)
+        rows = np.sort(np.concatenate(cell_slices))
+        offsets = self.positions_2d[rows] - center
+        return rows[np.sqrt(np.einsum("ij,ij->i", offsets, offsets)) <= radius]
+
+
+# %% === Containment graph ===
+class ContainmentGraph:
+    """
+    Receptacle-content relationships of the objects of a scene.
+
+    The graph maps each receptacle to the objects it contains (from its receptacleObjectIds
+    metadata) and each object to the receptacles containing it (from its parentReceptacles
+    metadata). The entries are read from the metadata the first time they are requested, and the
+    graph is built again for each step. The lists of the metadata are used as is (without copying
+    them to sets) since the relations intersect them with the sets of candidates anyway.
+
+    Attributes:
+        scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
+            objects in the scene to their metadata.
+        contained_object_ids (dict[SimObjId, Sequence[SimObjId]]): Map of the receptacles to the
+            ids of the objects they contain, for the entries already read.
+        parent_receptacle_ids (dict[SimObjId, Sequence[SimObjId]]): Map of the objects to the ids
+            of the receptacles containing them, for the entries already read.
+    """
+
+    def __init__(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> None:
+        """
+        Initialize the graph with no entries read yet.
+
+        Args:
+            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
+                objects in the scene to their metadata.
+        """
+        self.scene_objects_dict = scene_objects_dict
+        self.contained_object_ids = {}
+        self.parent_receptacle_ids = {}
+
+        # === Type annotations ===
+        self.scene_objects_dict: dict[SimObjId, SimObjMetadata]
+        self.contained_object_ids: dict[SimObjId, Sequence[SimObjId]]
+        self.parent_receptacle_ids: dict[SimObjId, Sequence[SimObjId]]
+
+    def get_contained_object_ids(self, receptacle_id: SimObjId) -> Sequence[SimObjId]:
+        """
+        Return the ids of the objects contained in the receptacle.
+
+        Args:
+            receptacle_id (SimObjId): Id of the receptacle.
+
+        Returns:
+            contained_object_ids (Sequence[SimObjId]): Ids of the contained objects.
+        """
+        contained_object_ids = self.contained_object_ids.get(receptacle_id)
+        if contained_object_ids is None:
+            contained_object_ids = self._read_object_ids(receptacle_id, SimObjVariableProp.RECEPTACLE_OBJ_IDS)
+            self.contained_object_ids[receptacle_id] = contained_object_ids
+        return contained_object_ids
+
+    def get_parent_receptacle_ids(self, obj_id: SimObjId) -> Sequence[SimObjId]:
+        """
+        Return the ids of the receptacles containing the object.
+
+        Args:
+            obj_id (SimObjId): Id of the object.
+
+        Returns:
+            parent_receptacle_ids (Sequence[SimObjId]): Ids of the parent receptacles.
+        """
+        parent_receptacle_ids = self.parent_receptacle_ids.get(obj_id)
+        if parent_receptacle_ids is None:
+            parent_receptacle_ids = self._read_object_ids(obj_id, SimObjVariableProp.PARENT_RECEPTACLES)
+            self.parent_receptacle_ids[obj_id] = parent_receptacle_ids
+        return parent_receptacle_ids
+
+    def _read_object_ids(self, obj_id: SimObjId, key: SimObjVariableProp) -> Sequence[SimObjId]:
+        """
+        Read a list of object ids from the metadata of an object.
+
+        Args:
+            obj_id (SimObjId): Id of the object.
+            key (SimObjVariableProp): Metadata key of the list of object ids.
+
+        Returns:
+            object_ids (Sequence[SimObjId]): Object ids of the metadata, empty if the object or
+                the list doesn't exist.
+        """
+        obj_metadata = self.scene_objects_dict.get(obj_id)
+        if obj_metadata is None or not obj_metadata[key]:
+            return _EMPTY_IDS
+        return obj_metadata[key]
@@ -0,0 +1,225 @@
+"""
+Synthetic scaling of the objects of a scene, to stress-test the tasks on denser scenes.
+
+The objects metadata of a scene are replicated `density` times: each replica of the scene is
+shifted by a random horizontal offset, and the containment of the replicas is consistent with the
+original scene (the replica of an object is in the replicas of its receptacles, or in its original
+receptacles if they are not replicated). The states of the replicas can also be perturbed, so that
+the candidates of the task items differ from one replica to the other.
+
+The synthetic controller scales the objects metadata samples of the scenes with its
+`object_density` parameter, e.g. with `controller_backend_parameters: {object_density: 5}`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from rl_thor.envs.sim_objects import SimObjFixedProp, SimObjVariableProp
+
+if TYPE_CHECKING:
+    from collections.abc import Container, Mapping
+
+    from rl_thor.envs.sim_objects import SimObjId, SimObjMetadata
+
+
+# %% === Constants ===
+DEFAULT_POSITION_JITTER = 0.25
+# Boolean states that can be perturbed, with the fixed property allowing them
+PERTURBED_STATES = {
+    SimObjVariableProp.IS_OPEN: SimObjFixedProp.OPENABLE,
+    SimObjVariableProp.IS_TOGGLED: SimObjFixedProp.TOGGLEABLE,
+    SimObjVariableProp.IS_DIRTY: SimObjFixedProp.DIRTYABLE,
+}
+
+
+# %% === Scene scaling ===
+def get_replica_id(obj_id: SimObjId, replica_idx: int) -> SimObjId:
+    """
+    Return the id of a replica of an object.
+
+    The object type remains the first part of the id, like in the ids of AI2-THOR.
+
+    Args:
+        obj_id (SimObjId): Id of the original object.
+        replica_idx (int): Index of the replica, starting at 1.
+
+    Returns:
+        replica_id (SimObjId): Id of the replica.
+    """
+    return f"{obj_id}|Replica{replica_idx}"  # type: ignore
+
+
+def scale_scene_objects(
+    objects: Mapping[SimObjId, SimObjMetadata],
+    density: int,
+    scaled_object_types: Container[str] | None = None,
+    position_jitter: float = DEFAULT_POSITION_JITTER,
+    state_perturbation: float = 0.0,
+    seed: int = 0,
+) -> dict[SimObjId, SimObjMetadata]:
+    """
+    Return the objects of the scene with `density - 1` replicas of each scaled object.
+
+    The metadata of the replicas are copies of the original metadata with:
+    - the id and name of the replica,
+    - the position and bounding boxes shifted by the horizontal offset of the replica,
+    - the replicas of the original receptacles and contained objects, and the original receptacles
+        and controlled objects when they are not replicated (the replica is then added to the
+        contained objects of the receptacle),
+    - the boolean states (open, toggled, dirty) flipped with a probability of `state_perturbation`
+        when the object allows it,
+    - the replica not picked up.
+
+    The given metadata are not modified: the receptacles receiving replicas are copied.
+
+    Args:
+        objects (Mapping[SimObjId, SimObjMetadata]): Metadata of the objects of the scene, with
+            consistent receptacles and contained objects.
+        density (int): Number of instances of each scaled object in the scaled scene, at least 1.
+        scaled_object_types (Container[str] | None): Types of the replicated objects. Defaults to
+            None, replicating all the objects.
+        position_jitter (float): Maximum horizontal offset of the replicas, in meters. Defaults
+            to DEFAULT_POSITION_JITTER.
+        state_perturbation (float): Probability of flipping each boolean state of the replicas.
+            Defaults to 0.
+        seed (int): Seed of the offsets and perturbations. Defaults to 0.
+
+    Returns:
+        scaled_objects (dict[SimObjId, SimObjMetadata]): Metadata of the original objects followed
+            by the ones of the replicas.
+    """
+    if density < 1:
+        raise InvalidObjectDensityError(density)
+    rng = np.random.default_rng(seed)
+    replicated_ids = [
+        obj_id
+        for obj_id, obj_metadata in objects.items()
+        if scaled_object_types is None or obj_metadata[SimObjFixedProp.OBJECT_TYPE] in scaled_object_types
+    ]
+    replicated_id_set = set(replicated_ids)
+    scaled_objects = dict(objects)
+    copied_receptacle_ids: set[SimObjId] = set()
+
+    for replica_idx in range(1, density):
+        offset_x, offset_z = rng.uniform(-position_jitter, position_jitter, size=2)
+        offset = (float(offset_x), 0.0, float(offset_z))
+
+        def to_replica_id(obj_id: SimObjId, replica_idx: int = replica_idx) -> SimObjId:
+            return get_replica_id(obj_id, replica_idx) if obj_id in replicated_id_set else obj_id
+
+        for obj_id in replicated_ids:
+            obj_metadata = objects[obj_id]
+            replica_id = get_replica_id(obj_id, replica_idx)
+            parent_ids = obj_metadata[SimObjVariableProp.PARENT_RECEPTACLES]
+            contained_ids = obj_metadata[SimObjVariableProp.RECEPTACLE_OBJ_IDS]
+            replica_metadata = {
+                **obj_metadata,
+                **_shift_pose(obj_metadata, offset),
+                SimObjFixedProp.OBJECT_ID: replica_id,
+                "name": f"{obj_metadata['name']}_Replica{replica_idx}",
+                SimObjVariableProp.IS_PICKED_UP: False,
+                SimObjVariableProp.PARENT_RECEPTACLES: None
+                if parent_ids is None
+                else [to_replica_id(parent_id) for parent_id in parent_ids],  # type: ignore
+                SimObjVariableProp.RECEPTACLE_OBJ_IDS: None
+                if contained_ids is None
+                else [
+                    get_replica_id(contained_id, replica_idx)
+                    for contained_id in contained_ids  # type: ignore
+                    if contained_id in replicated_id_set
+                ],
+            }
+            if obj_metadata.get("controlledObjects"):
+                replica_metadata["controlledObjects"] = [
+                    to_replica_id(controlled_id)
+                    for controlled_id in obj_metadata["controlledObjects"]  # type: ignore
+                ]
+            if state_perturbation > 0:
+                replica_metadata.update(_perturb_states(replica_metadata, rng, state_perturbation))
+            scaled_objects[replica_id] = replica_metadata
+
+            # The replica is also contained in its original receptacles that are not replicated
+            for parent_id in parent_ids or ():  # type: ignore
+                if parent_id in replicated_id_set or parent_id not in scaled_objects:
+                    continue
+                if parent_id not in copied_receptacle_ids:
+                    scaled_objects[parent_id] = {
+                        **scaled_objects[parent_id],
+                        SimObjVariableProp.RECEPTACLE_OBJ_IDS: list(
+                            scaled_objects[parent_id][SimObjVariableProp.RECEPTACLE_OBJ_IDS] or ()  # type: ignore
+                        ),
+                    }
+                    copied_receptacle_ids.add(parent_id)
+                scaled_objects[parent_id][SimObjVariableProp.RECEPTACLE_OBJ_IDS].append(replica_id)  # type: ignore
+
+    return scaled_objects
+
+
+def _shift_point(point: Mapping[str, float], offset: tuple[float, float, float]) -> dict[str, float]:
+    return {"x": point["x"] + offset[0], "y": point["y"] + offset[1], "z": point["z"] + offset[2]}
+
+
+def _shift_pose(obj_metadata: SimObjMetadata, offset: tuple[float, float, float]) -> dict[str, Any]:
+    """
+    Return the position and bounding boxes of the object shifted by the offset.
+
+    Args:
+        obj_metadata (SimObjMetadata): Metadata of the object.
+        offset (tuple[float, float, float]): Offset along the x, y and z axes.
+
+    Returns:
+        shifted_pose (dict[str, Any]): Shifted position and bounding boxes of the object.
+    """
+    shifted_pose: dict[str, Any] = {
+        SimObjVariableProp.POSITION: _shift_point(obj_metadata[SimObjVariableProp.POSITION], offset)  # type: ignore
+    }
+    for bounding_box_key in ("axisAlignedBoundingBox", "objectOrientedBoundingBox"):
+        bounding_box = obj_metadata.get(bounding_box_key)
+        if not bounding_box:
+            continue
+        shifted_bounding_box = dict(bounding_box)  # type: ignore
+        if bounding_box.get("cornerPoints") is not None:  # type: ignore
+            shifted_bounding_box["cornerPoints"] = [
+                [x + offset[0], y + offset[1], z + offset[2]]
+                for x, y, z in bounding_box["cornerPoints"]  # type: ignore
+            ]
+        if bounding_box.get("center") is not None:  # type: ignore
+            shifted_bounding_box["center"] = _shift_point(bounding_box["center"], offset)  # type: ignore
+        shifted_pose[bounding_box_key] = shifted_bounding_box
+    return shifted_pose
+
+
+def _perturb_states(obj_metadata: SimObjMetadata, rng: np.random.Generator, probability: float) -> dict[str, Any]:
+    """
+    Return the boolean states of the object flipped with the given probability.
+
+    Args:
+        obj_metadata (SimObjMetadata): Metadata of the object.
+        rng (np.random.Generator): Random number generator.
+        probability (float): Probability of flipping each state allowed by the object.
+
+    Returns:
+        perturbed_states (dict[str, Any]): Flipped states of the object, with the openness matching
+            the open state.
+    """
+    perturbed_states: dict[str, Any] = {}
+    for state, required_property in PERTURBED_STATES.items():
+        if obj_metadata.get(required_property) and rng.random() < probability:
+            perturbed_states[state] = not obj_metadata[state]
+    if SimObjVariableProp.IS_OPEN in perturbed_states:
+        perturbed_states[SimObjVariableProp.OPENNESS] = 1.0 if perturbed_states[SimObjVariableProp.IS_OPEN] else 0.0
+    return perturbed_states
+
+
+# %% === Exceptions ===
+class InvalidObjectDensityError(ValueError):
+    """Exception raised when the objects of a scene are scaled with a density lower than 1."""
+
+    def __init__(self, density: int) -> None:
+        self.density = density
+
+    def __str__(self) -> str:
+        return f"The object density must be an integer of at least 1, got {self.density}."
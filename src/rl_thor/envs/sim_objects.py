@@ -190,6 +190,7 @@ class SimObjVariableProp(StrEnum):
     # ROTATION = "rotation"
     # DISTANCE = "distance"
     RECEPTACLE_OBJ_IDS = "receptacleObjectIds"
+    PARENT_RECEPTACLES = "parentReceptacles"
 
 
 # TODO: Change this to a union of enums instead of type alias.
@@ -11,6 +11,8 @@ TODO: Finish module docstring.
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from rl_thor.envs.sim_objects import (
     COOKING_SOURCES,
     HEAT_SOURCES,
@@ -19,6 +21,7 @@ from rl_thor.envs.sim_objects import (
     SimObjectType,
     SimObjFixedProp,
     SimObjMetadata,
+    SimObjMetadataKey,
     SimObjVariableProp,
 )
 from rl_thor.envs.tasks._item_prop_fixed import (
@@ -36,10 +39,17 @@ from rl_thor.envs.tasks.item_prop_interface import (
     MultiValuePSF,
     SingleValuePSF,
     TemperatureValue,
+    evaluate_each,
 )
 from rl_thor.envs.tasks.items import AuxItem
 from rl_thor.envs.tasks.relations import ReceptacleOfRelation, Relation
 
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+    from rl_thor.envs.scene_object_table import SceneObjectTable
+
 
 # %% === Property Definitions ===
 # TODO: Support filling with other liquids and contextual interactions
@@ -184,3 +194,15 @@ class IsSlicedProp(BaseIsSlicedProp):
     def is_object_satisfying(self, obj_metadata: SimObjMetadata) -> bool:
         """Return true if the object is sliced or if it is an Egg object."""
         return super().is_object_satisfying(obj_metadata) or obj_metadata[SimObjFixedProp.OBJECT_TYPE] in SLICED_FORMS
+
+    def evaluate_many(self, scene_object_table: SceneObjectTable, rows: NDArray[np.intp]) -> NDArray[np.bool_]:
+        """Return whether each object is sliced or is one of the sliced forms."""
+        object_types = scene_object_table.column(SimObjFixedProp.OBJECT_TYPE)[rows]
+        return self._evaluate_target_values(scene_object_table, rows) | evaluate_each(
+            SLICED_FORMS.__contains__, object_types
+        )
+
+    @property
+    def read_metadata_keys(self) -> frozenset[SimObjMetadataKey]:
+        """Return the target AI2-THOR property and the object type."""
+        return super().read_metadata_keys | {SimObjFixedProp.OBJECT_TYPE}
@@ -32,6 +32,7 @@ from rl_thor.envs.tasks._item_prop_fixed import (
 from rl_thor.envs.tasks._item_prop_variable import (
     IsBrokenProp,
     IsInteractableProp,
+    IsOpenIfPossibleProp,
     IsOpenProp,
     IsPickedUpProp,
     IsToggledProp,
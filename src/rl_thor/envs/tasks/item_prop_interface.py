@@ -6,21 +6,28 @@ TODO: Finish module docstring.
 
 from __future__ import annotations
 
+import functools
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Container, Sized
+from collections.abc import Callable, Container, Hashable, Sized
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
+from rl_thor.envs.scene_object_table import SceneObjectTable
 from rl_thor.envs.sim_objects import (
     SimObjectType,
     SimObjFixedProp,
     SimObjId,
     SimObjMetadata,
+    SimObjMetadataKey,
     SimObjProp,
     SimObjVariableProp,
 )
 
 if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
     from rl_thor.envs.tasks.items import AuxItem
     from rl_thor.envs.tasks.relations import Relation
 
@@ -64,6 +71,21 @@ class BasePSF[T](ABC):
     def __call__(self, prop_value: T) -> bool:
         """Return True if the value satisfies the property."""
 
+    def evaluate_many(self, prop_values: NDArray) -> NDArray[np.bool_]:
+        """
+        Return whether each of the values satisfies the property.
+
+        Falls back to calling the function on each value; subclasses override it with a
+        vectorized implementation when possible.
+
+        Args:
+            prop_values (NDArray): Values of the property.
+
+        Returns:
+            are_satisfying (NDArray[np.bool_]): Whether each value satisfies the property.
+        """
+        return evaluate_each(self, prop_values)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}{self._init_args}"
 
@@ -86,6 +108,13 @@ class SingleValuePSF[T: ItemPropValue](BasePSF[T]):
         """Return True if the value is equal to the target value."""
         return prop_value == self.target_value
 
+    def evaluate_many(self, prop_values: NDArray) -> NDArray[np.bool_]:
+        """Return whether each of the values is equal to the target value."""
+        # NumPy would compare sequences element by element
+        if isinstance(self.target_value, list | tuple):
+            return evaluate_each(self, prop_values)
+        return np.asarray(prop_values == self.target_value, dtype=np.bool_)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.target_value})"
 
@@ -102,6 +131,10 @@ class MultiValuePSF[T: ItemPropValue](BasePSF[T]):
         """Return True if the value is in the target values."""
         return prop_value in self.target_values
 
+    def evaluate_many(self, prop_values: NDArray) -> NDArray[np.bool_]:
+        """Return whether each of the values is in the target values."""
+        return evaluate_each(self.target_values.__contains__, prop_values)
+
 
 class RangePSF(BasePSF[float | int]):
     """Property satisfaction function that accepts a range of values."""
@@ -116,6 +149,10 @@ class RangePSF(BasePSF[float | int]):
         """Return True if the value is in the range."""
         return self.min_value <= prop_value <= self.max_value
 
+    def evaluate_many(self, prop_values: NDArray) -> NDArray[np.bool_]:
+        """Return whether each of the values is in the range."""
+        return np.asarray((self.min_value <= prop_values) & (prop_values <= self.max_value), dtype=np.bool_)
+
 
 class SizeLimitPSF[T: Sized](BasePSF[T]):
     """Property satisfaction function that checks if a container's size meets a specified limit."""
@@ -146,6 +183,19 @@ class SizeLimitPSF[T: Sized](BasePSF[T]):
         """
         return (len(prop_value) <= self.max_elements) == self.expect_less_or_equal
 
+    def evaluate_many(self, prop_values: NDArray) -> NDArray[np.bool_]:
+        """
+        Return whether the size of each of the containers meets the criteria.
+
+        Args:
+            prop_values (NDArray): Object array of the containers to check.
+
+        Returns:
+            are_satisfying (NDArray[np.bool_]): Whether each container meets the size limit criteria.
+        """
+        sizes = np.fromiter(map(len, prop_values), dtype=np.intp, count=len(prop_values))
+        return (sizes <= self.max_elements) == self.expect_less_or_equal
+
 
 class EmptyContainerPSF[T: Sized](SizeLimitPSF[T]):
     """Property satisfaction function that accepts any empty container."""
@@ -186,6 +236,20 @@ class UndefinedPSF(BasePSF[Any]):
 type PropSatFunction[T: ItemPropValue] = BasePSF[T] | Callable[[T], bool]
 
 
+def evaluate_each[T](func: Callable[[T], bool], prop_values: NDArray) -> NDArray[np.bool_]:
+    """
+    Call the function on each of the values and return the results as a boolean array.
+
+    Args:
+        func (Callable[[T], bool]): Function to call on each value.
+        prop_values (NDArray): Values to call the function on.
+
+    Returns:
+        results (NDArray[np.bool_]): Result of the function for each value.
+    """
+    return np.fromiter(map(func, prop_values), dtype=np.bool_, count=len(prop_values))
+
+
 # %% === Item properties  ===
 # TODO? Add action validity checking (action group, etc)
 # TODO: Check if we need to add a hash
@@ -224,6 +288,21 @@ class BaseItemProp[Treq: ItemPropValue](ABC):
         """
         return self.is_object_satisfying(obj_metadata, scene_objects_dict)
 
+    @property
+    def read_metadata_keys(self) -> frozenset[SimObjMetadataKey] | None:
+        """
+        Metadata keys read by the property to check whether an object satisfies it.
+
+        Used to detect the objects whose metadata changed in a way that can change the result of
+        the property. None means that the keys are unknown and that any change of the object's
+        metadata has to be considered.
+
+        Returns:
+            read_metadata_keys (frozenset[SimObjMetadataKey] | None): Metadata keys read by the
+                property or None if they are unknown.
+        """
+        return None
+
     @abstractmethod
     def is_object_satisfying(
         self,
@@ -242,6 +321,94 @@ class BaseItemProp[Treq: ItemPropValue](ABC):
             is_satisfying (bool): Whether the object satisfies the property.
         """
 
+    def evaluate_many(self, scene_object_table: SceneObjectTable, rows: NDArray[np.intp]) -> NDArray[np.bool_]:
+        """
+        Return whether each of the objects at the given rows of the table satisfies the property.
+
+        Falls back to checking the objects one by one; properties reading a single metadata of the
+        objects override it to evaluate the property on the whole column at once.
+
+        Args:
+            scene_object_table (SceneObjectTable): Table of the objects of the scene.
+            rows (NDArray[np.intp]): Rows of the objects to check in the table.
+
+        Returns:
+            are_satisfying (NDArray[np.bool_]): Whether each object satisfies the property.
+        """
+        object_ids = scene_object_table.object_ids
+        return np.fromiter(
+            (self.is_object_satisfying(scene_object_table[object_ids[row]], scene_object_table) for row in rows),
+            dtype=np.bool_,
+            count=len(rows),
+        )
+
+    @property
+    def signature(self) -> Hashable | None:
+        """
+        Key identifying the results of the property, shared by the properties giving the same results.
+
+        The results of the properties with a signature are memoized in the scene object table of
+        the step, so that a property attached to several items (or auxiliary items and
+        properties) is evaluated once per object and per step. None means that the results of
+        the property can't be shared.
+
+        Returns:
+            signature (Hashable | None): Signature of the property, or None.
+        """
+        return None
+
+    def is_object_satisfying_memoized(
+        self,
+        obj_metadata: SimObjMetadata,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+    ) -> bool:
+        """
+        Return True if the object satisfies the property, reusing the result of the step if it is known.
+
+        Args:
+            obj_metadata (SimObjMetadata): Metadata of the object.
+            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping all object ids
+                of the scene to their metadata; the results are only memoized if it is a
+                SceneObjectTable.
+
+        Returns:
+            is_satisfying (bool): Whether the object satisfies the property.
+        """
+        signature = self.signature
+        if signature is None or not isinstance(scene_objects_dict, SceneObjectTable):
+            return self.is_object_satisfying(obj_metadata)
+        results, is_evaluated = scene_objects_dict.get_property_memo(signature)
+        row = scene_objects_dict.row_index[obj_metadata["objectId"]]
+        if not is_evaluated[row]:
+            results[row] = self.is_object_satisfying(obj_metadata)
+            is_evaluated[row] = True
+        return bool(results[row])
+
+    def evaluate_many_memoized(
+        self, scene_object_table: SceneObjectTable, rows: NDArray[np.intp]
+    ) -> NDArray[np.bool_]:
+        """
+        Return whether each of the objects at the given rows satisfies the property, reusing the results of the step.
+
+        Only the objects whose result is not memoized in the table yet are evaluated.
+
+        Args:
+            scene_object_table (SceneObjectTable): Table of the objects of the scene.
+            rows (NDArray[np.intp]): Rows of the objects to check in the table.
+
+        Returns:
+            are_satisfying (NDArray[np.bool_]): Whether each object satisfies the property.
+        """
+        signature = self.signature
+        if signature is None:
+            return self.evaluate_many(scene_object_table, rows)
+        results, is_evaluated = scene_object_table.get_property_memo(signature)
+        missing_rows = rows[~is_evaluated[rows]]
+        if len(missing_rows):
+            results[missing_rows] = self.evaluate_many(scene_object_table, missing_rows)
+            is_evaluated[missing_rows] = True
+        return results[rows]
+
 
 class AI2ThorBasedProp[T: ItemPropValue, Treq: ItemPropValue](BaseItemProp[Treq], ABC):
     """
@@ -293,6 +460,64 @@ class AI2ThorBasedProp[T: ItemPropValue, Treq: ItemPropValue](BaseItemProp[Treq]
         """
         return self.satisfaction_function(obj_metadata[self.target_ai2thor_property])
 
+    def evaluate_many(self, scene_object_table: SceneObjectTable, rows: NDArray[np.intp]) -> NDArray[np.bool_]:
+        """
+        Return whether each of the objects at the given rows of the table satisfies the property.
+
+        The satisfaction function is evaluated on the column of the target AI2-THOR property,
+        unless a subclass changed how a single object is checked without changing this method.
+
+        Args:
+            scene_object_table (SceneObjectTable): Table of the objects of the scene.
+            rows (NDArray[np.intp]): Rows of the objects to check in the table.
+
+        Returns:
+            are_satisfying (NDArray[np.bool_]): Whether each object satisfies the property.
+        """
+        if type(self).is_object_satisfying is not AI2ThorBasedProp.is_object_satisfying:
+            return super().evaluate_many(scene_object_table, rows)
+        return self._evaluate_target_values(scene_object_table, rows)
+
+    def _evaluate_target_values(
+        self, scene_object_table: SceneObjectTable, rows: NDArray[np.intp]
+    ) -> NDArray[np.bool_]:
+        """
+        Return whether the target AI2-THOR property of each object satisfies the satisfaction function.
+
+        Args:
+            scene_object_table (SceneObjectTable): Table of the objects of the scene.
+            rows (NDArray[np.intp]): Rows of the objects to check in the table.
+
+        Returns:
+            are_satisfying (NDArray[np.bool_]): Whether each object satisfies the satisfaction
+                function.
+        """
+        prop_values = scene_object_table.column(self.target_ai2thor_property)[rows]
+        if isinstance(self.satisfaction_function, BasePSF):
+            return self.satisfaction_function.evaluate_many(prop_values)
+        return evaluate_each(self.satisfaction_function, prop_values)
+
+    @functools.cached_property
+    def signature(self) -> Hashable | None:
+        """
+        Return the signature of the property, defined by how it checks the objects.
+
+        Properties checking the same AI2-THOR property with equal satisfaction functions (e.g.
+        IsPickedUpProp and IsPickedUpIfPossibleProp) have the same signature. The properties
+        whose satisfaction function is not hashable have no signature.
+        """
+        signature = (type(self).is_object_satisfying, self.target_ai2thor_property, self.satisfaction_function)
+        try:
+            hash(signature)
+        except TypeError:
+            return None
+        return signature
+
+    @property
+    def read_metadata_keys(self) -> frozenset[SimObjMetadataKey]:
+        """Return the target AI2-THOR property, which is the only metadata key read by the property."""
+        return frozenset({self.target_ai2thor_property})
+
     def __str__(self) -> str:
         return f"{self.__class__.__name__}({self.satisfaction_function})"
 
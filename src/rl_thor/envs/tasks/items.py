@@ -7,10 +7,16 @@ TODO: Finish module docstring.
 from __future__ import annotations
 
 import itertools
+import operator
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, NewType
 
+import numpy as np
+
+from rl_thor.envs import profiling
+from rl_thor.envs.profiling import CounterName, SpanName
+from rl_thor.envs.scene_object_table import SceneObjectTable
 from rl_thor.envs.sim_objects import (
     SimObjId,
     SimObjMetadata,
@@ -23,6 +29,10 @@ from rl_thor.envs.tasks.item_prop_interface import (
 from rl_thor.utils.global_exceptions import DuplicateRelationsError
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import NDArray
+
     from rl_thor.envs.tasks.item_prop_interface import (
         ItemFixedProp,
         ItemProp,
@@ -33,6 +43,243 @@ if TYPE_CHECKING:
 ItemId = NewType("ItemId", str)
 CandidateId = NewType("CandidateId", SimObjId)
 
+# Below this number of updated candidates, checking the candidates one by one is faster than
+# evaluating the properties on the columns of the scene object table.
+BATCH_EVALUATION_MIN_CANDIDATES = 20
+
+# Initial number of rows of the results arrays of the candidates of an item, doubled when full
+DEFAULT_RESULTS_CAPACITY = 8
+
+
+# %% === Candidates results ===
+class ItemResultsLayout:
+    """
+    Stable integer indices of the scored properties, relations and auxiliaries of an item.
+
+    The indices are the columns of the results arrays of the candidates of the item. The auxiliary
+    properties, relations and items of all the scored properties share their columns, in the order
+    of the scored properties.
+
+    Attributes:
+        scored_properties (tuple[ItemVariableProp, ...]): Scored properties of the item, in the
+            order of their columns.
+        props_aux_properties (tuple[tuple[tuple[PropAuxProp, int], ...], ...]): Auxiliary
+            properties of each scored property, with their column.
+        props_aux_relations (tuple[tuple[tuple[Relation, int], ...], ...]): Auxiliary relations of
+            each scored property, with their column.
+        props_aux_items (tuple[tuple[tuple[AuxItem, int], ...], ...]): Auxiliary items of each
+            scored property, with their column.
+        relations (tuple[Relation, ...]): Relations of the item, in the order of their columns.
+        relation_columns (dict[Relation, int]): Map of the relations of the item to their column.
+        relations_aux_properties (tuple[tuple[tuple[RelationAuxProp, int], ...], ...]): Auxiliary
+            properties of each relation, with their column.
+        nb_aux_properties (int): Number of auxiliary properties of the scored properties.
+        nb_aux_relations (int): Number of auxiliary relations of the scored properties.
+        nb_aux_items (int): Number of auxiliary items of the scored properties.
+        nb_relations_aux_properties (int): Number of auxiliary properties of the relations.
+    """
+
+    __slots__ = (
+        "nb_aux_items",
+        "nb_aux_properties",
+        "nb_aux_relations",
+        "nb_relations_aux_properties",
+        "props_aux_items",
+        "props_aux_properties",
+        "props_aux_relations",
+        "relation_columns",
+        "relations",
+        "relations_aux_properties",
+        "scored_properties",
+    )
+
+    def __init__(self, scored_properties: frozenset[ItemVariableProp], relations: frozenset[Relation]) -> None:
+        """
+        Assign the columns of the properties, relations and auxiliaries of the item.
+
+        Args:
+            scored_properties (frozenset[ItemVariableProp]): Scored properties of the item.
+            relations (frozenset[Relation]): Relations of the item.
+        """
+        self.scored_properties = tuple(scored_properties)
+        self.props_aux_properties, self.nb_aux_properties = self._assign_columns(
+            prop.auxiliary_properties for prop in self.scored_properties
+        )
+        self.props_aux_relations, self.nb_aux_relations = self._assign_columns(
+            prop.auxiliary_relations for prop in self.scored_properties
+        )
+        self.props_aux_items, self.nb_aux_items = self._assign_columns(
+            prop.auxiliary_items for prop in self.scored_properties
+        )
+        self.relations = tuple(relations)
+        self.relation_columns = {relation: col for col, relation in enumerate(self.relations)}
+        self.relations_aux_properties, self.nb_relations_aux_properties = self._assign_columns(
+            relation.auxiliary_properties for relation in self.relations
+        )
+
+        # === Type annotations ===
+        self.scored_properties: tuple[ItemVariableProp, ...]
+        self.props_aux_properties: tuple[tuple[tuple[PropAuxProp, int], ...], ...]
+        self.props_aux_relations: tuple[tuple[tuple[Relation, int], ...], ...]
+        self.props_aux_items: tuple[tuple[tuple[AuxItem, int], ...], ...]
+        self.relations: tuple[Relation, ...]
+        self.relation_columns: dict[Relation, int]
+        self.relations_aux_properties: tuple[tuple[tuple[RelationAuxProp, int], ...], ...]
+        self.nb_aux_properties: int
+        self.nb_aux_relations: int
+        self.nb_aux_items: int
+        self.nb_relations_aux_properties: int
+
+    @staticmethod
+    def _assign_columns[T](groups: Iterator[frozenset[T]]) -> tuple[tuple[tuple[T, int], ...], int]:
+        """
+        Assign consecutive columns to the elements of the groups.
+
+        Args:
+            groups (Iterator[frozenset[T]]): Groups of elements sharing the columns.
+
+        Returns:
+            groups_columns (tuple[tuple[tuple[T, int], ...], ...]): Elements of each group with
+                their column.
+            nb_columns (int): Total number of columns.
+        """
+        groups_columns = []
+        nb_columns = 0
+        for group in groups:
+            groups_columns.append(tuple((element, nb_columns + idx) for idx, element in enumerate(group)))
+            nb_columns += len(group)
+        return tuple(groups_columns), nb_columns
+
+    def matches(self, scored_properties: frozenset[ItemVariableProp], relations: frozenset[Relation]) -> bool:
+        """
+        Return True if the layout has the columns of the given scored properties and relations.
+
+        Args:
+            scored_properties (frozenset[ItemVariableProp]): Scored properties of the item.
+            relations (frozenset[Relation]): Relations of the item.
+
+        Returns:
+            matches (bool): True if the layout can be used for the item.
+        """
+        return scored_properties == frozenset(self.scored_properties) and relations == frozenset(self.relations)
+
+
+class CandidatesResults:
+    """
+    Preallocated arrays of the results and advancements of the candidates of an item.
+
+    Each candidate owns a row of the arrays for the whole episode and the columns are given by the
+    layout of the item. The arrays are allocated for each episode, updated in place by the
+    candidates at each step, and only reallocated when there are more candidates than rows.
+
+    Attributes:
+        layout (ItemResultsLayout): Columns of the properties, relations and auxiliaries.
+        nb_rows (int): Number of rows owned by candidates.
+        properties_results (NDArray[np.bool_]): Results of the scored properties.
+        properties_advancement (NDArray[np.int64]): Advancement of the scored properties.
+        aux_properties_results (NDArray[np.bool_]): Results of the auxiliary properties of the
+            scored properties, only up to date for the unsatisfied properties.
+        aux_relations_advancement (NDArray[np.int64]): Advancement of the auxiliary relations of the
+            scored properties, only up to date for the unsatisfied properties.
+        aux_items_advancement (NDArray[np.int64]): Advancement of the auxiliary items of the scored
+            properties, only up to date for the unsatisfied properties.
+        relations_all_satisfying (NDArray[np.bool_]): Whether every candidate of the related item
+            satisfies the relation.
+        relations_aux_properties_results (NDArray[np.bool_]): Results of the auxiliary properties of
+            the relations, only up to date for the relations not satisfied by every related candidate.
+        relations_aux_property_advancement (NDArray[np.int64]): Advancement of the auxiliary
+            properties of the relations, 0 for the relations satisfied by every related candidate.
+        relations_min_max_advancement (NDArray[np.int64]): Minimum and maximum advancement of the
+            relations, along the last axis.
+    """
+
+    __slots__ = (
+        "aux_items_advancement",
+        "aux_properties_results",
+        "aux_relations_advancement",
+        "layout",
+        "nb_rows",
+        "properties_advancement",
+        "properties_results",
+        "relations_all_satisfying",
+        "relations_aux_properties_results",
+        "relations_aux_property_advancement",
+        "relations_min_max_advancement",
+    )
+
+    def __init__(self, layout: ItemResultsLayout, capacity: int = DEFAULT_RESULTS_CAPACITY) -> None:
+        """
+        Allocate the arrays of the candidates.
+
+        Args:
+            layout (ItemResultsLayout): Columns of the properties, relations and auxiliaries.
+            capacity (int): Number of rows of the arrays. Defaults to DEFAULT_RESULTS_CAPACITY.
+        """
+        self.layout = layout
+        self.nb_rows = 0
+        self._allocate(capacity)
+
+        # === Type annotations ===
+        self.layout: ItemResultsLayout
+        self.nb_rows: int
+        self.properties_results: NDArray[np.bool_]
+        self.properties_advancement: NDArray[np.int64]
+        self.aux_properties_results: NDArray[np.bool_]
+        self.aux_relations_advancement: NDArray[np.int64]
+        self.aux_items_advancement: NDArray[np.int64]
+        self.relations_all_satisfying: NDArray[np.bool_]
+        self.relations_aux_properties_results: NDArray[np.bool_]
+        self.relations_aux_property_advancement: NDArray[np.int64]
+        self.relations_min_max_advancement: NDArray[np.int64]
+
+    @property
+    def capacity(self) -> int:
+        """
+        Number of rows of the arrays.
+
+        Returns:
+            capacity (int): Number of rows that can be owned by candidates without reallocation.
+        """
+        return len(self.properties_results)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Allocate the arrays with the given number of rows, keeping the rows owned by candidates.
+
+        Args:
+            capacity (int): Number of rows of the arrays.
+        """
+        layout = self.layout
+        nb_relations = len(layout.relations)
+        shapes = {
+            "properties_results": ((len(layout.scored_properties),), np.bool_),
+            "properties_advancement": ((len(layout.scored_properties),), np.int64),
+            "aux_properties_results": ((layout.nb_aux_properties,), np.bool_),
+            "aux_relations_advancement": ((layout.nb_aux_relations,), np.int64),
+            "aux_items_advancement": ((layout.nb_aux_items,), np.int64),
+            "relations_all_satisfying": ((nb_relations,), np.bool_),
+            "relations_aux_properties_results": ((layout.nb_relations_aux_properties,), np.bool_),
+            "relations_aux_property_advancement": ((nb_relations,), np.int64),
+            "relations_min_max_advancement": ((nb_relations, 2), np.int64),
+        }
+        for name, (row_shape, dtype) in shapes.items():
+            array = np.zeros((capacity, *row_shape), dtype=dtype)
+            if self.nb_rows:
+                array[: self.nb_rows] = getattr(self, name)[: self.nb_rows]
+            setattr(self, name, array)
+
+    def allocate_row(self) -> int:
+        """
+        Return a new row for a candidate, doubling the number of rows of the arrays when they are full.
+
+        Returns:
+            row (int): Row of the candidate.
+        """
+        if self.nb_rows == self.capacity:
+            self._allocate(max(2 * self.capacity, DEFAULT_RESULTS_CAPACITY))
+        self.nb_rows += 1
+        return self.nb_rows - 1
+
 
 # TODO? Implement simple CandidateData class for SimpleItems that have no relations and no auxiliary items or properties? ->  Wrong
 class CandidateData:
@@ -42,6 +289,10 @@ class CandidateData:
     Has to be updated at each step to take into account the changes in the scene and compute the
     results and scores of the candidate.
 
+    The results and advancements of the candidate are stored in its row of the results arrays of
+    the item and updated in place, and the dictionaries of the results and advancements are only
+    built when they are accessed (for debugging and for the advancement details).
+
     TODO: Implement weighted properties
     TODO: Implement weighted relations
     TODO: Implement properties and relations order
@@ -49,14 +300,17 @@ class CandidateData:
     Attributes:
         item (SimpleItem): The item of the candidate.
         id (CandidateId): The ID of the candidate.
+        row (int): The row of the candidate in the results arrays of the item.
         metadata (SimObjMetadata): The metadata of the candidate.
         base_properties_results (dict[ItemVariableProp, bool]): Dictionary mapping the item's
             properties to the results of the property satisfaction for the candidate.
-        _props_aux_properties_results (dict[ItemVariableProp, dict[PropAuxProp, bool]]):
+        props_aux_properties_results (dict[ItemVariableProp, dict[PropAuxProp, bool]]):
             Dictionary mapping the item's scored properties to the results of their auxiliary
             properties satisfaction for the candidate.
-        # TODO: Add _props_aux_relations_satisfying_related_candidate_ids....
-        _props_aux_items_advancement (dict[ItemVariableProp, dict[AuxItem, int]]): Dictionary
+        props_aux_relations_advancement (dict[ItemVariableProp, dict[Relation, int]]): Dictionary
+            mapping the item's scored properties to the advancement of their auxiliary relations for
+            the candidate.
+        props_aux_items_advancement (dict[ItemVariableProp, dict[AuxItem, int]]): Dictionary
             item's scored properties to the advancement of their auxiliary items for the candidate.
         properties_advancement (dict[ItemVariableProp, int]): Dictionary mapping the item's
             properties to the advancement of the candidate for the properties.
@@ -65,7 +319,7 @@ class CandidateData:
         relations_satisfying_related_candidate_ids (dict[Relation, set[CandidateId]]): Dictionary
             mapping the item's relations to the set of satisfying related item's candidate ids for
             the candidate.
-        _relations_aux_properties_results (dict[Relation, dict[RelationAuxProp, bool]]): Dictionary
+        relations_aux_properties_results (dict[Relation, dict[RelationAuxProp, bool]]): Dictionary
             mapping the item's relations to the results of the auxiliary properties satisfaction for
             the candidate.
         relations_aux_property_advancement (dict[Relation, int]): Dictionary mapping the item's
@@ -90,9 +344,25 @@ class CandidateData:
             item).
     """
 
+    # Candidates are created for every object of the scene matching an item and updated at each
+    # step, so their instances don't carry a __dict__
+    __slots__ = (
+        "_results",
+        "id",
+        "item",
+        "metadata",
+        "property_advancement",
+        "relation_max_advancement",
+        "relation_min_advancement",
+        "relations_satisfying_related_candidate_ids",
+        "row",
+        "total_max_advancement",
+        "total_min_advancement",
+    )
+
     def __init__(self, c_id: CandidateId, item: TaskItem) -> None:
         """
-        Initialize the candidate's id and item.
+        Initialize the candidate's id and item and allocate its row in the results arrays of the item.
 
         Args:
             c_id (CandidateId): The ID of the candidate.
@@ -100,54 +370,32 @@ class CandidateData:
         """
         self.item = item
         self.id = c_id
+        self._results = item.candidates_results
+        self.row = self._results.allocate_row()
+        self.relations_satisfying_related_candidate_ids = {}
 
         # === Type annotations ===
         # === Properties ===
         self.item: TaskItem
         self.id: CandidateId
+        self._results: CandidatesResults
+        self.row: int
         self.metadata: SimObjMetadata
-        self.base_properties_results: dict[ItemVariableProp, bool]
-        self.props_aux_properties_results = dict[ItemVariableProp, dict[PropAuxProp, bool]]
-        self._props_aux_relations_satisfying_related_candidate_ids: dict[
-            ItemVariableProp, dict[Relation, set[CandidateId]]
-        ]
-        self.props_aux_relations_advancement: dict[ItemVariableProp, dict[Relation, int]]
-        self.props_aux_items_advancement: dict[ItemVariableProp, dict[AuxItem, int]]
-        self.properties_advancement: dict[ItemVariableProp, int]
         self.property_advancement: int
         # === Relations ===
         self.relations_satisfying_related_candidate_ids: dict[Relation, set[CandidateId]]
-        self.relations_aux_properties_results: dict[Relation, dict[RelationAuxProp, bool]]
-        self.relations_aux_property_advancement: dict[Relation, int]
-        self.relations_min_max_advancement: dict[Relation, tuple[int, int]]
         self.relation_min_advancement: int
         self.relation_max_advancement: int
         # === Final advancement ===
         self.total_min_advancement: int
         self.total_max_advancement: int
 
-    @property
-    def _scored_properties(self) -> frozenset[ItemVariableProp]:
-        """
-        Scored properties of the candidate's item.
-
-        Returns:
-            frozenset[ItemVariableProp]: The scored properties of the item.
-        """
-        return self.item.scored_properties
-
-    @property
-    def _relations(self) -> frozenset[Relation]:
-        """
-        Relations of the candidate's item.
-
-        Returns:
-            frozenset[Relation]: The relations of the item.
-        """
-        return self.item.relations
-
     # TODO: Double check all this
-    def update(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> None:
+    def update(
+        self,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        properties_results: dict[ItemVariableProp, bool] | None = None,
+    ) -> None:
         """
         Update the candidate data with the given scene object dictionary.
 
@@ -156,6 +404,10 @@ class CandidateData:
         Args:
             scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
                 objects in the scene to their metadata.
+            properties_results (dict[ItemVariableProp, bool] | None): Results of the scored
+                properties and of their auxiliary properties for the candidate, already evaluated
+                for all the candidates of the item at once. The properties that are missing are
+                evaluated on the candidate's metadata. Defaults to None.
         """
         try:
             self.metadata = scene_objects_dict[self.id]
@@ -165,120 +417,175 @@ class CandidateData:
             ipdb.set_trace()
 
         # === Properties ===
-        self.base_properties_results = self._compute_base_properties_results()
-        self.props_aux_properties_results = self._compute_props_aux_properties_results(self.base_properties_results)
-        # self._props_aux_properties_advancement = self._compute_props_aux_properties_advancement(
-        #     self._props_aux_properties_results
-        # ) # TODO: Delete
-        self.props_aux_properties_advancement = {
-            prop: {
-                aux_prop: aux_prop.maximum_advancement if self.base_properties_results[prop] else 0
-                for aux_prop in prop.auxiliary_properties
-            }
-            for prop in self._scored_properties
-        }
-        self.props_aux_relations_advancement = self._compute_props_aux_relations_advancement(
-            self.base_properties_results,
-            scene_objects_dict,
-        )
-        self.props_aux_items_advancement = self._compute_props_aux_items_advancement(self.base_properties_results)
-
-        self.properties_advancement = self._compute_properties_advancement(
-            self.base_properties_results,
-            self.props_aux_properties_results,
-            self.props_aux_relations_advancement,
-            self.props_aux_items_advancement,
-        )
-        self.property_advancement = sum(self.properties_advancement.values())
+        results = self._results
+        row = self.row
+        property_advancement = 0
+        for prop_col, prop in enumerate(results.layout.scored_properties):
+            is_satisfying = self._is_satisfying(prop, scene_objects_dict, properties_results)
+            results.properties_results[row, prop_col] = is_satisfying
+            prop_advancement = (
+                prop.maximum_advancement
+                if is_satisfying
+                else self._update_prop_auxiliaries(prop_col, scene_objects_dict, properties_results)
+            )
+            results.properties_advancement[row, prop_col] = prop_advancement
+            property_advancement += prop_advancement
+        self.property_advancement = property_advancement
 
         # === Relations ===
         # Note: We can compute a more optimal lower bound on the relation's advancement (min_advancement) by taking into account the fact that several relations might involve the same related item and then computing the relations advancement for each assignment of the related item's candidate
         # TODO? Implement this?
-        self.relations_satisfying_related_candidate_ids = self._compute_relations_satisfying_related_candidate_ids(
-            self._relations,
-            scene_objects_dict,
-        )
-        self.relations_aux_properties_results = self._compute_relations_aux_properties_results(
-            self.relations_satisfying_related_candidate_ids
-        )
-        self.relations_aux_property_advancement = self._compute_relations_aux_property_advancement(
-            self.relations_aux_properties_results
-        )
-
-        self.relations_min_max_advancement = self._compute_relations_min_max_advancement(
-            self.relations_satisfying_related_candidate_ids, self.relations_aux_property_advancement
-        )
-        self.relation_min_advancement = sum(
-            min_adv for (min_adv, _max_adv) in self.relations_min_max_advancement.values()
-        )
-        self.relation_max_advancement = sum(
-            max_adv for (_min_adv, max_adv) in self.relations_min_max_advancement.values()
-        )
+        relation_min_advancement = 0
+        relation_max_advancement = 0
+        for relation_col, relation in enumerate(results.layout.relations):
+            min_advancement, max_advancement = self._update_relation(relation_col, relation, scene_objects_dict)
+            relation_min_advancement += min_advancement
+            relation_max_advancement += max_advancement
+        self.relation_min_advancement = relation_min_advancement
+        self.relation_max_advancement = relation_max_advancement
 
         # === Final advancement ===
         # TODO: Update this: For each relation that is considered satisfied, we need to add the advancement of the inverse relation too. It's not necessarily x2 for the relations because the inverse relation might not have the same max advancement (we need to implement this)
         self.total_min_advancement = self.property_advancement + 1 * self.relation_min_advancement
         self.total_max_advancement = self.property_advancement + 1 * self.relation_max_advancement
 
-    def _compute_base_properties_results(self) -> dict[ItemVariableProp, bool]:
+    def _is_satisfying(
+        self,
+        prop: ItemVariableProp,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        properties_results: dict[ItemVariableProp, bool] | None,
+    ) -> bool:
         """
-        Return the results dictionary of each properties for the candidate.
+        Return True if the candidate satisfies the property.
+
+        Use the result given to the update when the property has already been evaluated, or the
+        result memoized in the scene object table by another item during the step.
+
+        Args:
+            prop (ItemVariableProp): Property to check.
+            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
+                objects in the scene to their metadata.
+            properties_results (dict[ItemVariableProp, bool] | None): Results of the properties
+                given to the update.
 
         Returns:
-            base_properties_results (dict[ItemVariableProp, bool]): Dictionary mapping the item properties
-            to the results of the property satisfaction for the candidate.
+            is_satisfying (bool): Whether the candidate satisfies the property.
         """
-        return {prop: prop.is_object_satisfying(self.metadata) for prop in self._scored_properties}
+        if properties_results is not None:
+            is_satisfying = properties_results.get(prop)
+            if is_satisfying is not None:
+                return is_satisfying
+        return prop.is_object_satisfying_memoized(self.metadata, scene_objects_dict)
 
-    def _compute_props_aux_properties_results(
+    # TODO? Add support for auxiliary properties having auxiliary properties with a recursive way of computing the advancement
+    # TODO: Implement weighted properties
+    def _update_prop_auxiliaries(
         self,
-        base_properties_results: dict[ItemVariableProp, bool],
-    ) -> dict[ItemVariableProp, dict[PropAuxProp, bool]]:
+        prop_col: int,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        properties_results: dict[ItemVariableProp, bool] | None,
+    ) -> int:
         """
-        Return the results dictionary of each auxiliary properties for the candidate.
+        Update the results of the auxiliaries of a property not satisfied by the candidate and return its advancement.
 
-        The results are computed only for auxiliary properties of the property that are not
-        already satisfied by the candidate.
+        The advancement of the property is the sum of the maximum advancement of the satisfied
+        auxiliary properties and of the advancement of the auxiliary relations and items.
 
         Args:
-        base_properties_results (dict[ItemVariableProp, bool]): Dictionary mapping the item
-            properties to the results of the property satisfaction for the candidate.
-
+            prop_col (int): Column of the property in the layout of the item.
+            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
+                objects in the scene to their metadata.
+            properties_results (dict[ItemVariableProp, bool] | None): Results of the properties
+                given to the update.
 
         Returns:
-            aux_properties_results (dict[ItemVariableProp, dict[PropAuxProp, bool]]): Dictionary
-                mapping the item's properties to the results of the auxiliary properties
-                satisfaction for the candidate.
-        """
-        return {
-            prop: {aux_prop: aux_prop.is_object_satisfying(self.metadata) for aux_prop in prop.auxiliary_properties}
-            for prop in self._scored_properties
-            if not base_properties_results[prop]
-        }
+            prop_advancement (int): Advancement of the candidate for the property.
+        """
+        results = self._results
+        layout = results.layout
+        row = self.row
+        prop_advancement = 0
+        for aux_prop, col in layout.props_aux_properties[prop_col]:
+            is_satisfying = self._is_satisfying(aux_prop, scene_objects_dict, properties_results)
+            results.aux_properties_results[row, col] = is_satisfying
+            if is_satisfying:
+                # TODO? Replace aux_prop.maximum_advancement by 1
+                prop_advancement += aux_prop.maximum_advancement
+        # Satisfying related candidates and auxiliary properties results of the auxiliary relations
+        # are not stored
+        for relation, col in layout.props_aux_relations[prop_col]:
+            if relation.compute_satisfying_related_candidate_ids(self.metadata, scene_objects_dict):
+                aux_relation_advancement = relation.maximum_advancement
+            else:
+                # TODO? Replace aux_prop.maximum_advancement by 1
+                aux_relation_advancement = sum(
+                    aux_prop.maximum_advancement
+                    for aux_prop in relation.auxiliary_properties
+                    if aux_prop.is_object_satisfying_memoized(self.metadata, scene_objects_dict)
+                )
+            results.aux_relations_advancement[row, col] = aux_relation_advancement
+            prop_advancement += aux_relation_advancement
+        # The auxiliary items index the advancement of their candidates by related candidate
+        for aux_item, col in layout.props_aux_items[prop_col]:
+            aux_item_advancement = aux_item.compute_max_advancement_for_related_candidate(self.id)
+            results.aux_items_advancement[row, col] = aux_item_advancement
+            prop_advancement += aux_item_advancement
+        return prop_advancement
 
-    def _compute_relations_satisfying_related_candidate_ids(
+    # TODO: Implement weighted relations
+    def _update_relation(
         self,
-        relations: frozenset[Relation],
+        relation_col: int,
+        relation: Relation,
         scene_objects_dict: dict[SimObjId, SimObjMetadata],
-    ) -> dict[Relation, set[CandidateId]]:
+    ) -> tuple[int, int]:
         """
-        Return the satisfying related candidates ids for each relation of the item.
+        Update the results of a relation for the candidate and return its minimum and maximum advancement.
+
+        The auxiliary properties of the relation are only checked when the relation is not
+        satisfied by every related item's candidate (otherwise the relation is satisfied whatever
+        the assignment).
+
+        Minimum and maximum advancement meaning:
+        - The minimum advancement of the candidate for the relation is its maximum advancement if
+        all related item's candidate are satisfying (so the relation will be satisfied whatever
+        the assignment).
+        - The maximum advancement of the candidate for the relation is its maximum advancement if
+        there is at least one semi-satisfying related item's candidate (i.e. the set of satisfying
+        objects is not empty but they might not be part of the optimal global assignment).
+        Otherwise, both are the advancement of the auxiliary properties of the relation.
 
         Args:
-            relations (frozenset[Relation]): The relations for which to compute the satisfying
-                related candidates ids.
+            relation_col (int): Column of the relation in the layout of the item.
+            relation (Relation): The relation.
             scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
                 objects in the scene to their metadata.
 
         Returns:
-            relations_satisfying_related_candidate_ids (dict[Relation, set[CandidateId]]):
-                Dictionary mapping the item's relations to the set of satisfying related item's
-                candidate ids for the candidate.
+            min_advancement (int): Minimum advancement of the candidate for the relation.
+            max_advancement (int): Maximum advancement of the candidate for the relation.
         """
-        return {
-            relation: relation.compute_satisfying_related_candidate_ids(self.metadata, scene_objects_dict)
-            for relation in relations
-        }
+        results = self._results
+        row = self.row
+        satisfying_related_candidate_ids = relation.compute_satisfying_related_candidate_ids(
+            self.metadata, scene_objects_dict
+        )
+        self.relations_satisfying_related_candidate_ids[relation] = satisfying_related_candidate_ids
+        all_satisfying = len(satisfying_related_candidate_ids) == len(relation.related_item.candidates_data)
+        aux_property_advancement = 0
+        if not all_satisfying:
+            for aux_prop, col in results.layout.relations_aux_properties[relation_col]:
+                is_satisfying = aux_prop.is_object_satisfying_memoized(self.metadata, scene_objects_dict)
+                results.relations_aux_properties_results[row, col] = is_satisfying
+                if is_satisfying:
+                    # TODO? Replace aux_prop.maximum_advancement by 1
+                    aux_property_advancement += aux_prop.maximum_advancement
+        min_advancement = relation.maximum_advancement if all_satisfying else aux_property_advancement
+        max_advancement = relation.maximum_advancement if satisfying_related_candidate_ids else aux_property_advancement
+        results.relations_all_satisfying[row, relation_col] = all_satisfying
+        results.relations_aux_property_advancement[row, relation_col] = aux_property_advancement
+        results.relations_min_max_advancement[row, relation_col] = (min_advancement, max_advancement)
+        return min_advancement, max_advancement
 
     # TODO: Implement weighted relations
     def compute_relation_advancement_for_related_candidate(
@@ -297,273 +604,204 @@ class CandidateData:
             relation_advancement (int): The advancement of the candidate for the relation when the
                 related item's candidate is the given candidate.
         """
-        return (
-            relation.maximum_advancement
-            if related_candidate_id in self.relations_satisfying_related_candidate_ids[relation]
-            else self.relations_aux_property_advancement[relation]
-        )
+        if related_candidate_id in self.relations_satisfying_related_candidate_ids[relation]:
+            return relation.maximum_advancement
+        return self.get_relation_aux_property_advancement(relation)
 
-    def _compute_props_aux_relations_advancement(
-        self,
-        base_properties_results: dict[ItemVariableProp, bool],
-        scene_objects_dict: dict[SimObjId, SimObjMetadata],
-    ) -> dict[ItemVariableProp, dict[Relation, int]]:
+    def get_relation_aux_property_advancement(self, relation: Relation) -> int:
         """
-        Return the advancement of the candidate for each auxiliary relation of the item's properties.
+        Return the advancement of the auxiliary properties of the relation for the candidate.
 
         Args:
-            base_properties_results (dict[ItemVariableProp, bool]): Dictionary mapping the item
-                properties to the results of the property satisfaction for the candidate.
-            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
-                objects in the scene to their metadata.
+            relation (Relation): One of the relations of the item.
 
         Returns:
-            props_aux_relations_advancement (dict[ItemVariableProp, dict[Relation, int]]): Dictionary
-                mapping the item's properties to the dictionary mapping the item's relations to the
-                advancement of the candidate for the relations.
+            aux_property_advancement (int): Advancement of the auxiliary properties of the
+                relation, 0 if the relation is satisfied by every related item's candidate.
         """
-        props_aux_relations_satisfying_related_candidate_ids: dict[ItemVariableProp, dict[Relation, set[CandidateId]]]
-        props_aux_relations_satisfying_related_candidate_ids = {
-            prop: self._compute_relations_satisfying_related_candidate_ids(
-                prop.auxiliary_relations,
-                scene_objects_dict,
-            )
-            for prop in self._scored_properties
-            if not base_properties_results[prop]
-        }
-        # We keep only properties that are not satisfied by the candidate
+        results = self._results
+        return int(results.relations_aux_property_advancement[self.row, results.layout.relation_columns[relation]])
 
-        props_aux_relations_aux_properties_results: dict[ItemVariableProp, dict[Relation, dict[RelationAuxProp, bool]]]
-        props_aux_relations_aux_properties_results = {
-            prop: self._compute_relations_aux_properties_results(aux_relations_satisfying_related_candidate_ids)
-            for prop, aux_relations_satisfying_related_candidate_ids in props_aux_relations_satisfying_related_candidate_ids.items()
-        }
-        # Relations that are satisfied by all related items' candidates are dropped
+    def get_relation_max_advancement(self, relation: Relation) -> int:
+        """
+        Return the maximum advancement of the candidate for the relation.
 
-        props_aux_relations_aux_property_advancement: dict[ItemVariableProp, dict[Relation, int]]
-        props_aux_relations_aux_property_advancement = {
-            prop: self._compute_relations_aux_property_advancement(props_aux_relations_aux_properties_results[prop])
-            for prop in props_aux_relations_aux_properties_results
-        }
+        Args:
+            relation (Relation): One of the relations of the item.
 
-        props_aux_relations_advancement: dict[ItemVariableProp, dict[Relation, int]]
-        props_aux_relations_advancement = {
-            prop: {
-                relation: relation.maximum_advancement
-                if satisfying_related_candidate_ids
-                else props_aux_relations_aux_property_advancement[prop][relation]
-                for relation, satisfying_related_candidate_ids in aux_relations_satisfying_related_candidate_ids.items()
-            }
-            for prop, aux_relations_satisfying_related_candidate_ids in props_aux_relations_satisfying_related_candidate_ids.items()
-        }
+        Returns:
+            max_advancement (int): Maximum advancement of the candidate for the relation, whatever
+                the related item's candidate.
+        """
+        results = self._results
+        return int(results.relations_min_max_advancement[self.row, results.layout.relation_columns[relation], 1])
 
-        return props_aux_relations_advancement
+    # === Dictionary views of the results ===
+    @property
+    def base_properties_results(self) -> dict[ItemVariableProp, bool]:
+        """
+        Results of the scored properties for the candidate, built from its row of the results arrays.
+
+        Returns:
+            base_properties_results (dict[ItemVariableProp, bool]): Dictionary mapping the item
+                properties to the results of the property satisfaction for the candidate.
+        """
+        layout = self._results.layout
+        return dict(zip(layout.scored_properties, self._results.properties_results[self.row].tolist(), strict=True))
+
+    @property
+    def properties_advancement(self) -> dict[ItemVariableProp, int]:
+        """
+        Advancement of the candidate for the scored properties.
+
+        Returns:
+            properties_advancement (dict[ItemVariableProp, int]): Dictionary mapping the item
+                properties to the scores of the candidate for the properties.
+        """
+        layout = self._results.layout
+        return dict(
+            zip(layout.scored_properties, self._results.properties_advancement[self.row].tolist(), strict=True)
+        )
 
-    # TODO: Double and triple check this method
-    # TODO? Create methods to separate the computation of the relation's auxiliary properties results and the relation's advancement?
-    def _compute_props_aux_items_advancement(
+    def _build_props_aux_view[T](
         self,
-        base_properties_results: dict[ItemVariableProp, bool],
-    ) -> dict[ItemVariableProp, dict[AuxItem, int]]:
+        props_aux_columns: tuple[tuple[tuple[T, int], ...], ...],
+        aux_array: NDArray,
+    ) -> dict[ItemVariableProp, dict[T, Any]]:
         """
-        Return the advancement of the auxiliary items for the candidate for each property.
+        Return the results of the auxiliaries of the properties not satisfied by the candidate.
 
         Args:
-            base_properties_results (dict[ItemVariableProp, bool]): Dictionary mapping the item
-                properties to the results of the property satisfaction for the candidate.
+            props_aux_columns (tuple[tuple[tuple[T, int], ...], ...]): Auxiliaries of each scored
+                property with their column.
+            aux_array (NDArray): Results array of the auxiliaries.
 
         Returns:
-            props_aux_items_advancement (dict[ItemVariableProp, dict[AuxItem, int]]): Dictionary
-                mapping the item's properties to the advancement of the auxiliary items for the
-                candidate.
+            props_aux_results (dict[ItemVariableProp, dict[T, Any]]): Dictionary mapping the
+                unsatisfied properties to the results of their auxiliaries.
         """
-        # Extract the advancement of every candidate of the auxiliary items when the relation's
-        # related items' candidate is this candidate
-        aux_items_advancement: dict[ItemVariableProp, dict[AuxItem, dict[CandidateId, int]]]
-        aux_items_advancement = {
-            prop: {aux_item: {} for aux_item in prop.auxiliary_items}
-            for prop in self._scored_properties
-            if not base_properties_results[prop]
-        }
-        for prop in aux_items_advancement:
-            for aux_item in prop.auxiliary_items:
-                # TODO? Get this data from the inverse property's results instead? -> Not possible since the relation's results are not computed
-                for aux_candidate_id, aux_candidate_data in aux_item.candidates_data.items():
-                    # Add properties advancement
-                    aux_advancement = aux_candidate_data.property_advancement
-                    # Add relation advancement
-                    for relation in aux_item.relations:
-                        aux_advancement += aux_candidate_data.compute_relation_advancement_for_related_candidate(
-                            relation, self.id
-                        )
-                    aux_items_advancement[prop][aux_item][aux_candidate_id] = aux_advancement
-
-        # Keep only the maximum advancement for each auxiliary item
+        layout = self._results.layout
+        aux_row = aux_array[self.row].tolist()
+        properties_results = self._results.properties_results[self.row].tolist()
         return {
-            prop: {
-                aux_item: max(
-                    aux_items_advancement[prop][aux_item][candidate_id]
-                    for candidate_id in aux_items_advancement[prop][aux_item]
-                )
-                for aux_item in prop.auxiliary_items
-            }
-            for prop in aux_items_advancement
+            prop: {aux: aux_row[col] for aux, col in props_aux_columns[prop_col]}
+            for prop_col, prop in enumerate(layout.scored_properties)
+            if not properties_results[prop_col]
         }
 
-    # TODO? Add support for auxiliary properties having auxiliary properties with a recursive way of computing the advancement
-    # TODO: Implement weighted properties
-    @staticmethod
-    def _compute_properties_advancement(
-        base_properties_results: dict[ItemVariableProp, bool],
-        props_aux_properties_results: dict[ItemVariableProp, dict[PropAuxProp, bool]],
-        props_aux_relations_advancement: dict[ItemVariableProp, dict[Relation, int]],
-        props_aux_items_advancement: dict[ItemVariableProp, dict[AuxItem, int]],
-    ) -> dict[ItemVariableProp, int]:
+    @property
+    def props_aux_properties_results(self) -> dict[ItemVariableProp, dict[PropAuxProp, bool]]:
         """
-        Return the scores of the candidate for the item's properties.
+        Results of the auxiliary properties of the properties not satisfied by the candidate.
 
-        If the property is satisfied by the candidate, the score is the maximum advancement of the
-        property, otherwise it is the sum of the maximum advancement of the auxiliary properties and
-        the advancement of the auxiliary items.
-
-        Args:
-            base_properties_results (dict[ItemVariableProp, bool]): Dictionary mapping the item
-                properties to the results of the property satisfaction for the candidate.
-            props_aux_properties_results (dict[ItemVariableProp, dict[ItemVariableProp, bool]]):
-                Dictionary mapping the item's properties to the results of the auxiliary properties
+        Returns:
+            aux_properties_results (dict[ItemVariableProp, dict[PropAuxProp, bool]]): Dictionary
+                mapping the item's properties to the results of the auxiliary properties
                 satisfaction for the candidate.
-            props_aux_relations_advancement (dict[ItemVariableProp, dict[Relation, int]]):
-                Dictionary mapping the item's properties to the advancement of the candidate for the
-                auxiliary relations of the properties.
+        """
+        return self._build_props_aux_view(self._results.layout.props_aux_properties, self._results.aux_properties_results)
+
+    @property
+    def props_aux_relations_advancement(self) -> dict[ItemVariableProp, dict[Relation, int]]:
+        """
+        Advancement of the auxiliary relations of the properties not satisfied by the candidate.
+
+        Returns:
+            props_aux_relations_advancement (dict[ItemVariableProp, dict[Relation, int]]): Dictionary
+                mapping the item's properties to the dictionary mapping the item's relations to the
+                advancement of the candidate for the relations.
+        """
+        return self._build_props_aux_view(
+            self._results.layout.props_aux_relations, self._results.aux_relations_advancement
+        )
+
+    @property
+    def props_aux_items_advancement(self) -> dict[ItemVariableProp, dict[AuxItem, int]]:
+        """
+        Advancement of the auxiliary items of the properties not satisfied by the candidate.
+
+        Returns:
             props_aux_items_advancement (dict[ItemVariableProp, dict[AuxItem, int]]): Dictionary
                 mapping the item's properties to the advancement of the auxiliary items for the
                 candidate.
+        """
+        return self._build_props_aux_view(self._results.layout.props_aux_items, self._results.aux_items_advancement)
 
-        Returns:
-            properties_advancement (dict[ItemVariableProp, int]): Dictionary mapping the item
-                properties to the scores of the candidate for the properties.
+    @property
+    def props_aux_properties_advancement(self) -> dict[ItemVariableProp, dict[PropAuxProp, int]]:
         """
-        # TODO? Replace aux_prop.maximum_advancement by 1
-        aux_prop_advancement = {
-            prop: sum(
-                aux_prop.maximum_advancement
-                for aux_prop, result in props_aux_properties_results[prop].items()
-                if result
-            )
-            for prop in props_aux_properties_results
-        }
-        aux_relations_advancement = {
-            prop: sum(advancement for advancement in aux_relations_advancement.values())
-            for prop, aux_relations_advancement in props_aux_relations_advancement.items()
-        }
+        Advancement of the auxiliary properties of the item's properties for the candidate.
 
-        aux_item_advancement = {
-            prop: sum(advancement for advancement in aux_items_advancement.values())
-            for prop, aux_items_advancement in props_aux_items_advancement.items()
-        }
+        Only used for debugging, so it is built on demand from the properties results.
 
+        Returns:
+            props_aux_properties_advancement (dict[ItemVariableProp, dict[PropAuxProp, int]]):
+                Dictionary mapping the item's properties to the advancement of their auxiliary
+                properties for the candidate.
+        """
+        base_properties_results = self.base_properties_results
         return {
-            prop: prop.maximum_advancement
-            if base_properties_results[prop]
-            else aux_prop_advancement[prop] + aux_relations_advancement[prop] + aux_item_advancement[prop]
+            prop: {
+                aux_prop: aux_prop.maximum_advancement if base_properties_results[prop] else 0
+                for aux_prop in prop.auxiliary_properties
+            }
             for prop in base_properties_results
         }
 
-    def _compute_relations_aux_properties_results(
-        self,
-        relations_satisfying_related_candidate_ids: dict[Relation, set[CandidateId]],
-    ) -> dict[Relation, dict[RelationAuxProp, bool]]:
+    @property
+    def relations_aux_properties_results(self) -> dict[Relation, dict[RelationAuxProp, bool]]:
         """
-        Return the results dictionary of each relation's auxiliary properties for the candidate.
-
-        The results are computed only for auxiliary properties of the relation that are not
-        satisfied by every related item's candidate (we don't need to compute this information
-        in that case since the relation will be satisfied whatever the assignment).
-
-        Args:
-            relations_satisfying_related_candidate_ids (dict[Relation, set[CandidateId]]):
-                Dictionary mapping the item's relations to the set of satisfying related item's
-                candidate ids for the candidate.
+        Results of the auxiliary properties of the relations not satisfied by every related item's candidate.
 
         Returns:
             relations_aux_properties_results (dict[Relation, dict[RelationAuxProp, bool]]): Dictionary
                 mapping the item's relations to the results of the auxiliary properties satisfaction
                 for the candidate.
         """
+        results = self._results
+        aux_row = results.relations_aux_properties_results[self.row].tolist()
+        relations_all_satisfying = results.relations_all_satisfying[self.row].tolist()
         return {
-            relation: {
-                aux_prop: aux_prop.is_object_satisfying(self.metadata) for aux_prop in relation.auxiliary_properties
-            }
-            for relation, satisfying_related_candidate_ids in relations_satisfying_related_candidate_ids.items()
-            if len(satisfying_related_candidate_ids) != len(relation.related_item.candidate_ids)
+            relation: {aux_prop: aux_row[col] for aux_prop, col in results.layout.relations_aux_properties[relation_col]}
+            for relation_col, relation in enumerate(results.layout.relations)
+            if not relations_all_satisfying[relation_col]
         }
 
-    @staticmethod
-    def _compute_relations_aux_property_advancement(
-        relations_aux_properties_results: dict[Relation, dict[RelationAuxProp, bool]],
-    ) -> dict[Relation, int]:
+    @property
+    def relations_aux_property_advancement(self) -> dict[Relation, int]:
         """
-        Return the relation's auxiliary property advancement for the candidate.
-
-        Args:
-            relations_aux_properties_results (dict[Relation, dict[RelationAuxProp, bool]]):
-                Dictionary mapping the item's relations to the results of the auxiliary properties
-                satisfaction for the candidate.
+        Advancement of the auxiliary properties of the relations not satisfied by every related item's candidate.
 
         Returns:
             relations_aux_property_advancement (dict[Relation, int]): Dictionary mapping the item's
             relations to the relation's auxiliary property advancement for the candidate.
         """
-        # TODO? Replace aux_prop.maximum_advancement by 1
+        results = self._results
+        aux_property_advancement = results.relations_aux_property_advancement[self.row].tolist()
+        relations_all_satisfying = results.relations_all_satisfying[self.row].tolist()
         return {
-            relation: sum(aux_prop.maximum_advancement for aux_prop, result in aux_properties_results.items() if result)
-            for relation, aux_properties_results in relations_aux_properties_results.items()
+            relation: aux_property_advancement[relation_col]
+            for relation_col, relation in enumerate(results.layout.relations)
+            if not relations_all_satisfying[relation_col]
         }
 
-    # TODO: Implement weighted relations
-    @staticmethod
-    def _compute_relations_min_max_advancement(
-        relations_satisfying_related_candidate_ids: dict[Relation, set[CandidateId]],
-        relations_aux_property_advancement: dict[Relation, int],
-    ) -> dict[Relation, tuple[int, int]]:
+    @property
+    def relations_min_max_advancement(self) -> dict[Relation, tuple[int, int]]:
         """
-        Return the minimum and the maximum advancement of the candidate for each item's relations.
-
-        This advancement takes into account the auxiliary properties of the relations when
-        necessary, ie when the relation is not satisfied by every related item's candidate.
-
-        Minimum and maximum advancement meaning:
-        - The minimum advancement of the candidate for the item's relations is the sum of the
-        advancements of the relations where all related item's candidate are satisfying (so the
-        relation will be satisfied whatever the assignment).
-        - The maximum advancement of the candidate for the item's relations is the sum of the
-        advancements of the relations where there is at least one semi-satisfying related item's
-        candidate (i.e. the set of satisfying objects is not empty but they might not be part of the
-        optimal global assignment).
-
-        Args:
-            relations_satisfying_related_candidate_ids (dict[Relation, set[CandidateId]]):
-                Dictionary mapping the item's relations to the set of satisfying related item's
-                candidate ids for the candidate.
-            relations_aux_property_advancement (dict[Relation, int]): Dictionary mapping the item's
-                relations to the relation's auxiliary property advancement for the candidate.
+        Minimum and maximum advancement of the candidate for each item's relations.
 
         Returns:
             relations_min_max_scores (dict[Relation, tuple[int, int]]): Dictionary mapping the
                 item's relations to the minimum and maximum scores of the candidate for the
                 relations in this order.
         """
+        results = self._results
         return {
-            relation: (
-                relation.maximum_advancement
-                if len(relations_satisfying_related_candidate_ids[relation]) == len(relation.related_item.candidate_ids)
-                else relations_aux_property_advancement[relation],
-                relation.maximum_advancement
-                if relations_satisfying_related_candidate_ids[relation]
-                else relations_aux_property_advancement[relation],
+            relation: tuple(min_max_advancement)
+            for relation, min_max_advancement in zip(
+                results.layout.relations, results.relations_min_max_advancement[self.row].tolist(), strict=True
             )
-            for relation in relations_satisfying_related_candidate_ids
-        }
+        }  # type: ignore
 
     # TODO: Update to make printable for the logs?
     def make_info_dict(self) -> dict[str, Any]:
@@ -883,7 +1121,11 @@ class SimpleItem(ABC):
                 their data.
         """
 
-    def update_candidates_data(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> None:
+    def update_candidates_data(
+        self,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        changed_object_ids: set[SimObjId] | None = None,
+    ) -> bool:
         """
         Update the data of the candidates of the item with the given scene object dictionary.
 
@@ -892,13 +1134,91 @@ class SimpleItem(ABC):
         Args:
             scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
                 objects in the scene to their metadata.
+            changed_object_ids (set[SimObjId] | None): Ids of the objects whose metadata changed
+                since the last update. Only the data of those candidates is updated. If None, the
+                data of every candidate is updated.
+
+        Returns:
+            updated (bool): Whether the data of at least one candidate has been updated.
         """
-        for candidate_data in self.candidates_data.values():
-            candidate_data.update(scene_objects_dict)
+        if changed_object_ids is None:
+            updated_candidates_data = list(self.candidates_data.values())
+        else:
+            updated_candidates_data = [
+                self.candidates_data[obj_id] for obj_id in changed_object_ids if obj_id in self.candidates_data
+            ]
+        if not updated_candidates_data:
+            return False
+        profiling.count(CounterName.CANDIDATES_SCORED, len(updated_candidates_data))
+
+        if (
+            isinstance(scene_objects_dict, SceneObjectTable)
+            and len(updated_candidates_data) >= BATCH_EVALUATION_MIN_CANDIDATES
+        ):
+            candidates_properties_results = self._evaluate_properties_many(
+                scene_objects_dict, [candidate_data.id for candidate_data in updated_candidates_data]
+            )
+            for candidate_data, properties_results in zip(
+                updated_candidates_data, candidates_properties_results, strict=True
+            ):
+                candidate_data.update(scene_objects_dict, properties_results)
+        else:
+            for candidate_data in updated_candidates_data:
+                candidate_data.update(scene_objects_dict)
 
         self.step_max_property_advancement = max(
             candidate_data.property_advancement for candidate_data in self.candidates_data.values()
         )
+        return True
+
+    def _evaluate_properties_many(
+        self,
+        scene_object_table: SceneObjectTable,
+        candidate_ids: list[CandidateId],
+    ) -> list[dict[ItemVariableProp, bool]]:
+        """
+        Evaluate the scored properties and their auxiliary properties for all the given candidates at once.
+
+        Like in the candidate data, the auxiliary properties of a property are only evaluated for
+        the candidates that don't satisfy the property.
+
+        The candidates missing from the table are not evaluated: their results are empty, so their
+        properties are checked by the candidate update like without batch evaluation.
+
+        Args:
+            scene_object_table (SceneObjectTable): Table of the objects of the scene.
+            candidate_ids (list[CandidateId]): Ids of the candidates to evaluate.
+
+        Returns:
+            candidates_properties_results (list[dict[ItemVariableProp, bool]]): Results of the
+                properties for each candidate, in the order of the given candidate ids.
+        """
+        row_index = scene_object_table.row_index
+        candidates_properties_results: list[dict[ItemVariableProp, bool]] = [{} for _ in candidate_ids]
+        evaluated_results = [
+            properties_results
+            for c_id, properties_results in zip(candidate_ids, candidates_properties_results, strict=True)
+            if c_id in row_index
+        ]
+        if not evaluated_results:
+            return candidates_properties_results
+        rows = np.fromiter(
+            (row_index[c_id] for c_id in candidate_ids if c_id in row_index),
+            dtype=np.intp,
+            count=len(evaluated_results),
+        )
+        for prop in self.scored_properties:
+            are_satisfying = prop.evaluate_many_memoized(scene_object_table, rows)
+            for properties_results, is_satisfying in zip(evaluated_results, are_satisfying.tolist(), strict=True):
+                properties_results[prop] = is_satisfying
+            if not prop.auxiliary_properties or are_satisfying.all():
+                continue
+            unsatisfying_indices = np.flatnonzero(~are_satisfying)
+            for aux_prop in prop.auxiliary_properties:
+                aux_are_satisfying = aux_prop.evaluate_many_memoized(scene_object_table, rows[unsatisfying_indices])
+                for idx, is_satisfying in zip(unsatisfying_indices.tolist(), aux_are_satisfying.tolist(), strict=True):
+                    evaluated_results[idx][aux_prop] = is_satisfying
+        return candidates_properties_results
 
 
 # TODO? Add support for giving some score for semi satisfied relations and using this info in the selection of interesting objects/assignments
@@ -935,6 +1255,10 @@ class TaskItem(SimpleItem):
         candidate_ids (set[SimObjId]): Set of candidate ids of the item.
         candidates_data (dict[CandidateId, CandidateData]): Dictionary mapping the candidate ids to
             their data.
+        results_layout (ItemResultsLayout): Columns of the scored properties, relations and
+            auxiliaries in the results arrays of the candidates.
+        candidates_results (CandidatesResults): Results arrays of the candidates, with one row per
+            candidate.
         step_max_property_advancement (int): Maximum advancement of the item in the task at the
             current step when counting only properties, i.e. the maximum property advancement of the
             candidates. It is the "maximum" advancement of the properties, because it doesn't take
@@ -1008,12 +1332,18 @@ class TaskItem(SimpleItem):
         # === Initialize the maximum advancement of the item and its properties and relations ===
         self._init_maximum_advancement()
 
+        # === Assign the columns of the results arrays of the candidates ===
+        self.results_layout = ItemResultsLayout(self.scored_properties, self.relations)
+        self.candidates_results = CandidatesResults(self.results_layout)
+
         # === Type annotations ===
         self.relations: frozenset[Relation]
         self.props_auxiliary_items: dict[ItemVariableProp, frozenset[AuxItem]]
         self.props_auxiliary_relations: dict[ItemVariableProp, frozenset[Relation]]
         self.props_auxiliary_properties: dict[ItemVariableProp, frozenset[PropAuxProp]]
         self.relations_auxiliary_properties: dict[Relation, frozenset[RelationAuxProp]]
+        self.results_layout: ItemResultsLayout
+        self.candidates_results: CandidatesResults
         self.step_max_relation_advancement: int
 
     # TODO: Replace to hold a set of relations instead of dict of relation id -> relation
@@ -1088,28 +1418,93 @@ class TaskItem(SimpleItem):
                 their data.
         """
         candidate_ids = self._get_candidate_ids(scene_objects_dict)
+        self._reset_candidates_results(len(candidate_ids))
         return {c_id: CandidateData(c_id, self) for c_id in candidate_ids}
 
-    def update_candidates_data(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> None:
+    def _reset_candidates_results(self, nb_candidates: int) -> None:
+        """
+        Allocate the results arrays of the candidates of the new episode.
+
+        The arrays of the last episode are not reused, so the candidate data of its last task info
+        keep their results after the reset. The columns are only assigned again if the relations of
+        the item changed since they were assigned, like the relations of the auxiliary items that
+        are dropped when the task is reset.
+
+        Args:
+            nb_candidates (int): Number of candidates of the new episode.
+        """
+        if not self.results_layout.matches(self.scored_properties, self.relations):
+            self.results_layout = ItemResultsLayout(self.scored_properties, self.relations)
+        self.candidates_results = CandidatesResults(self.results_layout, nb_candidates)
+
+    def update_candidates_data(
+        self,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        changed_object_ids: set[SimObjId] | None = None,
+    ) -> bool:
         """
         Update the data of the candidates of the item with the given scene object dictionary.
 
         Also update the auxiliary items' candidates data.
 
+        When the ids of the changed objects are given, only the candidates whose data can depend on
+        those objects are updated: the changed candidates themselves, or every candidate if the
+        data of an auxiliary item changed or if a relation reading the metadata of the related
+        objects has a changed related candidate.
+
         Args:
             scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
                 objects in the scene to their metadata.
+            changed_object_ids (set[SimObjId] | None): Ids of the objects whose metadata changed
+                since the last update. If None, the data of every candidate is updated.
+
+        Returns:
+            updated (bool): Whether the data of at least one candidate has been updated.
         """
+        aux_items_updated = False
         for auxiliary_item_set in self.props_auxiliary_items.values():
             for auxiliary_item in auxiliary_item_set:
-                auxiliary_item.update_candidates_data(scene_objects_dict)
-        super().update_candidates_data(scene_objects_dict)
-        self.step_max_relation_advancement = max(
-            candidate_data.relation_max_advancement for candidate_data in self.candidates_data.values()
+                aux_items_updated |= auxiliary_item.update_candidates_data(scene_objects_dict, changed_object_ids)
+        if changed_object_ids is not None and (
+            aux_items_updated or self._has_changed_related_objects(changed_object_ids)
+        ):
+            changed_object_ids = None
+
+        updated = super().update_candidates_data(scene_objects_dict, changed_object_ids)
+        if updated:
+            self.step_max_relation_advancement = max(
+                candidate_data.relation_max_advancement for candidate_data in self.candidates_data.values()
+            )
+        return updated
+
+    def _has_changed_related_objects(self, changed_object_ids: set[SimObjId]) -> bool:
+        """
+        Return True if one of the changed objects can change the relations results of every candidate.
+
+        This is the case when a relation (or auxiliary relation) reading the metadata of the
+        related objects has a changed object among the related item's candidates.
+
+        Args:
+            changed_object_ids (set[SimObjId]): Ids of the objects whose metadata changed.
+
+        Returns:
+            has_changed_related_objects (bool): True if every candidate of the item has to be
+                updated.
+        """
+        relations = itertools.chain(self.relations, *self.props_auxiliary_relations.values())
+        return any(
+            obj_id in relation.related_item.candidates_data
+            for relation in relations
+            if relation.depends_on_related_metadata
+            for obj_id in changed_object_ids
         )
 
     # TODO: Double check the interesting candidates computation
-    def compute_interesting_candidates(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> set[CandidateId]:
+    def compute_interesting_candidates(
+        self,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        changed_object_ids: set[SimObjId] | None = None,
+    ) -> set[CandidateId]:
         """
         Return the set of interesting candidates for the item.
 
@@ -1119,11 +1514,14 @@ class TaskItem(SimpleItem):
         Args:
             scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary containing the metadata of
                 the objects in the scene. The keys are the object ids.
+            changed_object_ids (set[SimObjId] | None): Ids of the objects whose metadata changed
+                since the last update. If None, the data of every candidate is updated.
 
         Returns:
             interesting_candidates (set[CandidateId]): Set of interesting candidates for the item.
         """
-        self.update_candidates_data(scene_objects_dict)
+        with profiling.span(SpanName.UPDATE_CANDIDATES_DATA):
+            self.update_candidates_data(scene_objects_dict, changed_object_ids)
 
         # TODO: Double check this
         max_of_min_advancement = max(
@@ -1209,9 +1607,12 @@ class AuxItem(TaskItem):
             relation_descriptions = {}
         self._relation_descriptions = relation_descriptions
 
+        self._advancement_index = None
+
         # === Type annotations ===
         self.linked_prop: ItemVariableProp
         self._relation_descriptions = relation_descriptions
+        self._advancement_index: tuple[list[tuple[int, CandidateId]], dict[CandidateId, set[CandidateId]]] | None
 
     def initialize_relations(self, linked_item_id: ItemId) -> None:
         """
@@ -1235,6 +1636,106 @@ class AuxItem(TaskItem):
 
         super().__init__(self.t_id, self.properties, relations)
 
+    def update_candidates_data(
+        self,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        changed_object_ids: set[SimObjId] | None = None,
+    ) -> bool:
+        """
+        Update the data of the candidates of the auxiliary item and invalidate the advancement index.
+
+        Args:
+            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping the id of the
+                objects in the scene to their metadata.
+            changed_object_ids (set[SimObjId] | None): Ids of the objects whose metadata changed
+                since the last update. If None, the data of every candidate is updated.
+
+        Returns:
+            updated (bool): Whether the data of at least one candidate has been updated.
+        """
+        with profiling.span(SpanName.UPDATE_AUXILIARY_ITEMS):
+            updated = super().update_candidates_data(scene_objects_dict, changed_object_ids)
+        if updated:
+            self._advancement_index = None
+        return updated
+
+    def compute_max_advancement_for_related_candidate(self, related_candidate_id: CandidateId) -> int:
+        """
+        Return the maximum advancement of the candidates when the linked item is assigned the given candidate.
+
+        The advancement of a candidate is its property advancement plus the advancement of its
+        relations with the given candidate of the linked item. Only the candidates satisfying a
+        relation with the given candidate are checked one by one, the best of the other candidates
+        is read from the advancement index.
+
+        Args:
+            related_candidate_id (CandidateId): Candidate of the linked item.
+
+        Returns:
+            max_advancement (int): Maximum advancement of the candidates of the auxiliary item.
+        """
+        if not self.relations:
+            return self.step_max_property_advancement
+        if self._advancement_index is None:
+            self._advancement_index = self._build_advancement_index()
+        sorted_unrelated_advancements, related_candidates_index = self._advancement_index
+
+        related_aux_candidate_ids = related_candidates_index.get(related_candidate_id, set())
+        advancements = [
+            self._compute_candidate_advancement(aux_candidate_id, related_candidate_id)
+            for aux_candidate_id in related_aux_candidate_ids
+        ]
+        # Best candidate that doesn't satisfy any relation with the related candidate
+        for unrelated_advancement, aux_candidate_id in sorted_unrelated_advancements:
+            if aux_candidate_id not in related_aux_candidate_ids:
+                advancements.append(unrelated_advancement)
+                break
+        return max(advancements)
+
+    def _compute_candidate_advancement(self, aux_candidate_id: CandidateId, related_candidate_id: CandidateId) -> int:
+        """
+        Return the advancement of a candidate when the linked item is assigned the given candidate.
+
+        Args:
+            aux_candidate_id (CandidateId): Candidate of the auxiliary item.
+            related_candidate_id (CandidateId): Candidate of the linked item.
+
+        Returns:
+            advancement (int): Property advancement of the candidate plus the advancement of its
+                relations with the related candidate.
+        """
+        aux_candidate_data = self.candidates_data[aux_candidate_id]
+        return aux_candidate_data.property_advancement + sum(
+            aux_candidate_data.compute_relation_advancement_for_related_candidate(relation, related_candidate_id)
+            for relation in self.relations
+        )
+
+    def _build_advancement_index(
+        self,
+    ) -> tuple[list[tuple[int, CandidateId]], dict[CandidateId, set[CandidateId]]]:
+        """
+        Build the advancement index of the candidates of the auxiliary item.
+
+        Returns:
+            sorted_unrelated_advancements (list[tuple[int, CandidateId]]): Advancement of each
+                candidate when it doesn't satisfy any relation with the linked item's candidate,
+                sorted by decreasing advancement.
+            related_candidates_index (dict[CandidateId, set[CandidateId]]): Map of the linked
+                item's candidates to the candidates satisfying at least one relation with them.
+        """
+        unrelated_advancements: list[tuple[int, CandidateId]] = []
+        related_candidates_index: dict[CandidateId, set[CandidateId]] = {}
+        for aux_candidate_id, aux_candidate_data in self.candidates_data.items():
+            unrelated_advancement = aux_candidate_data.property_advancement + sum(
+                aux_candidate_data.get_relation_aux_property_advancement(relation) for relation in self.relations
+            )
+            unrelated_advancements.append((unrelated_advancement, aux_candidate_id))
+            for relation in self.relations:
+                for related_candidate_id in aux_candidate_data.relations_satisfying_related_candidate_ids[relation]:
+                    related_candidates_index.setdefault(related_candidate_id, set()).add(aux_candidate_id)
+        unrelated_advancements.sort(key=operator.itemgetter(0), reverse=True)
+        return unrelated_advancements, related_candidates_index
+
     def __str__(self) -> str:
         return f"AuxItem({self.id})"
 
@@ -1250,6 +1751,9 @@ class ItemOverlapClass:
     """
     A group of items whose sets of candidates overlap.
 
+    The valid assignments are stored compactly as tuples of indices in candidate_ids (one index per
+    item, in the order of items) and are only converted to Assignment dictionaries when needed.
+
     Attributes:
         items (list[TaskItem]): The items in the overlap class.
         candidate_ids (list[CandidateId]): The candidate ids of candidates in the overlap class.
@@ -1273,29 +1777,102 @@ class ItemOverlapClass:
             item.overlap_class = self
         self.items = items
         self.candidate_ids = candidate_ids
+        self._candidate_indices = {candidate_id: idx for idx, candidate_id in enumerate(candidate_ids)}
 
         # Compute all valid assignments of objects to the items in the overlap class
-        # One permutation is represented by a dictionary mapping the item to the assigned object id
-        candidate_permutations = [
-            dict(zip(self.items, permutation, strict=False))
-            for permutation in itertools.permutations(self.candidate_ids, len(self.items))
-            # TODO?: Replace candidate ids by their index in the list to make it more efficient? Probably need this kind of optimizations
-        ]
-        # Filter the permutations where the assigned objects are not candidates of the items
-        self.valid_assignments = [
-            permutation
-            for permutation in candidate_permutations
-            if all(obj_id in item.candidate_ids for item, obj_id in permutation.items())
-        ]
+        self._valid_assignment_tuples = list(self._generate_valid_assignment_tuples())
 
-        if not self.valid_assignments:
+        if not self._valid_assignment_tuples:
             # raise NoValidAssignmentError(self)
             print(f"No valid assignment for overlap class {self}")
 
         # === Type annotations ===
         self.items: list[TaskItem]
         self.candidate_ids: list[CandidateId]
-        self.valid_assignments: list[Assignment]
+        self._candidate_indices: dict[CandidateId, int]
+        self._valid_assignment_tuples: list[tuple[int, ...]]
+
+    def _generate_valid_assignment_tuples(self) -> Iterator[tuple[int, ...]]:
+        """
+        Generate the valid assignments by backtracking over the candidates of each item.
+
+        Each item is only assigned its own candidates and a candidate is assigned to at most one
+        item, so only valid assignments are generated (instead of all permutations of the
+        candidates). The assignments are generated in lexicographic order of the candidate indices.
+
+        Returns:
+            valid_assignment_tuples (Iterator[tuple[int, ...]]): Iterator over the valid assignments,
+                represented by the index of the candidate assigned to each item.
+        """
+        items_candidate_indices = [
+            [idx for idx, candidate_id in enumerate(self.candidate_ids) if candidate_id in item.candidates_data]
+            for item in self.items
+        ]
+        nb_items = len(self.items)
+        partial_assignment: list[int] = []
+        assigned_indices: set[int] = set()
+
+        def backtrack(item_idx: int) -> Iterator[tuple[int, ...]]:
+            if item_idx == nb_items:
+                yield tuple(partial_assignment)
+                return
+            for candidate_idx in items_candidate_indices[item_idx]:
+                if candidate_idx in assigned_indices:
+                    continue
+                assigned_indices.add(candidate_idx)
+                partial_assignment.append(candidate_idx)
+                yield from backtrack(item_idx + 1)
+                partial_assignment.pop()
+                assigned_indices.remove(candidate_idx)
+
+        return backtrack(0)
+
+    @property
+    def valid_assignments(self) -> list[Assignment]:
+        """
+        Get the valid assignments of objects to the items in the overlap class.
+
+        Returns:
+            valid_assignments (list[Assignment]): List of valid assignments of objects to the items
+                in the overlap class.
+        """
+        return [self._tuple_to_assignment(assignment_tuple) for assignment_tuple in self._valid_assignment_tuples]
+
+    @valid_assignments.setter
+    def valid_assignments(self, valid_assignments: list[Assignment]) -> None:
+        """
+        Set the valid assignments of objects to the items in the overlap class.
+
+        Candidates that are not in the overlap class yet (e.g. objects inherited from a sliced
+        object) are added to candidate_ids.
+
+        Args:
+            valid_assignments (list[Assignment]): List of valid assignments of objects to the items
+                in the overlap class.
+        """
+        for assignment in valid_assignments:
+            for candidate_id in assignment.values():
+                if candidate_id not in self._candidate_indices:
+                    self._candidate_indices[candidate_id] = len(self.candidate_ids)
+                    self.candidate_ids.append(candidate_id)
+        self._valid_assignment_tuples = [
+            tuple(self._candidate_indices[assignment[item]] for item in self.items) for assignment in valid_assignments
+        ]
+
+    def _tuple_to_assignment(self, assignment_tuple: tuple[int, ...]) -> Assignment:
+        """
+        Convert an assignment represented by candidate indices to an Assignment dictionary.
+
+        Args:
+            assignment_tuple (tuple[int, ...]): Index of the candidate assigned to each item.
+
+        Returns:
+            assignment (Assignment): Assignment of objects to the items in the overlap class.
+        """
+        candidate_ids = self.candidate_ids
+        return {
+            item: candidate_ids[candidate_idx] for item, candidate_idx in zip(self.items, assignment_tuple, strict=True)
+        }
 
     def compute_valid_assignments_with_inherited_objects(
         self, main_object_id: CandidateId, inherited_object_ids: set[CandidateId]
@@ -1341,19 +1918,25 @@ class ItemOverlapClass:
             compatible_global_assignments (list[Assignment]): List of global
                 compatible (for the whole task and not only this overlap class).
         """
-        compatible_global_assignments_set = {
-            tuple(global_assignment[item] for item in self.items) for global_assignment in compatible_global_assignments
+        compatible_assignment_tuples = {
+            tuple(self._candidate_indices[global_assignment[item]] for item in self.items)
+            for global_assignment in compatible_global_assignments
         }
 
-        self.valid_assignments = [
-            dict(zip(self.items, assignment_tuple, strict=True))
-            for assignment_tuple in compatible_global_assignments_set
+        self._valid_assignment_tuples = [
+            assignment_tuple
+            for assignment_tuple in self._valid_assignment_tuples
+            if assignment_tuple in compatible_assignment_tuples
         ]
 
     # I think there is a mistake in the computation of interesting candidates because it also
     # depends on the other items of the overlap class and not the item and its related items.
     # TODO: Check this and fix if needed
-    def compute_interesting_assignments(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> list[Assignment]:
+    def compute_interesting_assignments(
+        self,
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+        changed_object_ids: set[SimObjId] | None = None,
+    ) -> list[Assignment]:
         """
         Return the interesting assignments of objects to the items in the overlap class, the items results and items scores.
 
@@ -1370,6 +1953,8 @@ class ItemOverlapClass:
         Args:
             scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary containing the metadata of
                 the objects in the scene. The keys are the object ids.
+            changed_object_ids (set[SimObjId] | None): Ids of the objects whose metadata changed
+                since the last update. If None, the data of every candidate is updated.
 
         Returns:
             interesting_assignments (list[Assignment]):
@@ -1377,16 +1962,30 @@ class ItemOverlapClass:
         """
         # Extract the interesting candidates
         items_interesting_candidates = {
-            item: item.compute_interesting_candidates(scene_objects_dict) for item in self.items
+            item: item.compute_interesting_candidates(scene_objects_dict, changed_object_ids) for item in self.items
         }
 
         # Filter the valid assignments to keep only the ones with interesting candidates
+        items_interesting_indices = [
+            {
+                self._candidate_indices[candidate_id]
+                for candidate_id in items_interesting_candidates[item]
+                if candidate_id in self._candidate_indices
+            }
+            for item in self.items
+        ]
         interesting_assignments = [
-            assignment
-            for assignment in self.valid_assignments
-            if all(assignment[item] in items_interesting_candidates[item] for item in self.items)
+            self._tuple_to_assignment(assignment_tuple)
+            for assignment_tuple in self._valid_assignment_tuples
+            if all(
+                candidate_idx in interesting_indices
+                for candidate_idx, interesting_indices in zip(assignment_tuple, items_interesting_indices, strict=True)
+            )
         ]
         # TODO? Implement the filtering of the assignments based on the relations between the items in the overlap class
+        nb_valid_assignments = len(self._valid_assignment_tuples)
+        profiling.count(CounterName.ASSIGNMENTS_ENUMERATED, nb_valid_assignments)
+        profiling.count(CounterName.ASSIGNMENTS_PRUNED, nb_valid_assignments - len(interesting_assignments))
 
         return interesting_assignments
 
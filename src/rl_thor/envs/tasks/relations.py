@@ -12,13 +12,23 @@ from abc import ABC, abstractmethod
 from enum import StrEnum
 from typing import TYPE_CHECKING, Any
 
-from rl_thor.envs.sim_objects import OBJECT_TYPES_DATA, SimObjFixedProp, SimObjId, SimObjMetadata
+from rl_thor.envs.scene_object_table import SceneObjectTable
+from rl_thor.envs.sim_objects import (
+    OBJECT_TYPES_DATA,
+    SimObjFixedProp,
+    SimObjId,
+    SimObjMetadata,
+    SimObjMetadataKey,
+    SimObjVariableProp,
+)
 from rl_thor.envs.tasks._item_prop_fixed import PickupableProp, ReceptacleProp
 from rl_thor.envs.tasks._item_prop_variable import IsOpenIfPossibleProp, IsPickedUpProp
 from rl_thor.envs.tasks.items import ItemId
 from rl_thor.utils.ai2thor_utils import compute_objects_2d_distance
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from rl_thor.envs.tasks.item_prop_interface import ItemFixedProp, ItemVariableProp, RelationAuxProp
     from rl_thor.envs.tasks.items import CandidateId, TaskItem
 
@@ -66,11 +76,17 @@ class Relation(ABC):
             instantiated with this relation.
         related_item (TaskItem): The related item to which the main item is related. Automatically
             set when the related item is instantiated with the inverse relation.
+        read_metadata_keys (frozenset[SimObjMetadataKey]): Metadata keys read to compute the
+            satisfying related objects of a main object.
+        depends_on_related_metadata (bool): Whether the satisfying related objects also depend on
+            the metadata of the related objects (and not only on the one of the main object).
     """
 
     type_id: RelationTypeId
     inverse_relation_type_id: RelationTypeId
     candidate_required_prop: ItemFixedProp | None = None
+    read_metadata_keys: frozenset[SimObjMetadataKey] = frozenset()
+    depends_on_related_metadata: bool = False
     auxiliary_properties_blueprint: frozenset[tuple[type[RelationAuxProp], Any]] = frozenset()
 
     def __init__(
@@ -200,9 +216,9 @@ class Relation(ABC):
         self,
         main_obj_metadata: SimObjMetadata,
         scene_objects_dict: dict[SimObjId, SimObjMetadata],
-    ) -> list[SimObjId]:
+    ) -> Collection[SimObjId]:
         """
-        Return the list of the ids of the main object's related objects according to the relation.
+        Return the ids of the main object's related objects according to the relation.
 
         Args:
             main_obj_metadata (SimObjMetadata): The metadata of the main object.
@@ -210,7 +226,7 @@ class Relation(ABC):
             of the objects in the scene to their metadata.
 
         Returns:
-            list[SimObjId]: The ids of the main object's related objects.
+            Collection[SimObjId]: The ids of the main object's related objects.
         """
 
     def compute_satisfying_related_candidate_ids(
@@ -229,12 +245,9 @@ class Relation(ABC):
         Returns:
             set[CandidateId]: The ids of the related item's candidate's that satisfy the relation.
         """
-        satisfying_related_object_ids = {
-            related_object_id
-            for related_object_id in self._extract_related_object_ids(main_obj_metadata, scene_objects_dict)
-            if related_object_id in self.related_item.candidate_ids
-        }
-        return satisfying_related_object_ids
+        return self.related_item.candidates_data.keys() & self._extract_related_object_ids(
+            main_obj_metadata, scene_objects_dict
+        )
 
     def __str__(self) -> str:
         return f"{self.main_item} is {self.type_id} {self.related_item}"
@@ -275,6 +288,7 @@ class ReceptacleOfRelation(Relation):
     inverse_relation_type_id = RelationTypeId.CONTAINED_IN
     candidate_required_prop = ReceptacleProp(True)
     auxiliary_properties_blueprint = frozenset({(IsOpenIfPossibleProp, True)})
+    read_metadata_keys = frozenset({SimObjVariableProp.RECEPTACLE_OBJ_IDS})
 
     def __init__(
         self,
@@ -291,10 +305,12 @@ class ReceptacleOfRelation(Relation):
     def _extract_related_object_ids(  # noqa: PLR6301
         self,
         main_obj_metadata: SimObjMetadata,
-        scene_objects_dict: dict[SimObjId, SimObjMetadata],  # noqa: ARG002
-    ) -> list[SimObjId]:
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+    ) -> Collection[SimObjId]:
         """Return the ids of the objects contained in the main object."""
-        receptacle_object_ids = main_obj_metadata["receptacleObjectIds"]
+        if isinstance(scene_objects_dict, SceneObjectTable):
+            return scene_objects_dict.containment_graph.get_contained_object_ids(main_obj_metadata["objectId"])
+        receptacle_object_ids = main_obj_metadata[SimObjVariableProp.RECEPTACLE_OBJ_IDS]
         return receptacle_object_ids if receptacle_object_ids is not None else []
 
     def _are_candidates_compatible(  # noqa: PLR6301
@@ -332,6 +348,7 @@ class ContainedInRelation(Relation):
     inverse_relation_type_id = RelationTypeId.RECEPTACLE_OF
     candidate_required_prop = PickupableProp(True)
     auxiliary_properties_blueprint = frozenset({(IsPickedUpProp, True)})
+    read_metadata_keys = frozenset({SimObjVariableProp.PARENT_RECEPTACLES})
 
     def __init__(
         self,
@@ -348,10 +365,12 @@ class ContainedInRelation(Relation):
     def _extract_related_object_ids(  # noqa: PLR6301
         self,
         main_obj_metadata: SimObjMetadata,
-        scene_objects_dict: dict[SimObjId, SimObjMetadata],  # noqa: ARG002
-    ) -> list[SimObjId]:
+        scene_objects_dict: dict[SimObjId, SimObjMetadata],
+    ) -> Collection[SimObjId]:
         """Return the ids of the objects containing the main object."""
-        parent_receptacles = main_obj_metadata["parentReceptacles"]
+        if isinstance(scene_objects_dict, SceneObjectTable):
+            return scene_objects_dict.containment_graph.get_parent_receptacle_ids(main_obj_metadata["objectId"])
+        parent_receptacles = main_obj_metadata[SimObjVariableProp.PARENT_RECEPTACLES]
         return parent_receptacles if parent_receptacles is not None else []
 
     def _are_candidates_compatible(  # noqa: PLR6301
@@ -388,6 +407,8 @@ class CloseToRelation(Relation):
     type_id = RelationTypeId.CLOSE_TO
     inverse_relation_type_id = RelationTypeId.CLOSE_TO
     auxiliary_properties_blueprint = frozenset({(IsPickedUpProp, True)})
+    read_metadata_keys = frozenset({SimObjVariableProp.POSITION})
+    depends_on_related_metadata = True
 
     def __init__(
         self,
@@ -409,6 +430,9 @@ class CloseToRelation(Relation):
         scene_objects_dict: dict[SimObjId, SimObjMetadata],
     ) -> list[SimObjId]:
         """Return the ids of the objects close to the main object."""
+        if isinstance(scene_objects_dict, SceneObjectTable):
+            return scene_objects_dict.find_close_object_ids(main_obj_metadata["objectId"], self.distance)
+
         close_object_ids = []
         for scene_object_id, scene_object_metadata in scene_objects_dict.items():
             if (
@@ -9,13 +9,19 @@ TODO: Finish module docstring.
 # %% === Imports ===
 from __future__ import annotations
 
+import functools
 import itertools
+import math
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
+from rl_thor.envs import profiling
 from rl_thor.envs.actions import Ai2thorAction
-from rl_thor.envs.reward import BaseRewardHandler
+from rl_thor.envs.profiling import CounterName, SpanName
+from rl_thor.envs.reward import BaseRewardHandler, LazyInfoDict
+from rl_thor.envs.scene_object_table import SceneObjectTable
 from rl_thor.envs.sim_objects import SimObjectType
 from rl_thor.envs.tasks.item_prop import obj_prop_id_to_item_prop
 from rl_thor.envs.tasks.item_prop_interface import (
@@ -40,13 +46,14 @@ from rl_thor.envs.tasks.relations import (
 from rl_thor.utils.global_exceptions import DuplicateRelationsError
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping
 
     from ai2thor.controller import Controller
     from ai2thor.server import Event
 
     from rl_thor.envs.scenes import SceneId
-    from rl_thor.envs.sim_objects import SimObjId, SimObjMetadata
+    from rl_thor.envs.sim_objects import SimObjId, SimObjMetadata, SimObjMetadataKey
+    from rl_thor.envs.tasks.item_prop_interface import ItemVariableProp
     from rl_thor.envs.tasks.relations import Relation
 
 
@@ -60,6 +67,53 @@ class TaskBlueprint:
     task_args: Mapping[str, TaskArgValue] = field(default_factory=dict)
 
 
+class TaskTemplate:
+    """
+    Task compiled once from a task blueprint and reused for every episode of the blueprint.
+
+    Instantiating a task builds its items, relations, inverse relations, auxiliary items and
+    maximum advancements, which only depend on the blueprint. The template keeps the compiled task
+    and each instantiation only clears its episode state (candidates, overlap classes, incremental
+    advancement state), which is then initialized by the reset of the task.
+
+    The instances of a template are the same task object: the lazy entries of the task info of the
+    last step of an episode are computed when its episode state is cleared, so that this info can
+    still be read after the reset.
+    """
+
+    def __init__(self, task_blueprint: TaskBlueprint) -> None:
+        """
+        Initialize the template, the task is only compiled at the first instantiation.
+
+        Args:
+            task_blueprint (TaskBlueprint): Blueprint of the task.
+        """
+        self.task_blueprint = task_blueprint
+        self._task = None
+
+        # === Type Annotations ===
+        self.task_blueprint: TaskBlueprint
+        self._task: BaseTask | None
+
+    @property
+    def is_compiled(self) -> bool:
+        """Return True if the task of the template has already been compiled."""
+        return self._task is not None
+
+    def instantiate(self) -> BaseTask:
+        """
+        Return the task of the blueprint for a new episode, without its state of the last episode.
+
+        Returns:
+            task (BaseTask): Task to reset for the new episode.
+        """
+        if self._task is None:
+            self._task = self.task_blueprint.task_type(**self.task_blueprint.task_args)
+        else:
+            self._task.clear_episode_state()
+        return self._task
+
+
 # %% === Reward handlers ===
 # TODO: Add more options
 # TODO: Make the rewards more customizable
@@ -87,6 +141,7 @@ class GraphTaskRewardHandler(BaseRewardHandler):
         self,
         event: Event,
         controller_action: dict[str, Any],
+        scene_object_table: SceneObjectTable | None = None,
     ) -> tuple[float, bool, dict[str, Any]]:
         """
         Return the reward, task completion and additional information about the task for the given event.
@@ -95,6 +150,8 @@ class GraphTaskRewardHandler(BaseRewardHandler):
             event (Event): Event to calculate the reward for.
             controller_action (dict[str, Any]): Dictionary containing the information about the
                 action executed by the controller.
+            scene_object_table (SceneObjectTable | None): Scene object table of the event, to avoid
+                indexing the objects of the event again. Defaults to None.
 
         Returns:
             reward (float): Reward for the event.
@@ -103,7 +160,9 @@ class GraphTaskRewardHandler(BaseRewardHandler):
         """
         if not event.metadata["lastActionSuccess"]:
             return -0.0, False, {}
-        task_advancement, task_completion, info = self.task.compute_task_advancement(event, controller_action)
+        task_advancement, task_completion, info = self.task.compute_task_advancement(
+            event, controller_action, scene_object_table
+        )
         reward = task_advancement - self.last_step_advancement
         self.last_step_advancement = task_advancement
 
@@ -199,6 +258,13 @@ class BaseTask(ABC):
             return False, 0, False, {}
         return self.reset(controller)
 
+    def clear_episode_state(self) -> None:  # noqa: B027
+        """
+        Clear the state of the task initialized by its last reset, before reusing it for a new episode.
+
+        By default, the task has no episode state.
+        """
+
     @abstractmethod
     def compute_task_advancement(
         self,
@@ -214,7 +280,8 @@ class BaseTask(ABC):
             controller_action (dict[str, Any]): Dictionary containing the information about the
                 action executed by the controller.
             scene_objects_dict (dict[SimObjId, SimObjMetadata], optional): Dictionary
-                mapping object ids to their metadata to avoid recomputing it. Defaults to None.
+                mapping object ids to their metadata (usually the SceneObjectTable of the event) to
+                avoid recomputing it. Defaults to None.
 
         Returns:
             task_advancement (float): Task advancement.
@@ -222,6 +289,17 @@ class BaseTask(ABC):
             info (dict[str, Any]): Additional information about the task advancement.
         """
 
+    def get_candidate_object_ids(self) -> list[SimObjId]:  # noqa: PLR6301
+        """
+        Return the ids of the objects that can be assigned to the task, in a fixed order.
+
+        By default, the task has no candidate objects.
+
+        Returns:
+            candidate_object_ids (list[SimObjId]): Sorted ids of the candidate objects.
+        """
+        return []
+
     def get_reward_handler(self, no_task_advancement_reward: bool) -> GraphTaskRewardHandler:
         """Return the reward handler for the task."""
         return self._reward_handler_type(
@@ -272,6 +350,7 @@ type RelationsDict = dict[
     ],
 ]  # TODO: Replace RelationTypeId by type[Relation]
 type TaskDict = dict[ItemId, TaskItemData]
+type CandidatesCompatibilityFunc = Callable[[Relation, CandidateId, CandidateId], bool]
 
 
 @dataclass
@@ -332,6 +411,9 @@ class GraphTask(BaseTask):
         auxiliary_items (FrozenSet[TaskItem]): Set of items that are not part of the task
             but that are necessary for certain item's properties or relations to be satisfied.
         maximum_advancement (int): Maximum task advancement possible for the task.
+        incremental_advancement (bool): Whether to update only the candidates whose watched
+            metadata changed since the last step instead of every candidate. The task advancement
+            is the same in both modes.
 
     Methods:
         reset(self, event: Event) -> tuple[float, bool, dict[str, Any]]:
@@ -358,6 +440,13 @@ class GraphTask(BaseTask):
         self.task_description_dict = task_description_dict
         self.items = self.full_initialize_items_and_relations_from_dict(task_description_dict)
         self.items_by_id = {item.id: item for item in self.items}
+        self.incremental_advancement = True
+        self._watched_metadata_keys = self._collect_read_metadata_keys(self.items)
+        self.overlap_classes = []
+        self.auxiliary_items = frozenset()
+        self._watched_objects_snapshot = None
+        self._last_advancement_result = None
+        self._advancement_step = 0
 
         # === Type annotations ===
         self.task_description_dict: TaskDict
@@ -366,6 +455,12 @@ class GraphTask(BaseTask):
         self.overlap_classes: list[ItemOverlapClass]
         self.auxiliary_items: frozenset[AuxItem]
         self.maximum_advancement: int
+        self.incremental_advancement: bool
+        self._watched_metadata_keys: tuple[SimObjMetadataKey, ...] | None
+        self._watched_object_ids: frozenset[SimObjId]
+        self._watched_objects_snapshot: dict[SimObjId, tuple[Any, ...] | None] | None
+        self._last_advancement_result: tuple[int, bool, LazyInfoDict] | None
+        self._advancement_step: int
 
     def reset(self, controller: Controller) -> tuple[bool, int, bool, dict[str, Any]]:
         """
@@ -390,7 +485,7 @@ class GraphTask(BaseTask):
         """
         event: Event = controller.last_event  # type: ignore
         scene_name = event.metadata["sceneName"]
-        scene_objects_dict: dict[SimObjId, SimObjMetadata] = {obj["objectId"]: obj for obj in event.metadata["objects"]}
+        scene_objects_dict = SceneObjectTable.from_event(event)
 
         # Initialize the candidates of the items
         for item in self.items:
@@ -420,9 +515,11 @@ class GraphTask(BaseTask):
         # Keep only candidates that are in at least one compatible assignment
         for item in self.items:
             final_candidate_ids = {CandidateId(assignment[item]) for assignment in compatible_assignments}
-            for candidate_id in item.candidates_data:
-                if candidate_id not in final_candidate_ids:
-                    del item.candidates_data[candidate_id]
+            item.candidates_data = {
+                candidate_id: candidate_data
+                for candidate_id, candidate_data in item.candidates_data.items()
+                if candidate_id in final_candidate_ids
+            }
 
         # Initialize overlap classes and keep only assignments that are part of one of the global
         # compatible assignments
@@ -435,12 +532,42 @@ class GraphTask(BaseTask):
         # TODO: Make it compatible with weighted properties and relations
         self.maximum_advancement = sum(item.maximum_advancement for item in self.items)
 
+        # Reset the incremental advancement state
+        self._watched_object_ids = self._compute_watched_object_ids()
+        self._watched_objects_snapshot = None
+        self._last_advancement_result = None
+
         return True, *self.compute_task_advancement(event, controller.last_action, scene_objects_dict)
 
+    def clear_episode_state(self) -> None:
+        """
+        Clear the candidates, overlap classes and incremental advancement state of the last episode.
+
+        The items, relations and auxiliary items compiled from the task description are kept. The
+        lazy entries of the task info of the last step are computed before the candidates are
+        cleared, since this info can be read after the reset (e.g. as the final info of a same-step
+        autoreset).
+        """
+        if self._last_advancement_result is not None:
+            self._last_advancement_result[2].evaluate_all()
+        self._advancement_step += 1
+        for item in itertools.chain(self.items, self.auxiliary_items):
+            item.candidates_data = {}
+        self.overlap_classes = []
+        self.auxiliary_items = frozenset()
+        self._watched_object_ids = frozenset()
+        self._watched_objects_snapshot = None
+        self._last_advancement_result = None
+
     def _compute_compatible_assignments(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> list[Assignment]:
         """
         Compute the compatible assignments of the items in the scene.
 
+        The candidates of the items are first pruned with an arc consistency pass over the
+        relations between the items, then the compatible assignments are enumerated by
+        backtracking over the remaining candidates with forward checking. The compatibility of a
+        pair of candidates for a relation is only computed once.
+
         Args:
             scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping object ids to
                 their metadata.
@@ -448,41 +575,123 @@ class GraphTask(BaseTask):
         Returns:
             compatible_assignments (list[Assignment]): List of compatible assignments.
         """
-        temp_overlap_classes = self._compute_overlap_classes(self.items)
-        if not all(overlap_class.valid_assignments for overlap_class in temp_overlap_classes):
+
+        @functools.cache
+        def are_candidates_compatible(
+            relation: Relation, main_candidate_id: CandidateId, related_candidate_id: CandidateId
+        ) -> bool:
+            # The same object can't be assigned to both items
+            return main_candidate_id != related_candidate_id and relation._are_candidates_compatible(  # noqa: SLF001
+                scene_objects_dict[main_candidate_id], scene_objects_dict[related_candidate_id]
+            )
+
+        items_domains = self._prune_incompatible_candidates(are_candidates_compatible)
+        if items_domains is None:
             return []
+        return self._enumerate_compatible_assignments(items_domains, are_candidates_compatible)
 
-        valid_assignments_product = itertools.product(
-            *(overlap_class.valid_assignments for overlap_class in temp_overlap_classes)
-        )
-        compatible_assignments = []
-        for assignment_product in valid_assignments_product:
-            global_assignment: Assignment = {
-                item: candidate_id
-                for overlap_class_assignment in assignment_product
-                for item, candidate_id in overlap_class_assignment.items()
+    def _prune_incompatible_candidates(
+        self, are_candidates_compatible: CandidatesCompatibilityFunc
+    ) -> dict[TaskItem, set[CandidateId]] | None:
+        """
+        Return the candidates of each item that are arc consistent with the relations between the items.
+
+        A candidate is removed when a related item has no candidate compatible with it, until no
+        more candidate can be removed (AC-3 algorithm).
+
+        Args:
+            are_candidates_compatible (CandidatesCompatibilityFunc): Function returning whether a
+                candidate of the main item of a relation is compatible with a candidate of its
+                related item.
+
+        Returns:
+            items_domains (dict[TaskItem, set[CandidateId]] | None): Remaining candidates of each item,
+                or None if an item has no remaining candidate.
+        """
+        items_domains = {item: item.candidate_ids for item in self.items}
+        relations_queue = deque(relation for item in self.items for relation in item.relations)
+        queued_relations = set(relations_queue)
+        while relations_queue:
+            relation = relations_queue.popleft()
+            queued_relations.remove(relation)
+            main_domain = items_domains[relation.main_item]
+            related_domain = items_domains[relation.related_item]
+            unsupported_candidate_ids = {
+                main_candidate_id
+                for main_candidate_id in main_domain
+                if not any(
+                    are_candidates_compatible(relation, main_candidate_id, related_candidate_id)
+                    for related_candidate_id in related_domain
+                )
             }
-            incompatible_assignment = False
-            for i in range(len(self.items)):
-                main_item = self.items[i]
-                main_candidate_metadata = scene_objects_dict[global_assignment[main_item]]
-                for related_item in self.items[i + 1 :]:
-                    related_candidate_metadata = scene_objects_dict[global_assignment[related_item]]
-
-                    relations = main_item.organized_relations.get(related_item.id, {})
-                    for relation in relations.values():
-                        if not relation._are_candidates_compatible(
-                            main_candidate_metadata, related_candidate_metadata
-                        ):  # TODO: Use the cached version
-                            incompatible_assignment = True
-                            break
-                    if incompatible_assignment:
-                        break
-                if incompatible_assignment:
-                    break
-            if not incompatible_assignment:
-                compatible_assignments.append(global_assignment)
+            if not unsupported_candidate_ids:
+                continue
+            main_domain -= unsupported_candidate_ids
+            if not main_domain:
+                return None
+            # Candidates of the items related to the main item may have lost their support
+            for main_item_relation in relation.main_item.relations:
+                if main_item_relation.inverse_relation not in queued_relations:
+                    relations_queue.append(main_item_relation.inverse_relation)
+                    queued_relations.add(main_item_relation.inverse_relation)
+
+        return items_domains
+
+    def _enumerate_compatible_assignments(
+        self,
+        items_domains: dict[TaskItem, set[CandidateId]],
+        are_candidates_compatible: CandidatesCompatibilityFunc,
+    ) -> list[Assignment]:
+        """
+        Enumerate the compatible assignments by backtracking over the candidates of the items.
+
+        When an item is assigned, the candidates of its related items that are not compatible with
+        the assigned candidate are removed (forward checking), and the assignment is abandoned if
+        one of them has no candidate left.
+
+        Args:
+            items_domains (dict[TaskItem, set[CandidateId]]): Candidates of each item.
+            are_candidates_compatible (CandidatesCompatibilityFunc): Function returning whether a
+                candidate of the main item of a relation is compatible with a candidate of its
+                related item.
 
+        Returns:
+            compatible_assignments (list[Assignment]): List of compatible assignments.
+        """
+        compatible_assignments: list[Assignment] = []
+        partial_assignment: Assignment = {}
+
+        def restrict_related_domains(
+            item: TaskItem, candidate_id: CandidateId, domains: dict[TaskItem, set[CandidateId]]
+        ) -> dict[TaskItem, set[CandidateId]] | None:
+            restricted_domains: dict[TaskItem, set[CandidateId]] = {}
+            for relation in item.relations:
+                if relation.related_item in partial_assignment:
+                    continue
+                related_domain = restricted_domains.get(relation.related_item, domains[relation.related_item])
+                restricted_domains[relation.related_item] = {
+                    related_candidate_id
+                    for related_candidate_id in related_domain
+                    if are_candidates_compatible(relation, candidate_id, related_candidate_id)
+                }
+                if not restricted_domains[relation.related_item]:
+                    return None
+            return restricted_domains
+
+        def backtrack(item_idx: int, domains: dict[TaskItem, set[CandidateId]]) -> None:
+            if item_idx == len(self.items):
+                compatible_assignments.append(partial_assignment.copy())
+                return
+            item = self.items[item_idx]
+            assigned_candidate_ids = set(partial_assignment.values())
+            for candidate_id in sorted(domains[item] - assigned_candidate_ids):
+                restricted_domains = restrict_related_domains(item, candidate_id, domains)
+                if restricted_domains is not None:
+                    partial_assignment[item] = candidate_id
+                    backtrack(item_idx + 1, domains | restricted_domains)
+                    del partial_assignment[item]
+
+        backtrack(0, items_domains)
         return compatible_assignments
 
     @staticmethod
@@ -548,7 +757,9 @@ class GraphTask(BaseTask):
         the task to an object in the scene (as opposed to a an overlap class assignment).
         To construct the set of global assignments, we take the cartesian product of the
         assignments of the overlap classes. Interesting global assignments are the ones
-        constructed with only interesting overlap class assignments.
+        constructed with only interesting overlap class assignments. The best global assignment is
+        searched with a branch-and-bound search over this cartesian product (see
+        _search_best_assignment).
 
         For a given global assignment, the task advancement is the sum of the property
         scores of the assigned objects for each item and the sum of their relations scores
@@ -560,7 +771,8 @@ class GraphTask(BaseTask):
             controller_action (dict[str, Any]): Dictionary containing the information about the
                 action executed by the controller.
             scene_objects_dict (dict[SimObjId, SimObjMetadata], optional): Dictionary
-                mapping object ids to their metadata to avoid recomputing it. Defaults to None.
+                mapping object ids to their metadata (usually the SceneObjectTable of the event) to
+                avoid recomputing it. Defaults to None.
 
         Returns:
             task_advancement (int): Task advancement.
@@ -568,7 +780,7 @@ class GraphTask(BaseTask):
             info (dict[str, Any]): Additional information about the task advancement.
         """
         if scene_objects_dict is None:
-            scene_objects_dict = {obj["objectId"]: obj for obj in event.metadata["objects"]}
+            scene_objects_dict = SceneObjectTable.from_event(event)
 
         # === Update candidates ===
         if controller_action["action"] == Ai2thorAction.SLICE_OBJECT and event.metadata["lastActionSuccess"] == True:
@@ -595,48 +807,357 @@ class GraphTask(BaseTask):
                     sliced_object_id, inherited_object_ids
                 )
 
+            # New candidates have no data yet: force a full update
+            if to_update_overlap_classes:
+                self._watched_object_ids = self._compute_watched_object_ids()
+                self._watched_objects_snapshot = None
+
+        # === Identify the objects whose watched metadata changed ===
+        changed_object_ids = self._compute_changed_object_ids(scene_objects_dict)
+        if changed_object_ids is not None and not changed_object_ids and self._last_advancement_result is not None:
+            # Nothing that can change the advancement changed since the last step
+            last_task_advancement, last_is_terminated, last_info = self._last_advancement_result
+            return last_task_advancement, last_is_terminated, last_info.updated(scene_objects_dict=scene_objects_dict)
+        # The lazy entries of the infos of the previous steps can't be computed anymore
+        self._advancement_step += 1
+
         # Compute the interesting assignments for each overlap class
-        overlap_classes_assignments = [
-            overlap_class.compute_interesting_assignments(scene_objects_dict) for overlap_class in self.overlap_classes
-        ]
+        with profiling.span(SpanName.COMPUTE_INTERESTING_ASSIGNMENTS):
+            overlap_classes_assignments = [
+                overlap_class.compute_interesting_assignments(scene_objects_dict, changed_object_ids)
+                for overlap_class in self.overlap_classes
+            ]
+        if profiling.is_profiling():
+            profiling.count(
+                CounterName.GLOBAL_ASSIGNMENTS,
+                math.prod(len(assignments) for assignments in overlap_classes_assignments),
+            )
 
-        # Construct a generator of the cartesian product of the interesting assignments
-        assignment_products = itertools.product(*overlap_classes_assignments)
+        # Search the best global assignment
+        with profiling.span(SpanName.SEARCH_BEST_ASSIGNMENT):
+            max_task_advancement, best_assignment = self._search_best_assignment(overlap_classes_assignments)
+        is_terminated = max_task_advancement == self.maximum_advancement
 
-        max_task_advancement = -1
-        best_assignment = {}
-        is_terminated = False
-
-        # Compute the task advancement for each global assignment
-        for assignment_product in assignment_products:
-            # Merge the assignments of the overlap classes
-            global_assignment: Assignment = {
-                item: obj_id
-                for overlap_class_assignment in assignment_product
-                for item, obj_id in overlap_class_assignment.items()
-            }
-            assignment_advancement = self.compute_assignment_advancement(global_assignment)
-
-            if assignment_advancement > max_task_advancement:
-                max_task_advancement = assignment_advancement
-                best_assignment = global_assignment
-                if max_task_advancement == self.maximum_advancement:
-                    is_terminated = True
-                    break
-
-        # Add info about the task advancement
-        info = {
-            # Add best assignment, mapping between item ids and the assigned object ids
-            "best_assignment": {item.id: candidate_id for item, candidate_id in best_assignment.items()},
-            "candidate_data": {item.id: item.candidates_data[best_assignment[item]] for item in self.items},
-            "advancement_details": {item: ItemAdvancementDetails(item, best_assignment) for item in self.items},
-            "task_advancement": max_task_advancement,
-            "scene_objects_dict": scene_objects_dict,
-        }
+        # Add info about the task advancement, the details are only computed if they are read
+        info = LazyInfoDict(
+            {
+                "task_advancement": max_task_advancement,
+                "scene_objects_dict": scene_objects_dict,
+            },
+            {
+                # Add best assignment, mapping between item ids and the assigned object ids
+                "best_assignment": functools.partial(self._make_best_assignment_info, best_assignment),
+                "candidate_data": self._make_lazy_info_entry(self._make_candidate_data_info, best_assignment),
+                "advancement_details": self._make_lazy_info_entry(self._make_advancement_details_info, best_assignment),
+            },
+        )
         # TODO: Add other info
+        self._last_advancement_result = (max_task_advancement, is_terminated, info)
 
         return max_task_advancement, is_terminated, info
 
+    def _make_lazy_info_entry[T](
+        self, make_entry: Callable[[Assignment], T], best_assignment: Assignment
+    ) -> Callable[[], T]:
+        """
+        Return the function computing a lazy entry of the task info from the state of the current step.
+
+        The entry is cached, so that it is shared with the copies of the info returned by the next
+        steps that don't change the advancement. Computing it for the first time after the state of
+        the task changed raises a StaleTaskInfoError instead of returning the entry of a later step.
+
+        Args:
+            make_entry (Callable[[Assignment], T]): Function computing the entry from the best
+                assignment of the step.
+            best_assignment (Assignment): Best global assignment of the step.
+
+        Returns:
+            compute_entry (Callable[[], T]): Function computing the entry.
+        """
+        advancement_step = self._advancement_step
+
+        @functools.cache
+        def compute_entry() -> T:
+            if self._advancement_step != advancement_step:
+                raise StaleTaskInfoError(self)
+            return make_entry(best_assignment)
+
+        return compute_entry
+
+    @staticmethod
+    def _make_best_assignment_info(best_assignment: Assignment) -> dict[ItemId, CandidateId]:
+        """
+        Return the best assignment as a dictionary mapping the item ids to the assigned object ids.
+
+        Args:
+            best_assignment (Assignment): Best global assignment of the step.
+
+        Returns:
+            best_assignment_info (dict[ItemId, CandidateId]): Dictionary mapping the item ids to
+                the assigned object ids.
+        """
+        return {item.id: candidate_id for item, candidate_id in best_assignment.items()}
+
+    def _make_candidate_data_info(self, best_assignment: Assignment) -> dict[ItemId, CandidateData]:
+        """
+        Return the data of the candidates of the best assignment.
+
+        Args:
+            best_assignment (Assignment): Best global assignment of the step.
+
+        Returns:
+            candidate_data_info (dict[ItemId, CandidateData]): Dictionary mapping the item ids to
+                the data of their assigned candidate.
+        """
+        return {item.id: item.candidates_data[best_assignment[item]] for item in self.items}
+
+    def _make_advancement_details_info(self, best_assignment: Assignment) -> dict[TaskItem, ItemAdvancementDetails]:
+        """
+        Return the advancement details of the items for the best assignment.
+
+        Args:
+            best_assignment (Assignment): Best global assignment of the step.
+
+        Returns:
+            advancement_details_info (dict[TaskItem, ItemAdvancementDetails]): Dictionary mapping the
+                items to their advancement details.
+        """
+        return {item: ItemAdvancementDetails(item, best_assignment) for item in self.items}
+
+    def _search_best_assignment(self, overlap_classes_assignments: list[list[Assignment]]) -> tuple[int, Assignment]:
+        """
+        Return the best global assignment and its advancement with a branch-and-bound search.
+
+        The global assignments are explored depth-first in the same order as the cartesian product
+        of the overlap classes' assignments. A partial assignment is pruned when an upper bound of
+        the advancement of its completions is not strictly greater than the best advancement found
+        so far, so the returned assignment is the first one of the cartesian product that reaches
+        the maximum advancement.
+
+        The upper bound of a partial assignment is the sum of:
+        - the property advancement of the assigned candidates,
+        - the exact relation advancement of the relations between assigned items,
+        - the maximum relation advancement of the assigned candidates for the relations whose
+        related item is not assigned yet,
+        - the step maximum advancement of the items of the remaining overlap classes.
+
+        Args:
+            overlap_classes_assignments (list[list[Assignment]]): Interesting assignments of each
+                overlap class.
+
+        Returns:
+            max_task_advancement (int): Advancement of the best global assignment, -1 if there is no
+                global assignment.
+            best_assignment (Assignment): Best global assignment.
+        """
+        nb_overlap_classes = len(overlap_classes_assignments)
+        if not all(overlap_classes_assignments):
+            return -1, {}
+        if all(len(assignments) == 1 for assignments in overlap_classes_assignments):
+            global_assignment = {
+                item: candidate_id
+                for (overlap_class_assignment,) in overlap_classes_assignments
+                for item, candidate_id in overlap_class_assignment.items()
+            }
+            return self.compute_assignment_advancement(global_assignment), global_assignment
+
+        # Maximum advancement of the remaining overlap classes; it only depends on the items so it
+        # doesn't require to go through every assignment
+        remaining_max_advancements = list(
+            itertools.accumulate(
+                (
+                    sum(item.step_max_advancement for item in assignments[0])
+                    for assignments in reversed(overlap_classes_assignments)
+                ),
+                initial=0,
+            )
+        )[::-1]
+
+        max_task_advancement = -1
+        best_assignment: Assignment = {}
+        partial_assignment: Assignment = {}
+
+        def explore(class_idx: int, closed_advancement: int, open_advancement: int) -> bool:
+            """
+            Explore the completions of the partial assignment and return True when the maximum advancement is reached.
+
+            Args:
+                class_idx (int): Index of the next overlap class to assign.
+                closed_advancement (int): Property advancement of the assigned candidates plus the
+                    advancement of the relations between assigned items.
+                open_advancement (int): Maximum advancement of the relations of the assigned
+                    candidates whose related item is not assigned yet.
+            """
+            nonlocal max_task_advancement, best_assignment
+            for overlap_class_assignment in overlap_classes_assignments[class_idx]:
+                partial_assignment.update(overlap_class_assignment)
+                closed_advancement_increase, open_advancement_increase = self._compute_advancement_bounds_increase(
+                    overlap_class_assignment, partial_assignment
+                )
+                new_closed_advancement = closed_advancement + closed_advancement_increase
+                new_open_advancement = open_advancement + open_advancement_increase
+
+                upper_bound = new_closed_advancement + new_open_advancement + remaining_max_advancements[class_idx + 1]
+                if upper_bound > max_task_advancement:
+                    if class_idx + 1 == nb_overlap_classes:
+                        # Complete assignment: the upper bound is the exact advancement
+                        max_task_advancement = upper_bound
+                        best_assignment = partial_assignment.copy()
+                        if max_task_advancement == self.maximum_advancement:
+                            return True
+                    elif explore(class_idx + 1, new_closed_advancement, new_open_advancement):
+                        return True
+
+                for item in overlap_class_assignment:
+                    del partial_assignment[item]
+            return False
+
+        explore(0, 0, 0)
+        return max_task_advancement, best_assignment
+
+    @staticmethod
+    def _compute_advancement_bounds_increase(
+        overlap_class_assignment: Assignment, partial_assignment: Assignment
+    ) -> tuple[int, int]:
+        """
+        Return the increase of the closed and open advancement when an overlap class is assigned.
+
+        Args:
+            overlap_class_assignment (Assignment): Assignment of the overlap class.
+            partial_assignment (Assignment): Partial global assignment, including the assignment
+                of the overlap class.
+
+        Returns:
+            closed_advancement_increase (int): Property advancement of the newly assigned candidates
+                plus the advancement of the relations that are closed by the assignment.
+            open_advancement_increase (int): Change of the maximum advancement of the relations whose
+                related item is not assigned.
+        """
+        closed_advancement_increase = 0
+        open_advancement_increase = 0
+        for item, candidate_id in overlap_class_assignment.items():
+            candidate_data = item.candidates_data[candidate_id]
+            closed_advancement_increase += candidate_data.property_advancement
+            for relation in item.relations:
+                related_item = relation.related_item
+                related_candidate_id = partial_assignment.get(related_item)
+                if related_candidate_id is None:
+                    open_advancement_increase += candidate_data.get_relation_max_advancement(relation)
+                    continue
+                closed_advancement_increase += candidate_data.compute_relation_advancement_for_related_candidate(
+                    relation, related_candidate_id
+                )
+                if related_item not in overlap_class_assignment:
+                    # The inverse relation of a previously assigned item is now closed
+                    related_candidate_data = related_item.candidates_data[related_candidate_id]
+                    closed_advancement_increase += (
+                        related_candidate_data.compute_relation_advancement_for_related_candidate(
+                            relation.inverse_relation, candidate_id
+                        )
+                    )
+                    open_advancement_increase -= related_candidate_data.get_relation_max_advancement(
+                        relation.inverse_relation
+                    )
+
+        return closed_advancement_increase, open_advancement_increase
+
+    def get_candidate_object_ids(self) -> list[SimObjId]:
+        """
+        Return the ids of the candidates of the items of the task, in a fixed order.
+
+        The candidates are only known after the task is reset.
+
+        Returns:
+            candidate_object_ids (list[SimObjId]): Sorted ids of the candidates of the items.
+        """
+        return sorted(set().union(*(item.candidate_ids for item in self.items)))
+
+    def _compute_watched_object_ids(self) -> frozenset[SimObjId]:
+        """
+        Return the ids of the objects whose metadata can change the task advancement.
+
+        Those are the candidates of the items and of the auxiliary items.
+
+        Returns:
+            watched_object_ids (frozenset[SimObjId]): Ids of the watched objects.
+        """
+        return frozenset().union(*(item.candidates_data for item in itertools.chain(self.items, self.auxiliary_items)))
+
+    def _compute_changed_object_ids(self, scene_objects_dict: dict[SimObjId, SimObjMetadata]) -> set[SimObjId] | None:
+        """
+        Update the snapshot of the watched objects and return the ids of those that changed since the last call.
+
+        Only the metadata keys read by the properties and relations of the task are compared.
+
+        Args:
+            scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary mapping object ids to
+                their metadata.
+
+        Returns:
+            changed_object_ids (set[SimObjId] | None): Ids of the watched objects whose watched
+                metadata changed, or None if every candidate has to be updated (first step after a
+                reset, incremental mode disabled or unknown metadata keys).
+        """
+        watched_metadata_keys = self._watched_metadata_keys
+        if not self.incremental_advancement or watched_metadata_keys is None:
+            return None
+
+        previous_snapshot = self._watched_objects_snapshot
+        snapshot: dict[SimObjId, tuple[Any, ...] | None] = {}
+        for obj_id in self._watched_object_ids:
+            obj_metadata = scene_objects_dict.get(obj_id)
+            snapshot[obj_id] = (
+                None if obj_metadata is None else tuple(obj_metadata.get(key) for key in watched_metadata_keys)
+            )
+        self._watched_objects_snapshot = snapshot
+
+        if previous_snapshot is None:
+            return None
+        return {obj_id for obj_id, values in snapshot.items() if previous_snapshot.get(obj_id) != values}
+
+    @staticmethod
+    def _collect_read_metadata_keys(items: list[TaskItem]) -> tuple[SimObjMetadataKey, ...] | None:
+        """
+        Return the metadata keys read by the properties and relations of the items.
+
+        The properties and relations of the auxiliary items and the auxiliary properties are
+        recursively included.
+
+        Args:
+            items (list[TaskItem]): Items of the task.
+
+        Returns:
+            read_metadata_keys (tuple[SimObjMetadataKey, ...] | None): Sorted metadata keys read
+                by the task, or None if one of the properties doesn't declare its read keys.
+        """
+        properties: list[ItemVariableProp] = []
+        relations: list[Relation] = []
+        visited_items: set[TaskItem] = set()
+        items_to_visit: list[TaskItem] = list(items)
+        while items_to_visit:
+            item = items_to_visit.pop()
+            if item in visited_items:
+                continue
+            visited_items.add(item)
+            relations.extend(item.relations)
+            for prop in item.scored_properties:
+                properties.append(prop)
+                properties.extend(prop.auxiliary_properties)
+                relations.extend(prop.auxiliary_relations)
+                items_to_visit.extend(prop.auxiliary_items)
+
+        read_metadata_keys: set[SimObjMetadataKey] = set()
+        for relation in relations:
+            read_metadata_keys |= relation.read_metadata_keys
+            properties.extend(relation.auxiliary_properties)
+        for prop in properties:
+            prop_read_metadata_keys = prop.read_metadata_keys
+            if prop_read_metadata_keys is None:
+                return None
+            read_metadata_keys |= prop_read_metadata_keys
+
+        return tuple(sorted(read_metadata_keys))
+
     @staticmethod
     def compute_assignment_advancement(
         global_assignment: Assignment,
@@ -809,3 +1330,17 @@ def parse_task_description_dict(task_description_dict: dict[str, dict[str, Any]]
         parsed_task_description_dict[ItemId(item_id)] = TaskItemData(property_dict, relation_dict)
 
     return parsed_task_description_dict
+
+
+# %% === Exceptions ===
+class StaleTaskInfoError(Exception):
+    """Exception raised when a lazy entry of the task info is read after the state of its task changed."""
+
+    def __init__(self, task: BaseTask) -> None:
+        self.task = task
+
+    def __str__(self) -> str:
+        return (
+            f"The task info of a previous step of {self.task} can't be computed anymore: its lazy entries "
+            "have to be read before the next step of the task (or evaluated with `evaluate_all`)."
+        )
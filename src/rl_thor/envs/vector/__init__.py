@@ -0,0 +1,9 @@
+"""
+Multiprocess vectorized RL-THOR environments sharing their frames through shared memory.
+
+The Stable Baselines3 interface is in the `rl_thor.envs.vector.sb3_vec_env` module, which requires
+stable-baselines3.
+"""
+
+from rl_thor.envs.vector.shared_memory import SharedFrameBuffer
+from rl_thor.envs.vector.vector_envs import ITHORVectorEnv, WorkerError
@@ -0,0 +1,169 @@
+"""
+Stable Baselines3 interface of the multiprocess vectorized RL-THOR environments.
+
+This module requires stable-baselines3 to be installed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from rl_thor.envs.vector.vector_envs import ITHORVectorEnv
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    import gymnasium as gym
+    from stable_baselines3.common.vec_env.base_vec_env import VecEnvIndices, VecEnvObs, VecEnvStepReturn
+
+
+class ITHORSB3VecEnv(VecEnv):
+    """
+    Stable Baselines3 VecEnv running each environment in a subprocess, with frames in shared memory.
+
+    It wraps an ITHORVectorEnv and converts its same-step autoreset infos to the Stable Baselines3
+    format ("terminal_observation" and "TimeLimit.truncated" keys).
+    """
+
+    def __init__(self, env_fns: Sequence[Callable[[], gym.Env]], **vector_env_kwargs: Any) -> None:
+        """
+        Start the workers of the environments.
+
+        Args:
+            env_fns (Sequence[Callable[[], gym.Env]]): Functions creating the environments, called
+                in the workers.
+            **vector_env_kwargs (Any): Keyword arguments of ITHORVectorEnv.
+        """
+        self.vector_env = ITHORVectorEnv(env_fns, **vector_env_kwargs)
+        super().__init__(
+            self.vector_env.num_envs,
+            self.vector_env.single_observation_space,
+            self.vector_env.single_action_space,
+        )
+
+    def reset(self) -> VecEnvObs:
+        """
+        Reset all the environments with the seeds and options set beforehand.
+
+        Returns:
+            observations (VecEnvObs): Batched observations of the environments.
+        """
+        self.vector_env.reset_async(seed=self._seeds, options=self._options)
+        observations, self.reset_infos = self.vector_env.reset_wait()
+        self._reset_seeds()
+        self._reset_options()
+        return observations
+
+    def step_async(self, actions: np.ndarray) -> None:
+        """
+        Send the step command with their action to all the environments.
+
+        Args:
+            actions (np.ndarray): Batched actions of the environments.
+        """
+        self.vector_env.step_async(actions)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        """
+        Wait for the environments to be stepped.
+
+        Returns:
+            observations (VecEnvObs): Batched observations of the environments.
+            rewards (np.ndarray): Rewards of the environments.
+            dones (np.ndarray): Whether the episode of each environment ended.
+            infos (list[dict]): Infos of each environment, the info of the last step of the episode
+                for the environments that were reset.
+        """
+        observations, rewards, terminations, truncations, env_infos = self.vector_env.step_wait()
+        infos = []
+        for env_index, env_info in enumerate(env_infos):
+            if "final_obs" in env_info:
+                reset_info = dict(env_info)
+                final_observation = reset_info.pop("final_obs")
+                info = {
+                    **reset_info.pop("final_info"),
+                    "terminal_observation": final_observation,
+                    "TimeLimit.truncated": bool(truncations[env_index] and not terminations[env_index]),
+                }
+                self.reset_infos[env_index] = reset_info
+            else:
+                info = env_info
+            infos.append(info)
+        return observations, rewards.astype(np.float32), terminations | truncations, infos
+
+    def close(self) -> None:
+        """Close the workers of the environments."""
+        self.vector_env.close()
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        """
+        Return the attribute of the environments.
+
+        Args:
+            attr_name (str): Name of the attribute.
+            indices (VecEnvIndices): Indices of the environments, all of them if None.
+
+        Returns:
+            values (list[Any]): Values of the attribute for each environment.
+        """
+        return list(self.vector_env.get_attr(attr_name, self._get_indices(indices)))
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        """
+        Set the attribute of the environments to the same value.
+
+        Args:
+            attr_name (str): Name of the attribute.
+            value (Any): Value of the attribute.
+            indices (VecEnvIndices): Indices of the environments, all of them if None.
+        """
+        indices = list(self._get_indices(indices))
+        self.vector_env.set_attr(attr_name, [value] * len(indices), indices)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args: Any,
+        indices: VecEnvIndices = None,
+        **method_kwargs: Any,
+    ) -> list[Any]:
+        """
+        Call a method of the environments.
+
+        Args:
+            method_name (str): Name of the method.
+            *method_args (Any): Positional arguments of the method.
+            indices (VecEnvIndices): Indices of the environments, all of them if None.
+            **method_kwargs (Any): Keyword arguments of the method.
+
+        Returns:
+            results (list[Any]): Results of the method for each environment.
+        """
+        return list(
+            self.vector_env.env_method(method_name, *method_args, indices=self._get_indices(indices), **method_kwargs)
+        )
+
+    def env_is_wrapped(self, wrapper_class: type[gym.Wrapper], indices: VecEnvIndices = None) -> list[bool]:
+        """
+        Return whether the environments are wrapped by a wrapper of the given class.
+
+        Args:
+            wrapper_class (type[gym.Wrapper]): Class of the wrapper.
+            indices (VecEnvIndices): Indices of the environments, all of them if None.
+
+        Returns:
+            is_wrapped (list[bool]): Whether each environment is wrapped by the wrapper class.
+        """
+        return list(self.vector_env.is_wrapped(wrapper_class, self._get_indices(indices)))
+
+    def get_images(self) -> Sequence[np.ndarray | None]:
+        """
+        Return the render of each environment.
+
+        Returns:
+            images (Sequence[np.ndarray | None]): Render of each environment.
+        """
+        return list(self.vector_env.render())
@@ -0,0 +1,102 @@
+"""Shared memory buffers used to send the frames of the vectorized environments' workers."""
+
+from __future__ import annotations
+
+import contextlib
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+class SharedFrameBuffer:
+    """
+    Ring buffer of frames stored in shared memory, shaped (num_slots, num_envs, height, width, channels).
+
+    At each step, every worker writes its frame in the same slot, so the frames of a step are
+    contiguous and can be returned as a single (num_envs, height, width, channels) array without
+    being pickled. The slots are used in turn, so the frames of a step stay valid until
+    `num_slots - 1` other steps have been written.
+
+    The buffer is created by the main process and attached by the workers with its name.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        frame_shape: tuple[int, ...],
+        num_slots: int = 2,
+        name: str | None = None,
+        dtype: np.dtype | type = np.uint8,
+    ) -> None:
+        """
+        Create the shared memory of the buffer, or attach an existing one if a name is given.
+
+        Args:
+            num_envs (int): Number of environments writing in the buffer.
+            frame_shape (tuple[int, ...]): Shape of the frame of one environment.
+            num_slots (int): Number of slots of the ring buffer. Defaults to 2.
+            name (str | None): Name of the shared memory to attach. If None, a new shared memory
+                is created. Defaults to None.
+            dtype (np.dtype | type): Data type of the frames. Defaults to np.uint8.
+        """
+        self.num_envs = num_envs
+        self.frame_shape = frame_shape
+        self.num_slots = num_slots
+        self.dtype = np.dtype(dtype)
+        self.is_owner = name is None
+        shape = (num_slots, num_envs, *frame_shape)
+        if self.is_owner:
+            size = max(int(np.prod(shape)) * self.dtype.itemsize, 1)
+            self._shared_memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self._shared_memory = shared_memory.SharedMemory(name=name)
+        self.frames: NDArray = np.ndarray(shape, dtype=self.dtype, buffer=self._shared_memory.buf)
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory, used to attach the buffer in another process.
+
+        Returns:
+            name (str): Name of the shared memory.
+        """
+        return self._shared_memory.name
+
+    def write(self, slot: int, env_index: int, frame: NDArray) -> None:
+        """
+        Copy the frame of an environment in a slot of the buffer.
+
+        Args:
+            slot (int): Index of the slot of the ring buffer.
+            env_index (int): Index of the environment.
+            frame (NDArray): Frame of the environment.
+        """
+        self.frames[slot, env_index] = frame
+
+    def read(self, slot: int) -> NDArray:
+        """
+        Return a read-only view of the frames of a slot.
+
+        Args:
+            slot (int): Index of the slot of the ring buffer.
+
+        Returns:
+            frames (NDArray): Read-only view of the frames of the environments written in the slot.
+        """
+        frames = self.frames[slot]
+        frames.flags.writeable = False
+        return frames
+
+    def close(self) -> None:
+        """Release the shared memory, and destroy it if the buffer was created by this process."""
+        # The arrays must not reference the shared memory anymore before closing it
+        del self.frames
+        # Frames returned without copy still use the memory, it is released with them
+        with contextlib.suppress(BufferError):
+            self._shared_memory.close()
+        if self.is_owner:
+            self._shared_memory.unlink()
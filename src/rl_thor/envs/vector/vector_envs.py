@@ -0,0 +1,712 @@
+"""
+Multiprocess vectorized RL-THOR environments.
+
+Each environment runs in its own worker process with its own controller. The frames of the
+observations are written by the workers in a shared memory ring buffer instead of being pickled
+through the pipes; only the other observations, the rewards and the infos are sent back.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import traceback
+from enum import StrEnum
+from multiprocessing import resource_tracker
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import gymnasium as gym
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import CloudpickleWrapper, batch_space, concatenate, create_empty_array, iterate
+
+from rl_thor.envs.vector.shared_memory import SharedFrameBuffer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from multiprocessing.connection import Connection
+
+    from numpy.typing import NDArray
+
+
+# Key of the frames in the dictionary observations of the environments
+FRAME_OBSERVATION_KEY = "env_obs"
+
+
+# %% === Workers ===
+class WorkerCommand(StrEnum):
+    """Commands sent to the workers of the vectorized environments."""
+
+    GET_SPACES = "get_spaces"
+    ATTACH_FRAME_BUFFER = "attach_frame_buffer"
+    RESET = "reset"
+    STEP = "step"
+    GET_ATTR = "get_attr"
+    SET_ATTR = "set_attr"
+    CALL = "call"
+    IS_WRAPPED = "is_wrapped"
+    CLOSE = "close"
+
+
+def get_frame_key(observation_space: gym.Space) -> str | None:
+    """
+    Return the key of the frames in the observations of the space.
+
+    Args:
+        observation_space (gym.Space): Observation space of a single environment.
+
+    Returns:
+        frame_key (str | None): Key of the frames in the dictionary observations, or None if the
+            observations are the frames themselves.
+    """
+    if isinstance(observation_space, gym.spaces.Dict) and isinstance(
+        observation_space.spaces.get(FRAME_OBSERVATION_KEY), gym.spaces.Box
+    ):
+        return FRAME_OBSERVATION_KEY
+    if isinstance(observation_space, gym.spaces.Box):
+        return None
+    raise UnsupportedObservationSpaceError(observation_space)
+
+
+def _is_wrapped(env: gym.Env, wrapper_class: type[gym.Wrapper]) -> bool:
+    """
+    Return True if the environment is wrapped by a wrapper of the given class.
+
+    Args:
+        env (gym.Env): Environment to check.
+        wrapper_class (type[gym.Wrapper]): Class of the wrapper.
+
+    Returns:
+        is_wrapped (bool): Whether the environment is wrapped by the wrapper class.
+    """
+    while isinstance(env, gym.Wrapper):
+        if isinstance(env, wrapper_class):
+            return True
+        env = env.env
+    return False
+
+
+class _EnvWorker:
+    """Environment of a worker process, executing the commands received from the main process."""
+
+    def __init__(self, env_index: int, env: gym.Env) -> None:
+        """
+        Initialize the worker with its environment.
+
+        Args:
+            env_index (int): Index of the environment in the vectorized environment.
+            env (gym.Env): Environment of the worker.
+        """
+        self.env_index = env_index
+        self.env = env
+        self.frame_key = get_frame_key(env.observation_space)
+        self.frame_buffer: SharedFrameBuffer | None = None
+        self._command_handlers: dict[WorkerCommand, Callable[[Any], Any]] = {
+            WorkerCommand.GET_SPACES: self._get_spaces,
+            WorkerCommand.ATTACH_FRAME_BUFFER: self._attach_frame_buffer,
+            WorkerCommand.RESET: self._reset,
+            WorkerCommand.STEP: self._step,
+            WorkerCommand.GET_ATTR: self._get_attr,
+            WorkerCommand.SET_ATTR: self._set_attr,
+            WorkerCommand.CALL: self._call,
+            WorkerCommand.IS_WRAPPED: self._is_wrapped,
+        }
+
+        # === Type annotations ===
+        self.env_index: int
+        self.env: gym.Env
+        self.frame_key: str | None
+        self.frame_buffer: SharedFrameBuffer | None
+        self._command_handlers: dict[WorkerCommand, Callable[[Any], Any]]
+
+    def serve(self, pipe: Connection) -> None:
+        """
+        Execute the commands received through the pipe until the close command.
+
+        Every command is answered with a (result, success) tuple.
+
+        Args:
+            pipe (Connection): End of the pipe used by the worker.
+        """
+        while True:
+            command, data = pipe.recv()
+            if command == WorkerCommand.CLOSE:
+                pipe.send((None, True))
+                return
+            pipe.send((self.execute(command, data), True))
+
+    def execute(self, command: WorkerCommand, data: Any) -> Any:
+        """
+        Execute a command on the environment and return its result.
+
+        Args:
+            command (WorkerCommand): Command to execute.
+            data (Any): Data of the command.
+
+        Returns:
+            result (Any): Result of the command.
+        """
+        try:
+            command_handler = self._command_handlers[command]
+        except KeyError:
+            raise UnknownWorkerCommandError(command) from None
+        return command_handler(data)
+
+    def close(self) -> None:
+        """Detach the shared frame buffer and close the environment."""
+        if self.frame_buffer is not None:
+            self.frame_buffer.close()
+        self.env.close()
+
+    def _write_observation(self, observation: Any, slot: int) -> dict[str, Any] | None:
+        """
+        Write the frame of the observation in the shared buffer and return the rest of the observation.
+
+        Args:
+            observation (Any): Observation of the environment.
+            slot (int): Slot of the ring buffer to write the frame in.
+
+        Returns:
+            other_observations (dict[str, Any] | None): Observations other than the frame, or None if
+                the observation is the frame itself.
+        """
+        frame_buffer: SharedFrameBuffer = self.frame_buffer  # type: ignore
+        if self.frame_key is None:
+            frame_buffer.write(slot, self.env_index, observation)
+            return None
+        frame_buffer.write(slot, self.env_index, observation[self.frame_key])
+        return {key: value for key, value in observation.items() if key != self.frame_key}
+
+    def _copy_frame(self, observation: Any) -> Any:
+        """
+        Return the observation with a copy of its frame, which can be a view of a buffer of the environment.
+
+        Args:
+            observation (Any): Observation of the environment.
+
+        Returns:
+            observation (Any): Observation whose frame is not overwritten by the next reset or step.
+        """
+        if self.frame_key is None:
+            return np.array(observation)
+        return {**observation, self.frame_key: np.array(observation[self.frame_key])}
+
+    def _get_spaces(self, _data: None) -> tuple[gym.Space, gym.Space]:
+        return self.env.observation_space, self.env.action_space
+
+    def _attach_frame_buffer(self, data: dict[str, Any]) -> None:
+        self.frame_buffer = SharedFrameBuffer(**data)
+
+    def _reset(self, data: tuple[int, int | None, dict[str, Any] | None]) -> tuple[dict[str, Any] | None, dict]:
+        slot, seed, options = data
+        observation, info = self.env.reset(seed=seed, options=options)
+        return self._write_observation(observation, slot), info
+
+    def _step(self, data: tuple[int, Any]) -> tuple[dict[str, Any] | None, float, bool, bool, dict]:
+        slot, action = data
+        observation, reward, terminated, truncated, info = self.env.step(action)
+        if terminated or truncated:
+            # Same-step autoreset: the last observation and info are returned in the info
+            final_observation, final_info = self._copy_frame(observation), info
+            observation, info = self.env.reset()
+            info = {**info, "final_obs": final_observation, "final_info": final_info}
+        return self._write_observation(observation, slot), reward, terminated, truncated, info  # type: ignore
+
+    def _get_attr(self, name: str) -> Any:
+        return getattr(self.env, name)
+
+    def _set_attr(self, data: tuple[str, Any]) -> None:
+        name, value = data
+        setattr(self.env, name, value)
+
+    def _call(self, data: tuple[str, tuple, dict[str, Any]]) -> Any:
+        name, args, kwargs = data
+        return getattr(self.env, name)(*args, **kwargs)
+
+    def _is_wrapped(self, wrapper_class: type[gym.Wrapper]) -> bool:
+        return _is_wrapped(self.env, wrapper_class)
+
+
+def _worker(
+    env_index: int,
+    env_fn: CloudpickleWrapper,
+    pipe: Connection,
+    parent_pipe: Connection,
+) -> None:
+    """
+    Run an environment in a worker process and execute the commands received through the pipe.
+
+    Every command is answered with a (result, success) tuple. When an exception is raised, it is
+    sent back as a WorkerError and the worker stops.
+
+    Args:
+        env_index (int): Index of the environment in the vectorized environment.
+        env_fn (CloudpickleWrapper): Function creating the environment.
+        pipe (Connection): End of the pipe used by the worker.
+        parent_pipe (Connection): End of the pipe used by the main process, closed in the worker.
+    """
+    parent_pipe.close()
+    worker = _EnvWorker(env_index, env_fn())
+    try:
+        worker.serve(pipe)
+    except (KeyboardInterrupt, Exception):
+        pipe.send((WorkerError(env_index, traceback.format_exc()), False))
+    finally:
+        worker.close()
+
+
+# %% === Vectorized environments ===
+class ITHORVectorEnv(VectorEnv):
+    """
+    Vectorized environment running each environment in a subprocess, with frames in shared memory.
+
+    The environments are automatically reset in the same step as their episode ends (same-step
+    autoreset): the last observation and info of the episode are given in the "final_obs" and
+    "final_info" keys of the infos.
+
+    Only the observations in the "env_obs" Box of a dictionary observation space, or in a Box
+    observation space, are shared; the infos are pickled, so a `minimal` info verbosity is
+    recommended for training.
+    """
+
+    metadata: ClassVar[dict[str, Any]] = {"autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], gym.Env]],
+        num_frame_slots: int = 2,
+        copy: bool = True,
+        context: str | None = None,
+    ) -> None:
+        """
+        Start the workers and create the shared frame buffer.
+
+        Args:
+            env_fns (Sequence[Callable[[], gym.Env]]): Functions creating the environments, called
+                in the workers.
+            num_frame_slots (int): Number of steps whose frames are kept in the shared ring buffer.
+                Defaults to 2.
+            copy (bool): Whether to copy the frames of the shared buffer in the returned
+                observations. If False, the frames are read-only views that are overwritten
+                `num_frame_slots` steps later. Defaults to True.
+            context (str | None): Multiprocessing start method of the workers, the default method
+                is used if None. Defaults to None.
+        """
+        self.num_envs = len(env_fns)
+        self.copy = copy
+        self.closed = False
+        self._pipes: list[Connection] = []
+        self._processes: list[multiprocessing.process.BaseProcess] = []
+        self._slot = 0
+
+        # The workers attach the shared memory created by the main process, so they have to share
+        # its resource tracker for the memory to be released only by the main process
+        resource_tracker.ensure_running()
+        mp_context = multiprocessing.get_context(context)
+        for env_index, env_fn in enumerate(env_fns):
+            parent_pipe, child_pipe = mp_context.Pipe()
+            process = mp_context.Process(
+                target=_worker,
+                name=f"ITHORVectorEnvWorker-{env_index}",
+                args=(env_index, CloudpickleWrapper(env_fn), child_pipe, parent_pipe),
+                daemon=True,
+            )
+            process.start()
+            child_pipe.close()
+            self._pipes.append(parent_pipe)
+            self._processes.append(process)
+
+        # The spaces are given by the first worker to avoid creating an environment in this process
+        self._send_all(WorkerCommand.GET_SPACES, indices=[0])
+        ((self.single_observation_space, self.single_action_space),) = self._receive_all(indices=[0])
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        self._frame_key = get_frame_key(self.single_observation_space)
+        frame_space: gym.spaces.Box = (
+            self.single_observation_space
+            if self._frame_key is None
+            else self.single_observation_space.spaces[self._frame_key]  # type: ignore
+        )
+        self.frame_buffer = SharedFrameBuffer(
+            self.num_envs, frame_space.shape, num_frame_slots, dtype=frame_space.dtype
+        )
+        self._send_all(
+            WorkerCommand.ATTACH_FRAME_BUFFER,
+            {
+                "num_envs": self.num_envs,
+                "frame_shape": frame_space.shape,
+                "num_slots": num_frame_slots,
+                "name": self.frame_buffer.name,
+                "dtype": frame_space.dtype,
+            },
+        )
+        self._receive_all()
+
+        # === Type annotations ===
+        self.num_envs: int
+        self.copy: bool
+        self.closed: bool
+        self.single_observation_space: gym.Space
+        self.single_action_space: gym.Space
+        self.observation_space: gym.Space
+        self.action_space: gym.Space
+        self.frame_buffer: SharedFrameBuffer
+        self._frame_key: str | None
+        self._pipes: list[Connection]
+        self._processes: list[multiprocessing.process.BaseProcess]
+        self._slot: int
+
+    def reset(
+        self,
+        *,
+        seed: int | Sequence[int | None] | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> tuple[Any, dict[str, Any]]:
+        """
+        Reset all the environments.
+
+        Args:
+            seed (int | Sequence[int | None] | None): Seed of the environments. An integer seed is
+                incremented for each environment. Defaults to None.
+            options (dict[str, Any] | None): Reset options given to every environment. Defaults
+                to None.
+
+        Returns:
+            observations (Any): Batched observations of the environments.
+            infos (dict[str, Any]): Batched infos of the environments.
+        """
+        self.reset_async(seed=seed, options=options)
+        observations, env_infos = self.reset_wait()
+        return observations, self._merge_infos(env_infos)
+
+    def reset_async(
+        self,
+        seed: int | Sequence[int | None] | None = None,
+        options: dict[str, Any] | Sequence[dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        Send the reset command to all the environments.
+
+        Args:
+            seed (int | Sequence[int | None] | None): Seed of the environments. An integer seed is
+                incremented for each environment. Defaults to None.
+            options (dict[str, Any] | Sequence[dict[str, Any]] | None): Reset options given to
+                every environment, or to each environment. Defaults to None.
+        """
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + env_index for env_index in range(self.num_envs)]
+        if options is None or isinstance(options, dict):
+            options = [options] * self.num_envs
+        self._slot = (self._slot + 1) % self.frame_buffer.num_slots
+        for pipe, env_seed, env_options in zip(self._pipes, seed, options, strict=True):
+            pipe.send((WorkerCommand.RESET, (self._slot, env_seed, env_options)))
+
+    def reset_wait(self) -> tuple[Any, list[dict[str, Any]]]:
+        """
+        Wait for the environments to be reset.
+
+        Returns:
+            observations (Any): Batched observations of the environments.
+            env_infos (list[dict[str, Any]]): Infos of each environment.
+        """
+        other_observations, env_infos = zip(*self._receive_all(), strict=True)
+        return self._make_observations(other_observations), list(env_infos)
+
+    def step(
+        self, actions: Any
+    ) -> tuple[Any, NDArray[np.float64], NDArray[np.bool_], NDArray[np.bool_], dict[str, Any]]:
+        """
+        Step all the environments.
+
+        Args:
+            actions (Any): Batched actions of the environments.
+
+        Returns:
+            observations (Any): Batched observations of the environments.
+            rewards (NDArray[np.float64]): Rewards of the environments.
+            terminations (NDArray[np.bool_]): Whether the episode of each environment terminated.
+            truncations (NDArray[np.bool_]): Whether the episode of each environment was truncated.
+            infos (dict[str, Any]): Batched infos of the environments.
+        """
+        self.step_async(actions)
+        observations, rewards, terminations, truncations, env_infos = self.step_wait()
+        return observations, rewards, terminations, truncations, self._merge_infos(env_infos)
+
+    def step_async(self, actions: Any) -> None:
+        """
+        Send the step command with their action to all the environments.
+
+        Args:
+            actions (Any): Batched actions of the environments.
+        """
+        self._slot = (self._slot + 1) % self.frame_buffer.num_slots
+        for pipe, action in zip(self._pipes, iterate(self.action_space, actions), strict=True):
+            pipe.send((WorkerCommand.STEP, (self._slot, action)))
+
+    def step_wait(
+        self,
+    ) -> tuple[Any, NDArray[np.float64], NDArray[np.bool_], NDArray[np.bool_], list[dict[str, Any]]]:
+        """
+        Wait for the environments to be stepped.
+
+        Returns:
+            observations (Any): Batched observations of the environments.
+            rewards (NDArray[np.float64]): Rewards of the environments.
+            terminations (NDArray[np.bool_]): Whether the episode of each environment terminated.
+            truncations (NDArray[np.bool_]): Whether the episode of each environment was truncated.
+            env_infos (list[dict[str, Any]]): Infos of each environment.
+        """
+        other_observations, rewards, terminations, truncations, env_infos = zip(*self._receive_all(), strict=True)
+        return (
+            self._make_observations(other_observations),
+            np.array(rewards, dtype=np.float64),
+            np.array(terminations, dtype=np.bool_),
+            np.array(truncations, dtype=np.bool_),
+            list(env_infos),
+        )
+
+    def get_attr(self, name: str, indices: Iterable[int] | None = None) -> tuple[Any, ...]:
+        """
+        Return the attribute of the environments.
+
+        Args:
+            name (str): Name of the attribute.
+            indices (Iterable[int] | None): Indices of the environments, all of them if None.
+                Defaults to None.
+
+        Returns:
+            values (tuple[Any, ...]): Values of the attribute for each environment.
+        """
+        return self._execute(WorkerCommand.GET_ATTR, name, indices)
+
+    def set_attr(
+        self, name: str, values: list[Any] | tuple[Any, ...] | Any, indices: Iterable[int] | None = None
+    ) -> None:
+        """
+        Set the attribute of the environments.
+
+        Args:
+            name (str): Name of the attribute.
+            values (list[Any] | tuple[Any, ...] | Any): Values of the attribute for each
+                environment, or single value set for every environment.
+            indices (Iterable[int] | None): Indices of the environments, all of them if None.
+                Defaults to None.
+        """
+        indices = range(self.num_envs) if indices is None else list(indices)
+        if not isinstance(values, list | tuple):
+            values = [values] * len(indices)
+        for env_index, value in zip(indices, values, strict=True):
+            self._pipes[env_index].send((WorkerCommand.SET_ATTR, (name, value)))
+        self._receive_all(indices)
+
+    def call(self, name: str, *args: Any, **kwargs: Any) -> tuple[Any, ...]:
+        """
+        Call a method of all the environments.
+
+        Args:
+            name (str): Name of the method.
+            *args (Any): Positional arguments of the method.
+            **kwargs (Any): Keyword arguments of the method.
+
+        Returns:
+            results (tuple[Any, ...]): Results of the method for each environment.
+        """
+        return self.env_method(name, *args, **kwargs)
+
+    def env_method(self, name: str, *args: Any, indices: Iterable[int] | None = None, **kwargs: Any) -> tuple[Any, ...]:
+        """
+        Call a method of the environments.
+
+        Args:
+            name (str): Name of the method.
+            *args (Any): Positional arguments of the method.
+            indices (Iterable[int] | None): Indices of the environments, all of them if None.
+                Defaults to None.
+            **kwargs (Any): Keyword arguments of the method.
+
+        Returns:
+            results (tuple[Any, ...]): Results of the method for each environment.
+        """
+        return self._execute(WorkerCommand.CALL, (name, args, kwargs), indices)
+
+    def is_wrapped(self, wrapper_class: type[gym.Wrapper], indices: Iterable[int] | None = None) -> tuple[bool, ...]:
+        """
+        Return whether the environments are wrapped by a wrapper of the given class.
+
+        Args:
+            wrapper_class (type[gym.Wrapper]): Class of the wrapper.
+            indices (Iterable[int] | None): Indices of the environments, all of them if None.
+                Defaults to None.
+
+        Returns:
+            is_wrapped (tuple[bool, ...]): Whether each environment is wrapped by the wrapper class.
+        """
+        return self._execute(WorkerCommand.IS_WRAPPED, wrapper_class, indices)
+
+    def render(self) -> tuple[Any, ...]:
+        """
+        Return the render of each environment.
+
+        Returns:
+            renders (tuple[Any, ...]): Render of each environment.
+        """
+        return self.env_method("render")
+
+    def close_extras(self, terminate: bool = False, **kwargs: Any) -> None:  # noqa: ARG002
+        """
+        Close the workers and release the shared frame buffer.
+
+        Args:
+            terminate (bool): Whether to terminate the workers instead of waiting for them to
+                close their environment. Defaults to False.
+            **kwargs (Any): Unused keyword arguments.
+        """
+        if not terminate:
+            for pipe in self._pipes:
+                try:
+                    pipe.send((WorkerCommand.CLOSE, None))
+                    pipe.recv()
+                except (ConnectionError, EOFError):
+                    pass
+        for process in self._processes:
+            if terminate:
+                process.terminate()
+            process.join()
+        for pipe in self._pipes:
+            pipe.close()
+        self.frame_buffer.close()
+
+    def __del__(self) -> None:
+        if not getattr(self, "closed", True) and hasattr(self, "frame_buffer"):
+            self.close(terminate=True)
+
+    def _make_observations(self, other_observations: Sequence[dict[str, Any] | None]) -> Any:
+        """
+        Return the batched observations from the shared frames and the other observations.
+
+        Args:
+            other_observations (Sequence[dict[str, Any] | None]): Observations other than the frame
+                of each environment.
+
+        Returns:
+            observations (Any): Batched observations of the environments.
+        """
+        frames = self.frame_buffer.read(self._slot)
+        if self.copy:
+            frames = frames.copy()
+        if self._frame_key is None:
+            return frames
+        observation_spaces: dict[str, gym.Space] = self.single_observation_space.spaces  # type: ignore
+        return {
+            key: frames
+            if key == self._frame_key
+            else concatenate(
+                space,
+                [observation[key] for observation in other_observations],  # type: ignore
+                create_empty_array(space, self.num_envs),
+            )
+            for key, space in observation_spaces.items()
+        }
+
+    def _merge_infos(self, env_infos: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Return the infos of the environments batched in the format of Gymnasium's vector environments.
+
+        Args:
+            env_infos (list[dict[str, Any]]): Infos of each environment.
+
+        Returns:
+            infos (dict[str, Any]): Batched infos of the environments.
+        """
+        infos: dict[str, Any] = {}
+        for env_index, env_info in enumerate(env_infos):
+            infos = self._add_info(infos, env_info, env_index)
+        return infos
+
+    def _execute(self, command: WorkerCommand, data: Any, indices: Iterable[int] | None = None) -> tuple[Any, ...]:
+        """
+        Send the same command to the environments and return their results.
+
+        Args:
+            command (WorkerCommand): Command to send.
+            data (Any): Data of the command.
+            indices (Iterable[int] | None): Indices of the environments, all of them if None.
+                Defaults to None.
+
+        Returns:
+            results (tuple[Any, ...]): Results of the command for each environment.
+        """
+        indices = None if indices is None else list(indices)
+        self._send_all(command, data, indices)
+        return self._receive_all(indices)
+
+    def _send_all(self, command: WorkerCommand, data: Any = None, indices: Sequence[int] | None = None) -> None:
+        """
+        Send the same command to the environments.
+
+        Args:
+            command (WorkerCommand): Command to send.
+            data (Any): Data of the command. Defaults to None.
+            indices (Sequence[int] | None): Indices of the environments, all of them if None.
+                Defaults to None.
+        """
+        for env_index in range(self.num_envs) if indices is None else indices:
+            self._pipes[env_index].send((command, data))
+
+    def _receive_all(self, indices: Sequence[int] | None = None) -> tuple[Any, ...]:
+        """
+        Return the results of the last command sent to the environments.
+
+        Args:
+            indices (Sequence[int] | None): Indices of the environments, all of them if None.
+                Defaults to None.
+
+        Returns:
+            results (tuple[Any, ...]): Results of the command for each environment.
+        """
+        pipes = self._pipes if indices is None else [self._pipes[env_index] for env_index in indices]
+        results, successes = zip(*(pipe.recv() for pipe in pipes), strict=True)
+        for result, success in zip(results, successes, strict=True):
+            if not success:
+                raise result
+        return results
+
+
+# %% === Exceptions ===
+class UnsupportedObservationSpaceError(TypeError):
+    """Exception raised when the frames of an observation space can't be stored in shared memory."""
+
+    def __init__(self, observation_space: gym.Space) -> None:
+        """Initialize the UnsupportedObservationSpaceError object."""
+        self.observation_space = observation_space
+        super().__init__(observation_space)
+
+    def __str__(self) -> str:
+        return f"Observation space {self.observation_space} is not supported by ITHORVectorEnv: it must be a Box or a Dict with a '{FRAME_OBSERVATION_KEY}' Box."
+
+
+class UnknownWorkerCommandError(ValueError):
+    """Exception raised when a worker receives an unknown command."""
+
+    def __init__(self, command: str) -> None:
+        """Initialize the UnknownWorkerCommandError object."""
+        self.command = command
+        super().__init__(command)
+
+    def __str__(self) -> str:
+        return f"Unknown worker command '{self.command}', must be one of {list(WorkerCommand)}."
+
+
+class WorkerError(RuntimeError):
+    """Exception raised in the main process when a worker of a vectorized environment fails."""
+
+    def __init__(self, env_index: int, worker_traceback: str) -> None:
+        """Initialize the WorkerError object."""
+        self.env_index = env_index
+        self.worker_traceback = worker_traceback
+        super().__init__(env_index, worker_traceback)
+
+    def __str__(self) -> str:
+        return f"Worker of environment {self.env_index} failed:\n{self.worker_traceback}"
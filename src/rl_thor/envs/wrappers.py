@@ -42,13 +42,20 @@ class ChannelFirstObservationWrapper(ObservationWrapper, ITHOREnv):
     """
     Wrapper for changing the observation space from channel last to channel first.
 
-    It works for both single and multi channel observations (in case grayscale is supported).
+    It works for both single and multi channel observations (e.g. grayscale or stacked frames).
+
+    The observation is a `np.moveaxis` view of the frame of the event, so the wrapper makes no copy and
+    the observations of the previous steps are not overwritten. Setting `observation.channel_first` in
+    the environment's config gives contiguous channel first observations without the wrapper.
     """
 
     def __init__(self, env: ITHOREnv) -> None:
         """Initialize the wrapper."""
         super().__init__(env)
         self.env: ITHOREnv  # Only for type hinting
+        unwrapped_env: ITHOREnv = self.unwrapped  # type: ignore
+        if unwrapped_env.config.observation.channel_first:
+            raise AlreadyChannelFirstError(unwrapped_env.config)
         self.observation_space: gym.spaces.Dict
         env_obs_space: gym.spaces.Box = self.env.observation_space.spaces["env_obs"]  # type: ignore
         space_shape = (env_obs_space.shape[-1], *env_obs_space.shape[:-1])
@@ -60,7 +67,7 @@ class ChannelFirstObservationWrapper(ObservationWrapper, ITHOREnv):
         )
 
     def observation(self, observation: dict[str, NDArray[np.uint8] | str]) -> dict[str, NDArray[np.uint8] | str]:  # noqa: PLR6301
-        """Return only the first channel of the observation."""
+        """Return the observation with the environment's observation in channel first layout."""
         env_obs = np.moveaxis(observation["env_obs"], -1, 0)  # type: ignore
         observation["env_obs"] = env_obs
         return observation
@@ -135,6 +142,16 @@ class MoreThanOneArgumentValueError(Exception):
         return f"The environment's task has more than one possible argument value, which is incompatible with {SingleTaskWrapper.__name__}; config['tasks']]: {self.config["tasks"]}"
 
 
+class AlreadyChannelFirstError(Exception):
+    """Exception raised when an environment wrapped by ChannelFirstObservationWrapper already returns channel first observations."""
+
+    def __init__(self, config: EnvConfig) -> None:
+        self.config = config
+
+    def __str__(self) -> str:
+        return f"The environment already returns channel first observations (observation.channel_first=True), which is incompatible with {ChannelFirstObservationWrapper.__name__}; observation config: {self.config.observation}"
+
+
 class NotSimpleActionEnvironmentMode(Exception):
     """Exception raised when the environment is not in discrete actions and target closest object mode and it is wrapped by SimpleActionSpaceWrapper."""
 
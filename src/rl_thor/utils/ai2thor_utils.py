@@ -1,6 +1,7 @@
 """Utility functions specific to AI2THOR."""
 
-from rl_thor.envs.sim_objects import SimObjectType, SimObjId, SimObjMetadata
+from rl_thor.envs.scene_object_table import SceneObjectTable
+from rl_thor.envs.sim_objects import SimObjectType, SimObjMetadata
 
 
 def get_object_type_from_id(object_id: str) -> SimObjectType:
@@ -16,7 +17,7 @@ def get_object_type_from_id(object_id: str) -> SimObjectType:
     return SimObjectType(object_id.split("|")[0])
 
 
-def get_scene_objects_dict(objects: list[SimObjMetadata]) -> dict[SimObjId, SimObjMetadata]:
+def get_scene_objects_dict(objects: list[SimObjMetadata]) -> SceneObjectTable:
     """
     Return a dictionary of objects indexed by object id.
 
@@ -24,9 +25,10 @@ def get_scene_objects_dict(objects: list[SimObjMetadata]) -> dict[SimObjId, SimO
         objects (list[dict]): List of objects to index.
 
     Returns:
-        scene_objects_dict (dict[SimObjId, SimObjMetadata]): Dictionary of objects indexed by object id.
+        scene_objects_dict (SceneObjectTable): Scene object table, which is a dictionary of objects
+            indexed by object id.
     """
-    return {obj["objectId"]: obj for obj in objects}
+    return SceneObjectTable(objects)
 
 
 def compute_objects_3d_distance(obj1: SimObjMetadata, obj2: SimObjMetadata) -> float:
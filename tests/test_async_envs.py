@@ -0,0 +1,74 @@
+"""Tests for the async_envs module."""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import gymnasium as gym
+
+from rl_thor.envs.async_envs import AsyncITHOREnv, run_episodes
+
+
+class CountingEnv(gym.Env):
+    """Stand-in for ITHOREnv with blocking steps, terminating after a fixed number of steps."""
+
+    def __init__(self, episode_length: int, step_duration: float = 0.0) -> None:
+        self.episode_length = episode_length
+        self.step_duration = step_duration
+        self.observation_space = gym.spaces.Discrete(episode_length + 1)
+        self.action_space = gym.spaces.Discrete(2)
+        self.step_count = 0
+        self.thread_ids: set[int] = set()
+
+    def reset(self, seed: int | None = None, options: dict[str, Any] | None = None) -> tuple[int, dict]:  # noqa: ARG002
+        super().reset(seed=seed)
+        self.thread_ids.add(threading.get_ident())
+        self.step_count = 0
+        return self.step_count, {}
+
+    def step(self, action: int) -> tuple[int, float, bool, bool, dict]:
+        self.thread_ids.add(threading.get_ident())
+        time.sleep(self.step_duration)
+        self.step_count += 1
+        return self.step_count, float(action), self.step_count == self.episode_length, False, {}
+
+
+def test_run_episodes() -> None:
+    envs = [AsyncITHOREnv(CountingEnv(episode_length)) for episode_length in (2, 3, 5)]
+
+    async def policy(obs: int) -> int:
+        # Give the control back to the event loop, like a policy waiting for a batched inference
+        await asyncio.sleep(0)
+        return obs % 2
+
+    results = asyncio.run(run_episodes(envs, policy, nb_episodes=7, seed=0))
+    assert [result.episode_index for result in results] == list(range(7))
+    for result in results:
+        episode_length = envs[result.env_index].env.episode_length
+        assert result.episode_length == episode_length
+        assert result.episode_return == sum(obs % 2 for obs in range(episode_length))
+        assert result.terminated
+
+    # Each environment is always called from its own thread, which is not the event loop's
+    thread_ids = [env.env.thread_ids for env in envs]
+    assert all(len(env_thread_ids) == 1 for env_thread_ids in thread_ids)
+    assert len(set.union(*thread_ids)) == len(envs)
+    assert threading.get_ident() not in set.union(*thread_ids)
+
+    async def close_all() -> None:
+        await asyncio.gather(*(env.close() for env in envs))
+
+    asyncio.run(close_all())
+
+
+def test_run_episodes_overlaps_blocking_steps() -> None:
+    num_envs, episode_length, step_duration = 4, 5, 0.02
+    envs = [AsyncITHOREnv(CountingEnv(episode_length, step_duration)) for _ in range(num_envs)]
+
+    start_time = time.perf_counter()
+    results = asyncio.run(run_episodes(envs, lambda _obs: 0, nb_episodes=num_envs, max_steps=episode_length))
+    elapsed_time = time.perf_counter() - start_time
+
+    assert len(results) == num_envs
+    assert elapsed_time < num_envs * episode_length * step_duration
@@ -0,0 +1,76 @@
+"""Tests for the compat_index module."""
+
+import json
+
+import pytest
+
+from rl_thor.envs.ai2thor_envs import ITHOREnv
+from rl_thor.envs.compat_index import CompatIndex, CompatIndexVersionError, build_compat_index
+from rl_thor.envs.compat_index.__main__ import main
+from rl_thor.envs.scenes import SCENE_IDS, SceneGroup
+
+place_apple_in_fridge_args = {"placed_object_type": "Apple", "receptacle_type": "Fridge"}
+
+
+@pytest.fixture(scope="module")
+def compat_index() -> CompatIndex:
+    return build_compat_index(
+        [("PlaceIn", place_apple_in_fridge_args), ("PrepareMeal", {})],
+        scenes=["FloorPlan1", "FloorPlan201"],
+    )
+
+
+def test_build_compat_index(compat_index: CompatIndex) -> None:
+    entry = compat_index.get_entry("PlaceIn", dict(reversed(place_apple_in_fridge_args.items())))
+    assert entry.compatible_scenes == {"FloorPlan1"}
+    assert entry.incompatible_scenes == {"FloorPlan201"}
+    assert compat_index.filter_scenes("PrepareMeal", {}, ["FloorPlan1", "FloorPlan201", "FloorPlan2"]) == {
+        "FloorPlan1",
+        "FloorPlan2",
+    }
+    # Task blueprints that are not in the index are not filtered
+    assert compat_index.filter_scenes("OpenAny", {}, ["FloorPlan201"]) == {"FloorPlan201"}
+    assert compat_index.is_up_to_date()
+
+
+def test_compat_index_save_and_load(compat_index: CompatIndex, tmp_path) -> None:
+    index_path = tmp_path / "compat_index.json"
+    compat_index.save(index_path)
+    loaded_index = CompatIndex.load(index_path)
+    assert loaded_index.entries == compat_index.entries
+    assert loaded_index.metadata_digest == compat_index.metadata_digest
+
+    index_dict = json.loads(index_path.read_text())
+    index_dict["version"] = 0
+    index_path.write_text(json.dumps(index_dict))
+    with pytest.raises(CompatIndexVersionError):
+        CompatIndex.load(index_path)
+
+
+def test_compat_index_cli(tmp_path) -> None:
+    index_path = tmp_path / "compat_index.json"
+    main(["--output", str(index_path)])
+    compat_index = CompatIndex.load(index_path)
+    assert compat_index.get_entry("PrepareMeal", {}).compatible_scenes == set(SCENE_IDS[SceneGroup.KITCHEN])
+    assert compat_index.get_entry("PlaceIn", place_apple_in_fridge_args) is None
+
+
+def test_ithor_env_uses_compat_index(tmp_path) -> None:
+    index_path = tmp_path / "compat_index.json"
+    build_compat_index([("PlaceIn", place_apple_in_fridge_args)]).save(index_path)
+
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "tasks": {
+                "compat_index_path": str(index_path),
+                "task_blueprints": [
+                    {"task_type": "PlaceIn", "args": place_apple_in_fridge_args, "scenes": ["Kitchen", "LivingRoom"]},
+                ],
+            },
+        }
+    )
+    scenes = env.task_blueprints[0].scenes
+    assert "FloorPlan1" in scenes
+    assert scenes <= set(SCENE_IDS[SceneGroup.KITCHEN])
+    env.close()
@@ -0,0 +1,435 @@
+"""Tests for the controllers module."""
+
+import operator
+import pickle as pkl  # noqa: S403
+from pathlib import Path
+from typing import Any
+
+import pytest
+from ai2thor.server import Event
+
+from rl_thor.envs._config import EnvConfig  # noqa: PLC2701
+from rl_thor.envs.actions import ACTIONS_BY_NAME, EnvActionName
+from rl_thor.envs.ai2thor_envs import ITHOREnv, RewardResult
+from rl_thor.envs.controllers import (
+    ControllerPool,
+    NoRecordedEpisodeError,
+    ReplayController,
+    SceneSnapshot,
+    SyntheticController,
+    UnknownControllerBackendError,
+    create_controller,
+)
+from rl_thor.envs.scene_object_table import SceneObjectTable
+
+test_episode_path = Path(__file__).parent / "data" / "test_tasks" / "pickup_mug"
+
+apple_id = "Apple|-00.47|+01.15|+00.48"
+fridge_id = "Fridge|-02.10|+00.00|+01.07"
+counter_top_id = "CounterTop|-00.08|+01.15|00.00"
+light_switch_id = "LightSwitch|+02.33|+01.31|-00.16"
+
+
+def get_objects_by_id(controller: SyntheticController) -> dict:
+    return {obj["objectId"]: obj for obj in controller.last_event.metadata["objects"]}
+
+
+def test_replay_controller_serves_recorded_events() -> None:
+    with (test_episode_path / "event_list.pkl").open("rb") as f:
+        recorded_events = pkl.load(f)  # noqa: S301
+    with (test_episode_path / "controller_action_list.pkl").open("rb") as f:
+        recorded_actions = pkl.load(f)  # noqa: S301
+    controller = ReplayController(test_episode_path)
+    assert controller.available_scenes == ["FloorPlan1"]
+
+    event = controller.reset(scene="FloorPlan1")
+    assert event.metadata["objects"] == recorded_events[0].metadata["objects"]
+    # Queries of the scene don't advance the episode and the served events can be modified
+    query = controller.step(action="Done")
+    query.metadata["lastActionSuccess"] = False
+    assert controller.step(action="GetObjectInFrame").metadata["actionReturn"] == recorded_actions[1]["objectId"]
+    assert recorded_events[0].metadata["lastActionSuccess"]
+
+    for recorded_event, recorded_action in zip(recorded_events[1:], recorded_actions[1:], strict=True):
+        event = controller.step(action="MoveAhead")
+        assert event.metadata["objects"] == recorded_event.metadata["objects"]
+        assert controller.last_action == recorded_action
+    assert not controller.step(action="MoveAhead")
+
+    with pytest.raises(NoRecordedEpisodeError):
+        controller.reset(scene="FloorPlan2")
+
+
+def test_synthetic_controller_object_interactions() -> None:
+    controller = SyntheticController()
+    controller.reset(scene="FloorPlan1")
+    initial_objects = controller.last_event.metadata["objects"]
+
+    assert controller.step(action="PickupObject", objectId=apple_id)
+    objects = get_objects_by_id(controller)
+    assert objects[apple_id]["isPickedUp"]
+    assert apple_id not in objects[counter_top_id]["receptacleObjectIds"]
+    assert controller.last_event.metadata["inventoryObjects"] == [{"objectId": apple_id, "objectType": "Apple"}]
+
+    assert not controller.step(action="PutObject", objectId=fridge_id)
+    assert controller.step(action="OpenObject", objectId=fridge_id)
+    assert controller.step(action="PutObject", objectId=fridge_id)
+    objects = get_objects_by_id(controller)
+    assert objects[apple_id]["parentReceptacles"] == [fridge_id]
+    assert apple_id in objects[fridge_id]["receptacleObjectIds"]
+    assert not controller.last_event.metadata["inventoryObjects"]
+
+    assert controller.step(action="ToggleObjectOff", objectId=light_switch_id)
+    assert not get_objects_by_id(controller)[light_switch_id]["isToggled"]
+    assert not controller.step(action="ToggleObjectOn", objectId=apple_id)
+    assert controller.step(action="MoveAhead")
+    assert not controller.step(action="SliceObject", objectId=apple_id)
+
+    # The initial metadata of the scene are not modified by the actions
+    controller.reset(scene="FloorPlan1_physics")
+    assert controller.last_event.metadata["objects"] == initial_objects
+    assert not get_objects_by_id(controller)[apple_id]["isPickedUp"]
+
+
+def test_ithor_env_with_synthetic_backend() -> None:
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        "args": {"placed_object_type": "Apple", "receptacle_type": "Fridge"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+    observation, _ = env.reset(seed=0)
+    assert observation["env_obs"].shape == env.observation_space["env_obs"].shape
+
+    for action, object_id in (("OpenObject", fridge_id), ("PickupObject", apple_id), ("PutObject", fridge_id)):
+        event = env.controller.step(action=action, objectId=object_id)
+        _, terminated, _ = env.reward_handler.get_reward(
+            event, env.controller.last_action, SceneObjectTable.from_event(event)
+        )
+    assert terminated
+    env.close()
+
+
+def test_ithor_env_info_is_picklable() -> None:
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        "args": {"placed_object_type": "Apple", "receptacle_type": "Fridge"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+    action_name_to_idx = {action_name: idx for idx, action_name in env.action_idx_to_name.items()}
+    _, reset_info = env.reset(seed=0)
+    _, _, _, _, step_info = env.step({"action_index": action_name_to_idx[EnvActionName.MOVE_FORWARD]})
+    env.close()
+
+    # The info are sent between processes by the vectorized environments
+    for info in (reset_info, step_info):
+        candidate_data_info = info["task_info"]["candidate_data"]
+        advancement_details_info = info["task_info"]["advancement_details"]
+        unpickled_info = pkl.loads(pkl.dumps(info))  # noqa: S301
+        assert unpickled_info["task_info"]["candidate_data"].keys() == candidate_data_info.keys()
+        assert len(unpickled_info["task_info"]["advancement_details"]) == len(advancement_details_info)
+        for item_id, candidate_data in candidate_data_info.items():
+            unpickled_candidate_data = unpickled_info["task_info"]["candidate_data"][item_id]
+            assert unpickled_candidate_data.id == candidate_data.id
+            assert unpickled_candidate_data.base_properties_results == candidate_data.base_properties_results
+
+
+def test_ithor_env_last_info_read_after_reset() -> None:
+    action_names = [EnvActionName.OPEN_OBJECT, EnvActionName.MOVE_FORWARD, EnvActionName.PICKUP_OBJECT]
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "max_episode_steps": len(action_names),
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        # The credit card is the closest pickupable object, so the task advances
+                        "args": {"placed_object_type": "CreditCard", "receptacle_type": "Drawer"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+    action_name_to_idx = {action_name: idx for idx, action_name in env.action_idx_to_name.items()}
+    env.reset(seed=0)
+    for action_name in action_names:
+        _, _, _, truncated, info = env.step({"action_index": action_name_to_idx[action_name]})
+    assert truncated
+    assert info["task_advancement"] > 0
+
+    # The info of the last step is read after the reset, like with a same-step autoreset
+    env.reset()
+    task_info = info["task_info"]
+    assert task_info["candidate_data"].keys() == task_info["best_assignment"].keys()
+    advancement_details = task_info["advancement_details"]
+    assert sum(details.current_advancement for details in advancement_details.values()) == info["task_advancement"]
+    env.close()
+
+
+def test_create_controller_unknown_backend() -> None:
+    with pytest.raises(UnknownControllerBackendError):
+        create_controller(EnvConfig(controller_backend="unknown"))
+
+
+def test_scene_snapshot_restoration() -> None:
+    controller = SyntheticController()
+    initial_event = controller.reset(scene="FloorPlan1")
+    snapshot = SceneSnapshot(initial_event)
+    assert snapshot.get_restoration_actions(initial_event) == []
+
+    controller.step(action="PickupObject", objectId=apple_id)
+    controller.step(action="OpenObject", objectId=fridge_id)
+    controller.step(action="ToggleObjectOff", objectId=light_switch_id)
+    restoration_actions = snapshot.get_restoration_actions(controller.last_event)
+    assert [action["action"] for action in restoration_actions] == [
+        "DropHandObject",
+        "SetObjectPoses",
+        "CloseObject",
+        "ToggleObjectOn",
+    ]
+
+    assert snapshot.restore(controller)
+    objects = get_objects_by_id(controller)
+    for obj_id, obj_metadata in snapshot.objects.items():
+        assert objects[obj_id] == obj_metadata or obj_id == counter_top_id
+    assert set(objects[counter_top_id]["receptacleObjectIds"]) == set(
+        snapshot.objects[counter_top_id]["receptacleObjectIds"]
+    )
+    assert not controller.last_event.metadata["inventoryObjects"]
+
+    # Sliced objects can't be restored
+    sliced_event = Event({
+        **initial_event.metadata,
+        "objects": [{**obj, "isSliced": obj["objectId"] == apple_id} for obj in initial_event.metadata["objects"]],
+    })
+    assert snapshot.get_restoration_actions(sliced_event) is None
+
+
+@pytest.mark.parametrize("warm_scene_resets", [True, False])
+def test_controller_pool_keeps_recently_loaded_scenes(warm_scene_resets: bool) -> None:
+    pool_size = 2
+    pool = ControllerPool(SyntheticController, size=pool_size, warm_scene_resets=warm_scene_resets)
+    controller, is_warm_reset = pool.reset("FloorPlan1")
+    assert not is_warm_reset
+    controller.step(action="PickupObject", objectId=apple_id)
+
+    controller, is_warm_reset = pool.reset("FloorPlan1")
+    assert is_warm_reset == warm_scene_resets
+    assert not get_objects_by_id(controller)[apple_id]["isPickedUp"]
+
+    assert pool.reset("FloorPlan2") == (pool.controllers[1], False)
+    assert pool.reset("FloorPlan3")[1] is False
+    assert pool.loaded_scenes == ["FloorPlan2", "FloorPlan3"]
+    assert len(pool.controllers) == pool_size
+    pool.stop()
+
+
+def test_ithor_env_warm_scene_resets() -> None:
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "controller_pool": {"warm_scene_resets": True},
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        "args": {"placed_object_type": "Apple", "receptacle_type": "Fridge"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+    _, info = env.reset(seed=0)
+    assert info["speed_performance"]["warm_scene_initialization_time"] == 0
+    env.controller.step(action="PickupObject", objectId=apple_id)
+
+    _, info = env.reset()
+    speed_performance = info["speed_performance"]
+    assert speed_performance["cold_scene_initialization_time"] == 0
+    assert speed_performance["scene_initialization_time"] == speed_performance["warm_scene_initialization_time"] > 0
+    assert not info["metadata"]["inventoryObjects"]
+    env.close()
+
+
+def test_ithor_env_pipelined_reward() -> None:
+    action_names = [
+        EnvActionName.OPEN_OBJECT,
+        EnvActionName.MOVE_FORWARD,
+        EnvActionName.PICKUP_OBJECT,
+        EnvActionName.ROTATE_LEFT,
+        EnvActionName.PUT_DOWN_OBJECT,
+        EnvActionName.LOOK_DOWN,
+    ]
+
+    def run_episode(pipelined_reward: bool) -> tuple[list[float], list[bool], list[dict]]:
+        env = ITHOREnv(
+            config_override={
+                "controller_backend": "synthetic",
+                "max_episode_steps": len(action_names),
+                "pipelined_reward": pipelined_reward,
+                "tasks": {
+                    "task_blueprints": [
+                        {
+                            "task_type": "PlaceIn",
+                            # The credit card is the closest pickupable object, so the rewards are not all 0
+                            "args": {"placed_object_type": "CreditCard", "receptacle_type": "Drawer"},
+                            "scenes": ["FloorPlan1"],
+                        }
+                    ]
+                },
+            }
+        )
+        action_name_to_idx = {action_name: idx for idx, action_name in env.action_idx_to_name.items()}
+        env.reset(seed=0)
+        rewards, terminations, infos = [], [], []
+        for action_name in action_names:
+            _, reward, terminated, _, info = env.step({"action_index": action_name_to_idx[action_name]})
+            rewards.append(reward)
+            terminations.append(terminated)
+            infos.append(info)
+        env.close()
+        return rewards, terminations, infos
+
+    rewards, terminations, _ = run_episode(pipelined_reward=False)
+    pipelined_rewards, pipelined_terminations, pipelined_infos = run_episode(pipelined_reward=True)
+    assert any(rewards)
+
+    # The rewards are returned one step later and the last two are summed at truncation
+    assert pipelined_rewards == [0.0, *rewards[:-2], rewards[-2] + rewards[-1]]
+    assert pipelined_terminations == [False, *terminations[:-2], terminations[-2] or terminations[-1]]
+    assert [info["reward_episode_step"] for info in pipelined_infos] == [0, 1, 2, 3, 4, 6]
+    assert all(info["speed_performance"]["reward_wait_time"] >= 0 for info in pipelined_infos)
+
+
+def test_ithor_env_pipelined_reward_task_completion() -> None:
+    action_names = [EnvActionName.OPEN_OBJECT, EnvActionName.MOVE_FORWARD, EnvActionName.PICKUP_OBJECT]
+
+    def make_env(pipelined_reward: bool) -> ITHOREnv:
+        return ITHOREnv(
+            config_override={
+                "controller_backend": "synthetic",
+                "pipelined_reward": pipelined_reward,
+                "tasks": {
+                    "task_blueprints": [
+                        {
+                            "task_type": "Pickup",
+                            "args": {"picked_up_object_type": "CreditCard"},
+                            "scenes": ["FloorPlan1"],
+                        }
+                    ]
+                },
+            }
+        )
+
+    def run_steps(env: ITHOREnv, action_names: list[EnvActionName]) -> tuple[list[float], list[bool], list[dict]]:
+        action_name_to_idx = {action_name: idx for idx, action_name in env.action_idx_to_name.items()}
+        rewards, terminations, infos = [], [], []
+        for action_name in action_names:
+            _, reward, terminated, _, info = env.step({"action_index": action_name_to_idx[action_name]})
+            rewards.append(reward)
+            terminations.append(terminated)
+            infos.append(info)
+        return rewards, terminations, infos
+
+    env = make_env(pipelined_reward=False)
+    env.reset(seed=0)
+    rewards, terminations, _ = run_steps(env, action_names)
+    env.close()
+    assert terminations == [False, False, True]
+
+    pipelined_env = make_env(pipelined_reward=True)
+    pipelined_env.reset(seed=0)
+    compute_reward = pipelined_env._compute_reward
+    reward_scene_object_tables = []
+
+    def record_scene_object_table(*args: Any) -> RewardResult:
+        reward_scene_object_tables.append(args[3])
+        return compute_reward(*args)
+
+    pipelined_env._compute_reward = record_scene_object_table
+    first_rewards, first_terminations, _ = run_steps(pipelined_env, action_names[:1])
+    # The reward thread doesn't share the scene object table of the environment
+    assert reward_scene_object_tables[0] is not pipelined_env.last_scene_object_table
+    assert reward_scene_object_tables[0].object_ids == pipelined_env.last_scene_object_table.object_ids
+
+    next_rewards, next_terminations, next_infos = run_steps(
+        pipelined_env, [*action_names[1:], EnvActionName.ROTATE_LEFT]
+    )
+    # The episode ends at the step following the completion of the task, without computing its reward
+    assert len(reward_scene_object_tables) == len(action_names)
+    assert first_rewards + next_rewards == [0.0, *rewards]
+    assert first_terminations + next_terminations == [False, *terminations]
+    assert next_infos[-1]["reward_episode_step"] == len(action_names)
+    _, info = pipelined_env.reset(seed=0)
+    assert info["flushed_reward"] == 0
+
+    # The reward of the last step is returned by the reset when the episode is ended before it is returned by a step
+    run_steps(pipelined_env, action_names)
+    _, info = pipelined_env.reset(seed=0)
+    assert info["flushed_reward"] == rewards[-1] != 0
+    pipelined_env.close()
+
+
+def test_ithor_env_closest_object_targeting() -> None:
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "action_mask_in_info": True,
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        "args": {"placed_object_type": "Apple", "receptacle_type": "Fridge"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+    _, info = env.reset(seed=0)
+    scene_object_table = env.last_scene_object_table
+
+    expected_action_mask = []
+    for action_name in env.action_idx_to_name.values():
+        env_action = ACTIONS_BY_NAME[action_name]
+        if not env_action.has_target_object:
+            expected_action_mask.append(True)
+            continue
+        # Brute-force search of the closest interactable operable object
+        closest_object = min(
+            (
+                obj_metadata
+                for obj_metadata in scene_object_table.values()
+                if obj_metadata["isInteractable"] and env_action.is_object_operable(obj_metadata)
+            ),
+            key=operator.itemgetter("distance"),
+            default=None,
+        )
+        expected_action_mask.append(closest_object is not None)
+        if closest_object is not None:
+            target_object_id, _ = env._identify_target_object(env_action, None, scene_object_table)
+            assert target_object_id == closest_object["objectId"]
+
+    assert info["action_mask"].tolist() == expected_action_mask
+    assert env.action_masks().tolist() == expected_action_mask
+    env.close()
@@ -0,0 +1,123 @@
+"""Tests for the item_prop_interface module."""
+
+import pickle as pkl  # noqa: S403
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rl_thor.envs.scene_object_table import SceneObjectTable
+from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.item_prop import (
+    IsOpenIfPossibleProp,
+    IsOpenProp,
+    IsPickedUpProp,
+    IsSlicedProp,
+    ObjectTypeProp,
+    OpennessProp,
+    ReceptacleClearedProp,
+    ReceptacleMaxObjectsProp,
+    TemperatureProp,
+)
+from rl_thor.envs.tasks.item_prop_interface import (
+    BaseItemProp,
+    BasePSF,
+    EmptyContainerPSF,
+    GenericPSF,
+    MultiValuePSF,
+    RangePSF,
+    SingleValuePSF,
+    SizeLimitPSF,
+    TemperatureValue,
+)
+
+test_event_path = Path(__file__).parent / "data" / "test_tasks" / "clean_up_kitchen" / "event_list.pkl"
+
+
+def make_object_array(values: list) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+@pytest.mark.parametrize(
+    ("psf", "prop_values"),
+    [
+        (SingleValuePSF(True), np.array([True, False, True])),
+        (SingleValuePSF("Hot"), make_object_array(["Hot", "Cold", "RoomTemp"])),
+        (SingleValuePSF(["a"]), make_object_array([["a"], [], ["a", "b"]])),
+        (MultiValuePSF({"Apple", "Egg"}), make_object_array(["Apple", "Bread", "Egg"])),
+        (RangePSF(0.2, 0.8), np.array([0.0, 0.2, 0.5, 0.8, 1.0])),
+        (SizeLimitPSF(max_elements=1), make_object_array([[], ["a"], ["a", "b"]])),
+        (SizeLimitPSF(max_elements=1, expect_less_or_equal=False), make_object_array([[], ["a"], ["a", "b"]])),
+        (EmptyContainerPSF(), make_object_array([[], ["a"]])),
+        (EmptyContainerPSF(expect_empty=False), make_object_array([[], ["a"]])),
+        (GenericPSF(lambda value: value > 1), np.array([0, 1, 2, 3])),
+    ],
+)
+def test_psf_evaluate_many_matches_call(psf: BasePSF, prop_values: np.ndarray) -> None:
+    are_satisfying = psf.evaluate_many(prop_values)
+    assert are_satisfying.dtype == np.bool_
+    assert are_satisfying.tolist() == [psf(prop_value) for prop_value in prop_values]
+
+
+@pytest.mark.parametrize(
+    "prop",
+    [
+        ObjectTypeProp(MultiValuePSF({SimObjectType.APPLE, SimObjectType.MUG})),
+        IsOpenProp(True),
+        IsPickedUpProp(False),
+        OpennessProp(RangePSF(0.5, 1)),
+        IsSlicedProp(True),
+        TemperatureProp(TemperatureValue.ROOM_TEMP),
+        ReceptacleClearedProp(),
+        ReceptacleMaxObjectsProp(2),
+    ],
+)
+def test_prop_evaluate_many_matches_is_object_satisfying(prop: BaseItemProp) -> None:
+    with test_event_path.open("rb") as f:
+        event_list = pkl.load(f)  # noqa: S301
+    scene_object_table = SceneObjectTable.from_event(event_list[0])
+    candidate_required_prop = getattr(type(prop), "candidate_required_prop", None)
+    candidate_ids = [
+        obj_id
+        for obj_id, obj in scene_object_table.items()
+        if candidate_required_prop is None
+        or candidate_required_prop.satisfaction_function(obj[candidate_required_prop.target_ai2thor_property])
+    ]
+    rows = np.array([scene_object_table.row_index[obj_id] for obj_id in candidate_ids], dtype=np.intp)
+
+    are_satisfying = prop.evaluate_many(scene_object_table, rows)
+
+    assert are_satisfying.tolist() == [
+        prop.is_object_satisfying(scene_object_table[obj_id]) for obj_id in candidate_ids
+    ]
+
+
+def test_props_with_same_signature_share_memoized_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a property is evaluated once per object and per step for all the properties with its signature."""
+    with test_event_path.open("rb") as f:
+        event_list = pkl.load(f)  # noqa: S301
+    scene_object_table = SceneObjectTable.from_event(event_list[0])
+    object_ids = scene_object_table.object_ids
+    rows = np.arange(len(object_ids), dtype=np.intp)
+    prop, if_possible_prop = IsOpenProp(True), IsOpenIfPossibleProp(True)
+    assert prop.signature == if_possible_prop.signature != IsOpenProp(False).signature
+
+    expected_results = [prop.is_object_satisfying(scene_object_table[obj_id]) for obj_id in object_ids]
+    assert prop.is_object_satisfying_memoized(scene_object_table[object_ids[0]], scene_object_table) == (
+        expected_results[0]
+    )
+    assert prop.evaluate_many_memoized(scene_object_table, rows[:5]).tolist() == expected_results[:5]
+
+    # Only the objects that were not evaluated yet are checked
+    evaluated_rows = []
+
+    def evaluate_many(table: SceneObjectTable, missing_rows: np.ndarray) -> np.ndarray:
+        evaluated_rows.extend(missing_rows.tolist())
+        return IsOpenIfPossibleProp.evaluate_many(if_possible_prop, table, missing_rows)
+
+    monkeypatch.setattr(if_possible_prop, "evaluate_many", evaluate_many)
+    assert if_possible_prop.evaluate_many_memoized(scene_object_table, rows).tolist() == expected_results
+    assert evaluated_rows == rows[5:].tolist()
+
@@ -1,7 +1,18 @@
 """Tests for the items module."""
 
+import itertools
+import random
+
 from rl_thor.envs.sim_objects import SimObjId
-from rl_thor.envs.tasks.items import CandidateData, CandidateId, ItemOverlapClass, TaskItem
+from rl_thor.envs.tasks.items import (
+    DEFAULT_RESULTS_CAPACITY,
+    AuxItem,
+    CandidateData,
+    CandidateId,
+    ItemOverlapClass,
+    TaskItem,
+)
+from rl_thor.envs.tasks.relations import CloseToRelation, ReceptacleOfRelation
 
 
 def test_compute_valid_assignments_with_inherited_objects():
@@ -75,3 +86,91 @@ def test_compute_valid_assignments_with_inherited_objects():
     assert all(
         expected_valid_assignment in expected_valid_assignments for expected_valid_assignment in valid_assignments
     )
+
+
+def test_valid_assignments_match_filtered_permutations():
+    candidate_ids = [CandidateId(SimObjId(f"obj_{i}")) for i in range(6)]
+    items_candidate_ids = [candidate_ids[:3], candidate_ids[1:5], candidate_ids[2:], candidate_ids[::2]]
+    items = []
+    for i, item_candidate_ids in enumerate(items_candidate_ids):
+        item = TaskItem(f"item_{i}", set())
+        item.candidates_data = {candidate_id: CandidateData(candidate_id, item) for candidate_id in item_candidate_ids}
+        items.append(item)
+
+    overlap_class = ItemOverlapClass(items, candidate_ids)
+
+    expected_valid_assignments = [
+        dict(zip(items, permutation, strict=True))
+        for permutation in itertools.permutations(candidate_ids, len(items))
+        if all(candidate_id in item.candidate_ids for item, candidate_id in zip(items, permutation, strict=True))
+    ]
+    assert overlap_class.valid_assignments == expected_valid_assignments
+
+    # Pruning keeps the order of the valid assignments
+    compatible_assignments = expected_valid_assignments[::-3]
+    overlap_class.prune_assignments(compatible_assignments)
+    assert overlap_class.valid_assignments == compatible_assignments[::-1]
+
+
+def test_aux_item_max_advancement_matches_candidate_scan():
+    rng = random.Random(0)  # noqa: S311
+    relation_satisfaction_rate = 0.2
+    main_item = TaskItem("main_item", set())
+    main_candidate_ids = [CandidateId(SimObjId(f"main_obj_{i}")) for i in range(6)]
+    main_item.candidates_data = {
+        candidate_id: CandidateData(candidate_id, main_item) for candidate_id in main_candidate_ids
+    }
+
+    aux_item = AuxItem("aux_item", set(), {ReceptacleOfRelation: {}, CloseToRelation: {"distance": 1.0}})
+    aux_item.initialize_relations(main_item.id)
+    for relation in aux_item.relations:
+        relation.related_item = main_item
+        relation.maximum_advancement = 2
+    aux_item.candidates_data = {}
+    for i in range(8):
+        aux_candidate_id = CandidateId(SimObjId(f"aux_obj_{i}"))
+        aux_candidate_data = CandidateData(aux_candidate_id, aux_item)
+        aux_candidate_data.property_advancement = rng.randint(0, 3)
+        aux_candidate_data.relations_satisfying_related_candidate_ids = {
+            relation: {candidate_id for candidate_id in main_candidate_ids if rng.random() < relation_satisfaction_rate}
+            for relation in aux_item.relations
+        }
+        for relation in aux_item.relations:
+            relation_col = aux_item.results_layout.relation_columns[relation]
+            aux_item.candidates_results.relations_aux_property_advancement[aux_candidate_data.row, relation_col] = (
+                rng.randint(0, 1)
+            )
+        aux_item.candidates_data[aux_candidate_id] = aux_candidate_data
+
+    for main_candidate_id in main_candidate_ids:
+        assert aux_item.compute_max_advancement_for_related_candidate(main_candidate_id) == max(
+            aux_candidate_data.property_advancement
+            + sum(
+                aux_candidate_data.compute_relation_advancement_for_related_candidate(relation, main_candidate_id)
+                for relation in aux_item.relations
+            )
+            for aux_candidate_data in aux_item.candidates_data.values()
+        )
+
+
+def test_candidate_data_has_no_instance_dict():
+    item = TaskItem("item", set())
+    candidate_data = CandidateData(CandidateId(SimObjId("obj")), item)
+    assert not hasattr(candidate_data, "__dict__")
+    assert candidate_data.item is item
+
+
+def test_candidates_results_rows():
+    item = TaskItem("item", set())
+    candidate_ids = [CandidateId(SimObjId(f"obj_{i}")) for i in range(DEFAULT_RESULTS_CAPACITY + 1)]
+    candidates_data = [CandidateData(candidate_id, item) for candidate_id in candidate_ids]
+    assert [candidate_data.row for candidate_data in candidates_data] == list(range(len(candidate_ids)))
+    assert item.candidates_results.capacity == 2 * DEFAULT_RESULTS_CAPACITY
+
+    # The candidates of a new episode get new arrays, the ones of the last episode keep theirs
+    candidates_results = item.candidates_results
+    item.candidates_data = item.instantiate_candidate_data({})
+    assert item.candidates_results is not candidates_results
+    assert item.candidates_results.nb_rows == 0
+    assert CandidateData(candidate_ids[0], item).row == 0
+    assert candidates_results.nb_rows == len(candidate_ids)
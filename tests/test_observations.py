@@ -0,0 +1,140 @@
+"""Tests for the observations module."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from rl_thor.envs._config import ObservationConfig  # noqa: PLC2701
+from rl_thor.envs.ai2thor_envs import ITHOREnv
+from rl_thor.envs.observations import FrameProcessor, InvalidObservationConfigError, compute_object_state
+from rl_thor.envs.scene_object_table import SceneObjectTable
+
+frame_height, frame_width = 12, 16
+rng = np.random.default_rng(0)
+frames = [rng.integers(0, 256, size=(frame_height, frame_width, 3), dtype=np.uint8) for _ in range(5)]
+# Maximum difference with the floating point grayscale conversion, due to the integer weights
+GRAYSCALE_TOLERANCE = 2
+
+
+def test_identity_observation_is_read_only_view() -> None:
+    processor = FrameProcessor(ObservationConfig(), frame_height, frame_width)
+    observation = processor.reset(frames[0])
+    assert processor.observation_shape == (frame_height, frame_width, 3)
+    assert np.shares_memory(observation, frames[0])
+    assert not observation.flags.writeable
+
+
+@pytest.mark.parametrize("channel_first", [True, False])
+def test_crop_resize_grayscale(channel_first: bool) -> None:
+    config = ObservationConfig(
+        channel_first=channel_first, frame_height=4, frame_width=6, grayscale=True, center_crop=[8, 12]
+    )
+    processor = FrameProcessor(config, frame_height, frame_width)
+    observation = processor.process(frames[0])
+
+    cropped_frame = frames[0][2:10, 2:14].astype(np.float64)
+    expected_frame = cropped_frame[::2, ::2] @ np.array([0.299, 0.587, 0.114])
+    expected_shape = (1, 4, 6) if channel_first else (4, 6, 1)
+    assert processor.observation_shape == expected_shape
+    assert observation.shape == expected_shape
+    assert observation.dtype == np.uint8
+    assert np.abs(observation.reshape(4, 6) - expected_frame).max() <= GRAYSCALE_TOLERANCE
+
+
+@pytest.mark.parametrize("channel_first", [True, False])
+def test_frame_stack(channel_first: bool) -> None:
+    frame_stack = 3
+    processor = FrameProcessor(
+        ObservationConfig(channel_first=channel_first, frame_stack=frame_stack), frame_height, frame_width
+    )
+    stack_axis = 0 if channel_first else -1
+
+    def to_frames(observation: np.ndarray) -> list[np.ndarray]:
+        stacked_frames = np.split(observation, frame_stack, axis=stack_axis)
+        return [np.moveaxis(frame, 0, -1) if channel_first else frame for frame in stacked_frames]
+
+    observation = processor.reset(frames[0])
+    assert observation.shape == processor.observation_shape
+    assert not observation.flags.writeable
+    assert all(np.array_equal(frame, frames[0]) for frame in to_frames(observation))
+
+    for step in range(1, len(frames)):
+        observation = processor.process(frames[step])
+        expected_frames = [frames[max(index, 0)] for index in range(step - frame_stack + 1, step + 1)]
+        assert all(itertools.starmap(np.array_equal, zip(to_frames(observation), expected_frames, strict=True)))
+
+
+@pytest.mark.parametrize(
+    "config",
+    [ObservationConfig(grayscale=True), ObservationConfig(channel_first=True, frame_stack=2)],
+)
+def test_last_observation_kept_after_reset(config: ObservationConfig) -> None:
+    processor = FrameProcessor(config, frame_height, frame_width)
+    processor.reset(frames[0])
+    last_observation = processor.process(frames[1])
+    expected_last_observation = last_observation.copy()
+
+    reset_observation = processor.reset(frames[2])
+    assert not np.shares_memory(last_observation, reset_observation)
+    assert np.array_equal(last_observation, expected_last_observation)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [ObservationConfig(frame_stack=0), ObservationConfig(center_crop=[frame_height + 1, frame_width])],
+)
+def test_invalid_observation_config(config: ObservationConfig) -> None:
+    with pytest.raises(InvalidObservationConfigError):
+        FrameProcessor(config, frame_height, frame_width)
+
+
+def test_compute_object_state() -> None:
+    scene_object_table = SceneObjectTable([
+        {"objectId": "Fridge_1", "position": {"x": 1.0, "y": 2.0, "z": 3.0}, "isOpen": True},
+        {"objectId": "Apple_1", "position": {"x": -1.0, "y": 0.5, "z": 0.0}, "isPickedUp": True},
+    ])
+    object_state = compute_object_state(scene_object_table, ["Apple_1", "Sliced_1", "Fridge_1", "Mug_1"], nb_rows=3)
+    assert object_state.dtype == np.float32
+    np.testing.assert_array_equal(
+        object_state,
+        [
+            [1, -1.0, 0.5, 0.0, 0, 0, 1],
+            [0, 0, 0, 0, 0, 0, 0],
+            [1, 1.0, 2.0, 3.0, 1, 0, 0],
+        ],
+    )
+
+
+def test_ithor_env_additional_modalities() -> None:
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "observation": {
+                "frame_height": 64,
+                "frame_width": 64,
+                "depth": True,
+                "instance_segmentation": True,
+                "object_state": True,
+            },
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        "args": {"placed_object_type": "Apple", "receptacle_type": "Fridge"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+    observation, _ = env.reset(seed=0)
+    assert env.observation_space.contains(observation)
+    assert observation["depth"].shape == (64, 64, 1)
+    assert observation["instance_segmentation"].shape == (64, 64, 3)
+    # The candidates of the apple and of the fridge are present
+    nb_candidates = len(env.task.get_candidate_object_ids())
+    assert nb_candidates >= 2  # noqa: PLR2004
+    assert observation["object_state"][:nb_candidates, 0].all()
+    assert not observation["object_state"][nb_candidates:].any()
+    env.close()
@@ -0,0 +1,132 @@
+"""Tests for the profiling module."""
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from rl_thor.envs import profiling
+from rl_thor.envs._config import ProfilingConfig  # noqa: PLC2701
+from rl_thor.envs.actions import EnvActionName
+from rl_thor.envs.ai2thor_envs import ITHOREnv
+from rl_thor.envs.profiling import (
+    COUNTER_NAMES,
+    SPAN_NAMES,
+    CounterName,
+    CsvProfilingSink,
+    JsonlProfilingSink,
+    MissingProfilingSinkPathError,
+    SpanHistogram,
+    SpanName,
+    StepProfiler,
+)
+
+
+def test_hooks_without_active_profiler() -> None:
+    assert not profiling.is_profiling()
+    with profiling.span(SpanName.REWARD):
+        profiling.count(CounterName.CANDIDATES_SCORED, 3)
+
+
+def test_step_profiler_records_active_spans_and_counters() -> None:
+    profiler = StepProfiler()
+    with profiling.activate(profiler):
+        assert profiling.is_profiling()
+        with profiling.span(SpanName.REWARD):
+            profiling.count(CounterName.CANDIDATES_SCORED, 3)
+        profiling.count(CounterName.CANDIDATES_SCORED, 2)
+        with profiling.span(SpanName.REWARD):
+            pass
+    assert not profiling.is_profiling()
+    profiling.count(CounterName.CANDIDATES_SCORED)
+
+    breakdown = profiler.end_step(1)
+    assert breakdown["episode_step"] == 1
+    assert set(breakdown["spans"]) == {SpanName.REWARD}
+    assert breakdown["spans"][SpanName.REWARD] >= 0
+    assert breakdown["counters"] == {CounterName.CANDIDATES_SCORED: 5}
+
+    # The next step starts empty and the summary aggregates the steps
+    assert profiler.end_step(2) == {"episode_step": 2, "spans": {}, "counters": {}}
+    summary = profiler.summary()
+    assert summary["spans"][SpanName.REWARD]["count"] == 1
+    assert summary["counters"] == {CounterName.CANDIDATES_SCORED: 5}
+
+
+def test_span_histogram_quantiles() -> None:
+    short_duration, long_duration = 1e-5, 1e-2
+    durations = [short_duration] * 9 + [long_duration]
+    histogram = SpanHistogram()
+    assert histogram.quantile(0.5) == pytest.approx(0.0)
+    for duration in durations:
+        histogram.add(duration)
+    summary = histogram.summary()
+    assert summary["count"] == len(durations)
+    assert summary["min"] == pytest.approx(short_duration)
+    assert summary["max"] == pytest.approx(long_duration)
+    # The quantiles are only known up to the width of the buckets of the histogram
+    assert short_duration <= summary["p50"] <= 2 * short_duration
+    assert summary["p99"] == pytest.approx(long_duration)
+
+
+def test_profiling_sinks(tmp_path: Path) -> None:
+    records = [
+        {"episode_step": 1, "spans": {SpanName.REWARD: 0.5, "custom_span": 1.0}, "counters": {}},
+        {"episode_step": 2, "spans": {}, "counters": {CounterName.GLOBAL_ASSIGNMENTS: 4}},
+    ]
+    jsonl_sink = JsonlProfilingSink(tmp_path / "profiling.jsonl")
+    csv_sink = CsvProfilingSink(tmp_path / "profiling.csv")
+    for record in records:
+        jsonl_sink.write(record)
+        csv_sink.write(record)
+    jsonl_sink.close()
+    csv_sink.close()
+
+    with (tmp_path / "profiling.jsonl").open(encoding="utf-8") as file:
+        assert [json.loads(line) for line in file] == records
+    with (tmp_path / "profiling.csv").open(encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert list(rows[0]) == ["episode_step", *SPAN_NAMES, *COUNTER_NAMES]
+    assert rows[0]["reward"] == "0.5"
+    assert rows[1]["global_assignments"] == "4"
+    assert rows[1]["reward"] == "0"
+
+
+def test_step_profiler_from_config(tmp_path: Path) -> None:
+    assert StepProfiler.from_config(ProfilingConfig()) is None
+    config = ProfilingConfig(enabled=True, sink="jsonl", sink_path=str(tmp_path / "profiling.jsonl"))
+    profiler = StepProfiler.from_config(config)
+    assert isinstance(profiler, StepProfiler)
+    assert isinstance(profiler.sink, JsonlProfilingSink)
+    profiler.close()
+    with pytest.raises(MissingProfilingSinkPathError):
+        StepProfiler.from_config(ProfilingConfig(enabled=True, sink="csv"))
+
+
+def test_ithor_env_profiling_info() -> None:
+    env = ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "profiling": {"enabled": True},
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        "args": {"placed_object_type": "Apple", "receptacle_type": "Fridge"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+    env.reset(seed=0)
+    action_name_to_idx = {action_name: idx for idx, action_name in env.action_idx_to_name.items()}
+    _, _, _, _, info = env.step({"action_index": action_name_to_idx[EnvActionName.MOVE_FORWARD]})
+
+    breakdown = info["profiling"]
+    assert breakdown["episode_step"] == 1
+    assert {SpanName.CONTROLLER_STEP, SpanName.REWARD, SpanName.OBSERVATION} <= set(breakdown["spans"])
+    assert env.profiler is not None
+    assert env.profiler.summary()["spans"][SpanName.CONTROLLER_STEP]["count"] == 1
+    env.close()
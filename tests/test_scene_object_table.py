@@ -0,0 +1,111 @@
+"""Tests for the scene_object_table module."""
+
+import pickle as pkl  # noqa: S403
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rl_thor.envs.scene_object_table import SPATIAL_GRID_MIN_OBJECTS, SceneObjectTable
+from rl_thor.envs.sim_objects import SimObjVariableProp
+from rl_thor.envs.tasks.relations import CloseToRelation, ContainedInRelation, ReceptacleOfRelation, Relation
+from rl_thor.utils.ai2thor_utils import compute_objects_2d_distance
+
+test_event_path = Path(__file__).parent / "data" / "test_tasks" / "clean_up_kitchen" / "event_list.pkl"
+
+
+@pytest.fixture
+def scene_object_table() -> SceneObjectTable:
+    with test_event_path.open("rb") as f:
+        event_list = pkl.load(f)  # noqa: S301
+    return SceneObjectTable.from_event(event_list[0])
+
+
+def test_table_is_scene_objects_dict(scene_object_table: SceneObjectTable) -> None:
+    objects = list(scene_object_table.values())
+    assert scene_object_table == {obj["objectId"]: obj for obj in objects}
+    assert all(
+        scene_object_table.object_ids[scene_object_table.row_index[obj_id]] == obj_id for obj_id in scene_object_table
+    )
+
+
+@pytest.mark.parametrize(
+    "key", [SimObjVariableProp.IS_OPEN, SimObjVariableProp.IS_PICKED_UP, SimObjVariableProp.RECEPTACLE_OBJ_IDS]
+)
+def test_columns_match_metadata(scene_object_table: SceneObjectTable, key: SimObjVariableProp) -> None:
+    column = scene_object_table.column(key)
+    assert len(column) == len(scene_object_table)
+    for obj_id, obj in scene_object_table.items():
+        assert scene_object_table.get_value(obj_id, key) == obj[key]
+    assert column is scene_object_table.column(key)
+    assert not column.flags.writeable
+
+
+def test_positions_and_temperature_codes(scene_object_table: SceneObjectTable) -> None:
+    for obj_id, obj in scene_object_table.items():
+        row = scene_object_table.row_index[obj_id]
+        assert tuple(scene_object_table.positions[row]) == (
+            obj["position"]["x"],
+            obj["position"]["y"],
+            obj["position"]["z"],
+        )
+        expected_code = {"Cold": -1, "RoomTemp": 0, "Hot": 1}[obj["temperature"]]
+        assert scene_object_table.temperature_codes[row] == expected_code
+
+
+def test_close_to_related_objects_match_dict_scan(scene_object_table: SceneObjectTable) -> None:
+    relation = CloseToRelation("main", "related", distance=1.5)
+    scene_objects_dict = dict(scene_object_table)
+    for obj in scene_object_table.values():
+        close_object_ids = relation._extract_related_object_ids(obj, scene_object_table)
+        assert close_object_ids == relation._extract_related_object_ids(obj, scene_objects_dict)
+        assert np.allclose(
+            scene_object_table.compute_2d_distances(obj["objectId"]),
+            [compute_objects_2d_distance(obj, other_obj) for other_obj in scene_object_table.values()],
+        )
+
+
+@pytest.mark.parametrize("radius", [0.3, 1.0, 2.5])
+def test_spatial_grid_query_matches_distance_scan(scene_object_table: SceneObjectTable, radius: float) -> None:
+    spatial_grid = scene_object_table.get_spatial_grid(radius)
+    assert spatial_grid is scene_object_table.get_spatial_grid(radius)
+    for obj_id in scene_object_table:
+        distances = scene_object_table.compute_2d_distances(obj_id)
+        center = scene_object_table.positions[scene_object_table.row_index[obj_id], [0, 2]]
+        assert spatial_grid.query_radius(center, radius).tolist() == np.flatnonzero(distances <= radius).tolist()
+
+
+def test_spatial_grid_query_with_smaller_cells(scene_object_table: SceneObjectTable) -> None:
+    spatial_grid = scene_object_table.get_spatial_grid(0.25)
+    for obj_id in scene_object_table:
+        distances = scene_object_table.compute_2d_distances(obj_id)
+        center = scene_object_table.positions[scene_object_table.row_index[obj_id], [0, 2]]
+        assert spatial_grid.query_radius(center, 1.0).tolist() == np.flatnonzero(distances <= 1.0).tolist()
+
+
+def test_find_close_object_ids_in_large_scene() -> None:
+    rng = np.random.default_rng(0)
+    objects = [
+        {"objectId": f"Object|{i}", "position": {"x": float(x), "y": 0.0, "z": float(z)}}
+        for i, (x, z) in enumerate(rng.uniform(-10, 10, size=(2 * SPATIAL_GRID_MIN_OBJECTS, 2)))
+    ]
+    scene_object_table = SceneObjectTable(objects)
+    distance = 1.5
+    for obj in objects[:50]:
+        assert scene_object_table.find_close_object_ids(obj["objectId"], distance) == [
+            other_obj["objectId"]
+            for other_obj in objects
+            if other_obj is not obj and compute_objects_2d_distance(obj, other_obj) <= distance
+        ]
+
+
+@pytest.mark.parametrize("relation_type", [ReceptacleOfRelation, ContainedInRelation])
+def test_containment_related_objects_match_metadata(
+    scene_object_table: SceneObjectTable, relation_type: type[Relation]
+) -> None:
+    relation = relation_type("main", "related")
+    scene_objects_dict = dict(scene_object_table)
+    for obj in scene_object_table.values():
+        assert set(relation._extract_related_object_ids(obj, scene_object_table)) == set(
+            relation._extract_related_object_ids(obj, scene_objects_dict)
+        )
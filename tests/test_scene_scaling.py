@@ -0,0 +1,87 @@
+"""Tests for the scene_scaling module."""
+
+import copy
+import json
+from collections import Counter
+
+import pytest
+
+from rl_thor.envs.controllers import DEFAULT_METADATA_SAMPLES_DIR, SyntheticController
+from rl_thor.envs.scene_scaling import InvalidObjectDensityError, get_replica_id, scale_scene_objects
+from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.tasks import PlaceIn
+
+mug_id = "Mug|-01.76|+00.90|-00.62"
+
+
+@pytest.fixture(scope="module")
+def scene_objects() -> dict:
+    with (DEFAULT_METADATA_SAMPLES_DIR / "FloorPlan1_physics.json").open() as f:
+        return json.load(f)
+
+
+def assert_consistent_containment(objects: dict) -> None:
+    for obj_id, obj_metadata in objects.items():
+        assert obj_metadata["objectId"] == obj_id
+        for parent_id in obj_metadata["parentReceptacles"] or ():
+            assert obj_id in objects[parent_id]["receptacleObjectIds"]
+        for contained_id in obj_metadata["receptacleObjectIds"] or ():
+            assert obj_id in objects[contained_id]["parentReceptacles"]
+    assert len({obj_metadata["name"] for obj_metadata in objects.values()}) == len(objects)
+
+
+@pytest.mark.parametrize("density", [1, 5, 20])
+def test_scale_scene_objects(scene_objects: dict, density: int) -> None:
+    original_scene_objects = copy.deepcopy(scene_objects)
+    scaled_objects = scale_scene_objects(scene_objects, density, state_perturbation=0.5)
+
+    assert len(scaled_objects) == density * len(scene_objects)
+    assert_consistent_containment(scaled_objects)
+    assert Counter(obj["objectType"] for obj in scaled_objects.values()) == Counter({
+        object_type: density * nb_objects
+        for object_type, nb_objects in Counter(obj["objectType"] for obj in scene_objects.values()).items()
+    })
+    # The original objects are not modified
+    assert scene_objects == original_scene_objects
+
+
+def test_scale_scene_object_types(scene_objects: dict) -> None:
+    scaled_objects = scale_scene_objects(scene_objects, 3, scaled_object_types={"Mug", "CounterTop"})
+    assert_consistent_containment(scaled_objects)
+
+    mug_replica = scaled_objects[get_replica_id(mug_id, 2)]
+    assert mug_replica["objectType"] == "Mug"
+    assert mug_replica["position"] != scene_objects[mug_id]["position"]
+    # The replicated mug is in the replica of its counter top
+    assert mug_replica["parentReceptacles"] == [
+        get_replica_id(parent_id, 2) for parent_id in scene_objects[mug_id]["parentReceptacles"]
+    ]
+    assert len(scaled_objects) == len(scene_objects) + 2 * sum(
+        obj["objectType"] in {"Mug", "CounterTop"} for obj in scene_objects.values()
+    )
+
+
+def test_scale_scene_objects_invalid_density(scene_objects: dict) -> None:
+    with pytest.raises(InvalidObjectDensityError):
+        scale_scene_objects(scene_objects, 0)
+    with pytest.raises(InvalidObjectDensityError):
+        SyntheticController(object_density=0)
+
+
+def test_synthetic_controller_object_density(scene_objects: dict) -> None:
+    controller = SyntheticController(object_density=5)
+    event = controller.reset("FloorPlan1")
+    assert len(event.metadata["objects"]) == 5 * len(scene_objects)
+
+    task = PlaceIn(placed_object_type=SimObjectType.MUG, receptacle_type=SimObjectType.COUNTER_TOP)
+    reset_successful, _, _, _ = task.preprocess_and_reset(controller)
+    assert reset_successful
+    placed_object_item = next(item for item in task.items if item.id == "placed_object_0")
+    assert len(placed_object_item.candidates_data) == 5 * sum(
+        obj["objectType"] == "Mug" for obj in scene_objects.values()
+    )
+
+    # The replicas can be interacted with like the original objects
+    event = controller.step(action="PickupObject", objectId=get_replica_id(mug_id, 4))
+    assert event.metadata["lastActionSuccess"]
+    task.compute_task_advancement(event, controller.last_action)
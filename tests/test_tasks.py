@@ -1,8 +1,11 @@
 """Tests for the tasks module."""
 
+import copy
+import itertools
 import pickle as pkl  # noqa: S403
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import pytest
 import yaml
@@ -10,7 +13,11 @@ from ai2thor.controller import Controller
 from ai2thor.server import Event
 from PIL import Image
 
+from rl_thor.envs.controllers import SyntheticController
+from rl_thor.envs.reward import LazyInfoDict
+from rl_thor.envs.scene_object_table import SceneObjectTable
 from rl_thor.envs.sim_objects import SimObjectType
+from rl_thor.envs.tasks.items import SimpleItem
 from rl_thor.envs.tasks.tasks import (
     CleanToiletsTask,
     CleanUpBathroomTask,
@@ -23,34 +30,60 @@ from rl_thor.envs.tasks.tasks import (
     Open,
     Pickup,
     PlaceCooledIn,
+    PlaceNSameIn,
     PrepareGoingToBedTask,
     PrepareMealTask,
     WashCutleryTask,
 )
-from rl_thor.envs.tasks.tasks_interface import BaseTask
+from rl_thor.envs.tasks.tasks_interface import (
+    BaseTask,
+    GraphTask,
+    StaleTaskInfoError,
+    TaskBlueprint,
+    TaskTemplate,
+)
 
 data_dir = Path(__file__).parent / "data"
 test_task_data_dir = data_dir / "test_tasks"
 
 
+class RecordedEpisode(NamedTuple):
+    """Events, controller actions and expected results recorded for a task."""
+
+    event_list: list[Event]
+    controller_action_list: list[dict[str, Any]]
+    advancement_list: list[int]
+    terminated_list: list[bool]
+
+    def initial_controller(self) -> "MockController":
+        """Return a mock controller at the beginning of the episode, to reset the tasks."""
+        return MockController(last_event=self.event_list[0], last_action=self.controller_action_list[0])
+
+    def steps(self) -> Iterator[tuple[Event, dict[str, Any]]]:
+        """Iterate over the events and controller actions of the steps after the reset."""
+        return zip(self.event_list[1:], self.controller_action_list[1:], strict=True)
+
+
+def load_recorded_episode(task_data_dir: Path) -> RecordedEpisode:
+    """Load the episode recorded for a task."""
+    recorded_lists = []
+    for list_name in RecordedEpisode._fields:
+        with (task_data_dir / f"{list_name}.pkl").open("rb") as f:
+            recorded_lists.append(pkl.load(f))  # noqa: S301
+    return RecordedEpisode(*recorded_lists)
+
+
+@pytest.fixture
+def recorded_episode(task_data_dir_name: str) -> RecordedEpisode:
+    """Episode recorded in the `task_data_dir_name` directory of the test tasks data."""
+    return load_recorded_episode(test_task_data_dir / task_data_dir_name)
+
+
 def generate_task_tests_from_saved_data(task: BaseTask, task_data_dir: Path) -> None:  # noqa: PLR0914
     """Generate tests for a task from saved data."""
-    event_list_path = task_data_dir / "event_list.pkl"
-    controller_action_list_path = task_data_dir / "controller_action_list.pkl"
-    advancement_list_path = task_data_dir / "advancement_list.pkl"
-    terminated_list_path = task_data_dir / "terminated_list.pkl"
     test_info_path = task_data_dir / "test_info.yaml"
     test_info = {}
-    with (
-        event_list_path.open("rb") as f,
-        advancement_list_path.open("rb") as g,
-        terminated_list_path.open("rb") as h,
-        controller_action_list_path.open("rb") as i,
-    ):
-        event_list = pkl.load(f)  # noqa: S301
-        controller_action_list = pkl.load(i)  # noqa: S301
-        advancement_list = pkl.load(g)  # noqa: S301
-        terminated_list = pkl.load(h)  # noqa: S301
+    event_list, controller_action_list, advancement_list, terminated_list = load_recorded_episode(task_data_dir)
 
     initial_event = event_list[0]
     mock_controller = MockController(last_event=initial_event, last_action=controller_action_list[0])
@@ -239,3 +272,339 @@ def test_clean_up_bathroom() -> None:
     task = CleanUpBathroomTask()
     task_data_dir = test_task_data_dir / "clean_up_bathroom"
     generate_task_tests_from_saved_data(task, task_data_dir)
+
+
+@pytest.mark.parametrize(
+    ("task_factory", "task_data_dir_name"),
+    [
+        (
+            lambda: PlaceCooledIn(placed_object_type=SimObjectType.APPLE, receptacle_type=SimObjectType.COUNTER_TOP),
+            "place_cooled_in_apple_counter_top",
+        ),
+        (WashCutleryTask, "WashCutleryTask"),
+        (CleanUpKitchenTask, "clean_up_kitchen"),
+        (PrepareGoingToBedTask, "prepare_going_to_bed"),
+    ],
+)
+def test_incremental_advancement_matches_full_update(task_factory: Any, recorded_episode: RecordedEpisode) -> None:
+    """Test that the incremental advancement gives the same results as updating every candidate."""
+    incremental_task = task_factory()
+    full_task = task_factory()
+    full_task.incremental_advancement = False
+    for task in (incremental_task, full_task):
+        task.reset(recorded_episode.initial_controller())
+
+    for event, controller_action in recorded_episode.steps():
+        incremental_results = incremental_task.compute_task_advancement(event, controller_action)
+        full_results = full_task.compute_task_advancement(event, controller_action)
+        assert incremental_results[:2] == full_results[:2]
+        assert incremental_results[2]["best_assignment"] == full_results[2]["best_assignment"]
+
+
+@pytest.mark.parametrize(
+    ("task_blueprint", "task_data_dir_name"),
+    [
+        (
+            TaskBlueprint(
+                PlaceCooledIn,
+                {"FloorPlan1"},
+                {"placed_object_type": SimObjectType.APPLE, "receptacle_type": SimObjectType.COUNTER_TOP},
+            ),
+            "place_cooled_in_apple_counter_top",
+        ),
+        (TaskBlueprint(CleanUpKitchenTask, {"FloorPlan1"}), "clean_up_kitchen"),
+    ],
+)
+def test_task_template_reused_across_episodes(task_blueprint: TaskBlueprint, recorded_episode: RecordedEpisode) -> None:
+    """Test that the task of a template gives the same advancements in each episode it is reused for."""
+    task_template = TaskTemplate(task_blueprint)
+    assert not task_template.is_compiled
+    first_task = task_template.instantiate()
+    for _ in range(2):
+        task = task_template.instantiate()
+        assert task is first_task
+        _, task_advancement, _, _ = task.reset(recorded_episode.initial_controller())
+        task_advancements = [task_advancement]
+        for event, controller_action in recorded_episode.steps():
+            task_advancement, _, info = task.compute_task_advancement(event, controller_action)
+            task_advancements.append(task_advancement)
+        assert task_advancements == recorded_episode.advancement_list
+        assert task.get_candidate_object_ids()
+    # Last info of the episode, and a copy like the ones returned by the steps without changes
+    last_infos = (info, info.updated())
+
+    # The candidates of the last episode are cleared when the task is instantiated again
+    task = task_template.instantiate()
+    assert not task.get_candidate_object_ids()
+
+    # The last info of the episode can be read after the reset, like with a same-step autoreset
+    task.reset(recorded_episode.initial_controller())
+    for info in last_infos:
+        advancement_details = info["advancement_details"]
+        assert sum(details.current_advancement for details in advancement_details.values()) == task_advancement
+        for item_id, candidate_data in info["candidate_data"].items():
+            assert candidate_data.id == info["best_assignment"][item_id]
+            assert sum(candidate_data.properties_advancement.values()) == candidate_data.property_advancement
+
+
+def test_task_info_details_are_computed_on_access() -> None:
+    """Test that the details of the task info are only computed when they are read."""
+    episode = load_recorded_episode(test_task_data_dir / "clean_up_kitchen")
+    task = CleanUpKitchenTask()
+    task.reset(episode.initial_controller())
+    task_advancement, _, info = task.compute_task_advancement(*next(episode.steps()))
+    assert isinstance(info, LazyInfoDict)
+    assert info["task_advancement"] == task_advancement
+    assert not any(info.is_evaluated(key) for key in ("best_assignment", "candidate_data", "advancement_details"))
+
+    best_assignment = info["best_assignment"]
+    assert info.is_evaluated("best_assignment")
+    assert best_assignment.keys() == info["candidate_data"].keys() == {item.id for item in task.items}
+    assert sum(details.current_advancement for details in info["advancement_details"].values()) == task_advancement
+    assert info.evaluate_all().keys() == set(info)
+
+
+def test_lazy_info_dict() -> None:
+    """Test that the lazy entries are computed once and that copies don't compute them."""
+    calls = []
+    info = LazyInfoDict({"a": 1}, {"b": lambda: calls.append("b") or 2})
+    updated_info = info.updated(a=3)
+    assert dict(updated_info) == {"a": 3, "b": 2}
+    assert calls == ["b"]
+    assert not info.is_evaluated("b")
+    assert pkl.loads(pkl.dumps(info)) == {"a": 1, "b": 2}  # noqa: S301
+    assert info["b"] == updated_info["b"]
+    assert calls == ["b", "b"]
+
+    # The lazy entries can be read while iterating over the dictionary
+    info = LazyInfoDict({"a": 1}, {"b": lambda: 2, "c": lambda: 3})
+    assert list(info.items()) == [("a", 1), ("b", 2), ("c", 3)]
+    info = LazyInfoDict({"a": 1}, {"b": lambda: 2, "c": lambda: 3})
+    assert list(info.values()) == [1, 2, 3]
+    assert info.is_evaluated("c")
+
+    # Copies keep the lazy entries lazy and only copy the computed values
+    b_value = 2
+    info = LazyInfoDict({"a": [1]}, {"b": lambda: calls.append("b") or b_value})
+    for info_copy in (copy.copy(info), copy.deepcopy(info)):
+        assert isinstance(info_copy, LazyInfoDict)
+        assert not info_copy.is_evaluated("b")
+    deep_info_copy = copy.deepcopy(info)
+    assert deep_info_copy["a"] == info["a"]
+    assert deep_info_copy["a"] is not info["a"]
+    assert calls == ["b", "b"]
+    assert deep_info_copy["b"] == b_value
+
+
+def test_stale_task_info() -> None:
+    """Test that the lazy entries of the task info can't be computed after the next step."""
+    episode = load_recorded_episode(test_task_data_dir / "clean_up_kitchen")
+    task = CleanUpKitchenTask()
+    task.reset(episode.initial_controller())
+    steps = episode.steps()
+    _, _, read_info = task.compute_task_advancement(*next(steps))
+    read_advancement_details = read_info["advancement_details"]
+    _, _, unread_info = task.compute_task_advancement(*next(steps))
+    for event, controller_action in steps:
+        task.compute_task_advancement(event, controller_action)
+
+    # The entries read at their step are kept, the other ones can't be computed anymore
+    assert read_info["advancement_details"] is read_advancement_details
+    with pytest.raises(StaleTaskInfoError):
+        unread_info["advancement_details"]
+    with pytest.raises(StaleTaskInfoError):
+        copy.deepcopy(unread_info)["candidate_data"]
+
+
+def compute_best_assignment_exhaustively(task: GraphTask, event: Event) -> tuple[int, dict]:
+    """Return the best global assignment by scanning the whole cartesian product of the interesting assignments."""
+    scene_objects_dict = {obj["objectId"]: obj for obj in event.metadata["objects"]}
+    overlap_classes_assignments = [
+        overlap_class.compute_interesting_assignments(scene_objects_dict) for overlap_class in task.overlap_classes
+    ]
+    max_task_advancement = -1
+    best_assignment = {}
+    for assignment_product in itertools.product(*overlap_classes_assignments):
+        global_assignment = {
+            item: obj_id
+            for overlap_class_assignment in assignment_product
+            for item, obj_id in overlap_class_assignment.items()
+        }
+        assignment_advancement = task.compute_assignment_advancement(global_assignment)
+        if assignment_advancement > max_task_advancement:
+            max_task_advancement = assignment_advancement
+            best_assignment = global_assignment
+            if max_task_advancement == task.maximum_advancement:
+                break
+    return max_task_advancement, {item.id: candidate_id for item, candidate_id in best_assignment.items()}
+
+
+@pytest.mark.parametrize(
+    ("task_factory", "task_data_dir_name"),
+    [
+        (PrepareGoingToBedTask, "prepare_going_to_bed"),
+        (WashCutleryTask, "WashCutleryTask"),
+        (DoHomeworkTask, "DoHomework"),
+        (CleanUpKitchenTask, "clean_up_kitchen"),
+        (CleanUpLivingRoomTask, "clean_up_living_room"),
+        (CleanUpBedroomTask, "clean_up_bedroom"),
+        (CleanUpBathroomTask, "clean_up_bathroom"),
+    ],
+)
+def test_best_assignment_search_matches_exhaustive_search(task_factory: Any, recorded_episode: RecordedEpisode) -> None:
+    """Test that the branch-and-bound search returns the same best assignment as the exhaustive search."""
+    task = task_factory()
+    task.reset(recorded_episode.initial_controller())
+    for event, controller_action in recorded_episode.steps():
+        task_advancement, _, info = task.compute_task_advancement(event, controller_action)
+        assert (task_advancement, info["best_assignment"]) == compute_best_assignment_exhaustively(task, event)
+
+
+@pytest.mark.parametrize(
+    ("task_factory", "task_data_dir_name"),
+    [
+        (
+            lambda: PlaceCooledIn(placed_object_type=SimObjectType.APPLE, receptacle_type=SimObjectType.COUNTER_TOP),
+            "place_cooled_in_apple_counter_top",
+        ),
+        (WashCutleryTask, "WashCutleryTask"),
+        (CleanUpKitchenTask, "clean_up_kitchen"),
+        (CleanUpBathroomTask, "clean_up_bathroom"),
+    ],
+)
+def test_batch_property_evaluation_matches_candidate_updates(
+    task_factory: Any, recorded_episode: RecordedEpisode, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that evaluating the properties of all the candidates at once gives the same advancements."""
+
+    def compute_advancements() -> list[int]:
+        task = task_factory()
+        _, task_advancement, _, _ = task.reset(recorded_episode.initial_controller())
+        advancements = [task_advancement]
+        for event, controller_action in recorded_episode.steps():
+            task_advancement, _, _ = task.compute_task_advancement(event, controller_action)
+            advancements.append(task_advancement)
+        return advancements
+
+    expected_advancements = compute_advancements()
+    monkeypatch.setattr("rl_thor.envs.tasks.items.BATCH_EVALUATION_MIN_CANDIDATES", 1)
+    assert compute_advancements() == expected_advancements
+
+
+@pytest.mark.parametrize(
+    "task_factory",
+    [
+        lambda: Open(opened_object_type=SimObjectType.CABINET),
+        lambda: PlaceNSameIn(placed_object_type=SimObjectType.VASE, receptacle_type=SimObjectType.CABINET, n=2),
+    ],
+)
+def test_batch_property_evaluation_on_scaled_scene(task_factory: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the batch evaluation of the properties on a scene with enough candidates to use it."""
+    controller = SyntheticController(frame_shape=(1, 1, 3), object_density=5, state_perturbation=0.5)
+    scene_objects = controller.reset("FloorPlan1").metadata["objects"]
+    object_ids_by_type: dict[str, list[str]] = {}
+    for obj_metadata in scene_objects:
+        object_ids_by_type.setdefault(obj_metadata["objectType"], []).append(obj_metadata["objectId"])
+    actions = [
+        *({"action": "OpenObject", "objectId": obj_id} for obj_id in object_ids_by_type["Cabinet"][::4]),
+        {"action": "PickupObject", "objectId": object_ids_by_type["Vase"][3]},
+        {"action": "PutObject", "objectId": object_ids_by_type["Cabinet"][4]},
+        {"action": "PickupObject", "objectId": object_ids_by_type["Vase"][6]},
+        {"action": "PutObject", "objectId": object_ids_by_type["Cabinet"][12]},
+        *({"action": "CloseObject", "objectId": obj_id} for obj_id in object_ids_by_type["Cabinet"][::8]),
+    ]
+
+    batch_evaluations = []
+    evaluate_properties_many = SimpleItem._evaluate_properties_many
+
+    def spy_evaluate_properties_many(item: SimpleItem, *args: Any) -> list[dict]:
+        batch_evaluations.append(item)
+        return evaluate_properties_many(item, *args)
+
+    def compute_advancements() -> list[int]:
+        controller.reset("FloorPlan1")
+        task = task_factory()
+        reset_successful, task_advancement, _, _ = task.preprocess_and_reset(controller)
+        assert reset_successful
+        advancements = [task_advancement]
+        for action in actions:
+            event = controller.step(action)
+            assert event.metadata["lastActionSuccess"], event.metadata["errorMessage"]
+            task_advancement, _, _ = task.compute_task_advancement(event, controller.last_action)
+            advancements.append(task_advancement)
+        return advancements
+
+    monkeypatch.setattr(SimpleItem, "_evaluate_properties_many", spy_evaluate_properties_many)
+    batch_advancements = compute_advancements()
+    assert batch_evaluations
+
+    monkeypatch.setattr("rl_thor.envs.tasks.items.BATCH_EVALUATION_MIN_CANDIDATES", len(scene_objects) + 1)
+    batch_evaluations.clear()
+    assert compute_advancements() == batch_advancements
+    assert not batch_evaluations
+
+
+def test_batch_property_evaluation_skips_missing_candidates() -> None:
+    """Test that the candidates missing from the scene object table are left to the candidate updates."""
+    controller = SyntheticController(frame_shape=(1, 1, 3), object_density=5)
+    controller.reset("FloorPlan1")
+    task = Open(opened_object_type=SimObjectType.CABINET)
+    reset_successful, _, _, _ = task.preprocess_and_reset(controller)
+    assert reset_successful
+    opened_object_item = next(iter(task.items))
+    candidate_ids = list(opened_object_item.candidates_data)
+    missing_id = candidate_ids[0]
+    scene_object_table = SceneObjectTable([
+        obj_metadata
+        for obj_metadata in controller.last_event.metadata["objects"]
+        if obj_metadata["objectId"] != missing_id
+    ])
+
+    candidates_properties_results = opened_object_item._evaluate_properties_many(scene_object_table, candidate_ids)
+
+    assert candidates_properties_results[0] == {}
+    assert all(
+        properties_results.keys() >= opened_object_item.scored_properties
+        for properties_results in candidates_properties_results[1:]
+    )
+
+
+def compute_compatible_assignments_exhaustively(task: GraphTask, scene_objects_dict: dict[str, Any]) -> list[dict]:
+    """Return the compatible assignments by checking every relation of every assignment of different candidates."""
+    compatible_assignments = []
+    for candidate_ids in itertools.product(*(item.candidate_ids for item in task.items)):
+        if len(set(candidate_ids)) < len(candidate_ids):
+            continue
+        assignment = dict(zip(task.items, candidate_ids, strict=True))
+        if all(
+            relation._are_candidates_compatible(
+                scene_objects_dict[assignment[item]], scene_objects_dict[assignment[relation.related_item]]
+            )
+            for item in task.items
+            for relation in item.relations
+        ):
+            compatible_assignments.append(assignment)
+    return compatible_assignments
+
+
+@pytest.mark.parametrize(
+    "task",
+    [
+        PlaceNSameIn(placed_object_type=SimObjectType.VASE, receptacle_type=SimObjectType.CABINET, n=2),
+        PlaceNSameIn(placed_object_type=SimObjectType.VASE, receptacle_type=SimObjectType.STOVE_BURNER, n=2),
+        PlaceNSameIn(placed_object_type=SimObjectType.APPLE, receptacle_type=SimObjectType.DRAWER),
+        CleanUpKitchenTask(),
+    ],
+)
+def test_compatible_assignments_match_exhaustive_check(task: GraphTask) -> None:
+    """Test that the constraint propagation finds the same compatible assignments as the exhaustive check."""
+    event_list = load_recorded_episode(test_task_data_dir / "clean_up_kitchen").event_list
+    scene_objects_dict = {obj["objectId"]: obj for obj in event_list[0].metadata["objects"]}
+    for item in task.items:
+        item.candidates_data = item.instantiate_candidate_data(scene_objects_dict)
+
+    compatible_assignments = task._compute_compatible_assignments(scene_objects_dict)
+
+    expected_compatible_assignments = compute_compatible_assignments_exhaustively(task, scene_objects_dict)
+    assert len(compatible_assignments) == len(expected_compatible_assignments)
+    assert all(assignment in expected_compatible_assignments for assignment in compatible_assignments)
@@ -0,0 +1,204 @@
+"""Tests for the vector module."""
+
+import pickle as pkl  # noqa: S403
+from pathlib import Path
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium.vector import AutoresetMode, SyncVectorEnv
+
+from rl_thor.envs.actions import EnvActionName
+from rl_thor.envs.ai2thor_envs import ITHOREnv
+from rl_thor.envs.vector import ITHORVectorEnv, WorkerError
+
+test_event_path = Path(__file__).parent / "data" / "test_tasks" / "clean_up_kitchen" / "event_list.pkl"
+
+
+class ReplayEventsEnv(gym.Env):
+    """Stand-in for ITHOREnv replaying the frames of recorded events, one event per step."""
+
+    def __init__(self, offset: int = 0) -> None:
+        with test_event_path.open("rb") as f:
+            self.frames = [event.frame for event in pkl.load(f)]  # noqa: S301
+        self.offset = offset
+        self.observation_space = gym.spaces.Dict({
+            "env_obs": gym.spaces.Box(low=0, high=255, shape=self.frames[0].shape, dtype=np.uint8),
+            "task_obs": gym.spaces.Discrete(4),
+        })
+        self.action_space = gym.spaces.Discrete(2)
+        self.step_count = 0
+
+    def _get_observation(self) -> dict[str, Any]:
+        return {"env_obs": self.frames[self.step_count], "task_obs": self.offset}
+
+    def reset(self, seed: int | None = None, options: dict[str, Any] | None = None) -> tuple[dict[str, Any], dict]:  # noqa: ARG002
+        super().reset(seed=seed)
+        self.step_count = self.offset
+        return self._get_observation(), {"episode_step": self.step_count}
+
+    def step(self, action: int) -> tuple[dict[str, Any], float, bool, bool, dict]:
+        if action == -1:
+            raise ValueError(action)
+        self.step_count += 1
+        terminated = self.step_count == len(self.frames) - 1
+        return self._get_observation(), float(action), terminated, False, {"episode_step": self.step_count}
+
+
+class BufferedReplayEventsEnv(ReplayEventsEnv):
+    """Stand-in for ITHOREnv whose frame observations are views of a buffer overwritten at each step."""
+
+    def __init__(self, offset: int = 0) -> None:
+        super().__init__(offset)
+        self.frame_buffer = np.empty_like(self.frames[0])
+
+    def _get_observation(self) -> dict[str, Any]:
+        np.copyto(self.frame_buffer, self.frames[self.step_count])
+        frame_observation = self.frame_buffer.view()
+        frame_observation.flags.writeable = False
+        return {"env_obs": frame_observation, "task_obs": self.offset}
+
+
+def make_env_fns(num_envs: int) -> list:
+    return [lambda offset=offset: ReplayEventsEnv(offset) for offset in range(num_envs)]
+
+
+def make_synthetic_ithor_env(max_episode_steps: int) -> ITHOREnv:
+    return ITHOREnv(
+        config_override={
+            "controller_backend": "synthetic",
+            "max_episode_steps": max_episode_steps,
+            "tasks": {
+                "task_blueprints": [
+                    {
+                        "task_type": "PlaceIn",
+                        "args": {"placed_object_type": "Apple", "receptacle_type": "Fridge"},
+                        "scenes": ["FloorPlan1"],
+                    }
+                ]
+            },
+        }
+    )
+
+
+@pytest.mark.parametrize("copy", [True, False])
+def test_vector_env_matches_sync_vector_env(copy: bool) -> None:
+    num_envs = 3
+    vector_env = ITHORVectorEnv(make_env_fns(num_envs), copy=copy)
+    sync_vector_env = SyncVectorEnv(make_env_fns(num_envs), autoreset_mode=AutoresetMode.SAME_STEP)
+    try:
+        assert vector_env.observation_space == sync_vector_env.observation_space
+        observations, infos = vector_env.reset(seed=0)
+        expected_observations, expected_infos = sync_vector_env.reset(seed=0)
+        assert all(np.array_equal(observations[key], expected_observations[key]) for key in expected_observations)
+        assert np.array_equal(infos["episode_step"], expected_infos["episode_step"])
+
+        for _ in range(12):
+            actions = vector_env.action_space.sample()
+            results = vector_env.step(actions)
+            expected_results = sync_vector_env.step(actions)
+            for key in expected_results[0]:
+                assert np.array_equal(results[0][key], expected_results[0][key])
+            for result, expected_result in zip(results[1:4], expected_results[1:4], strict=True):
+                assert np.array_equal(result, expected_result)
+            assert np.array_equal(results[4]["episode_step"], expected_results[4]["episode_step"])
+            assert np.array_equal(results[4].get("_final_obs"), expected_results[4].get("_final_obs"))
+        assert results[0]["env_obs"].flags.writeable == copy
+    finally:
+        vector_env.close()
+        sync_vector_env.close()
+
+
+def test_vector_env_attributes_and_worker_errors() -> None:
+    vector_env = ITHORVectorEnv(make_env_fns(2))
+    try:
+        vector_env.reset()
+        assert vector_env.get_attr("offset") == (0, 1)
+        new_offset = 3
+        vector_env.set_attr("offset", new_offset, indices=[1])
+        assert vector_env.get_attr("offset") == (0, new_offset)
+        assert vector_env.env_method("_get_observation", indices=[1])[0]["task_obs"] == new_offset
+        assert vector_env.is_wrapped(gym.Wrapper) == (False, False)
+        with pytest.raises(WorkerError, match="ValueError"):
+            vector_env.step(np.array([0, -1]))
+    finally:
+        vector_env.close()
+
+
+def test_vector_env_autoreset_of_ithor_envs() -> None:
+    num_envs, max_episode_steps = 2, 3
+    vector_env = ITHORVectorEnv([lambda: make_synthetic_ithor_env(max_episode_steps)] * num_envs)
+    try:
+        action_index = vector_env.get_attr("action_idx_to_name")[0]
+        action_name_to_idx = {action_name: idx for idx, action_name in action_index.items()}
+        actions = {"action_index": np.full(num_envs, action_name_to_idx[EnvActionName.MOVE_FORWARD])}
+        observations, infos = vector_env.reset(seed=0)
+        assert observations["env_obs"].shape == vector_env.observation_space["env_obs"].shape
+        assert infos["episode_step"].tolist() == [0] * num_envs
+
+        for step in range(1, 2 * max_episode_steps + 1):
+            observations, _, terminations, truncations, infos = vector_env.step(actions)
+            episode_ended = step % max_episode_steps == 0
+            assert not terminations.any()
+            assert truncations.tolist() == [episode_ended] * num_envs
+            if not episode_ended:
+                assert infos["episode_step"].tolist() == [step % max_episode_steps] * num_envs
+                assert "final_info" not in infos
+                continue
+            # The environments are reset in the same step and the last step is in the final infos
+            assert infos["episode_step"].tolist() == [0] * num_envs
+            assert infos["_final_info"].all()
+            assert infos["final_info"]["episode_step"].tolist() == [max_episode_steps] * num_envs
+            assert infos["final_obs"][0]["env_obs"].shape == observations["env_obs"].shape[1:]
+            assert infos["final_info"]["task_info"]["_advancement_details"].all()
+    finally:
+        vector_env.close()
+
+
+def test_vector_env_final_observation_of_buffered_env() -> None:
+    vector_env = ITHORVectorEnv([BufferedReplayEventsEnv])
+    episode_length = len(ReplayEventsEnv().frames) - 1
+    try:
+        vector_env.reset()
+        for _ in range(episode_length):
+            observations, _, terminations, _, infos = vector_env.step(np.array([0]))
+        assert terminations.all()
+        # The last frame of the episode is not overwritten by the frame of the reset
+        assert np.array_equal(infos["final_obs"][0]["env_obs"], ReplayEventsEnv().frames[-1])
+        assert np.array_equal(observations["env_obs"][0], ReplayEventsEnv().frames[0])
+    finally:
+        vector_env.close()
+
+
+def test_sb3_vec_env_terminal_observations() -> None:
+    sb3_vec_env_module = pytest.importorskip("rl_thor.envs.vector.sb3_vec_env")
+    sb3_vec_env = sb3_vec_env_module.ITHORSB3VecEnv(make_env_fns(2))
+    episode_length = len(ReplayEventsEnv().frames) - 1
+    try:
+        observations = sb3_vec_env.reset()
+        assert observations["env_obs"].shape == (2, *ReplayEventsEnv().frames[0].shape)
+        for _ in range(episode_length):
+            _, rewards, dones, infos = sb3_vec_env.step(np.array([1, 0]))
+            assert rewards.tolist() == [1.0, 0.0]
+        assert dones.tolist() == [True, False]
+        assert infos[0]["episode_step"] == episode_length
+        assert not infos[0]["TimeLimit.truncated"]
+        assert np.array_equal(infos[0]["terminal_observation"]["env_obs"], ReplayEventsEnv().frames[-1])
+        assert sb3_vec_env.reset_infos[0] == {"episode_step": 0}
+    finally:
+        sb3_vec_env.close()
+
+
+def test_sb3_dummy_vec_env_keeps_task_info_lazy() -> None:
+    dummy_vec_env_module = pytest.importorskip("stable_baselines3.common.vec_env")
+    dummy_vec_env = dummy_vec_env_module.DummyVecEnv([lambda: make_synthetic_ithor_env(max_episode_steps=10)])
+    try:
+        dummy_vec_env.reset()
+        # The infos are deep copied by DummyVecEnv at each step
+        _, _, _, infos = dummy_vec_env.step([{"action_index": 0}])
+        task_info = infos[0]["task_info"]
+        assert not any(task_info.is_evaluated(key) for key in ("candidate_data", "advancement_details"))
+        assert {item.id for item in task_info["advancement_details"]} == task_info["candidate_data"].keys()
+    finally:
+        dummy_vec_env.close()
@@ -6,6 +6,7 @@ import pytest
 
 from rl_thor.envs.ai2thor_envs import ITHOREnv
 from rl_thor.envs.wrappers import (
+    AlreadyChannelFirstError,
     ChannelFirstObservationWrapper,
     MoreThanOneTaskBlueprintError,
     NormalizeActionWrapper,
@@ -148,6 +149,42 @@ def test_channel_first_observation_wrapper_step():
     environment_obs = observation["env_obs"]
     assert isinstance(environment_obs, np.ndarray)
     assert environment_obs.shape == (3, 300, 300)
+    assert not environment_obs.flags.writeable
+    assert np.array_equal(environment_obs, np.moveaxis(channel_last_ithor_env.last_frame, -1, 0))
+
+
+def test_channel_first_observation_wrapper_previous_observation_kept():
+    channel_last_ithor_env = ITHOREnv(config_override={**base_config, "controller_backend": "synthetic"})
+    wrapped_env = ChannelFirstObservationWrapper(channel_last_ithor_env)
+    rng = np.random.default_rng(0)
+    previous_frame, frame = rng.integers(0, 256, size=(2, 300, 300, 3), dtype=np.uint8)
+    previous_environment_obs = wrapped_env.observation({"env_obs": previous_frame})["env_obs"]
+
+    environment_obs = wrapped_env.observation({"env_obs": frame})["env_obs"]
+    assert not np.shares_memory(previous_environment_obs, environment_obs)
+    assert np.array_equal(previous_environment_obs, np.moveaxis(previous_frame, -1, 0))
+    wrapped_env.close()
+
+
+channel_first_config = {
+    **base_config,
+    "controller_backend": "synthetic",
+    "observation": {"channel_first": True},
+}
+
+
+@pytest.mark.parametrize("config_override", [channel_first_config])
+def test_channel_first_observation_config(ithor_env_conf):
+    observation, _ = ithor_env_conf.reset(seed=0)
+    environment_obs = observation["env_obs"]
+    assert ithor_env_conf.observation_space.spaces["env_obs"].shape == (3, 300, 300)
+    assert environment_obs.shape == (3, 300, 300)
+    assert environment_obs.flags.c_contiguous
+    assert not environment_obs.flags.writeable
+    assert np.array_equal(environment_obs, np.moveaxis(ithor_env_conf.last_frame, -1, 0))
+
+    with pytest.raises(AlreadyChannelFirstError):
+        ChannelFirstObservationWrapper(ithor_env_conf)
 
 
 # %% === NormalizeActionWrapper tests ===#